@@ -0,0 +1,7 @@
+"""
+Performance benchmarks of the grader.
+
+Synthetic submissions of several shapes are generated on the fly, graded and processed by the file helpers,
+and the latency and throughput of each benchmark (and of each stage measured inside it) are stored as JSON,
+to be compared against a baseline. Run with ``python -m benchmarks --help``.
+"""
@@ -0,0 +1,140 @@
+"""
+Entry point of the benchmarks.
+
+Usage:
+    python -m benchmarks run [--profiles small medium] [--output results.json] [--baseline baseline.json]
+    python -m benchmarks compare results.json baseline.json [--threshold 0.2] [--thresholds thresholds.json]
+    python -m benchmarks list
+
+The exit code is 1 if a benchmark regressed compared to the baseline.
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+from typing import Any
+
+from benchmarks.compare import (
+    DEFAULT_MIN_DELTA,
+    DEFAULT_THRESHOLD,
+    compare_results,
+    format_comparisons,
+    load_thresholds,
+)
+from benchmarks.generators import DEFAULT_PROFILES, PROFILES
+from benchmarks.runner import load_results, run_benchmarks, save_results
+from benchmarks.scenarios import SCENARIOS
+
+DEFAULT_RESULTS_PATH = "benchmark_results.json"
+
+
+def get_args() -> dict[str, Any]:
+    """
+    Create the CLI parser and return the parsed arguments.
+
+    :returns: Dictionary, containing the parsed arguments
+    """
+    parser = argparse.ArgumentParser("python -m benchmarks", description="Grader performance benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    comparison_parser = argparse.ArgumentParser(add_help=False)
+    comparison_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Allowed slowdown of the median latency, as a fraction. Defaults to {DEFAULT_THRESHOLD}",
+    )
+    comparison_parser.add_argument(
+        "--thresholds", type=str, help="JSON file mapping benchmark name patterns (e.g. 'grade:*') to thresholds"
+    )
+    comparison_parser.add_argument(
+        "--min-delta",
+        type=float,
+        default=DEFAULT_MIN_DELTA,
+        help=f"Smallest slowdown in seconds counted as a regression. Defaults to {DEFAULT_MIN_DELTA}",
+    )
+
+    run_parser = subparsers.add_parser("run", parents=[comparison_parser], help="Run the benchmarks")
+    run_parser.add_argument(
+        "--profiles", nargs="+", choices=list(PROFILES), default=DEFAULT_PROFILES, help="The generated submissions"
+    )
+    run_parser.add_argument(
+        "--scenarios", nargs="+", choices=list(SCENARIOS), help="The scenarios to run. Defaults to the offline ones"
+    )
+    run_parser.add_argument("--repeat", type=int, default=5, help="Amount of measured runs of each benchmark")
+    run_parser.add_argument("--warmup", type=int, default=1, help="Amount of unmeasured runs before the measured ones")
+    run_parser.add_argument("-o", "--output", type=str, default=DEFAULT_RESULTS_PATH, help="The results file")
+    run_parser.add_argument("--baseline", type=str, help="A results file to compare the results with")
+
+    compare_parser = subparsers.add_parser(
+        "compare", parents=[comparison_parser], help="Compare a results file with a baseline"
+    )
+    compare_parser.add_argument("results", type=str, help="The results file")
+    compare_parser.add_argument("baseline", type=str, help="The baseline results file")
+
+    subparsers.add_parser("list", help="List the scenarios and the submission profiles")
+
+    return parser.parse_args().__dict__
+
+
+def compare(results_path: str, baseline_path: str, args: dict[str, Any]) -> int:
+    """
+    Compare a results file with a baseline and print the comparison.
+
+    :param results_path: The results file.
+    :param baseline_path: The baseline results file.
+    :param args: The parsed arguments, with the thresholds.
+    :return: The exit code - 1 if a benchmark regressed, 0 otherwise.
+    """
+    comparisons = compare_results(
+        load_results(results_path),
+        load_results(baseline_path),
+        load_thresholds(args["thresholds"]),
+        args["threshold"],
+        args["min_delta"],
+    )
+    sys.stdout.write(format_comparisons(comparisons))
+
+    return 1 if any(comparison.is_regression for comparison in comparisons) else 0
+
+
+def main() -> int:
+    """
+    Run the benchmarks CLI.
+
+    :return: The exit code.
+    """
+    args = get_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # The grader logs every check result, which is noise in the benchmark output
+    logging.getLogger("grader").setLevel(logging.WARNING)
+
+    match args["command"]:
+        case "list":
+            for scenario in SCENARIOS.values():
+                suffix = "" if scenario.is_offline else " (needs the package index)"
+                sys.stdout.write(f"{scenario.name}: {scenario.description}{suffix}\n")
+            for profile in PROFILES.values():
+                sys.stdout.write(f"{profile.name}: {profile}\n")
+            return 0
+        case "compare":
+            return compare(args["results"], args["baseline"], args)
+
+    scenario_names = args["scenarios"] or [name for name, scenario in SCENARIOS.items() if scenario.is_offline]
+    scenarios = [SCENARIOS[name] for name in scenario_names]
+    profiles = [PROFILES[name] for name in args["profiles"]]
+
+    work_directory = tempfile.mkdtemp(prefix="pygrader-benchmarks-")
+    results = run_benchmarks(scenarios, profiles, work_directory, args["repeat"], args["warmup"])
+    save_results(results, args["output"])
+    logging.getLogger("benchmarks").info("Results written to %s", args["output"])
+
+    if args["baseline"] is not None:
+        return compare(args["output"], args["baseline"], args)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
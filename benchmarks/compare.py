@@ -0,0 +1,155 @@
+"""
+Module comparing benchmark results against a baseline.
+
+A benchmark regressed when its median latency grew by more than its threshold (a fraction, e.g. 0.2 for 20%).
+The mean wall time of each stage measured inside a benchmark is compared the same way, so a slower check shows up
+even when the whole benchmark is within its threshold. Differences below a minimal delta are ignored,
+as very short benchmarks are dominated by noise.
+"""
+
+import json
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from typing import Any, Optional
+
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_MIN_DELTA = 0.005
+
+
+@dataclass
+class Comparison:
+    """The comparison of a benchmark (or of a stage inside it) with the baseline."""
+
+    name: str
+    baseline: float
+    current: float
+    threshold: float
+    is_regression: bool
+
+    @property
+    def change(self) -> float:
+        """
+        Get the relative change of the latency.
+
+        :returns: The change, e.g. 0.25 if the benchmark got 25% slower, or 0.0 if there is no baseline latency.
+        :rtype: float
+        """
+        if self.baseline == 0:
+            return 0.0
+        return self.current / self.baseline - 1
+
+
+def load_thresholds(path: Optional[str]) -> dict[str, float]:
+    """
+    Load the per-benchmark thresholds.
+
+    The file maps glob patterns of benchmark names to thresholds, e.g. {"grade:*": 0.3, "*#check:*": 0.5}.
+
+    :param path: The path to the thresholds file, or None for no per-benchmark thresholds.
+    :raises ValueError: If the thresholds are not a mapping of patterns to non-negative numbers.
+    :return: The thresholds, keyed by pattern.
+    """
+    if path is None:
+        return {}
+
+    with open(path, "r", encoding="utf-8") as thresholds_file:
+        thresholds = json.load(thresholds_file)
+
+    if not isinstance(thresholds, dict) or not all(
+        isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0 for value in thresholds.values()
+    ):
+        raise ValueError(f"{path} must map benchmark name patterns to non-negative thresholds")
+
+    return {pattern: float(value) for pattern, value in thresholds.items()}
+
+
+def get_threshold(name: str, thresholds: dict[str, float], default_threshold: float) -> float:
+    """
+    Get the threshold of a benchmark: the one of the last matching pattern, or the default one.
+
+    :param name: The name of the benchmark, e.g. "grade:directory/small", or "grade:directory/small#check:structure".
+    :param thresholds: The per-benchmark thresholds, keyed by glob pattern.
+    :param default_threshold: The threshold of the benchmarks matching no pattern.
+    :return: The threshold.
+    """
+    threshold = default_threshold
+
+    for pattern, pattern_threshold in thresholds.items():
+        if fnmatchcase(name, pattern):
+            threshold = pattern_threshold
+
+    return threshold
+
+
+def get_stage_latencies(benchmark: dict[str, Any]) -> dict[str, float]:
+    """
+    Get the mean wall time of each stage measured inside a benchmark.
+
+    :param benchmark: The results of the benchmark.
+    :return: The mean wall time of each stage, keyed by stage name.
+    """
+    return {
+        stage["name"]: stage["total_wall_time"] / stage["runs"]
+        for stage in benchmark.get("stages", [])
+        if stage["runs"]
+    }
+
+
+def compare_results(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    thresholds: Optional[dict[str, float]] = None,
+    default_threshold: float = DEFAULT_THRESHOLD,
+    min_delta: float = DEFAULT_MIN_DELTA,
+) -> list[Comparison]:
+    """
+    Compare the benchmarks (and their stages) present in both results.
+
+    :param current: The current results, keyed by benchmark name.
+    :param baseline: The baseline results, keyed by benchmark name.
+    :param thresholds: The per-benchmark thresholds, keyed by glob pattern.
+    :param default_threshold: The threshold of the benchmarks matching no pattern.
+    :param min_delta: The smallest slowdown, in seconds, which can be a regression.
+    :return: The comparison of each benchmark, followed by the comparisons of its stages.
+    """
+    thresholds = thresholds or {}
+    comparisons = []
+
+    for name, benchmark in current.items():
+        if name not in baseline:
+            continue
+
+        latencies = [(name, baseline[name]["latency"]["median"], benchmark["latency"]["median"])]
+        baseline_stages = get_stage_latencies(baseline[name])
+        latencies += [
+            (f"{name}#{stage}", baseline_stages[stage], latency)
+            for stage, latency in get_stage_latencies(benchmark).items()
+            if stage in baseline_stages
+        ]
+
+        for comparison_name, baseline_latency, current_latency in latencies:
+            threshold = get_threshold(comparison_name, thresholds, default_threshold)
+            slowdown = current_latency - baseline_latency
+            is_regression = slowdown > min_delta and current_latency > baseline_latency * (1 + threshold)
+            comparisons.append(Comparison(comparison_name, baseline_latency, current_latency, threshold, is_regression))
+
+    return comparisons
+
+
+def format_comparisons(comparisons: list[Comparison]) -> str:
+    """
+    Format the comparisons as a plain text table.
+
+    :param comparisons: The comparisons of the benchmarks.
+    :return: A line for each comparison, with the regressions marked.
+    """
+    lines = [
+        f"{'REGRESSION' if comparison.is_regression else 'ok':<10} {comparison.name}: "
+        f"{comparison.baseline:.4f}s -> {comparison.current:.4f}s ({comparison.change:+.1%}, "
+        f"threshold {comparison.threshold:.0%})"
+        for comparison in comparisons
+    ]
+    regressions = sum(comparison.is_regression for comparison in comparisons)
+    lines.append(f"{regressions} regressions in {len(comparisons)} comparisons")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,191 @@
+"""
+Module generating synthetic submissions for the benchmarks.
+
+The submissions are deterministic - the same profile always generates the same files - so results of different runs
+are comparable. Each profile stresses a different part of the grader: the size of the project, the amount of files,
+the depth of the directory tree or the size of the test suite.
+"""
+
+import os
+import shutil
+import zipfile
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class SubmissionProfile:
+    """The shape of a synthetic submission."""
+
+    name: str
+    modules: int
+    functions_per_module: int
+    test_files: int
+    tests_per_file: int
+    depth: int = 1
+
+
+PROFILES: dict[str, SubmissionProfile] = {
+    profile.name: profile
+    for profile in [
+        SubmissionProfile("small", modules=5, functions_per_module=5, test_files=2, tests_per_file=5),
+        SubmissionProfile("medium", modules=50, functions_per_module=10, test_files=20, tests_per_file=10),
+        SubmissionProfile("large", modules=300, functions_per_module=20, test_files=100, tests_per_file=10),
+        SubmissionProfile("many-files", modules=2000, functions_per_module=1, test_files=200, tests_per_file=1),
+        SubmissionProfile("deep-tree", modules=200, functions_per_module=2, test_files=20, tests_per_file=2, depth=25),
+        SubmissionProfile("heavy-tests", modules=20, functions_per_module=10, test_files=50, tests_per_file=200),
+    ]
+}
+
+DEFAULT_PROFILES = ["small", "medium", "large", "many-files", "deep-tree", "heavy-tests"]
+
+PACKAGE_NAME = "app"
+
+
+@dataclass(frozen=True)
+class GeneratedSubmission:
+    """A synthetic submission, both as a directory and as a zip archive."""
+
+    profile: SubmissionProfile
+    project_root: str
+    archive_path: str
+    files: int
+    size: int
+
+
+def get_module_directory(profile: SubmissionProfile, index: int) -> str:
+    """
+    Get the directory of a module, relative to the project root. Modules are spread over the levels of the tree.
+
+    :param profile: The profile of the submission.
+    :param index: The index of the module.
+    :return: The directory of the module.
+    """
+    level = index % profile.depth
+    return os.path.join("src", PACKAGE_NAME, *(f"level_{depth}" for depth in range(level)))
+
+
+def get_module_import(profile: SubmissionProfile, index: int) -> str:
+    """
+    Get the import path of a module.
+
+    :param profile: The profile of the submission.
+    :param index: The index of the module.
+    :return: The dotted path of the module.
+    """
+    directory = get_module_directory(profile, index)
+    return ".".join([*directory.split(os.sep)[1:], f"module_{index}"])
+
+
+def render_module(profile: SubmissionProfile, index: int) -> str:
+    """
+    Render the source of a module, with type hinted functions and a class.
+
+    :param profile: The profile of the submission.
+    :param index: The index of the module.
+    :return: The source of the module.
+    """
+    parts = [f'"""Generated module {index}."""\n']
+
+    for function_index in range(profile.functions_per_module):
+        parts.append(
+            f"\n\ndef function_{function_index}(value: int) -> int:\n"
+            f'    """Transform the value."""\n'
+            f"    total = value\n"
+            f"    for step in range({function_index % 7 + 3}):\n"
+            f"        total += step * {index + 1}\n"
+            f"    return total\n"
+        )
+
+    parts.append(
+        f"\n\nclass Model{index}:\n"
+        f'    """A generated model."""\n\n'
+        f"    def __init__(self, value: int) -> None:\n"
+        f'        """Store the value."""\n'
+        f"        self.value = value\n\n"
+        f"    def compute(self) -> int:\n"
+        f'        """Compute the result of the model."""\n'
+        f"        return function_0(self.value)\n"
+    )
+
+    return "".join(parts)
+
+
+def render_test_file(profile: SubmissionProfile, index: int) -> str:
+    """
+    Render the source of a test file, testing one of the modules.
+
+    :param profile: The profile of the submission.
+    :param index: The index of the test file.
+    :return: The source of the test file.
+    """
+    module_index = index % profile.modules
+    parts = [
+        f'"""Generated tests {index}."""\n\n'
+        f"import unittest\n\n"
+        f"from {get_module_import(profile, module_index)} import function_0\n\n\n"
+        f"class TestModule{index}(unittest.TestCase):\n"
+        f'    """Generated test case."""\n'
+    ]
+
+    parts += [
+        f"\n    def test_{test_index}(self) -> None:\n"
+        f'        """Generated test."""\n'
+        f"        self.assertEqual(function_0({test_index}), function_0({test_index}))\n"
+        for test_index in range(profile.tests_per_file)
+    ]
+
+    return "".join(parts)
+
+
+def write_file(path: str, content: str) -> int:
+    """
+    Write a file of the submission, creating its directory.
+
+    :param path: The path of the file.
+    :param content: The content of the file.
+    :return: The size of the file, in bytes.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with open(path, "w", encoding="utf-8") as file:
+        return file.write(content)
+
+
+def generate_submission(profile: SubmissionProfile, directory: str) -> GeneratedSubmission:
+    """
+    Generate a submission, as a directory and a zip archive of that directory.
+
+    :param profile: The profile of the submission.
+    :param directory: The directory to generate the submission in. It is replaced if it exists.
+    :return: The generated submission.
+    """
+    shutil.rmtree(directory, ignore_errors=True)
+    project_root = os.path.join(directory, profile.name)
+
+    files = {
+        "main.py": f'"""Entry point."""\n\nfrom {PACKAGE_NAME}.module_0 import Model0\n\nprint(Model0(1).compute())\n',
+        "requirements.txt": "",
+        "README.md": f"# Generated {profile.name} submission\n",
+        # The tests import the package from the source directory
+        "pyproject.toml": '[tool.pytest.ini_options]\npythonpath = ["src"]\n',
+    }
+
+    for index in range(profile.modules):
+        module_directory = get_module_directory(profile, index)
+        files[os.path.join(module_directory, f"module_{index}.py")] = render_module(profile, index)
+
+        # Every level of the tree is a package
+        for level in range(index % profile.depth + 1):
+            files[os.path.join(get_module_directory(profile, level), "__init__.py")] = ""
+
+    for index in range(profile.test_files):
+        files[os.path.join("tests", f"test_module_{index}.py")] = render_test_file(profile, index)
+
+    size = sum(write_file(os.path.join(project_root, path), content) for path, content in files.items())
+
+    archive_path = os.path.join(directory, f"{profile.name}.zip")
+    with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for path in sorted(files):
+            archive.write(os.path.join(project_root, path), os.path.join(profile.name, path))
+
+    return GeneratedSubmission(profile, project_root, archive_path, len(files), size)
@@ -0,0 +1,207 @@
+"""
+Module running the benchmarks and storing their results.
+
+Every scenario runs on every generated submission, a few times after a warmup run. Each run is timed as a whole,
+and the stages measured inside it (checks, extraction, venv setup...) are aggregated over all the runs.
+"""
+
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+import grader.utils.constants as const
+from benchmarks.generators import GeneratedSubmission, SubmissionProfile, generate_submission
+from benchmarks.scenarios import Scenario
+from grader.utils.instrumentation import Instrumentation, StageMetrics, StageSummary, summarize_stages
+
+logger = logging.getLogger("benchmarks")
+
+# Bump when the format of the results file changes
+RESULTS_FORMAT_VERSION = 1
+
+
+@dataclass
+class LatencyStatistics:
+    """The latency of the runs of a benchmark, in seconds."""
+
+    min: float
+    median: float
+    mean: float
+    p95: float
+    max: float
+
+    @staticmethod
+    def from_samples(samples: list[float]) -> "LatencyStatistics":
+        """
+        Compute the statistics of the measured latencies.
+
+        :param samples: The latency of each run, in seconds.
+        :return: The statistics of the latencies.
+        """
+        ordered = sorted(samples)
+        p95_index = min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))
+
+        return LatencyStatistics(
+            min=ordered[0],
+            median=statistics.median(ordered),
+            mean=statistics.fmean(ordered),
+            p95=ordered[p95_index],
+            max=ordered[-1],
+        )
+
+
+@dataclass
+class BenchmarkResult:
+    """The result of a scenario on a submission profile."""
+
+    scenario: str
+    profile: str
+    runs: int
+    files: int
+    size: int
+    latency: LatencyStatistics
+    files_per_second: float
+    bytes_per_second: float
+    stages: list[StageSummary] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        """
+        Get the name of the benchmark.
+
+        :returns: The scenario and the profile, e.g. "grade:directory/small".
+        :rtype: str
+        """
+        return f"{self.scenario}/{self.profile}"
+
+
+def run_benchmark(
+    scenario: Scenario, submission: GeneratedSubmission, work_directory: str, repeat: int, warmup: int
+) -> BenchmarkResult:
+    """
+    Run a scenario on a submission several times and measure it.
+
+    :param scenario: The scenario to run.
+    :param submission: The submission to run the scenario on.
+    :param work_directory: A directory for the files of the runs, emptied after each run.
+    :param repeat: The amount of measured runs.
+    :param warmup: The amount of runs before the measured ones, e.g. to fill the OS caches.
+    :return: The result of the benchmark.
+    """
+    samples: list[float] = []
+    stages: list[StageMetrics] = []
+
+    for run_index in range(warmup + repeat):
+        run_directory = os.path.join(work_directory, f"run-{run_index}")
+
+        with Instrumentation() as instrumentation:
+            start_time = time.perf_counter()
+            scenario.run(submission, run_directory)
+            elapsed = time.perf_counter() - start_time
+
+        shutil.rmtree(run_directory, ignore_errors=True)
+
+        if run_index >= warmup:
+            samples.append(elapsed)
+            stages += instrumentation.stages
+
+    latency = LatencyStatistics.from_samples(samples)
+
+    return BenchmarkResult(
+        scenario=scenario.name,
+        profile=submission.profile.name,
+        runs=repeat,
+        files=submission.files,
+        size=submission.size,
+        latency=latency,
+        files_per_second=submission.files / latency.median if latency.median > 0 else 0.0,
+        bytes_per_second=submission.size / latency.median if latency.median > 0 else 0.0,
+        stages=summarize_stages(stages),
+    )
+
+
+def run_benchmarks(
+    scenarios: list[Scenario], profiles: list[SubmissionProfile], work_directory: str, repeat: int, warmup: int
+) -> list[BenchmarkResult]:
+    """
+    Generate a submission of each profile, and run every scenario on it.
+
+    :param scenarios: The scenarios to run.
+    :param profiles: The profiles of the generated submissions.
+    :param work_directory: The directory for the submissions and the files of the runs, removed afterwards.
+    :param repeat: The amount of measured runs of each benchmark.
+    :param warmup: The amount of unmeasured runs before the measured ones.
+    :return: The result of each benchmark.
+    """
+    results = []
+
+    try:
+        for profile in profiles:
+            logger.info("Generating the %s submission", profile.name)
+            submission = generate_submission(profile, os.path.join(work_directory, "submissions", profile.name))
+
+            for scenario in scenarios:
+                logger.info("Running %s on the %s submission", scenario.name, profile.name)
+                result = run_benchmark(scenario, submission, os.path.join(work_directory, "runs"), repeat, warmup)
+                logger.info("%s: median %.4fs", result.name, result.latency.median)
+                results.append(result)
+    finally:
+        shutil.rmtree(work_directory, ignore_errors=True)
+
+    return results
+
+
+def results_to_json(results: list[BenchmarkResult]) -> dict[str, Any]:
+    """
+    Convert the results of the benchmarks to a JSON-compatible dictionary, with the environment they ran in.
+
+    :param results: The results of the benchmarks.
+    :return: The results, keyed by the name of each benchmark.
+    """
+    return {
+        "format": RESULTS_FORMAT_VERSION,
+        "grader": const.VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "benchmarks": {result.name: asdict(result) for result in results},
+    }
+
+
+def save_results(results: list[BenchmarkResult], path: str) -> None:
+    """
+    Store the results of the benchmarks in a JSON file.
+
+    :param results: The results of the benchmarks.
+    :param path: The path of the results file.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(path, "w", encoding="utf-8") as results_file:
+        json.dump(results_to_json(results), results_file, indent=4)
+
+
+def load_results(path: str) -> dict[str, Any]:
+    """
+    Load the results of the benchmarks from a JSON file.
+
+    :param path: The path of the results file.
+    :raises ValueError: If the file is not a results file of a supported format.
+    :return: The results, keyed by the name of each benchmark.
+    """
+    with open(path, "r", encoding="utf-8") as results_file:
+        content = json.load(results_file)
+
+    if not isinstance(content, dict) or content.get("format") != RESULTS_FORMAT_VERSION:
+        raise ValueError(f"{path} is not a benchmark results file of format {RESULTS_FORMAT_VERSION}")
+
+    return content["benchmarks"]
@@ -0,0 +1,218 @@
+"""
+Module containing the benchmarked scenarios.
+
+Each scenario processes a generated submission once. The default scenarios run fully offline:
+the grading scenarios run the checks which need no virtual environment, with the grader tools installed alongside
+the benchmarks. Setting up a virtual environment installs the grader tools from the package index, so that scenario
+is opt-in.
+"""
+
+import json
+import logging
+import os
+import shutil
+import sysconfig
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from benchmarks.generators import GeneratedSubmission
+from grader.grader import Grader
+from grader.utils import constants as const
+from grader.utils.archive import extract_archive
+from grader.utils.project_index import ProjectIndex
+from grader.utils.virtual_environment import VirtualEnvironment
+
+logger = logging.getLogger("benchmarks")
+
+# The grader logs through its own logger, silenced by the benchmarks CLI
+grader_logger = logging.getLogger("grader")
+
+# The checks run by a tool, and the path the check runs the tool from when it needs no virtual environment
+TOOL_CHECKS = {"pylint": const.PYLINT_PATH, "tests": const.PYTEST_PATH}
+
+# The structure of the generated submissions, checked by the structure check
+SUBMISSION_STRUCTURE = {
+    "main": {"name": "Main file", "required": True, "patterns": ["main.py"]},
+    "source": {"name": "Source files", "required": True, "patterns": ["src/**/*.py"]},
+    "tests": {"name": "Test files", "required": False, "patterns": ["tests/**/*.py"]},
+    "readme": {"name": "Readme file", "required": False, "patterns": ["README.md"]},
+}
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A benchmarked operation on a submission."""
+
+    name: str
+    description: str
+    run: Callable[[GeneratedSubmission, str], None]
+    is_offline: bool = True
+
+
+def find_tool(tool_path: str) -> Optional[str]:
+    """
+    Find a grader tool installed in the environment running the benchmarks.
+
+    :param tool_path: The path to the tool in the virtual environment of a project.
+    :return: The path to the installed tool, or None if it is not installed.
+    """
+    tool_name = os.path.basename(tool_path)
+    installed_path = os.path.join(sysconfig.get_path("scripts"), tool_name)
+
+    return installed_path if os.path.isfile(installed_path) else shutil.which(tool_name)
+
+
+def link_tools(project_root: str) -> list[str]:
+    """
+    Link the installed grader tools into the project, where the checks which need no virtual environment run them.
+
+    The virtual environment directories are skipped on extraction, so only a submission directory can be linked.
+
+    :param project_root: The project directory.
+    :return: The names of the checks whose tool is installed.
+    """
+    tool_checks = []
+
+    for check_name, tool_path in TOOL_CHECKS.items():
+        installed_path = find_tool(tool_path)
+        if installed_path is None:
+            logger.warning("%s is not installed, grading without the %s check", os.path.basename(tool_path), check_name)
+            continue
+
+        link_path = os.path.join(project_root, tool_path)
+        if not os.path.lexists(link_path):
+            os.makedirs(os.path.dirname(link_path), exist_ok=True)
+            os.symlink(installed_path, link_path)
+
+        tool_checks.append(check_name)
+
+    return tool_checks
+
+
+def write_grader_config(work_directory: str, tool_checks: Optional[list[str]] = None) -> str:
+    """
+    Write the configuration of the grading scenarios: the checks which need no virtual environment.
+
+    :param work_directory: The directory of the current run of the scenario.
+    :param tool_checks: Optional checks run by a tool linked into the project, see link_tools.
+        Without them, only the checks which need no files on the disk are configured.
+    :return: The path to the configuration file.
+    """
+    structure_path = os.path.join(work_directory, "structure.json")
+    config_path = os.path.join(work_directory, "config.json")
+    checks: list[dict[str, Any]] = [
+        {"name": "requirements", "max_points": 1, "is_venv_required": False},
+        {"name": "structure", "is_venv_required": False, "structure_file": structure_path},
+    ]
+
+    if tool_checks is not None:
+        checks.append({"name": "type-hints", "max_points": 1, "is_venv_required": False, "engine": "ast"})
+    if tool_checks and "pylint" in tool_checks:
+        checks.append({"name": "pylint", "max_points": 10, "is_venv_required": False})
+    if tool_checks and "tests" in tool_checks:
+        checks.append({"name": "tests", "max_points": 10, "is_venv_required": False, "tests_path": ["tests"]})
+
+    os.makedirs(work_directory, exist_ok=True)
+    with open(structure_path, "w", encoding="utf-8") as structure_file:
+        json.dump(SUBMISSION_STRUCTURE, structure_file)
+    with open(config_path, "w", encoding="utf-8") as config_file:
+        json.dump({"checks": checks}, config_file)
+
+    return config_path
+
+
+def grade(project_path: str, work_directory: str, tool_checks: Optional[list[str]] = None) -> None:
+    """
+    Grade a submission, measuring the stages of the grader.
+
+    :param project_path: The submission directory or zip archive.
+    :param work_directory: The directory of the current run of the scenario.
+    :param tool_checks: Optional checks run by a tool linked into the project, see write_grader_config.
+    """
+    grader = Grader(
+        "benchmark",
+        project_path,
+        grader_logger,
+        config_path=write_grader_config(work_directory, tool_checks),
+        is_skipping_venv_creation=True,
+        work_directory=os.path.join(work_directory, "extracted"),
+        is_collecting_timings=True,
+    )
+    grader.grade()
+
+
+def grade_directory(submission: GeneratedSubmission, work_directory: str) -> None:
+    """
+    Grade the submission directory with all the checks which need no virtual environment, including its tests.
+
+    :param submission: The generated submission.
+    :param work_directory: The directory of the current run of the scenario.
+    """
+    grade(submission.project_root, work_directory, link_tools(submission.project_root))
+
+
+def grade_archive(submission: GeneratedSubmission, work_directory: str) -> None:
+    """
+    Grade the submission archive with the checks which need no files on the disk, so it is only indexed.
+
+    :param submission: The generated submission.
+    :param work_directory: The directory of the current run of the scenario.
+    """
+    grade(submission.archive_path, work_directory)
+
+
+def extract(submission: GeneratedSubmission, work_directory: str) -> None:
+    """
+    Extract the submission archive.
+
+    :param submission: The generated submission.
+    :param work_directory: The directory of the current run of the scenario.
+    """
+    extract_archive(submission.archive_path, os.path.join(work_directory, "extracted"))
+
+
+def build_index(submission: GeneratedSubmission, _: str) -> None:
+    """
+    Index the submission and list its Python and source files.
+
+    :param submission: The generated submission.
+    :raises ValueError: If the index finds no files, so the benchmark would measure nothing.
+    """
+    project_index = ProjectIndex(submission.project_root)
+    if not project_index.python_files or not project_index.source_files:
+        raise ValueError(f"No Python files indexed in {submission.project_root}")
+
+
+def fingerprint(submission: GeneratedSubmission, _: str) -> None:
+    """
+    Compute the fingerprint of the submission contents, as the results cache does.
+
+    :param submission: The generated submission.
+    """
+    ProjectIndex(submission.project_root).compute_fingerprint()
+
+
+def setup_venv(submission: GeneratedSubmission, work_directory: str) -> None:
+    """
+    Set up and tear down a virtual environment for a copy of the submission.
+
+    :param submission: The generated submission.
+    :param work_directory: The directory of the current run of the scenario.
+    """
+    project_root = shutil.copytree(submission.project_root, os.path.join(work_directory, "project"))
+
+    with VirtualEnvironment(project_root):
+        pass
+
+
+SCENARIOS: dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in [
+        Scenario("grade:directory", "Grade the submission directory", grade_directory),
+        Scenario("grade:archive", "Grade the submission zip archive", grade_archive),
+        Scenario("archive:extract", "Extract the submission zip archive", extract),
+        Scenario("index:build", "Index the submission and list its files", build_index),
+        Scenario("index:fingerprint", "Hash the submission contents", fingerprint),
+        Scenario("venv:setup", "Set up and tear down a virtual environment", setup_venv, is_offline=False),
+    ]
+}
@@ -3,7 +3,23 @@
 import argparse
 from typing import Any
 
-from grader.utils.constants import VERSION
+from grader.utils.constants import DEFAULT_SERVER_HOST, DEFAULT_SERVER_PORT, VERSION
+
+
+def positive_int(value: str) -> int:
+    """
+    Parse a positive integer argument.
+
+    :param value: The value of the argument.
+    :raises ArgumentTypeError: If the value is not a positive integer.
+    :returns: The integer.
+    """
+    number = int(value)
+
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {number}")
+
+    return number
 
 
 def get_args() -> dict[str, Any]:
@@ -15,7 +31,13 @@ def get_args() -> dict[str, Any]:
     """
     parser = argparse.ArgumentParser("Python project grader")
 
-    parser.add_argument("project_root", type=str, help="The path to the project directory")
+    parser.add_argument(
+        "project_root",
+        type=str,
+        nargs="?",
+        help="The path to the project directory. With --batch, the directory containing all submissions. "
+        "With --rescore, the JSON report to rescore. Not used with --serve",
+    )
     parser.add_argument("-c", "--config", type=str, help="The path to the config file to use")
     parser.add_argument("--student-id", type=str, help="The student's id")
     parser.add_argument(
@@ -34,7 +56,67 @@ def get_args() -> dict[str, Any]:
     parser.add_argument(
         "--keep-venv", action="store_true", help="Keep the virtual environment after grading", default=False
     )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Grade every submission (folder or zip archive) inside project_root",
+        default=False,
+    )
+    parser.add_argument(
+        "--rescore",
+        action="store_true",
+        help="Recompute the scores of a JSON report from its raw metrics, with the scoring of the config file",
+        default=False,
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Add the time and resources used by each check, download, extraction and venv setup to the report",
+        default=False,
+    )
+    parser.add_argument(
+        "--trace",
+        type=str,
+        metavar="TRACE_PATH",
+        help="Write a Chrome trace of the run (config loading, extraction, venv setup steps, checks and commands) "
+        "to TRACE_PATH, to open in chrome://tracing or Perfetto",
+    )
+    parser.add_argument(
+        "--otlp-endpoint",
+        type=str,
+        help="Send the trace of the run to an OpenTelemetry collector, e.g. http://localhost:4318/v1/traces",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=positive_int,
+        help="Amount of submissions graded in parallel with --batch or --serve. Defaults to CPU count",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run a grading server with warm workers, accepting jobs over a local HTTP API",
+        default=False,
+    )
+    parser.add_argument(
+        "--host", type=str, default=DEFAULT_SERVER_HOST, help=f"Host of --serve. Defaults to {DEFAULT_SERVER_HOST}"
+    )
+    parser.add_argument(
+        "--port", type=int, default=DEFAULT_SERVER_PORT, help=f"Port of --serve. Defaults to {DEFAULT_SERVER_PORT}"
+    )
+    parser.add_argument("--socket", type=str, help="Serve on this Unix socket instead of --host and --port")
+    parser.add_argument(
+        "--queue",
+        type=str,
+        metavar="QUEUE_PATH",
+        help="With --batch or --serve, record the progress in a SQLite job queue at QUEUE_PATH. Restarted on the same "
+        "queue, the grading resumes where it stopped. Transient failures (downloads, package installation) are retried",
+    )
 
     parser.add_argument("--version", action="version", help="Show the version of the tool", version=VERSION)
 
-    return parser.parse_args().__dict__
+    args = parser.parse_args()
+    if args.project_root is None and not args.serve:
+        parser.error("the following arguments are required: project_root")
+
+    return args.__dict__
@@ -6,12 +6,18 @@ Calls all the checks, and stores their results.
 
 import os
 import shutil
-from pathlib import Path
+from contextlib import nullcontext
+from logging import Logger
+from typing import Any
 
 import grader.utils.constants as const
 from desktop.cli import get_args
+from grader.batch import BatchGrader
+from grader.exceptions import TraceExportError
 from grader.grader import Grader
-from grader.utils.files import is_path_zip, unzip_archive
+from grader.rescore import Rescorer, is_batch_report, load_report
+from grader.server import GradingServer, serve
+from grader.utils.instrumentation import Instrumentation, StageMetrics
 from grader.utils.logger import setup_logger
 from grader.utils.results_reporter import (
     CSVResultsReporter,
@@ -19,6 +25,7 @@ from grader.utils.results_reporter import (
     PlainTextResultsReporter,
     ResultsReporter,
 )
+from grader.utils.trace_export import export_otlp, write_chrome_trace
 
 
 def build_reporter(report_format: str) -> ResultsReporter:
@@ -39,6 +46,25 @@ def build_reporter(report_format: str) -> ResultsReporter:
             return PlainTextResultsReporter()
 
 
+def export_trace(timings: dict[str, list[StageMetrics]], args: dict[str, Any], log: Logger) -> None:
+    """
+    Export the trace of the run to a Chrome trace file and/or an OpenTelemetry collector, as requested.
+
+    A failed export is logged, it does not fail the grading.
+
+    :param timings: A mapping of submission id to the metrics of the stages of that submission.
+    :param args: The parsed CLI arguments.
+    :param log: The logger instance for output.
+    """
+    try:
+        if args["trace"] is not None:
+            write_chrome_trace(timings, args["trace"])
+        if args["otlp_endpoint"] is not None:
+            export_otlp(timings, args["otlp_endpoint"])
+    except TraceExportError as error:
+        log.error("%s", error)
+
+
 def run_grader() -> None:
     """Run the grader application."""
     args = get_args()
@@ -49,38 +75,80 @@ def run_grader() -> None:
         suppress_info=is_suppressing_info,
     )
 
-    if is_path_zip(args["project_root"]):
-        project_root = unzip_archive(args["project_root"])
-
-        # If the unzipped folder contains only one subfolder (except MACOS subdirectories), use that as the project root
-        project_root_dir = Path(project_root)
-        subdirs = [
-            directory
-            for directory in project_root_dir.iterdir()
-            if directory.is_dir() and directory.name not in const.IGNORE_DIRS
-        ]
-
-        if len(subdirs) == 1:
-            project_root = str(subdirs[0])
-    else:
-        project_root = str(args["project_root"])  # type safety
-
-    grader = Grader(
-        args["student_id"],
-        project_root,
-        log,
-        is_keeping_venv=args["keep_venv"],
-        is_skipping_venv_creation=args["skip_venv_creation"],
-        config_path=args["config"],
-    )
-
-    checks_results = grader.grade()
-
     reporter = build_reporter(args["report_format"])
     verbose = args["verbosity"] >= 1
-
-    # TODO - Add output to a file
-    reporter.display(checks_results, verbose=verbose)
+    is_tracing = args["trace"] is not None or args["otlp_endpoint"] is not None
+    is_collecting_timings = args["timings"] or is_tracing
+
+    if args["serve"]:
+        # The jobs are graded until the server is interrupted, each one answered with a JSON report
+        grading_server = GradingServer(
+            args["config"],
+            jobs=args["jobs"],
+            verbosity=args["verbosity"],
+            is_keeping_venv=args["keep_venv"],
+            is_skipping_venv_creation=args["skip_venv_creation"],
+            is_collecting_timings=args["timings"],
+            queue_path=args["queue"],
+        )
+        serve(grading_server, host=args["host"], port=args["port"], socket_path=args["socket"])
+        return
+
+    if args["rescore"]:
+        # Nothing is run, the scores are recomputed from the raw metrics in the report
+        rescorer = Rescorer(args["config"])
+        report = load_report(args["project_root"])
+
+        if is_batch_report(report):
+            reporter.display_batch(rescorer.rescore_batch_report(report), verbose=verbose)
+        else:
+            reporter.display(rescorer.rescore_report(report), verbose=verbose)
+
+        return
+
+    if args["batch"]:
+        batch_grader = BatchGrader(
+            args["project_root"],
+            config_path=args["config"],
+            jobs=args["jobs"],
+            verbosity=args["verbosity"],
+            is_keeping_venv=args["keep_venv"],
+            is_skipping_venv_creation=args["skip_venv_creation"],
+            is_collecting_timings=is_collecting_timings,
+            queue_path=args["queue"],
+        )
+
+        batch_results = batch_grader.grade()
+        batch_timings = batch_grader.stage_metrics if args["timings"] else None
+        reporter.display_batch(batch_results, verbose=verbose, timings=batch_timings)
+
+        if is_tracing:
+            export_trace(batch_grader.stage_metrics, args, log)
+    else:
+        # Traces include the loading of the configuration, on top of the stages measured by the grader
+        instrumentation = Instrumentation()
+
+        with instrumentation if is_tracing else nullcontext():
+            # Zip archives are extracted by the grader, only if a check needs the files on the disk
+            grader = Grader(
+                args["student_id"],
+                args["project_root"],
+                log,
+                is_keeping_venv=args["keep_venv"],
+                is_skipping_venv_creation=args["skip_venv_creation"],
+                config_path=args["config"],
+                is_collecting_timings=is_collecting_timings,
+            )
+
+            checks_results = grader.grade()
+
+        timings = grader.stage_metrics if args["timings"] else None
+
+        # TODO - Add output to a file
+        reporter.display(checks_results, verbose=verbose, timings=timings)
+
+        if is_tracing:
+            export_trace({args["student_id"] or args["project_root"]: instrumentation.stages}, args, log)
 
     if os.path.exists(const.WORK_DIR):
         shutil.rmtree(const.WORK_DIR)
@@ -0,0 +1,424 @@
+"""
+Module containing the BatchGrader class.
+
+Grades a whole directory of submissions, fanning them out over a process pool.
+"""
+
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Optional
+
+import grader.utils.constants as const
+from grader.checks.abstract_check import CheckResult, NonScoredCheckResult
+from grader.exceptions import GraderError, InvalidConfigError, InvalidProjectRootError
+from grader.grader import Grader
+from grader.utils.config import load_config
+from grader.utils.files import is_path_zip
+from grader.utils.instrumentation import Instrumentation, StageMetrics, measure
+from grader.utils.job_queue import JobQueue, JobResultsCache, QueuedJob, is_transient_error
+from grader.utils.logger import setup_logger
+
+logger = logging.getLogger("grader")
+
+BATCH_ERROR_CHECK_NAME = "grader"
+
+QueuedGrading = tuple[list[CheckResult], list[StageMetrics], Optional[str]]
+
+
+def find_submissions(batch_root: str) -> dict[str, str]:
+    """
+    Find all submissions in a batch directory.
+
+    Every subdirectory (except ignored ones) and every zip archive directly under the batch root is a submission.
+
+    :param batch_root: The directory containing the submissions
+    :raises InvalidProjectRootError: If the batch root is not a directory, or two submissions have the same id
+        (e.g. the directory foo and the archive foo.zip)
+    :return: A mapping of submission id to submission path, sorted by submission id
+    """
+    if not os.path.isdir(batch_root):
+        raise InvalidProjectRootError(f"Batch directory does not exist: {batch_root}")
+
+    submissions: dict[str, str] = {}
+    for entry in sorted(Path(batch_root).iterdir()):
+        if entry.is_dir() and entry.name not in const.IGNORE_DIRS:
+            submission_id = entry.name
+        elif entry.is_file() and is_path_zip(str(entry)):
+            submission_id = entry.stem
+        else:
+            continue
+
+        if submission_id in submissions:
+            raise InvalidProjectRootError(
+                f"Submissions {submissions[submission_id]} and {entry} have the same id: {submission_id}"
+            )
+
+        submissions[submission_id] = str(entry)
+
+    return dict(sorted(submissions.items()))
+
+
+class BatchGrader:
+    """Grades multiple submissions in parallel, each one in a separate worker process."""
+
+    def __init__(
+        self,
+        batch_root: str,
+        config_path: Optional[str] = None,
+        jobs: Optional[int] = None,
+        verbosity: int = 0,
+        is_keeping_venv: bool = False,
+        is_skipping_venv_creation: bool = False,
+        is_collecting_timings: bool = False,
+        queue_path: Optional[str] = None,
+    ):
+        """
+        Initialize the batch grader.
+
+        :param batch_root: The directory containing the submissions (folders or zip archives).
+        :param config_path: Optional path to configuration file.
+        :param jobs: The amount of worker processes. Defaults to the amount of CPUs.
+        :param verbosity: The verbosity of the per-submission loggers.
+        :param is_keeping_venv: Whether to keep the virtual environments after grading.
+        :param is_skipping_venv_creation: Whether to skip virtual environment creation.
+        :param is_collecting_timings: Whether to measure the time and resources used by each stage of the grading.
+        :param queue_path: Optional job queue recording the progress of the batch. A batch restarted on the same
+                           queue does not grade the finished submissions again, and transient failures are retried.
+        :raises InvalidConfigError: If the amount of jobs is not positive.
+        """
+        if jobs is not None and jobs < 1:
+            raise InvalidConfigError(f"The amount of jobs must be a positive integer, got {jobs}")
+
+        self.__submissions = find_submissions(batch_root)
+        self.__config_path = config_path
+        self.__jobs = jobs or os.cpu_count() or 1
+        self.__verbosity = verbosity
+        self.__is_keeping_venv = is_keeping_venv
+        self.__is_skipping_venv_creation = is_skipping_venv_creation
+        self.__is_collecting_timings = is_collecting_timings
+        self.__queue_path = queue_path
+        self.__stage_metrics: dict[str, list[StageMetrics]] = {}
+
+        logger.info("Found %d submissions in %s", len(self.__submissions), batch_root)
+
+    @property
+    def stage_metrics(self) -> dict[str, list[StageMetrics]]:
+        """
+        Get the time and resources used by each stage of the last grading, if timings are collected.
+
+        :returns: A mapping of submission id to the metrics of the stages of that submission.
+        :rtype: dict[str, list[StageMetrics]]
+        """
+        return self.__stage_metrics
+
+    def grade(self) -> dict[str, list[CheckResult]]:
+        """
+        Grade all submissions and aggregate their results.
+
+        :return: A mapping of submission id to the results of its checks, in submission order.
+        """
+        workers_root = os.path.join(const.WORK_DIR, "workers")
+
+        if self.__queue_path is not None:
+            return self.__grade_queued(self.__queue_path, workers_root)
+
+        with ProcessPoolExecutor(
+            max_workers=self.__jobs,
+            initializer=_initialize_worker,
+            initargs=(workers_root,),
+        ) as executor:
+            futures: dict[str, Future[tuple[list[CheckResult], list[StageMetrics]]]] = {
+                submission_id: executor.submit(
+                    _grade_submission,
+                    submission_id,
+                    submission_path,
+                    self.__config_path,
+                    self.__verbosity,
+                    self.__is_keeping_venv,
+                    self.__is_skipping_venv_creation,
+                    self.__is_collecting_timings,
+                )
+                for submission_id, submission_path in self.__submissions.items()
+            }
+
+            collected = {
+                submission_id: BatchGrader.__collect(submission_id, future) for submission_id, future in futures.items()
+            }
+
+        shutil.rmtree(workers_root, ignore_errors=True)
+
+        self.__stage_metrics = {submission_id: stages for submission_id, (_, stages) in collected.items()}
+        return {submission_id: results for submission_id, (results, _) in collected.items()}
+
+    def __grade_queued(self, queue_path: str, workers_root: str) -> dict[str, list[CheckResult]]:
+        """
+        Grade the submissions which are not finished in the job queue, and aggregate the results of all of them.
+
+        :param queue_path: The path to the job queue.
+        :param workers_root: The directory under which each worker gets its own subdirectory.
+        :raises JobQueueError: If the job queue cannot be opened.
+        :return: A mapping of submission id to the results of its checks, in submission order.
+        """
+        self.__stage_metrics = {}
+
+        with JobQueue(queue_path) as queue:
+            added = sum(queue.add(submission_id, path) for submission_id, path in self.__submissions.items())
+            interrupted = queue.requeue_interrupted()
+            logger.info("Queued %d new submissions, resuming %d interrupted ones", added, interrupted)
+
+            # A new pool replaces the one broken by a dying worker, until no job is left
+            while queue.get_next_attempt_delay() is not None:
+                self.__run_queued_jobs(queue, workers_root)
+
+            jobs = {job.id: job for job in queue.get_jobs()}
+
+        shutil.rmtree(workers_root, ignore_errors=True)
+
+        return {submission_id: get_queued_job_results(jobs[submission_id]) for submission_id in self.__submissions}
+
+    def __run_queued_jobs(self, queue: JobQueue, workers_root: str) -> None:
+        """
+        Grade the queued jobs in a pool of workers, as soon as they are ready to run.
+
+        :param queue: The job queue.
+        :param workers_root: The directory under which each worker gets its own subdirectory.
+        """
+        futures: dict[Future[QueuedGrading], str] = {}
+        is_pool_broken = False
+
+        with ProcessPoolExecutor(
+            max_workers=self.__jobs,
+            initializer=_initialize_worker,
+            initargs=(workers_root,),
+        ) as executor:
+            while True:
+                for job in [] if is_pool_broken else queue.claim(self.__jobs - len(futures)):
+                    future = executor.submit(
+                        _grade_queued_submission,
+                        queue.path,
+                        job.id,
+                        job.path,
+                        self.__config_path,
+                        self.__verbosity,
+                        self.__is_keeping_venv,
+                        self.__is_skipping_venv_creation,
+                        self.__is_collecting_timings,
+                    )
+                    futures[future] = job.id
+
+                if not futures:
+                    delay = queue.get_next_attempt_delay()
+                    if is_pool_broken or delay is None:
+                        return
+
+                    time.sleep(delay)
+                    continue
+
+                # Wakes up for the next retry only if there is a free worker for it
+                timeout = queue.get_next_attempt_delay() if len(futures) < self.__jobs else None
+                done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    is_pool_broken |= self.__record(queue, futures.pop(future), future)
+
+    def __record(self, queue: JobQueue, submission_id: str, future: Future[QueuedGrading]) -> bool:
+        """
+        Record the outcome of a queued job.
+
+        :param queue: The job queue.
+        :param submission_id: The id of the submission.
+        :param future: The future of the grading job.
+        :return: True if the worker died, breaking the pool, False otherwise.
+        """
+        try:
+            check_results, stage_metrics, transient_error = future.result()
+        except BrokenProcessPool as error:
+            # The worker which died cannot be told apart, every job it was running with gets another attempt
+            queue.fail(submission_id, f"The grading worker died: {error}", is_transient=True)
+            return True
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            logger.error("Grading %s crashed: %s", submission_id, error)
+            queue.fail(submission_id, str(error), is_transient=False)
+            return False
+
+        self.__stage_metrics.setdefault(submission_id, []).extend(stage_metrics)
+
+        if transient_error is not None:
+            if not queue.fail(submission_id, transient_error, is_transient=True):
+                logger.error("Grading %s failed: %s", submission_id, transient_error)
+        else:
+            queue.complete(submission_id, check_results)
+            logger.info("Graded %s", submission_id)
+
+        return False
+
+    @staticmethod
+    def __collect(
+        submission_id: str, future: Future[tuple[list[CheckResult], list[StageMetrics]]]
+    ) -> tuple[list[CheckResult], list[StageMetrics]]:
+        """
+        Wait for a submission to be graded and return its results.
+
+        A crashed worker does not stop the batch - the submission gets a single failed result instead.
+
+        :param submission_id: The id of the submission.
+        :param future: The future of the grading job.
+        :return: The results of the checks for the submission, and the metrics of its stages.
+        """
+        try:
+            check_results, stage_metrics = future.result()
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            logger.error("Grading %s crashed: %s", submission_id, error)
+            return [NonScoredCheckResult(BATCH_ERROR_CHECK_NAME, False, "", str(error))], []
+
+        logger.info("Graded %s", submission_id)
+        return check_results, stage_metrics
+
+
+def get_queued_job_results(job: QueuedJob) -> list[CheckResult]:
+    """
+    Get the results of a finished queued job.
+
+    :param job: The job.
+    :return: The results of its checks, or a single failed result if the job failed.
+    """
+    if job.results is not None:
+        return job.results
+
+    return [NonScoredCheckResult(BATCH_ERROR_CHECK_NAME, False, "", job.error or f"Grading is {job.status}")]
+
+
+def _initialize_worker(workers_root: str) -> None:
+    """
+    Point the working directories of the current worker process to a private location.
+
+    Workers share the grader installation, so the temporary files, reports and extracted archives
+    of concurrent submissions must not end up in the same place.
+
+    :param workers_root: The directory under which each worker gets its own subdirectory.
+    """
+    worker_root = os.path.join(workers_root, f"worker-{os.getpid()}")
+
+    const.WORK_DIR = os.path.join(worker_root, "work")
+    const.TEMP_FILES_DIR = os.path.join(worker_root, "temp_files")
+    const.REPORTS_TEMP_DIR = os.path.join(worker_root, "reports")
+    const.MYPY_LINE_COUNT_REPORT = os.path.join(const.REPORTS_TEMP_DIR, "linecount.txt")
+
+
+def _grade_submission(
+    submission_id: str,
+    submission_path: str,
+    config_path: Optional[str],
+    verbosity: int,
+    is_keeping_venv: bool,
+    is_skipping_venv_creation: bool,
+    is_collecting_timings: bool,
+) -> tuple[list[CheckResult], list[StageMetrics]]:
+    """
+    Grade a single submission inside a worker process.
+
+    :param submission_id: The id of the submission, used as the run id.
+    :param submission_path: The path to the submission directory or zip archive.
+    :param config_path: Optional path to configuration file.
+    :param verbosity: The verbosity of the logger.
+    :param is_keeping_venv: Whether to keep the virtual environment after grading.
+    :param is_skipping_venv_creation: Whether to skip virtual environment creation.
+    :param is_collecting_timings: Whether to measure the time and resources used by each stage of the grading.
+    :return: The results of the checks, and the metrics of the stages if timings are collected.
+    """
+    log = setup_logger(submission_id, verbosity=verbosity, suppress_info=True)
+    # Measures the loading of the configuration too, on top of the stages measured by the grader
+    instrumentation = Instrumentation()
+
+    with instrumentation if is_collecting_timings else nullcontext():
+        try:
+            grader = Grader(
+                submission_id,
+                submission_path,
+                log,
+                is_keeping_venv=is_keeping_venv,
+                is_skipping_venv_creation=is_skipping_venv_creation,
+                config_path=config_path,
+                work_directory=os.path.join(const.WORK_DIR, submission_id),
+                is_collecting_timings=is_collecting_timings,
+            )
+            check_results = grader.grade()
+        except GraderError as error:
+            log.error("Grading %s failed: %s", submission_id, error)
+            check_results = [NonScoredCheckResult(BATCH_ERROR_CHECK_NAME, False, "", str(error))]
+        finally:
+            shutil.rmtree(os.path.join(const.WORK_DIR, submission_id), ignore_errors=True)
+
+    # The stages measured before a failure are kept
+    return check_results, instrumentation.stages
+
+
+def _grade_queued_submission(
+    queue_path: str,
+    submission_id: str,
+    submission_path: str,
+    config_path: Optional[str],
+    verbosity: int,
+    is_keeping_venv: bool,
+    is_skipping_venv_creation: bool,
+    is_collecting_timings: bool,
+) -> QueuedGrading:
+    """
+    Grade a single queued submission inside a worker process, recording the result of each check in the queue.
+
+    The checks recorded by a previous attempt are not run again.
+
+    :param queue_path: The path to the job queue.
+    :param submission_id: The id of the submission, used as the run id and as the id of the job.
+    :param submission_path: The path to the submission directory or zip archive.
+    :param config_path: Optional path to configuration file.
+    :param verbosity: The verbosity of the logger.
+    :param is_keeping_venv: Whether to keep the virtual environment after grading.
+    :param is_skipping_venv_creation: Whether to skip virtual environment creation.
+    :param is_collecting_timings: Whether to measure the time and resources used by each stage of the grading.
+    :return: The results of the checks, the metrics of the stages if timings are collected,
+             and the error if the grading failed for a transient reason and should be retried.
+    """
+    log = setup_logger(submission_id, verbosity=verbosity, suppress_info=True)
+    instrumentation = Instrumentation()
+    check_results: list[CheckResult] = []
+    transient_error = None
+
+    with JobQueue(queue_path) as queue, instrumentation if is_collecting_timings else nullcontext():
+        try:
+            if config_path is None:
+                raise InvalidConfigError("No configuration source provided")
+
+            with measure("config:load"):
+                config = load_config(config_path)
+
+            grader = Grader(
+                submission_id,
+                submission_path,
+                log,
+                is_keeping_venv=is_keeping_venv,
+                is_skipping_venv_creation=is_skipping_venv_creation,
+                config_path=config_path,
+                work_directory=os.path.join(const.WORK_DIR, submission_id),
+                is_collecting_timings=is_collecting_timings,
+                config=config,
+                results_cache=JobResultsCache(queue, submission_id, config),
+            )
+            check_results = grader.grade()
+        except GraderError as error:
+            if is_transient_error(error):
+                log.warning("Grading %s failed, it will be retried: %s", submission_id, error)
+                transient_error = str(error)
+            else:
+                log.error("Grading %s failed: %s", submission_id, error)
+                check_results = [NonScoredCheckResult(BATCH_ERROR_CHECK_NAME, False, "", str(error))]
+        finally:
+            shutil.rmtree(os.path.join(const.WORK_DIR, submission_id), ignore_errors=True)
+
+    return check_results, instrumentation.stages, transient_error
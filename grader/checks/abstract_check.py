@@ -6,11 +6,12 @@ Each check should inherit from this class.
 
 import logging
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Generic, Optional, TypeVar
+from dataclasses import dataclass, field, replace
+from typing import Any, Generic, Optional, TypeVar
 
 from grader.exceptions import CheckError
 from grader.utils.logger import VERBOSE
+from grader.utils.project_index import ProjectIndex
 from grader.utils.virtual_environment import VirtualEnvironment
 
 logger = logging.getLogger("grader")
@@ -51,6 +52,7 @@ class AbstractCheck(ABC, Generic[T]):
         self._project_root = project_root
         self._is_venv_required = is_venv_required
         self._env_vars = env_vars
+        self._project_index: Optional[ProjectIndex] = None
 
     @abstractmethod
     def run(self) -> CheckResult[T]:
@@ -81,6 +83,51 @@ class AbstractCheck(ABC, Generic[T]):
         """
         return self._env_vars
 
+    @property
+    def exclusive_resource(self) -> Optional[str]:
+        """
+        Get the resource the check needs exclusive access to.
+
+        Checks sharing the same resource are never run concurrently.
+
+        :returns: The name of the resource, or None if the check can run alongside any other check.
+        :rtype: Optional[str]
+        """
+        return None
+
+    def share_project_index(self, project_index: ProjectIndex) -> None:
+        """
+        Look up the project files in an index shared with other checks, instead of walking the project.
+
+        :param project_index: The shared index of the project.
+        """
+        self._project_index = project_index
+
+    @property
+    def is_reading_project_files(self) -> bool:
+        """
+        Check if the check reads the files of the project from the disk.
+
+        Checks which only need the project index can run before a zip submission is extracted.
+
+        :returns: True if the project files must be on the disk, False otherwise.
+        :rtype: bool
+        """
+        return True
+
+    @property
+    def referenced_files(self) -> Optional[list[str]]:
+        """
+        Get the local files outside of the project which the configuration of the check points to, e.g. a pylintrc.
+
+        Their contents are part of the key of the cached results of the check.
+
+        :returns: The paths to the files, or None if the check depends on remote resources (URLs, Cove URIs),
+            whose contents cannot be fingerprinted cheaply, so the results of the check are not cached.
+        :rtype: Optional[list[str]]
+        """
+        return []
+
     @staticmethod
     def is_running_within_venv() -> bool:
         """
@@ -105,9 +152,16 @@ class AbstractCheck(ABC, Generic[T]):
 
 @dataclass
 class ScoredCheckResult(CheckResult[T]):
-    """Class representing the result of a scored check."""
+    """
+    Class representing the result of a scored check.
+
+    The raw metrics the score was computed from (e.g. the pylint rating) allow rescoring the result later,
+    without running the check again. A check killed after exceeding its time limits is timed out, with no score.
+    """
 
     max_score: int
+    metrics: Optional[dict[str, Any]] = field(default=None, compare=False)
+    is_timed_out: bool = False
 
 
 @dataclass
@@ -143,6 +197,36 @@ class ScoredCheck(AbstractCheck[float]):
         """Return the maximum amount of points that can be achieved by the check."""
         return self._max_points
 
+    def rescore(self, result: ScoredCheckResult) -> ScoredCheckResult:
+        """
+        Recompute the score of a previous result of the check from its raw metrics, with the current scoring.
+
+        Results without metrics (e.g. of checks which failed with an error) keep their score.
+
+        :param result: The previous result of the check.
+        :raises CheckError: If the metrics are invalid or cannot be scored.
+        :return: The result with the new score and maximum score.
+        """
+        if result.metrics is None:
+            return replace(result, max_score=self.max_points)
+
+        try:
+            score = self._score_metrics(result.metrics)
+        except (KeyError, TypeError, ValueError) as error:
+            raise CheckError(f"Invalid metrics for the {self.name} check: {error}") from error
+
+        return replace(result, result=score, max_score=self.max_points)
+
+    def _score_metrics(self, _metrics: dict[str, Any]) -> float:
+        """
+        Compute the score from the raw metrics of a result.
+
+        :param _metrics: The raw metrics, as stored in the result by run().
+        :raises CheckError: If the check cannot be rescored.
+        :return: The score.
+        """
+        raise CheckError(f"The {self.name} check cannot be rescored")
+
 
 class NonScoredCheck(AbstractCheck[bool]):
     """Non-scored checks do not have a maximum amount of points."""
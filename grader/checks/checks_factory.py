@@ -1,5 +1,10 @@
 """Factory for creating the checks objects."""
 
+import os
+from pathlib import Path
+from typing import Optional
+
+import grader.utils.constants as const
 from grader.checks.abstract_check import AbstractCheck
 from grader.checks.coverage_check import CoverageCheck
 from grader.checks.pylint_check import PylintCheck
@@ -8,7 +13,12 @@ from grader.checks.run_tests_check import RunTestsCheck
 from grader.checks.structure_check import StructureCheck
 from grader.checks.type_hints_check import TypeHintsCheck
 from grader.exceptions import InvalidCheckError, InvalidConfigError
+from grader.utils.archive import ExtractionLimits
 from grader.utils.environment import merge_environment_variables
+from grader.utils.files import is_path_zip
+from grader.utils.project_index import ProjectIndex
+from grader.utils.pytest_session import PytestSession
+from grader.utils.zip_project_index import ZipProjectIndex
 
 NAME_TO_CHECK: dict[str, type[AbstractCheck]] = {
     "coverage": CoverageCheck,
@@ -20,7 +30,45 @@ NAME_TO_CHECK: dict[str, type[AbstractCheck]] = {
 }
 
 
-def create_checks(config: dict, project_root: str) -> tuple[list[AbstractCheck], list[AbstractCheck]]:
+def create_project_index(config: dict, project_path: str, target_directory: Optional[str] = None) -> ProjectIndex:
+    """
+    Build the index of the project files, shared by all checks.
+
+    Zip archives are not extracted - they are indexed from their central directory and extracted on demand.
+
+    :param config: The configuration dictionary.
+    :type config: dict
+    :param project_path: The path to the project directory or zip archive.
+    :type project_path: str
+    :param target_directory: Optional directory to extract a zip archive into.
+    :type target_directory: Optional[str]
+    :raises InvalidConfigError: If respect_gitignore or the archive section is invalid.
+    :return: The index of the project.
+    :rtype: ProjectIndex
+    """
+    is_respecting_gitignore = config.get("respect_gitignore", False)
+    if not isinstance(is_respecting_gitignore, bool):
+        raise InvalidConfigError("respect_gitignore must be a boolean")
+
+    if is_path_zip(project_path):
+        archive_config = config.get("archive", {})
+        if not isinstance(archive_config, dict):
+            raise InvalidConfigError("archive must be an object")
+
+        jobs = archive_config.get("jobs")
+        if jobs is not None and (not isinstance(jobs, int) or isinstance(jobs, bool) or jobs < 0):
+            raise InvalidConfigError("archive.jobs must be a non-negative integer or null")
+
+        target_directory = target_directory or os.path.join(const.WORK_DIR, Path(project_path).stem)
+        limits = ExtractionLimits.from_dict(archive_config)
+        return ZipProjectIndex(project_path, target_directory, is_respecting_gitignore, limits, jobs)
+
+    return ProjectIndex(project_path, is_respecting_gitignore)
+
+
+def create_checks(
+    config: dict, project_root: str, project_index: Optional[ProjectIndex] = None
+) -> tuple[list[AbstractCheck], list[AbstractCheck]]:
     """
     Build two lists, containing the non-venv checks and the venv checks.
 
@@ -28,7 +76,9 @@ def create_checks(config: dict, project_root: str) -> tuple[list[AbstractCheck],
     :type config: dict
     :param project_root: The root of the project.
     :type project_root: str
-    :raises InvalidConfigError: If no checks are found in the configuration file.
+    :param project_index: Optional index of the project. If not given, an index of the project root is built.
+    :type project_index: Optional[ProjectIndex]
+    :raises InvalidConfigError: If no checks are found in the configuration file, or respect_gitignore is invalid.
     :raises InvalidCheckError: If the check name is unknown.
     :return: A tuple containing the non-venv checks and the venv checks.
     :rtype: tuple[list[AbstractCheck], list[AbstractCheck]]
@@ -43,9 +93,13 @@ def create_checks(config: dict, project_root: str) -> tuple[list[AbstractCheck],
     non_venv_checks = []
     venv_checks = []
 
+    if project_index is None:
+        project_index = create_project_index(config, project_root)
+
     expected_keys = {"name", "is_venv_required"}
     for check in checks:
         created_check = __create_check(project_root, expected_keys, check, global_env)
+        created_check.share_project_index(project_index)
 
         is_venv = check.get("is_venv_required", False)
         if is_venv:
@@ -53,6 +107,8 @@ def create_checks(config: dict, project_root: str) -> tuple[list[AbstractCheck],
         else:
             non_venv_checks.append(created_check)
 
+    __share_pytest_sessions(project_root, venv_checks)
+
     return non_venv_checks, venv_checks
 
 
@@ -81,3 +137,34 @@ def __create_check(project_root: str, expected_keys: set[str], check: dict, glob
     created_check = check_class(name, project_root, **other_args)
 
     return created_check
+
+
+def __share_pytest_sessions(project_root: str, checks: list[AbstractCheck]) -> None:
+    """
+    Let each coverage check share a single pytest run with a tests check running the same tests.
+
+    :param project_root: The root of the project.
+    :param checks: The checks which run in the same virtual environment.
+    """
+    tests_checks = [check for check in checks if isinstance(check, RunTestsCheck)]
+    coverage_checks = [check for check in checks if isinstance(check, CoverageCheck)]
+
+    for coverage_check in coverage_checks:
+        tests_check = next(
+            (
+                check
+                for check in tests_checks
+                if check.tests_path == coverage_check.tests_path
+                and check.env_vars == coverage_check.env_vars
+                and check.limits == coverage_check.limits
+            ),
+            None,
+        )
+
+        if tests_check is None:
+            continue
+
+        session = PytestSession(project_root, coverage_check.env_vars, coverage_check.limits)
+        coverage_check.share_session(session)
+        tests_check.share_session(session)
+        tests_checks.remove(tests_check)
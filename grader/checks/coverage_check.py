@@ -1,19 +1,28 @@
 """Module containing the unit test code coverage check."""
 
 import logging
-from typing import Optional
+from typing import Any, Optional
 
 from grader.checks.abstract_check import ScoredCheck, ScoredCheckResult
-from grader.exceptions import CheckError
+from grader.exceptions import (
+    CheckError,
+    CheckTimeoutError,
+    ExternalResourceError,
+    ProcessLimitError,
+    ProcessTimeoutError,
+)
 from grader.utils.constants import (
     COVERAGE_PATH,
     COVERAGE_REPORT_ARGS,
     COVERAGE_REPORT_ARGS_NO_FORMAT,
     COVERAGE_RUN_ARGS,
     COVERAGE_RUN_PYTEST_ARGS,
+    PYTEST_RESOURCE,
 )
+from grader.utils.external_resources import download_resource, get_local_paths
 from grader.utils.files import find_all_source_files
-from grader.utils.process import run
+from grader.utils.process import ProcessLimits, run
+from grader.utils.pytest_session import PytestSession
 
 logger = logging.getLogger("grader")
 
@@ -27,7 +36,9 @@ class CoverageCheck(ScoredCheck):
         project_root: str,
         max_points: int,
         is_venv_required: bool,
+        tests_path: Optional[list[str]] = None,
         env_vars: Optional[dict[str, str]] = None,
+        limits: Optional[dict[str, Any]] = None,
     ):
         """
         Initialize the coverage check.
@@ -36,11 +47,66 @@ class CoverageCheck(ScoredCheck):
         :param project_root: The root directory of the project.
         :param max_points: The maximum points this check can award.
         :param is_venv_required: Whether a virtual environment is required.
+        :param tests_path: Optional list of paths to the test files. If not set, pytest discovers the tests.
         :param env_vars: Optional environment variables for the check.
+        :param limits: Optional wall-clock and CPU time limits of the tests run under coverage.
+        :raises InvalidConfigError: If the limits are invalid.
         """
         super().__init__(name, max_points, project_root, is_venv_required, env_vars)
 
         self.__coverage_full_path = COVERAGE_PATH
+        self.__tests_path = tests_path
+        self.__limits = ProcessLimits.from_dict(limits or {})
+        self.__session: Optional[PytestSession] = None
+
+    @property
+    def tests_path(self) -> Optional[list[str]]:
+        """
+        Get the paths to the test files.
+
+        :returns: The paths to the test files, or None if pytest discovers the tests.
+        :rtype: Optional[list[str]]
+        """
+        return self.__tests_path
+
+    @property
+    def referenced_files(self) -> Optional[list[str]]:
+        """
+        Get the local files outside of the project which the configuration of the check points to.
+
+        :returns: The paths to the test files, relative to the project root like for pytest, or None if some of them
+            are remote.
+        :rtype: Optional[list[str]]
+        """
+        return get_local_paths(self.__tests_path or [], self._project_root)
+
+    @property
+    def limits(self) -> ProcessLimits:
+        """
+        Get the limits of the tests run under coverage.
+
+        :returns: The limits of the tests run.
+        :rtype: ProcessLimits
+        """
+        return self.__limits
+
+    def share_session(self, session: PytestSession) -> None:
+        """
+        Measure the coverage of a pytest session shared with other checks.
+
+        :param session: The shared pytest session.
+        """
+        self.__session = session
+
+    @property
+    def exclusive_resource(self) -> Optional[str]:
+        """
+        Get the resource the check needs exclusive access to.
+
+        :returns: The name of the resource.
+        :rtype: Optional[str]
+        """
+        return PYTEST_RESOURCE
 
     def run(self) -> ScoredCheckResult:
         """
@@ -60,9 +126,23 @@ class CoverageCheck(ScoredCheck):
 
         score = self.__translate_score(coverage_report_result)
         return ScoredCheckResult(
-            self.name, score, f"Tests cover {coverage_report_result:.2f}% of the code", "", self.max_points
+            self.name,
+            score,
+            f"Tests cover {coverage_report_result:.2f}% of the code",
+            "",
+            self.max_points,
+            {"coverage": coverage_report_result},
         )
 
+    def _score_metrics(self, metrics: dict[str, Any]) -> float:
+        """
+        Compute the score from the coverage percentage of a previous run.
+
+        :param metrics: The raw metrics, with the coverage percentage.
+        :return: The score.
+        """
+        return self.__translate_score(float(metrics["coverage"]))
+
     def __translate_score(self, coverage_score: float) -> float:
         """
         Split the coverage score into regions and assign a score based on the region.
@@ -86,12 +166,40 @@ class CoverageCheck(ScoredCheck):
 
         return self._max_points
 
+    def _pre_run(self) -> None:
+        super()._pre_run()
+
+        if self.__tests_path is None:
+            return
+
+        try:
+            self.__tests_path = [download_resource(path) for path in self.__tests_path]
+        except ExternalResourceError as e:
+            logger.error("Downloading the tests failed: %s", e)
+            raise CheckError("Downloading the tests failed") from e
+
     def __coverage_run(self) -> None:
-        """Run the coverage tool on the project."""
-        command = [self.__coverage_full_path] + COVERAGE_RUN_ARGS + COVERAGE_RUN_PYTEST_ARGS
+        """
+        Run the coverage tool on the project.
+
+        :raises CheckTimeoutError: If the tests exceed their time limits.
+        :raises CheckError: If the tests cannot be run, or exceed their resource limits.
+        """
+        command = [self.__coverage_full_path] + COVERAGE_RUN_ARGS + COVERAGE_RUN_PYTEST_ARGS + (self.__tests_path or [])
 
         try:
-            output = run(command, current_directory=self._project_root, env_vars=self.env_vars)
+            if self.__session is not None:
+                output = self.__session.run(self.__tests_path or [])
+            else:
+                output = run(
+                    command, current_directory=self._project_root, env_vars=self.env_vars, limits=self.__limits
+                )
+        except ProcessTimeoutError as e:
+            logger.error("Coverage run timed out: %s", e)
+            raise CheckTimeoutError(f"Coverage run timed out: {e}") from e
+        except ProcessLimitError as e:
+            logger.error("Coverage run exceeded its limits: %s", e)
+            raise CheckError(f"Coverage run exceeded its limits: {e}") from e
         except (OSError, ValueError) as e:
             logger.error("Coverage run failed: %s", e)
             raise CheckError("Coverage run failed") from e
@@ -102,7 +210,7 @@ class CoverageCheck(ScoredCheck):
 
     def __coverage_report(self) -> int:
         """Generate a report from the coverage tool."""
-        source_files = find_all_source_files(self._project_root)
+        source_files = find_all_source_files(self._project_root, self._project_index)
 
         try:
             command = [self.__coverage_full_path] + COVERAGE_REPORT_ARGS_NO_FORMAT + source_files
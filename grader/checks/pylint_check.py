@@ -3,11 +3,12 @@
 It uses the pylint python library directly to run the check.
 """
 
+import hashlib
+import json
 import logging
 import os
-import re
 from io import StringIO
-from typing import Optional
+from typing import Any, Optional
 
 from pylint.reporters.text import TextReporter
 
@@ -17,6 +18,15 @@ from grader.exceptions import CheckError
 
 # import grader.utils.files as files
 from grader.utils import files, process
+from grader.utils.logger import VERBOSE
+from grader.utils.pylint_cache import (
+    PYLINT_EVALUATION_OPTION_PATTERN,
+    PylintCache,
+    PylintFileResult,
+    compute_pylint_score,
+    count_statements,
+    group_pylint_messages,
+)
 
 logger = logging.getLogger("grader")
 
@@ -31,6 +41,8 @@ class PylintCheck(ScoredCheck):
         max_points: int,
         is_venv_required: bool,
         pylintrc_path: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        jobs: Optional[int] = None,
         env_vars: Optional[dict[str, str]] = None,
     ):
         """
@@ -41,18 +53,32 @@ class PylintCheck(ScoredCheck):
         :param max_points: The maximum points this check can award.
         :param is_venv_required: Whether a virtual environment is required.
         :param pylintrc_path: Optional path to custom pylintrc configuration.
+        :param cache_dir: Optional directory of a persistent cache of per-file pylint results.
+        :param jobs: Optional number of parallel pylint processes (0 - one per CPU).
         :param env_vars: Optional environment variables for the check.
         """
         super().__init__(name, max_points, project_root, is_venv_required, env_vars)
         self.__pylint_max_score = 10
         self.__pylintrc_path = pylintrc_path or const.PYLINTRC
+        self.__cache = PylintCache(cache_dir) if cache_dir is not None else None
+        self.__jobs = jobs
+
+    @property
+    def referenced_files(self) -> Optional[list[str]]:
+        """
+        Get the local files outside of the project which the configuration of the check points to.
+
+        :returns: The path to the pylintrc file.
+        :rtype: Optional[list[str]]
+        """
+        return [self.__pylintrc_path]
 
     def run(self) -> ScoredCheckResult:
         """
         Run the pylint check on the project.
 
-        First, find all python files in the project, then create a custom reporter (to suppress all output).
-        Run the pylint check itself and map the score within the desired bounds.
+        First, find all python files in the project, then run pylint on them with the JSON reporter.
+        Read the score and the messages from the report and map the score within the desired bounds.
 
         :returns: The score from the pylint check.
         :rtype: float
@@ -60,14 +86,49 @@ class PylintCheck(ScoredCheck):
         self._pre_run()
 
         try:
-            pylint_args = files.find_all_python_files(self._project_root)
+            python_files = files.find_all_python_files(self._project_root, self._project_index)
         except OSError as error:
             logger.error("Error while finding python files: %s", error)
             raise CheckError("Error while finding python files") from error
 
-        logger.debug("Running pylint check on files: %s", pylint_args)
+        if self.__cache is not None:
+            cached_result = self.__run_cached(self.__cache, python_files)
+
+            if cached_result is not None:
+                return cached_result
+
+        pylint_score, messages = self.__run_pylint(python_files)
+
+        if not messages and sum(self.__count_statements(path) for path in python_files) == 0:
+            # Pylint does not rate code without statements
+            logger.error("Pylint score not found")
+            raise CheckError("Pylint score not found")
+
+        logger.debug("Pylint score: %s", pylint_score)
+        score = self.__translate_score(pylint_score)
+
+        short_output = "\n".join(
+            f"{message['path']}: {message['message']} ({message['symbol']})" for message in messages
+        )
+
+        return ScoredCheckResult(self.name, score, short_output, "", self.max_points, {"pylint_score": pylint_score})
+
+    def __run_pylint(self, python_files: list[str]) -> tuple[float, list[dict]]:
+        """
+        Run pylint on the given files.
+
+        :param python_files: The files to lint.
+        :raises CheckError: If pylint cannot be run, fails or its report is invalid.
+        :return: The score and the messages from the pylint JSON report.
+        """
+        logger.debug("Running pylint check on files: %s", python_files)
+        pylint_args = list(python_files)
         pylint_args.append("--fail-under=0")
         pylint_args.append("--extension-pkg-whitelist=pygame")
+        pylint_args.append(f"--output-format={const.PYLINT_OUTPUT_FORMAT}")
+
+        if self.__jobs is not None:
+            pylint_args.append(f"--jobs={self.__jobs}")
 
         if os.path.exists(self.__pylintrc_path):
             pylint_args.extend(["--rcfile", self.__pylintrc_path])
@@ -82,14 +143,129 @@ class PylintCheck(ScoredCheck):
         if results.returncode != 0:
             raise CheckError("Pylint check failed")
 
-        pylint_score = self.__get_pylint_score(results.stdout)
+        try:
+            report = json.loads(results.stdout)
+            return float(report["statistics"]["score"]), list(report["messages"])
+        except (ValueError, TypeError, KeyError) as error:
+            logger.error("Invalid pylint report: %s", error)
+            raise CheckError("Invalid pylint report") from error
+
+    def __run_cached(self, cache: PylintCache, python_files: list[str]) -> Optional[ScoredCheckResult]:
+        """
+        Run the pylint check, linting the files only if their results are not in the cache.
+
+        The messages of a file depend on the other files, so the results are cached for the whole set of linted files:
+        a single new or changed file lints all of them again.
+        The score is recomputed from the per-file results with pylint's default evaluation.
+
+        :param cache: The cache of per-file results.
+        :param python_files: The files to lint.
+        :raises CheckError: If pylint fails or the score cannot be computed.
+        :return: The result of the check, or None if the cache cannot be used.
+        """
+        pylint_version = self.__get_pylint_version()
+        rcfile_hash = self.__get_rcfile_hash()
+
+        if pylint_version is None or rcfile_hash is None:
+            return None
+
+        sources: dict[str, bytes] = {}
+
+        for path in python_files:
+            try:
+                with open(path, "rb") as python_file:
+                    sources[path] = python_file.read()
+            except OSError as error:
+                logger.error("Error while reading python file: %s", error)
+                raise CheckError("Error while reading python files") from error
+
+        relative_paths = {path: os.path.relpath(path, self._project_root) for path in python_files}
+        project_fingerprint = PylintCache.compute_project_fingerprint(
+            {relative_paths[path]: source for path, source in sources.items()}
+        )
+        keys = {
+            path: PylintCache.compute_key(relative_paths[path], project_fingerprint, rcfile_hash, pylint_version)
+            for path in python_files
+        }
+        cached_results = {path: cache.get(key) for path, key in keys.items()}
+        file_results = {path: result for path, result in cached_results.items() if result is not None}
+        logger.log(VERBOSE, "Pylint cache: %d of %d files cached", len(file_results), len(python_files))
+
+        if len(file_results) < len(python_files):
+            _, messages = self.__run_pylint(python_files)
+            messages_by_file = group_pylint_messages(messages)
+
+            for path in python_files:
+                file_messages = messages_by_file.get(os.path.normpath(path), [])
+                file_result = PylintFileResult(count_statements(sources[path]), file_messages)
+                cache.put(keys[path], file_result)
+                file_results[path] = file_result
+
+        pylint_score = compute_pylint_score([file_results[path] for path in python_files])
+
+        if pylint_score is None:
+            logger.error("Pylint score not found")
+            raise CheckError("Pylint score not found")
 
         logger.debug("Pylint score: %s", pylint_score)
         score = self.__translate_score(pylint_score)
 
-        short_output = self.__summarize_output(results.stdout)
+        short_output = "\n".join(
+            f"{os.path.relpath(path, self._project_root)}: {message.text}"
+            for path in python_files
+            for message in file_results[path].messages
+        )
 
-        return ScoredCheckResult(self.name, score, short_output, "", self.max_points)
+        return ScoredCheckResult(self.name, score, short_output, "", self.max_points, {"pylint_score": pylint_score})
+
+    def __get_pylint_version(self) -> Optional[str]:
+        """
+        Get the version of pylint (and astroid and python) in the virtual environment.
+
+        :return: The version information, or None if it cannot be determined.
+        """
+        try:
+            output = process.run([const.PYLINT_PATH, "--version"], current_directory=self._project_root)
+        except (OSError, ValueError) as error:
+            logger.warning("Cannot determine the pylint version, not using the cache: %s", error)
+            return None
+
+        if output.returncode != 0:
+            logger.warning("Cannot determine the pylint version, not using the cache")
+            return None
+
+        return output.stdout.strip()
+
+    def __get_rcfile_hash(self) -> Optional[str]:
+        """
+        Get the hash of the pylint configuration.
+
+        :return: The hash, an empty string if there is no rcfile, or None if the cache cannot be used with the rcfile.
+        """
+        if not os.path.exists(self.__pylintrc_path):
+            return ""
+
+        try:
+            with open(self.__pylintrc_path, "rb") as rcfile:
+                content = rcfile.read()
+        except OSError as error:
+            logger.warning("Cannot read the pylintrc file, not using the cache: %s", error)
+            return None
+
+        if PYLINT_EVALUATION_OPTION_PATTERN.search(content.decode("utf-8", errors="replace")):
+            logger.log(VERBOSE, "The pylintrc file has a custom evaluation, not using the cache")
+            return None
+
+        return hashlib.sha256(content).hexdigest()
+
+    def _score_metrics(self, metrics: dict[str, Any]) -> float:
+        """
+        Compute the score from the pylint rating of a previous run.
+
+        :param metrics: The raw metrics, with the pylint rating.
+        :return: The score.
+        """
+        return self.__translate_score(float(metrics["pylint_score"]))
 
     def __translate_score(self, pylint_score: float) -> float:
         """
@@ -114,49 +290,21 @@ class PylintCheck(ScoredCheck):
 
         return self._max_points
 
-    def __get_pylint_score(self, pylint_output: str) -> float:
+    @staticmethod
+    def __count_statements(path: str) -> int:
         """
-        Get the score from the pylint output.
-
-        The score is the last value in the output.
-
-        :param pylint_output: The output from the pylint check
-        :return: The score from the pylint check
-        """
-        expression = re.compile(r"[a-zA-Z ]*(\d*.\d*)\/.*")
-
-        for line in pylint_output.strip().split("\n"):
-            if "Your code has been rated at" in line:
-                match expression.match(line):
-                    case re.Match() as match_result:
-                        score = match_result.group(1)
-                        return float(score)
-                    case None:
-                        logger.error("Pylint score not found")
-                        raise CheckError("Pylint score not found")
-
-        logger.error("Pylint score not found")
-        raise CheckError("Pylint score not found")
+        Count the statements in a python file.
 
-    def __summarize_output(self, pylint_output: str) -> str:
+        :param path: The path to the file.
+        :raises CheckError: If the file cannot be read.
+        :return: The amount of statements.
         """
-        Summarize the pylint output to only include the messages.
-
-        :param pylint_output: The output from the pylint check
-        :return: The summarized output
-        """
-        # TODO: Improve parsing to handle Windows paths (C:\path) and complex pylint output format
-        # Current implementation may break with multiple colons in paths or line:column:code:message format
-        summarized_output = []
-        for line in pylint_output.strip().split("\n"):
-            parts = line.split(":")
-
-            if len(parts) < 2:
-                continue
-
-            file, message = parts[0], parts[-1]
-            summarized_output.append(f"{file.strip()}: {message.strip()}")
-        return "\n".join(summarized_output)
+        try:
+            with open(path, "rb") as python_file:
+                return count_statements(python_file.read())
+        except OSError as error:
+            logger.error("Error while reading python file: %s", error)
+            raise CheckError("Error while reading python files") from error
 
 
 class PylintCustomReporter(TextReporter):
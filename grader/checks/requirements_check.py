@@ -45,6 +45,16 @@ class RequirementsCheck(ScoredCheck):
         self.__pyproject_path = os.path.join(self._project_root, PYPROJECT_FILENAME)
         self.__is_checking_install = is_checking_install
 
+    @property
+    def is_reading_project_files(self) -> bool:
+        """
+        Check if the check reads the files of the project from the disk.
+
+        :returns: True only if the installation of the dependencies is checked.
+        :rtype: bool
+        """
+        return self.__is_checking_install
+
     def run(self) -> ScoredCheckResult:
         """
         Run the requirements check on the project.
@@ -55,12 +65,17 @@ class RequirementsCheck(ScoredCheck):
         """
         self._pre_run()
 
-        requirements = Path(self.__requirements_path)
-        pyproject = Path(self.__pyproject_path)
+        if self._project_index is not None:
+            is_one_of_files_present = any(
+                file_name in self._project_index.entries for file_name in (REQUIREMENTS_FILENAME, PYPROJECT_FILENAME)
+            )
+        else:
+            requirements = Path(self.__requirements_path)
+            pyproject = Path(self.__pyproject_path)
 
-        files_to_search = [requirements, pyproject]
+            files_to_search = [requirements, pyproject]
 
-        is_one_of_files_present = any(file_path.exists() for file_path in files_to_search)
+            is_one_of_files_present = any(file_path.exists() for file_path in files_to_search)
 
         score = int(is_one_of_files_present) * self.max_points
 
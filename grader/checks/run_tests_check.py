@@ -3,20 +3,29 @@
 import logging
 import os
 from collections import defaultdict
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from xml.etree import ElementTree
 
 from grader.checks.abstract_check import ScoredCheck, ScoredCheckResult
-from grader.exceptions import CheckError
+from grader.exceptions import CheckError, CheckTimeoutError, ProcessLimitError, ProcessTimeoutError
 from grader.utils import process
-from grader.utils.constants import PYTEST_ARGS, PYTEST_PATH, PYTEST_ROOT_DIR_ARG
+from grader.utils.constants import (
+    PYTEST_ARGS,
+    PYTEST_JUNIT_XML_ARG,
+    PYTEST_PATH,
+    PYTEST_RESOURCE,
+    PYTEST_ROOT_DIR_ARG,
+)
 from grader.utils.external_resources import (
     download_file_from_url,
     download_python_file_from_cove,
+    get_local_paths,
     is_resource_cove,
     is_resource_remote,
 )
 from grader.utils.logger import VERBOSE
+from grader.utils.pytest_session import PytestSession, new_junit_report_path, remove_junit_report
 
 logger = logging.getLogger("grader")
 
@@ -27,6 +36,7 @@ class TestId:
 
     class_name: str
     test_name: str
+    duration: float = field(default=0.0, compare=False)
 
     def __str__(self) -> str:
         """Return string representation of test ID."""
@@ -54,6 +64,7 @@ class RunTestsCheck(ScoredCheck):
         default_test_score: float = 0.0,
         test_score_mapping: Optional[dict[str, float]] = None,
         env_vars: Optional[dict[str, str]] = None,
+        limits: Optional[dict[str, Any]] = None,
     ):
         """
         Initialize the RunTestsCheck class.
@@ -65,6 +76,8 @@ class RunTestsCheck(ScoredCheck):
         :param tests_path: A list of paths to the test files.
         :param default_test_score: The default score for tests not explicitly mapped.
         :param test_score_mapping: A mapping of test names to their respective scores.
+        :param limits: Optional wall-clock and CPU time limits of the tests run.
+        :raises InvalidConfigError: If the limits are invalid.
         """
         super().__init__(name, max_points, project_root, is_venv_required, env_vars)
         self.__default_test_score = default_test_score
@@ -75,6 +88,57 @@ class RunTestsCheck(ScoredCheck):
                 self.__test_score_mapping[test_name] = score
 
         self.__tests_path = tests_path
+        self.__limits = process.ProcessLimits.from_dict(limits or {})
+        self.__session: Optional[PytestSession] = None
+
+    @property
+    def tests_path(self) -> list[str]:
+        """
+        Get the paths to the test files.
+
+        :returns: The paths to the test files.
+        :rtype: list[str]
+        """
+        return self.__tests_path
+
+    @property
+    def referenced_files(self) -> Optional[list[str]]:
+        """
+        Get the local files outside of the project which the configuration of the check points to.
+
+        :returns: The paths to the test files, relative to the project root like for pytest, or None if some of them
+            are remote.
+        :rtype: Optional[list[str]]
+        """
+        return get_local_paths(self.__tests_path, self._project_root)
+
+    @property
+    def limits(self) -> process.ProcessLimits:
+        """
+        Get the limits of the tests run.
+
+        :returns: The limits of the tests run.
+        :rtype: ProcessLimits
+        """
+        return self.__limits
+
+    def share_session(self, session: PytestSession) -> None:
+        """
+        Run the tests as part of a pytest session shared with other checks.
+
+        :param session: The shared pytest session.
+        """
+        self.__session = session
+
+    @property
+    def exclusive_resource(self) -> Optional[str]:
+        """
+        Get the resource the check needs exclusive access to.
+
+        :returns: The name of the resource.
+        :rtype: Optional[str]
+        """
+        return PYTEST_RESOURCE
 
     def run(self) -> ScoredCheckResult:
         """
@@ -88,11 +152,52 @@ class RunTestsCheck(ScoredCheck):
         """
         self._pre_run()
 
-        pytest_stdout = self.__pytest_run()
+        report_path = self.__pytest_run()
 
-        passed, failed = self.__parse_pytest_output(pytest_stdout)
+        try:
+            passed, failed = self.__parse_junit_report(report_path)
+        finally:
+            remove_junit_report(report_path)
         total_amount = len(passed) + len(failed)
 
+        passed_tests_score = self.__score_outcomes(passed, failed)
+
+        logger.log(VERBOSE, "Passed tests: %d/%d", len(passed), total_amount)
+        logger.log(VERBOSE, "Failed tests: %d/%d", len(failed), total_amount)
+
+        tests_info = []
+        tests_info += [test.pretty(True) for test in passed]
+        tests_info += [test.pretty(False) for test in failed]
+
+        metrics = {
+            "passed": [[test.class_name, test.test_name] for test in passed],
+            "failed": [[test.class_name, test.test_name] for test in failed],
+        }
+
+        return ScoredCheckResult(self.name, passed_tests_score, "\n".join(tests_info), "", self.max_points, metrics)
+
+    def _score_metrics(self, metrics: dict[str, Any]) -> float:
+        """
+        Compute the score from the outcomes of the tests of a previous run, with the current test score mapping.
+
+        :param metrics: The raw metrics, with the class and name of the passed and failed tests.
+        :raises CheckError: If the total score exceeds the maximum points.
+        :return: The score.
+        """
+        passed = [TestId(class_name, test_name) for class_name, test_name in metrics["passed"]]
+        failed = [TestId(class_name, test_name) for class_name, test_name in metrics["failed"]]
+
+        return self.__score_outcomes(passed, failed)
+
+    def __score_outcomes(self, passed: list[TestId], failed: list[TestId]) -> float:
+        """
+        Score the passed tests, making sure all tests together do not exceed the maximum points.
+
+        :param passed: The passed tests.
+        :param failed: The failed tests.
+        :raises CheckError: If the total score exceeds the maximum points.
+        :return: The score of the passed tests.
+        """
         passed_tests_score, _, total_score = self.__calculate_score(passed, failed)
 
         logger.debug("Passed tests core %f", passed_tests_score)
@@ -102,28 +207,21 @@ class RunTestsCheck(ScoredCheck):
             logger.error("Total score %f exceeds maximum points %f", total_score, self.max_points)
             raise CheckError("Total score exceeds maximum points")
 
-        logger.log(VERBOSE, "Passed tests: %d/%d", len(passed), total_amount)
-        logger.log(VERBOSE, "Failed tests: %d/%d", len(failed), total_amount)
-
-        tests_info = []
-        tests_info += [test.pretty(True) for test in passed]
-        tests_info += [test.pretty(False) for test in failed]
-
-        return ScoredCheckResult(self.name, passed_tests_score, "\n".join(tests_info), "", self.max_points)
+        return passed_tests_score
 
     def __pytest_run(self) -> str:
         """
         Run pytest on the specified test files.
 
-        :returns: The stdout output from the pytest run.
+        :returns: The path to the JUnit XML report of the pytest run.
         :rtype: str
-        :raises CheckError: If pytest fails to execute or encounters an error.
+        :raises CheckTimeoutError: If the tests exceed their time limits.
+        :raises CheckError: If pytest fails to execute, encounters an error or exceeds its resource limits.
         """
         if os.path.isabs(self._project_root):
             pytest_root_dir = PYTEST_ROOT_DIR_ARG.format(self._project_root)
         else:
             pytest_root_dir = PYTEST_ROOT_DIR_ARG.format(os.path.join(os.getcwd(), self._project_root))
-        command = [PYTEST_PATH] + PYTEST_ARGS + [pytest_root_dir] + self.__tests_path
 
         pythonpath_env = process.extend_env_variable("PYTHONPATH", self._project_root)
 
@@ -133,48 +231,102 @@ class RunTestsCheck(ScoredCheck):
             merged_env = pythonpath_env
 
         try:
-            output = process.run(
-                command,
-                current_directory=self._project_root,
-                env_vars=merged_env,
-            )
+            if self.__session is not None:
+                output = self.__session.run(self.__tests_path)
+                report_path = self.__session.report_path
+            else:
+                report_path = new_junit_report_path()
+                junit_xml_arg = PYTEST_JUNIT_XML_ARG.format(report_path)
+                command = [PYTEST_PATH] + PYTEST_ARGS + [pytest_root_dir, junit_xml_arg] + self.__tests_path
+
+                output = process.run(
+                    command,
+                    current_directory=self._project_root,
+                    env_vars=merged_env,
+                    limits=self.__limits,
+                )
+        except ProcessTimeoutError as e:
+            logger.error("Tests run timed out: %s", e)
+            raise CheckTimeoutError(f"Tests run timed out: {e}") from e
+        except ProcessLimitError as e:
+            logger.error("Tests run exceeded its limits: %s", e)
+            raise CheckError(f"Tests run exceeded its limits: {e}") from e
         except (OSError, ValueError) as e:
             logger.error("Tests run failed: %s", e)
             raise CheckError("Tests run failed") from e
 
         if output.returncode >= 2:  # 0: OK, 1: Tests failed
             logger.error("Tests run failed")
+            remove_junit_report(report_path)
             raise CheckError("Tests run failed")
 
-        return output.stdout
+        if report_path is None or not os.path.exists(report_path):
+            logger.error("Tests report not found. stdout: %s", output.stdout)
+            raise CheckError("Tests report not found")
 
-    def __parse_pytest_output(self, output: str) -> tuple[list[TestId], list[TestId]]:
+        return report_path
+
+    def __parse_junit_report(self, report_path: str) -> tuple[list[TestId], list[TestId]]:
         """
-        Parse the output from pytest to determine passed and failed tests.
+        Parse the JUnit XML report from pytest to determine passed and failed tests.
+
+        The report is read incrementally and each test case is discarded once processed,
+        so memory usage does not depend on the size of the report.
+        Errors count as failures, skipped tests are not counted.
 
-        :param output: The output from the pytest run.
+        :param report_path: The path to the JUnit XML report.
+        :raises CheckError: If the report cannot be parsed.
         :returns: A tuple containing two lists - passed tests and failed tests.
-        :rtype: tuple[list[str], list[str]]
+        :rtype: tuple[list[TestId], list[TestId]]
         """
         passed_tests = []
         failed_tests = []
 
-        for line in output.splitlines():
-            items = line.split("::")
-
-            if line.startswith("PASSED"):
-                class_name = items[-2]
-                test_name = items[-1]
-                passed_tests.append(TestId(class_name, test_name))
-            elif line.startswith("FAILED"):
-                class_name = items[-2]
-                test_name = items[-1].split(" ")[0]  # test_06_str_method - AssertionError: ...
-                test_id = TestId(class_name, test_name)
-                logger.log(VERBOSE, "Test %s failed", test_id)
-                failed_tests.append(test_id)
+        try:
+            for _, element in ElementTree.iterparse(report_path, events=("end",)):
+                if element.tag != "testcase":
+                    continue
+
+                class_name = RunTestsCheck.__get_class_name(element.get("classname", ""), element.get("file"))
+                test_id = TestId(class_name, element.get("name", ""), float(element.get("time", 0)))
+                outcomes = {child.tag for child in element}
+                element.clear()
+
+                logger.debug("Test %s took %.3fs", test_id, test_id.duration)
+
+                if "skipped" in outcomes:
+                    logger.log(VERBOSE, "Test %s skipped", test_id)
+                elif "failure" in outcomes or "error" in outcomes:
+                    logger.log(VERBOSE, "Test %s failed", test_id)
+                    failed_tests.append(test_id)
+                else:
+                    passed_tests.append(test_id)
+        except (OSError, ValueError, ElementTree.ParseError) as e:
+            logger.error("Tests report is invalid: %s", e)
+            raise CheckError("Tests report is invalid") from e
 
         return passed_tests, failed_tests
 
+    @staticmethod
+    def __get_class_name(classname: str, file_path: Optional[str]) -> str:
+        """
+        Get the class of a test case of the JUnit XML report.
+
+        Plain test functions belong to their test file, as in the pytest node id (e.g. tests/test_sample_code.py).
+
+        :param classname: The dotted path to the class of the test, or to its module for plain test functions.
+        :param file_path: The path to the test file, relative to the pytest root directory, if reported.
+        :returns: The name of the class, or the path to the test file.
+        :rtype: str
+        """
+        if file_path is not None:
+            # pytest builds the classname of plain test functions from the path to their file
+            module_name = file_path.replace("\\", "/").replace("/", ".").removesuffix(".py")
+            if classname == module_name:
+                return file_path.replace("\\", "/")
+
+        return classname.rsplit(".", 1)[-1]
+
     def _pre_run(self) -> None:
         super()._pre_run()
 
@@ -216,6 +368,10 @@ class RunTestsCheck(ScoredCheck):
         test_class = test.class_name
         test_name = test.test_name
 
+        # Parametrized tests (test_add[1-2]) are scored by their base name, unless the exact id is mapped
+        if test_name not in self.__test_score_mapping:
+            test_name = test_name.split("[", 1)[0]
+
         if test_class in self.__test_score_mapping and test_name in self.__test_score_mapping:
             score = self.__test_score_mapping[test_name]
         elif test_class in self.__test_score_mapping and test_name not in self.__test_score_mapping:
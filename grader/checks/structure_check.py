@@ -13,10 +13,13 @@ from grader.exceptions import CheckError, ExternalResourceError
 from grader.utils.external_resources import (
     download_file_from_url,
     fetch_json_from_cove,
+    get_local_paths,
     is_resource_cove,
     is_resource_remote,
 )
 from grader.utils.logger import VERBOSE
+from grader.utils.project_index import ProjectIndex
+from grader.utils.structure_matcher import StructureMatcher
 from grader.utils.structure_validator import StructureValidator
 
 logger = logging.getLogger("grader")
@@ -47,11 +50,33 @@ class StructureCheck(NonScoredCheck):
         super().__init__(name, project_root, is_fatal, is_venv_required, env_vars)
         self.__structure_file = structure_file
 
+    @property
+    def is_reading_project_files(self) -> bool:
+        """
+        Check if the check reads the files of the project from the disk.
+
+        :returns: False, the patterns are matched against the project index.
+        :rtype: bool
+        """
+        return False
+
+    @property
+    def referenced_files(self) -> Optional[list[str]]:
+        """
+        Get the local files outside of the project which the configuration of the check points to.
+
+        :returns: The path to the structure file, or None if it is remote or in Cove.
+        :rtype: Optional[list[str]]
+        """
+        return get_local_paths([self.__structure_file])
+
     def run(self) -> NonScoredCheckResult:
         """
         Run the structure check on the project.
 
         Load the structure file, then check if the structure is valid.
+        All patterns are matched in a single pass over the project files, and all invalid required elements
+        are reported.
 
         :raises CheckError: If the structure is invalid
         :return: The score from the structure check
@@ -61,13 +86,19 @@ class StructureCheck(NonScoredCheck):
 
         structure_elements = StructureCheck.__load_structure_file(self.__structure_file)
 
+        # The validity of every element is only needed for the verbose log, otherwise only the required ones matter
+        is_required_only = not logger.isEnabledFor(VERBOSE)
+        project_index = self._project_index or ProjectIndex(self._project_root)
+        invalid_elements = StructureMatcher(structure_elements).get_invalid_elements(project_index, is_required_only)
+
         for element in structure_elements:
-            is_element_valid = element.is_structure_valid(self._project_root)
+            if element.required or not is_required_only:
+                logger.log(VERBOSE, "Is %s structure valid ? %s", element.name, element not in invalid_elements)
 
-            logger.log(VERBOSE, "Is %s structure valid ? %s", element.name, is_element_valid)
+        invalid_names = [f"'{element.name}'" for element in invalid_elements if element.required]
 
-            if element.required and not is_element_valid:
-                return NonScoredCheckResult(self.name, False, f"Structure for '{element.name}' is invalid.", "")
+        if invalid_names:
+            return NonScoredCheckResult(self.name, False, f"Structure for {', '.join(invalid_names)} is invalid.", "")
 
         return NonScoredCheckResult(self.name, True, "Structure is valid", "")
 
@@ -2,15 +2,28 @@
 Module containing the type hints check.
 
 It calls mypy as a subprocess to generate a report and then read from the report.
+Alternatively, the same counts can be computed from the syntax trees of the files, without mypy.
 """
 
+import hashlib
 import logging
-from typing import Optional
+import os
+from typing import Any, Optional
 
+import grader.utils.constants as const
 from grader.checks.abstract_check import ScoredCheck, ScoredCheckResult
-from grader.exceptions import CheckError
+from grader.exceptions import CheckError, InvalidConfigError
 from grader.utils import files, process
-from grader.utils.constants import MYPY_LINE_COUNT_REPORT, MYPY_PATH, MYPY_TYPE_HINT_CONFIG, REPORTS_TEMP_DIR
+from grader.utils.constants import (
+    MYPY_PATH,
+    MYPY_RESOURCE,
+    MYPY_TYPE_HINT_CONFIG,
+    TYPE_HINTS_ENGINE_AST,
+    TYPE_HINTS_ENGINE_MYPY,
+)
+from grader.utils.logger import VERBOSE
+from grader.utils.mypy_cache import MypyCache, MypyFileResult, get_module_name, parse_linecount_report
+from grader.utils.type_hints import count_all_annotated_functions
 
 logger = logging.getLogger("grader")
 
@@ -24,6 +37,9 @@ class TypeHintsCheck(ScoredCheck):
         project_root: str,
         max_points: int,
         is_venv_required: bool,
+        cache_dir: Optional[str] = None,
+        engine: str = TYPE_HINTS_ENGINE_MYPY,
+        jobs: Optional[int] = None,
         env_vars: Optional[dict[str, str]] = None,
     ):
         """
@@ -33,13 +49,34 @@ class TypeHintsCheck(ScoredCheck):
         :param project_root: The root directory of the project.
         :param max_points: The maximum points this check can award.
         :param is_venv_required: Whether a virtual environment is required.
+        :param cache_dir: Optional directory of a persistent cache of per-file mypy linecount rows.
+        :param engine: How the functions with type hints are counted - by mypy or from the syntax trees ("ast").
+        :param jobs: Optional number of processes the "ast" engine parses the files in (0 - one per CPU).
         :param env_vars: Optional environment variables for the check.
+        :raises InvalidConfigError: If the engine is unknown.
         """
         super().__init__(name, max_points, project_root, is_venv_required, env_vars)
 
         self.__mypy_binary = MYPY_PATH
-        self.__mypy_arguments = ["--config-file", MYPY_TYPE_HINT_CONFIG, "--linecount-report", REPORTS_TEMP_DIR]
+        self.__mypy_arguments = ["--config-file", MYPY_TYPE_HINT_CONFIG, "--linecount-report", const.REPORTS_TEMP_DIR]
         self.__mypy_max_score = 1
+        self.__cache = MypyCache(cache_dir) if cache_dir is not None else None
+        self.__jobs = jobs
+
+        if engine not in (TYPE_HINTS_ENGINE_MYPY, TYPE_HINTS_ENGINE_AST):
+            raise InvalidConfigError(f"Unknown type hints engine: {engine}")
+
+        self.__engine = engine
+
+    @property
+    def exclusive_resource(self) -> Optional[str]:
+        """
+        Get the resource the check needs exclusive access to.
+
+        :returns: The name of the resource, or None if mypy is not used.
+        :rtype: Optional[str]
+        """
+        return MYPY_RESOURCE if self.__engine == TYPE_HINTS_ENGINE_MYPY else None
 
     def run(self) -> ScoredCheckResult:
         """
@@ -51,6 +88,9 @@ class TypeHintsCheck(ScoredCheck):
         The first line in the report contains the values for all files.
         The line contains a lot of stuff, we just need the type-hinted lines and the total amount of lines.
 
+        With a cache directory, mypy checks only the files whose rows are not cached and the rows are summed instead.
+        With the "ast" engine, mypy is not run and the functions are counted from the syntax trees of the files.
+
         :returns: The score from the mypy check.
         :rtype: float
         """
@@ -58,13 +98,81 @@ class TypeHintsCheck(ScoredCheck):
 
         # Gather all files
         try:
-            all_source_files = files.find_all_source_files(self._project_root)
+            all_source_files = files.find_all_source_files(self._project_root, self._project_index)
         except OSError as error:
             logger.error("Error while finding python files: %s", error)
             raise CheckError("Error while finding python files") from error
 
+        counts: Optional[tuple[int, int]]
+
+        if self.__engine == TYPE_HINTS_ENGINE_AST:
+            counts = self.__count_from_syntax_trees(all_source_files)
+        elif self.__cache is not None:
+            counts = self.__run_cached(self.__cache, all_source_files)
+        else:
+            counts = None
+
+        if counts is None:
+            counts = self.__run_mypy(all_source_files)
+
+        lines_with_type_annotations, lines_total = counts
+        metrics = {"annotated_functions": lines_with_type_annotations, "functions": lines_total}
+
+        if lines_total == 0:
+            logger.error("Mypy linecount report is empty")
+            return ScoredCheckResult(self.name, 0, "", "", self.max_points, metrics)
+
+        # Calculate score
+        covered_lines_percentage = lines_with_type_annotations / lines_total
+        score = self.__translate_score(covered_lines_percentage)
+
+        return ScoredCheckResult(
+            self.name,
+            score,
+            f"{covered_lines_percentage * 100:.2f}% of the functions have type hints",
+            "",
+            self.max_points,
+            metrics,
+        )
+
+    def _score_metrics(self, metrics: dict[str, Any]) -> float:
+        """
+        Compute the score from the function counts of a previous run.
+
+        :param metrics: The raw metrics, with the amount of functions with type hints and the total amount.
+        :return: The score.
+        """
+        functions = int(metrics["functions"])
+
+        if functions == 0:
+            return 0
+
+        return self.__translate_score(int(metrics["annotated_functions"]) / functions)
+
+    def __count_from_syntax_trees(self, source_files: list[str]) -> tuple[int, int]:
+        """
+        Count the functions with type hints from the syntax trees of the files, the way the mypy report does.
+
+        :param source_files: The files to check.
+        :raises CheckError: If a file cannot be read.
+        :return: The amount of functions with type hints and the total amount of functions.
+        """
+        try:
+            return count_all_annotated_functions(source_files, self.__jobs)
+        except OSError as error:
+            logger.error("Error while reading python file: %s", error)
+            raise CheckError("Error while reading python files") from error
+
+    def __run_mypy(self, source_files: list[str]) -> tuple[int, int]:
+        """
+        Run mypy on the given files, with the linecount report.
+
+        :param source_files: The files to check.
+        :raises CheckError: If mypy cannot be run or the report is missing.
+        :return: The amount of functions with type hints and the total amount of functions.
+        """
         # Run mypy on all files
-        command = [self.__mypy_binary] + self.__mypy_arguments + all_source_files
+        command = [self.__mypy_binary] + self.__mypy_arguments + source_files
         try:
             _ = process.run(
                 command,
@@ -77,7 +185,7 @@ class TypeHintsCheck(ScoredCheck):
 
         # Read mypy linecount report
         try:
-            with open(MYPY_LINE_COUNT_REPORT, "r", encoding="utf-8") as report_file:
+            with open(const.MYPY_LINE_COUNT_REPORT, "r", encoding="utf-8") as report_file:
                 report = report_file.readline().strip().split()
         except FileNotFoundError as error:
             logger.error("Mypy linecount report not found")
@@ -86,22 +194,106 @@ class TypeHintsCheck(ScoredCheck):
         # Fancy way to get the needed values - I need the 3rd and 4th values, out of 5 total
         *_, lines_with_type_annotations, lines_total, _ = report
 
-        if int(lines_total) == 0:
-            logger.error("Mypy linecount report is empty")
-            return ScoredCheckResult(self.name, 0, "", "", self.max_points)
+        return int(lines_with_type_annotations), int(lines_total)
 
-        # Calculate score
-        covered_lines_percentage = int(lines_with_type_annotations) / int(lines_total)
-        score = self.__translate_score(covered_lines_percentage)
+    def __run_cached(self, cache: MypyCache, source_files: list[str]) -> Optional[tuple[int, int]]:
+        """
+        Run mypy only on the files which are not in the cache, and sum the per-file rows of the linecount report.
 
-        return ScoredCheckResult(
-            self.name,
-            score,
-            f"{covered_lines_percentage * 100:.2f}% of the functions have type hints",
-            "",
-            self.max_points,
+        :param cache: The cache of per-file rows.
+        :param source_files: The files to check.
+        :raises CheckError: If a file cannot be read or mypy cannot be run.
+        :return: The amount of functions with type hints and the total amount of functions,
+                 or None if the cache cannot be used.
+        """
+        mypy_version = self.__get_mypy_version()
+        config_hash = self.__get_config_hash()
+
+        if mypy_version is None or config_hash is None:
+            return None
+
+        file_results: dict[str, MypyFileResult] = {}
+        uncached_files: dict[str, tuple[str, str]] = {}
+
+        for path in source_files:
+            try:
+                with open(path, "rb") as source_file:
+                    source = source_file.read()
+            except OSError as error:
+                logger.error("Error while reading python file: %s", error)
+                raise CheckError("Error while reading python files") from error
+
+            key = MypyCache.compute_key(os.path.relpath(path, self._project_root), source, config_hash, mypy_version)
+            cached_file_result = cache.get(key)
+
+            if cached_file_result is None:
+                uncached_files[path] = (key, get_module_name(path))
+            else:
+                file_results[path] = cached_file_result
+
+        logger.log(VERBOSE, "Mypy cache: %d files cached, %d to check", len(file_results), len(uncached_files))
+
+        if uncached_files:
+            # A report left from another project must never be cached
+            try:
+                os.remove(const.MYPY_LINE_COUNT_REPORT)
+            except FileNotFoundError:
+                pass
+
+            self.__run_mypy(list(uncached_files))
+
+            try:
+                report = parse_linecount_report(const.MYPY_LINE_COUNT_REPORT)
+            except (OSError, ValueError) as error:
+                logger.warning("Cannot read the mypy linecount report, not using the cache: %s", error)
+                return None
+
+            if any(module_name not in report for _, module_name in uncached_files.values()):
+                # Mypy did not check every file (e.g. because of a syntax error)
+                logger.log(VERBOSE, "Mypy linecount report is incomplete, not using the cache")
+                return None
+
+            for path, (key, module_name) in uncached_files.items():
+                cache.put(key, report[module_name])
+                file_results[path] = report[module_name]
+
+        return (
+            sum(result.annotated_functions for result in file_results.values()),
+            sum(result.functions for result in file_results.values()),
         )
 
+    def __get_mypy_version(self) -> Optional[str]:
+        """
+        Get the version of mypy in the virtual environment.
+
+        :return: The version information, or None if it cannot be determined.
+        """
+        try:
+            output = process.run([self.__mypy_binary, "--version"], current_directory=self._project_root)
+        except (OSError, ValueError) as error:
+            logger.warning("Cannot determine the mypy version, not using the cache: %s", error)
+            return None
+
+        if output.returncode != 0:
+            logger.warning("Cannot determine the mypy version, not using the cache")
+            return None
+
+        return output.stdout.strip()
+
+    @staticmethod
+    def __get_config_hash() -> Optional[str]:
+        """
+        Get the hash of the mypy configuration.
+
+        :return: The hash, or None if the configuration cannot be read.
+        """
+        try:
+            with open(MYPY_TYPE_HINT_CONFIG, "rb") as config_file:
+                return hashlib.sha256(config_file.read()).hexdigest()
+        except OSError as error:
+            logger.warning("Cannot read the mypy configuration, not using the cache: %s", error)
+            return None
+
     def __translate_score(self, mypy_score: float) -> float:
         """
         Split the mypy score into regions and assign a score based on the region.
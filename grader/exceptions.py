@@ -21,9 +21,37 @@ class CheckError(GraderError):
     """Custom exception for check errors."""
 
 
+class CheckTimeoutError(CheckError):
+    """Raised when a check exceeds its wall-clock or CPU time limit."""
+
+
+class ProcessLimitError(GraderError):
+    """Raised when a command exceeds one of its resource limits, or when its limits cannot be enforced."""
+
+
+class ProcessTimeoutError(ProcessLimitError):
+    """Raised when a command exceeds its wall-clock or CPU time limit, after it was killed."""
+
+
 class VirtualEnvironmentError(GraderError):
     """Exception raised when an error occurs during the virtual environment setup."""
 
 
 class ExternalResourceError(GraderError):
     """Custom exception for external resource errors."""
+
+
+class ArchiveError(GraderError):
+    """Raised when a zip archive cannot be extracted safely, e.g. when it exceeds the extraction limits."""
+
+
+class InvalidReportError(GraderError):
+    """Raised when a results report cannot be read, e.g. when rescoring it."""
+
+
+class TraceExportError(GraderError):
+    """Raised when the trace of a run cannot be written or sent to a collector."""
+
+
+class JobQueueError(GraderError):
+    """Raised when the job queue cannot be opened, e.g. when it was created by an incompatible version."""
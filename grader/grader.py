@@ -2,6 +2,9 @@
 
 import os
 import shutil
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from logging import Logger
 from typing import Optional
 
@@ -14,11 +17,15 @@ from grader.checks.abstract_check import (
     ScoredCheck,
     ScoredCheckResult,
 )
-from grader.checks.checks_factory import create_checks
-from grader.exceptions import CheckError, InvalidConfigError, InvalidProjectRootError
+from grader.checks.checks_factory import create_checks, create_project_index
+from grader.exceptions import ArchiveError, CheckError, CheckTimeoutError, InvalidConfigError, InvalidProjectRootError
 from grader.utils.config import load_config
+from grader.utils.instrumentation import Instrumentation, StageMetrics, measure
 from grader.utils.logger import setup_logger
+from grader.utils.project_index import ProjectIndex
+from grader.utils.results_cache import ResultsCache, compute_files_fingerprint
 from grader.utils.virtual_environment import VirtualEnvironment
+from grader.utils.zip_project_index import ZipProjectIndex
 
 
 class Grader:
@@ -32,28 +39,43 @@ class Grader:
         config_path: Optional[str] = None,
         is_keeping_venv: bool = False,
         is_skipping_venv_creation: bool = False,
+        work_directory: Optional[str] = None,
+        is_collecting_timings: bool = False,
+        config: Optional[dict] = None,
+        results_cache: Optional[ResultsCache] = None,
     ):
         """
         Initialize the Grader.
 
         :param run_id: The ID of the current run.
-        :param project_root: The root directory of the project to grade.
+        :param project_root: The root directory of the project to grade, or a zip archive containing it.
+                             Archives are extracted only when a check needs the files on the disk.
         :param logger: The logger instance for output.
         :param config_path: Optional path to configuration file.
         :param is_keeping_venv: Whether to keep the virtual environment after grading.
         :param is_skipping_venv_creation: Whether to skip virtual environment creation.
+        :param work_directory: Optional directory to extract a zip archive into.
+        :param is_collecting_timings: Whether to measure the time and resources used by each stage of the grading.
+        :param config: Optional configuration, already loaded from config_path, e.g. by a long-running worker.
+        :param results_cache: Optional results cache, used instead of the results_cache_dir of the configuration,
+                              e.g. to resume a queued submission without running its finished checks again.
         """
         self.__logger = logger or setup_logger(run_id)
 
         self.__logger.info("Python project grader, %s", const.VERSION)
         self.__is_keeping_venv = is_keeping_venv
         self.__is_skipping_venv_creation = is_skipping_venv_creation
+        self.__is_collecting_timings = is_collecting_timings
+        self.__stage_metrics: list[StageMetrics] = []
         try:
-            if config_path is None:
+            if config is not None:
+                self.__config = config
+            elif config_path is None:
                 raise InvalidConfigError("No configuration source provided")
-
-            self.__logger.info("Loading configuration from file: %s", config_path)
-            self.__config = load_config(config_path)
+            else:
+                self.__logger.info("Loading configuration from file: %s", config_path)
+                with measure("config:load"):
+                    self.__config = load_config(config_path)
 
             self.__logger.debug(f"Config contents: {self.__config}")
         except InvalidConfigError as exc:
@@ -61,6 +83,27 @@ class Grader:
             self.__logger.exception(exc)
             raise
 
+        self.__max_parallel_checks = self.__config.get("max_parallel_checks", const.DEFAULT_MAX_PARALLEL_CHECKS)
+        if (
+            not isinstance(self.__max_parallel_checks, int)
+            or isinstance(self.__max_parallel_checks, bool)
+            or self.__max_parallel_checks < 1
+        ):
+            self.__logger.error("Invalid max_parallel_checks: %s", self.__max_parallel_checks)
+            raise InvalidConfigError("max_parallel_checks must be a positive integer")
+
+        results_cache_dir = self.__config.get("results_cache_dir")
+        if results_cache_dir is not None and not isinstance(results_cache_dir, str):
+            self.__logger.error("Invalid results_cache_dir: %s", results_cache_dir)
+            raise InvalidConfigError("results_cache_dir must be a string")
+
+        if results_cache is None and results_cache_dir:
+            results_cache = ResultsCache(results_cache_dir, self.__config)
+
+        self.__results_cache = results_cache
+        self.__cache_keys: dict[AbstractCheck, str] = {}
+        self.__cached_results: dict[AbstractCheck, CheckResult] = {}
+
         if run_id is not None:
             self.__logger.info("Running checks for student %s", run_id)
 
@@ -71,23 +114,77 @@ class Grader:
         self.__logger.debug("PYTHONPATH: %s", os.environ.get("PYTHONPATH", "Not set"))
 
         self.__project_root = project_root
+        self.__work_directory = work_directory
+        self.__project_index: Optional[ProjectIndex] = None
         if not os.path.exists(self.__project_root):
             self.__logger.error("Project root directory does not exist")
             raise InvalidProjectRootError("Project root directory does not exist")
 
+    @property
+    def stage_metrics(self) -> list[StageMetrics]:
+        """
+        Get the time and resources used by each stage of the last grading, if timings are collected.
+
+        :returns: The metrics of the checks, the virtual environment setup and teardown, the downloads
+                  and the archive extraction, in the order they finished.
+        :rtype: list[StageMetrics]
+        """
+        return self.__stage_metrics
+
     def grade(self) -> list[CheckResult]:
         """
         Run all checks and return their results.
 
         :return: A list of CheckResult objects containing the results of the checks.
         """
-        non_venv_checks, venv_checks = create_checks(self.__config, self.__project_root)
+        if not self.__is_collecting_timings:
+            return self.__grade()
+
+        with Instrumentation() as instrumentation:
+            try:
+                return self.__grade()
+            finally:
+                self.__stage_metrics = instrumentation.stages
+
+    def __grade(self) -> list[CheckResult]:
+        """
+        Run all checks and return their results.
+
+        :return: A list of CheckResult objects containing the results of the checks.
+        """
+        try:
+            self.__project_index = create_project_index(self.__config, self.__project_root, self.__work_directory)
+        except (OSError, zipfile.BadZipFile) as error:
+            self.__logger.error("Cannot read the project archive: %s", error)
+            raise InvalidProjectRootError("Cannot read the project archive") from error
+
+        self.__project_root = self.__project_index.project_root
+
+        try:
+            return self.__run_checks()
+        finally:
+            self.__cleanup()
+
+    def __run_checks(self) -> list[CheckResult]:
+        """
+        Run the checks of the project, creating the virtual environment for the checks which need it.
+
+        :return: A list of CheckResult objects containing the results of the checks.
+        """
+        non_venv_checks, venv_checks = create_checks(self.__config, self.__project_root, self.__project_index)
+        self.__look_up_cached_results(non_venv_checks, venv_checks)
 
         scores = [self.__run_check(check) for check in non_venv_checks]
 
         if self.__is_skipping_venv_creation or len(venv_checks) == 0:
             return scores
 
+        if all(check in self.__cached_results for check in venv_checks):
+            self.__logger.debug("All checks needing the virtual environment are cached, not creating it")
+            return scores + [self.__run_check(check) for check in venv_checks]
+
+        self.__extract_project()
+
         venv_config = self.__config.get("venv", {})
 
         with VirtualEnvironment(
@@ -95,12 +192,46 @@ class Grader:
             is_keeping_venv_after_run=self.__is_keeping_venv,
             **venv_config,
         ):
-            scores += [self.__run_check(check) for check in venv_checks]
-
-        self.__cleanup()
+            scores += self.__run_checks_concurrently(venv_checks)
 
         return scores
 
+    def __run_checks_concurrently(self, checks: list[AbstractCheck]) -> list[CheckResult]:
+        """
+        Run the checks concurrently and return their results in the order of the checks.
+
+        Checks needing the same exclusive resource are grouped and run one after another, in their original order.
+        The groups run in parallel, with at most max_parallel_checks of them at the same time.
+
+        :param checks: The checks to run.
+        :return: The results of the checks, in the same order as the checks.
+        """
+        groups: dict[object, list[int]] = {}
+        for index, check in enumerate(checks):
+            resource = check.exclusive_resource
+            groups.setdefault(index if resource is None else resource, []).append(index)
+
+        max_workers = min(self.__max_parallel_checks, len(groups))
+
+        if max_workers <= 1:
+            return [self.__run_check(check) for check in checks]
+
+        self.__logger.debug("Running %d checks in %d parallel groups", len(checks), max_workers)
+
+        results: dict[int, CheckResult] = {}
+
+        def run_group(indices: list[int]) -> None:
+            for index in indices:
+                results[index] = self.__run_check(checks[index])
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(run_group, indices) for indices in groups.values()]
+
+            for future in futures:
+                future.result()
+
+        return [results[index] for index in range(len(checks))]
+
     def __run_check(self, check: AbstractCheck) -> CheckResult:
         """
         Run a single check and return the result.
@@ -109,23 +240,115 @@ class Grader:
         :raises TypeError: If the check is of an unknown type.
         :return: The result of the check.
         """
+        cached_result = self.__cached_results.get(check)
+        if cached_result is not None:
+            self.__logger.info("Using the cached result of %s", check.name)
+            return cached_result
+
+        if self.__is_archive_pending() and check.is_reading_project_files:
+            self.__extract_project()
+
+        stage = measure(f"check:{check.name}") if self.__is_collecting_timings else nullcontext()
+
         try:
-            check_result = check.run()
+            with stage:
+                check_result = check.run()
         except CheckError as error:
             self.__logger.error("Check failed: %s", error)
 
             # TODO - Pass the information from the exception
             match check:
                 case ScoredCheck():
-                    check_result = ScoredCheckResult(check.name, 0, "", str(error), check.max_points)
+                    is_timed_out = isinstance(error, CheckTimeoutError)
+                    check_result = ScoredCheckResult(
+                        check.name, 0, "", str(error), check.max_points, is_timed_out=is_timed_out
+                    )
                 case NonScoredCheck():
                     check_result = NonScoredCheckResult(check.name, False, "", str(error))
                 case _:
                     raise TypeError(f"Unknown check type: {type(check)}") from error
+        else:
+            cache_key = self.__cache_keys.get(check)
+            if self.__results_cache is not None and cache_key is not None:
+                self.__results_cache.put(cache_key, check_result)
 
         self.__logger.debug("Check result: %s", check_result)
         return check_result
 
+    def __look_up_cached_results(self, non_venv_checks: list[AbstractCheck], venv_checks: list[AbstractCheck]) -> None:
+        """
+        Compute the cache key of each check and look up the cached results, if the results cache is enabled.
+
+        Checks which do not read the project files are keyed by the paths of the files only.
+        The contents of the files the configuration of a check points to are part of its key, and checks pointing to
+        remote resources are not cached at all.
+        Results of failed checks are never cached, so they are retried on the next run.
+
+        :param non_venv_checks: The checks which run without a virtual environment.
+        :param venv_checks: The checks which run in the virtual environment.
+        """
+        if self.__results_cache is None or self.__project_index is None:
+            return
+
+        # The checks are created in the order of the configuration, split by is_venv_required
+        check_configs = [
+            *(check for check in self.__config["checks"] if not check.get("is_venv_required", False)),
+            *(check for check in self.__config["checks"] if check.get("is_venv_required", False)),
+        ]
+        fingerprints: dict[bool, str] = {}
+
+        for check, check_config in zip(non_venv_checks + venv_checks, check_configs, strict=True):
+            referenced_files = check.referenced_files
+            if referenced_files is None:
+                self.__logger.debug("%s depends on remote resources, its result is not cached", check.name)
+                continue
+
+            is_reading_project_files = check.is_reading_project_files
+            if is_reading_project_files not in fingerprints:
+                fingerprints[is_reading_project_files] = self.__project_index.compute_fingerprint(
+                    is_reading_project_files
+                )
+
+            key = self.__results_cache.compute_key(
+                type(check).__name__,
+                check_config,
+                fingerprints[is_reading_project_files],
+                compute_files_fingerprint(referenced_files),
+            )
+            self.__cache_keys[check] = key
+
+            cached_result = self.__results_cache.get(key)
+            if cached_result is not None:
+                self.__cached_results[check] = cached_result
+
+    def __is_archive_pending(self) -> bool:
+        """
+        Check if the project was submitted as a zip archive that is not extracted yet.
+
+        :return: True if the archive still has to be extracted, False otherwise.
+        """
+        return isinstance(self.__project_index, ZipProjectIndex) and not self.__project_index.is_extracted
+
+    def __extract_project(self) -> None:
+        """
+        Extract the project, if it was submitted as a zip archive that is not extracted yet.
+
+        :raises ArchiveError: If the archive exceeds the extraction limits.
+        :raises InvalidProjectRootError: If the archive cannot be extracted.
+        """
+        if not isinstance(self.__project_index, ZipProjectIndex) or self.__project_index.is_extracted:
+            return
+
+        try:
+            with measure("archive:extract"):
+                self.__project_index.extract()
+        except ArchiveError as error:
+            self.__logger.error("Refusing to extract the project archive: %s", error)
+            raise
+        except (OSError, zipfile.BadZipFile) as error:
+            self.__logger.error("Cannot extract the project archive: %s", error)
+            raise InvalidProjectRootError("Cannot extract the project archive") from error
+
     def __cleanup(self) -> None:
         """
         Cleanup temporary files created during the grading process.
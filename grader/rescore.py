@@ -0,0 +1,131 @@
+"""
+Module containing the Rescorer class.
+
+Scored results keep the raw metrics their score was computed from (the pylint rating, the coverage percentage...),
+so when the scoring changes (e.g. max_points or test_score_mapping), the scores of a JSON report are recomputed
+from the metrics, without running a single tool or creating a virtual environment.
+"""
+
+import json
+import logging
+from dataclasses import replace
+from typing import Optional
+
+from grader.checks.abstract_check import CheckResult, ScoredCheck, ScoredCheckResult
+from grader.checks.checks_factory import create_checks
+from grader.exceptions import CheckError, InvalidConfigError, InvalidReportError
+from grader.utils.config import load_config
+from grader.utils.results_reporter import results_from_json
+
+logger = logging.getLogger("grader")
+
+
+def load_report(report_path: str) -> dict:
+    """
+    Load a JSON report of a single submission or of a batch.
+
+    :param report_path: The path to the JSON report.
+    :raises InvalidReportError: If the report cannot be read.
+    :return: The contents of the report.
+    """
+    try:
+        with open(report_path, "r", encoding="utf-8") as report_file:
+            report = json.load(report_file)
+    except (OSError, ValueError) as error:
+        raise InvalidReportError(f"Cannot read the report {report_path}: {error}") from error
+
+    if not isinstance(report, dict):
+        raise InvalidReportError(f"Invalid report {report_path}")
+
+    return report
+
+
+def is_batch_report(report: dict) -> bool:
+    """
+    Check if a JSON report contains the results of a batch of submissions.
+
+    :param report: The contents of the report.
+    :return: True for batch reports, False for reports of a single submission.
+    """
+    return "submissions" in report
+
+
+class Rescorer:
+    """Recomputes the scores of previous results with the scoring of a configuration."""
+
+    def __init__(self, config_path: Optional[str]):
+        """
+        Build the checks of the configuration, without running them.
+
+        :param config_path: Path to the configuration file with the new scoring.
+        :raises InvalidConfigError: If the configuration is missing or invalid.
+        """
+        if config_path is None:
+            raise InvalidConfigError("No configuration source provided")
+
+        config = load_config(config_path)
+
+        # The project root is never read, the checks only score metrics
+        non_venv_checks, venv_checks = create_checks(config, ".")
+        self.__checks = [check for check in non_venv_checks + venv_checks if isinstance(check, ScoredCheck)]
+
+    def rescore(self, results: list[CheckResult]) -> list[CheckResult]:
+        """
+        Recompute the scores of the results of a single submission.
+
+        Each scored result is rescored by the next check with the same name in the configuration.
+        Results without such a check, and results which cannot be rescored, keep their score.
+
+        :param results: The previous results.
+        :return: The results, with the new scores.
+        """
+        pending = list(self.__checks)
+        rescored_results = []
+
+        for result in results:
+            check = next((check for check in pending if check.name == result.name), None)
+
+            if not isinstance(result, ScoredCheckResult) or check is None:
+                rescored_results.append(result)
+                continue
+
+            pending.remove(check)
+
+            try:
+                rescored_results.append(check.rescore(result))
+            except CheckError as error:
+                logger.error("Cannot rescore %s: %s", result.name, error)
+                rescored_results.append(replace(result, error=str(error)))
+
+        return rescored_results
+
+    def rescore_report(self, report: dict) -> list[CheckResult]:
+        """
+        Recompute the scores of the JSON report of a single submission.
+
+        :param report: The contents of the report.
+        :raises InvalidReportError: If the report is invalid.
+        :return: The results, with the new scores.
+        """
+        try:
+            return self.rescore(results_from_json(report))
+        except (KeyError, TypeError) as error:
+            raise InvalidReportError(f"Invalid report: {error}") from error
+
+    def rescore_batch_report(self, report: dict) -> dict[str, list[CheckResult]]:
+        """
+        Recompute the scores of the JSON report of a batch.
+
+        :param report: The contents of the report.
+        :raises InvalidReportError: If the report is invalid.
+        :return: A mapping of submission id to the results of its checks, with the new scores.
+        """
+        try:
+            submissions = dict(report["submissions"])
+        except (KeyError, TypeError, ValueError) as error:
+            raise InvalidReportError(f"Invalid batch report: {error}") from error
+
+        return {
+            submission_id: self.rescore_report(submission_report)
+            for submission_id, submission_report in submissions.items()
+        }
@@ -0,0 +1,949 @@
+"""
+Module containing the GradingServer class.
+
+Keeps a pool of warm worker processes and grades the jobs submitted over a local HTTP API,
+served on a TCP port or on a Unix socket. Each worker imports the grader and loads the configuration once,
+so a job only pays for its own checks. The progress of each job (every finished stage, e.g. each check)
+is streamed as newline-delimited JSON, and its report is the same JSON as the one of JSONResultsReporter.
+
+Endpoints:
+    GET  /health             - The state of the server.
+    POST /jobs               - Submit a job. Either a JSON object with a "project_path" (and optional "student_id",
+                               "config" and "verbose"), or a zip archive of the project
+                               (Content-Type: application/zip, with the same options as query parameters).
+    GET  /jobs/<id>          - The status of a job, with its report once finished.
+    GET  /jobs/<id>/events   - Stream the events of a job until it finishes.
+    GET  /jobs/<id>/result   - Wait for a job to finish and return its report.
+"""
+
+import copy
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import signal
+import socketserver
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from functools import partial
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing.queues import SimpleQueue
+from typing import Any, Iterator, Optional
+from urllib.parse import parse_qs, urlparse
+
+import grader.utils.constants as const
+from grader.batch import _initialize_worker
+from grader.exceptions import GraderError, InvalidConfigError, InvalidProjectRootError
+from grader.grader import Grader
+from grader.utils.config import load_config
+from grader.utils.instrumentation import Instrumentation, StageMetrics
+from grader.utils.job_queue import JobQueue, JobResultsCache, QueuedJob, is_transient_error
+from grader.utils.logger import setup_logger
+from grader.utils.results_reporter import JSONResultsReporter
+
+logger = logging.getLogger("grader")
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_FINISHED = "finished"
+JOB_FAILED = "failed"
+JOB_RETRYING = "retrying"
+
+# The JSON report of a job, or the error of a transient failure
+GradedJob = tuple[Optional[str], Optional[str]]
+
+# Set in each worker process by _initialize_server_worker
+_events: Optional[SimpleQueue[Optional[dict[str, Any]]]] = None
+# The configurations loaded by the current worker process, keyed by path, with the modification time of the file
+_configs: dict[str, tuple[int, dict]] = {}
+
+
+@dataclass
+class Job:
+    """A grading job submitted to the server."""
+
+    id: str
+    project_path: str
+    config_path: str
+    student_id: Optional[str] = None
+    verbose: bool = False
+    is_upload: bool = False
+    status: str = JOB_QUEUED
+    events: list[dict[str, Any]] = field(default_factory=list)
+    report: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def is_finished(self) -> bool:
+        """
+        Check if the job is finished, successfully or not.
+
+        :returns: True if the job finished or failed, False if it is queued or running.
+        :rtype: bool
+        """
+        return self.status in (JOB_FINISHED, JOB_FAILED)
+
+    @staticmethod
+    def from_queued_job(queued_job: QueuedJob, default_config_path: str) -> "Job":
+        """
+        Build a job from a job recorded in the job queue, with the report of its results if it is finished.
+
+        :param queued_job: The recorded job.
+        :param default_config_path: The configuration of the jobs which do not specify one.
+        :return: The job.
+        """
+        options = queued_job.options
+        job = Job(
+            queued_job.id,
+            queued_job.path,
+            options.get("config") or default_config_path,
+            options.get("student_id"),
+            bool(options.get("verbose", False)),
+            bool(options.get("is_upload", False)),
+        )
+
+        if queued_job.is_finished and queued_job.results is not None:
+            job.status = JOB_FINISHED
+            job.report = JSONResultsReporter().to_string(queued_job.results, job.verbose)
+        elif queued_job.is_finished:
+            job.status = JOB_FAILED
+            job.error = queued_job.error
+
+        return job
+
+    def to_json(self) -> dict[str, Any]:
+        """
+        Convert the status of the job to a JSON-compatible dictionary.
+
+        :return: The id, status and student id of the job, with its report or error once finished.
+        """
+        return {
+            "id": self.id,
+            "status": self.status,
+            "student_id": self.student_id,
+            "report": json.loads(self.report) if self.report is not None else None,
+            "error": self.error,
+        }
+
+
+class GradingServer:
+    """Grades the submitted jobs in a pool of warm worker processes, and tracks their progress."""
+
+    def __init__(
+        self,
+        config_path: Optional[str],
+        jobs: Optional[int] = None,
+        verbosity: int = 0,
+        is_keeping_venv: bool = False,
+        is_skipping_venv_creation: bool = False,
+        is_collecting_timings: bool = False,
+        queue_path: Optional[str] = None,
+    ):
+        """
+        Initialize the server. The workers are started by start.
+
+        :param config_path: The configuration of the jobs which do not specify one, preloaded by every worker.
+        :param jobs: The amount of worker processes. Defaults to the amount of CPUs.
+        :param verbosity: The verbosity of the per-job loggers.
+        :param is_keeping_venv: Whether to keep the virtual environments after grading.
+        :param is_skipping_venv_creation: Whether to skip virtual environment creation.
+        :param is_collecting_timings: Whether to add the time and resources used by each stage to the reports.
+        :param queue_path: Optional job queue recording the jobs. A server restarted on the same queue resumes
+                           the unfinished jobs and still knows the finished ones, and transient failures are retried.
+        :raises InvalidConfigError: If no configuration is given.
+        """
+        if config_path is None:
+            raise InvalidConfigError("The grading server needs a configuration file")
+
+        self.__config_path = config_path
+        self.__jobs = jobs or os.cpu_count() or 1
+        self.__verbosity = verbosity
+        self.__is_keeping_venv = is_keeping_venv
+        self.__is_skipping_venv_creation = is_skipping_venv_creation
+        self.__is_collecting_timings = is_collecting_timings
+
+        self.__root = os.path.join(const.WORK_DIR, "server")
+        self.__queue_path = queue_path
+        self.__queue: Optional[JobQueue] = None
+        # The uploaded archives of the queued jobs must survive a restart of the server
+        self.__uploads_dir = f"{queue_path}.uploads" if queue_path is not None else os.path.join(self.__root, "uploads")
+        self.__retries: set[threading.Timer] = set()
+        # Workers are started from a clean process, as forking the threads of the server is unsafe
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self.__context = multiprocessing.get_context(start_method)
+        self.__events: SimpleQueue[Optional[dict[str, Any]]] = self.__context.SimpleQueue()
+        self.__executor: Optional[ProcessPoolExecutor] = None
+        self.__executor_lock = threading.Lock()
+        self.__listener: Optional[threading.Thread] = None
+
+        self.__jobs_by_id: OrderedDict[str, Job] = OrderedDict()
+        self.__condition = threading.Condition()
+
+    @property
+    def workers(self) -> int:
+        """
+        Get the amount of worker processes.
+
+        :returns: The amount of jobs graded in parallel.
+        :rtype: int
+        """
+        return self.__jobs
+
+    def start(self) -> None:
+        """
+        Load the configuration, and start the workers and the thread collecting the progress of the jobs.
+
+        :raises InvalidConfigError: If the default configuration cannot be loaded.
+        :raises JobQueueError: If the job queue cannot be opened.
+        """
+        # Fails early on a broken configuration, instead of failing every job
+        load_config(self.__config_path)
+        os.makedirs(self.__uploads_dir, exist_ok=True)
+
+        if self.__queue_path is not None:
+            self.__queue = JobQueue(self.__queue_path)
+            self.__queue.requeue_interrupted()
+
+        self.__listener = threading.Thread(target=self.__collect_events, name="grading-events", daemon=True)
+        self.__listener.start()
+
+        self.__executor = self.__create_executor()
+        # Starts every worker now, so the first jobs do not wait for the workers to import the grader
+        warm_ups = [self.__executor.submit(_warm_up_worker) for _ in range(self.__jobs)]
+        for warm_up in warm_ups:
+            warm_up.result()
+
+        logger.info("Started %d grading workers", self.__jobs)
+
+        if self.__queue is not None:
+            self.__restore_jobs(self.__queue)
+
+    def stop(self) -> None:
+        """Stop the workers, waiting for the running jobs. With a job queue, the next server resumes the other jobs."""
+        with self.__condition:
+            for retry in self.__retries:
+                retry.cancel()
+            self.__retries.clear()
+
+        with self.__executor_lock:
+            executor, self.__executor = self.__executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        if self.__listener is not None:
+            self.__events.put(None)
+            self.__listener.join()
+            self.__listener = None
+
+        if self.__queue is not None:
+            self.__queue.close()
+            self.__queue = None
+
+        shutil.rmtree(self.__root, ignore_errors=True)
+
+    def submit(
+        self,
+        project_path: str,
+        student_id: Optional[str] = None,
+        config_path: Optional[str] = None,
+        verbose: bool = False,
+        is_upload: bool = False,
+    ) -> Job:
+        """
+        Queue a job to grade a project.
+
+        :param project_path: The path to the project directory or zip archive.
+        :param student_id: The student's id, used as the run id.
+        :param config_path: The configuration of the job. Defaults to the configuration of the server.
+        :param verbose: Whether to include the info and error fields in the report.
+        :param is_upload: Whether the project is an uploaded archive, removed once graded.
+                          Only the archives stored by save_upload are removed.
+        :raises InvalidProjectRootError: If the project does not exist.
+        :return: The queued job.
+        """
+        if not os.path.exists(project_path):
+            raise InvalidProjectRootError(f"Project path does not exist: {project_path}")
+
+        is_upload = is_upload and self.__is_saved_upload(project_path)
+
+        job = Job(uuid.uuid4().hex, project_path, config_path or self.__config_path, student_id, verbose, is_upload)
+
+        if self.__queue is not None:
+            options = {"config": job.config_path, "student_id": student_id, "verbose": verbose, "is_upload": is_upload}
+            self.__queue.add(job.id, project_path, options)
+
+        self.__enqueue(job)
+
+        logger.info("Queued job %s for %s", job.id, student_id or project_path)
+        return job
+
+    def save_upload(self, content: bytes) -> str:
+        """
+        Store an uploaded project archive until it is graded.
+
+        :param content: The content of the zip archive.
+        :return: The path to the stored archive.
+        """
+        path = os.path.join(self.__uploads_dir, f"{uuid.uuid4().hex}.zip")
+
+        with open(path, "wb") as archive:
+            archive.write(content)
+
+        return path
+
+    def __is_saved_upload(self, project_path: str) -> bool:
+        """
+        Check if a project is an archive stored by save_upload, so the server may remove it.
+
+        :param project_path: The path to the project.
+        :return: True if the project is in the uploads directory of the server.
+        """
+        uploads_dir = os.path.realpath(self.__uploads_dir)
+        return os.path.dirname(os.path.realpath(project_path)) == uploads_dir
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        """
+        Get a job by its id.
+
+        :param job_id: The id of the job.
+        :return: The job, or None if it is unknown or was forgotten.
+        """
+        with self.__condition:
+            return self.__jobs_by_id.get(job_id)
+
+    def describe(self, job: Job) -> dict[str, Any]:
+        """
+        Get the status of a job, consistent with its report.
+
+        :param job: The job.
+        :return: The status of the job, as returned by the API.
+        """
+        with self.__condition:
+            return job.to_json()
+
+    def iter_events(self, job: Job) -> Iterator[dict[str, Any]]:
+        """
+        Iterate over the events of a job, waiting for new ones until the job finishes.
+
+        :param job: The job.
+        :return: The events, from the queueing of the job to its final "finished" or "failed" event.
+        """
+        index = 0
+
+        while True:
+            with self.__condition:
+                self.__condition.wait_for(lambda: len(job.events) > index)
+                events = job.events[index:]
+                is_finished = job.is_finished
+
+            index += len(events)
+            yield from events
+
+            if is_finished:
+                return
+
+    def wait(self, job: Job) -> Job:
+        """
+        Wait for a job to finish.
+
+        :param job: The job.
+        :return: The finished job.
+        """
+        with self.__condition:
+            self.__condition.wait_for(lambda: job.is_finished)
+
+        return job
+
+    def get_health(self) -> dict[str, Any]:
+        """
+        Get the state of the server.
+
+        :return: The version of the grader, the amount of workers, and the amount of jobs in each status.
+        """
+        with self.__condition:
+            statuses = [job.status for job in self.__jobs_by_id.values()]
+
+        return {
+            "status": "ok",
+            "version": const.VERSION,
+            "workers": self.__jobs,
+            "jobs": {status: statuses.count(status) for status in (JOB_QUEUED, JOB_RUNNING, JOB_FINISHED, JOB_FAILED)},
+        }
+
+    def __enqueue(self, job: Job, delay: float = 0.0) -> None:
+        """
+        Track a job and submit it to the workers, now or after a delay.
+
+        :param job: The job.
+        :param delay: The delay before submitting the job, in seconds, e.g. before retrying it.
+        """
+        with self.__condition:
+            self.__jobs_by_id[job.id] = job
+            job.events.append({"job": job.id, "event": JOB_QUEUED})
+
+        self.__schedule(job, delay)
+
+    def __schedule(self, job: Job, delay: float) -> None:
+        """
+        Submit a tracked job to the workers, now or after a delay.
+
+        :param job: The job.
+        :param delay: The delay before submitting the job, in seconds.
+        """
+        if delay <= 0:
+            self.__submit_tracked_job(job)
+            return
+
+        retry = threading.Timer(delay, self.__submit_tracked_job, (job,))
+        retry.daemon = True
+
+        with self.__condition:
+            self.__retries.add(retry)
+
+        retry.start()
+
+    def __submit_tracked_job(self, job: Job) -> None:
+        """
+        Submit a tracked job to the workers, and handle its outcome once it is done.
+
+        :param job: The job.
+        """
+        with self.__condition:
+            self.__retries = {retry for retry in self.__retries if retry.is_alive()}
+
+        future = self.__submit_job(job)
+        future.add_done_callback(lambda future: self.__on_job_done(job, future))
+
+    def __restore_jobs(self, queue: JobQueue) -> None:
+        """
+        Restore the jobs recorded in the queue by a previous run of the server, resuming the unfinished ones.
+
+        :param queue: The job queue.
+        """
+        queued_jobs = queue.get_jobs()
+        finished_jobs = [queued_job for queued_job in queued_jobs if queued_job.is_finished]
+        unfinished_jobs = [queued_job for queued_job in queued_jobs if not queued_job.is_finished]
+
+        for queued_job in finished_jobs[-const.SERVER_MAX_FINISHED_JOBS :]:
+            job = Job.from_queued_job(queued_job, self.__config_path)
+
+            final_event: dict[str, Any] = {"job": job.id, "event": job.status, "error": job.error}
+            if job.report is not None:
+                final_event["report"] = json.loads(job.report)
+
+            with self.__condition:
+                self.__jobs_by_id[job.id] = job
+                job.events.append(final_event)
+
+        for queued_job in unfinished_jobs:
+            job = Job.from_queued_job(queued_job, self.__config_path)
+            # The recorded options are not trusted to remove a file the server did not store
+            job.is_upload = job.is_upload and self.__is_saved_upload(job.project_path)
+            self.__enqueue(job, queued_job.next_attempt_at - time.time())
+
+        if unfinished_jobs:
+            logger.info("Resuming %d unfinished jobs", len(unfinished_jobs))
+
+    def __create_executor(self) -> ProcessPoolExecutor:
+        """
+        Create the pool of worker processes.
+
+        :return: The pool, with the workers preloading the default configuration.
+        """
+        return ProcessPoolExecutor(
+            max_workers=self.__jobs,
+            mp_context=self.__context,
+            initializer=_initialize_server_worker,
+            initargs=(os.path.join(self.__root, "workers"), self.__events, self.__config_path),
+        )
+
+    def __submit_job(self, job: Job) -> Future[GradedJob]:
+        """
+        Submit a job to the workers, replacing the pool if a worker died.
+
+        :param job: The job.
+        :raises RuntimeError: If the server is not started.
+        :return: The future of the report of the job.
+        """
+        grade = partial(
+            _grade_job,
+            self.__queue_path,
+            job.id,
+            job.project_path,
+            job.student_id,
+            job.config_path,
+            job.verbose,
+            self.__verbosity,
+            self.__is_keeping_venv,
+            self.__is_skipping_venv_creation,
+            self.__is_collecting_timings,
+        )
+
+        with self.__executor_lock:
+            if self.__executor is None:
+                raise RuntimeError("The grading server is not started")
+
+            try:
+                return self.__executor.submit(grade)
+            except BrokenProcessPool:
+                # The jobs running on the broken pool fail, the next ones get a new pool
+                logger.error("A grading worker died, restarting the workers")
+                self.__executor.shutdown(wait=False, cancel_futures=True)
+                self.__executor = self.__create_executor()
+                return self.__executor.submit(grade)
+
+    def __on_job_done(self, job: Job, future: Future[GradedJob]) -> None:
+        """
+        Send the final event of a job once its worker is done with it, or retry it after a transient failure.
+
+        The event goes through the events queue, after the progress events the worker sent.
+
+        :param job: The job.
+        :param future: The future of the report of the job.
+        """
+        try:
+            report, transient_error = future.result()
+        except CancelledError:
+            # The server is stopping, the job stays in the job queue, if any
+            return
+        except BrokenProcessPool as error:
+            report, transient_error = None, f"The grading worker died: {error}"
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            report, transient_error = None, None
+            event = {"job": job.id, "event": JOB_FAILED, "error": str(error) or type(error).__name__}
+            if self.__queue is not None:
+                self.__queue.fail(job.id, event["error"], is_transient=False)
+
+        if report is not None:
+            event = {"job": job.id, "event": JOB_FINISHED, "report": report}
+        elif transient_error is not None:
+            event = {"job": job.id, "event": JOB_FAILED, "error": transient_error}
+
+            if self.__queue is not None and self.__queue.fail(job.id, transient_error, is_transient=True):
+                queued_job = self.__queue.get(job.id)
+                delay = queued_job.next_attempt_at - time.time() if queued_job is not None else 0.0
+                self.__events.put({"job": job.id, "event": JOB_RETRYING, "error": transient_error, "delay": delay})
+                self.__schedule(job, delay)
+                return
+
+        if job.is_upload and os.path.exists(job.project_path):
+            os.remove(job.project_path)
+
+        self.__events.put(event)
+
+    def __collect_events(self) -> None:
+        """Add the events sent by the workers to their jobs, until the server stops."""
+        while (event := self.__events.get()) is not None:
+            with self.__condition:
+                job = self.__jobs_by_id.get(event["job"])
+                if job is None:
+                    continue
+
+                match event["event"]:
+                    case "started":
+                        job.status = JOB_RUNNING
+                    case "retrying":
+                        job.status = JOB_QUEUED
+                    case "finished":
+                        job.status = JOB_FINISHED
+                        job.report = event["report"]
+                        event = {**event, "report": json.loads(job.report)}
+                        logger.info("Finished job %s", job.id)
+                    case "failed":
+                        job.status = JOB_FAILED
+                        job.error = event["error"]
+                        logger.error("Job %s failed: %s", job.id, job.error)
+
+                job.events.append(event)
+                self.__forget_old_jobs()
+                self.__condition.notify_all()
+
+    def __forget_old_jobs(self) -> None:
+        """Forget the oldest finished jobs, beyond the amount of finished jobs kept."""
+        finished = [job_id for job_id, job in self.__jobs_by_id.items() if job.is_finished]
+
+        for job_id in finished[: max(0, len(finished) - const.SERVER_MAX_FINISHED_JOBS)]:
+            del self.__jobs_by_id[job_id]
+
+
+class _ProgressInstrumentation(Instrumentation):
+    """Sends an event for every finished stage of a job, on top of collecting its metrics."""
+
+    def __init__(self, job_id: str) -> None:
+        """
+        Initialize the instrumentation.
+
+        :param job_id: The id of the job the stages belong to.
+        """
+        super().__init__()
+        self.__job_id = job_id
+
+    def add(self, metrics: StageMetrics) -> None:
+        """
+        Add the metrics of a finished stage and report its progress.
+
+        :param metrics: The metrics of the stage.
+        """
+        super().add(metrics)
+        _send_event(self.__job_id, "stage", name=metrics.name, wall_time=metrics.wall_time)
+
+
+def _send_event(job_id: str, event: str, **fields: Any) -> None:
+    """
+    Send an event of a job from a worker to the server.
+
+    :param job_id: The id of the job.
+    :param event: The kind of event, e.g. "started" or "stage".
+    :param fields: The fields of the event.
+    """
+    if _events is not None:
+        _events.put({"job": job_id, "event": event, **fields})
+
+
+def _initialize_server_worker(
+    workers_root: str, events: SimpleQueue[Optional[dict[str, Any]]], config_path: str
+) -> None:
+    """
+    Prepare a worker process: point its working directories to a private location and preload the configuration.
+
+    :param workers_root: The directory under which each worker gets its own subdirectory.
+    :param events: The queue of the events sent to the server.
+    :param config_path: The default configuration of the jobs.
+    """
+    global _events  # pylint: disable=global-statement
+
+    # Ctrl+C reaches the whole process group, the server stops the workers once the running jobs finish
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _initialize_worker(workers_root)
+    _events = events
+
+    try:
+        _get_config(config_path)
+    except GraderError as error:
+        # The jobs using this configuration fail with the same error
+        logger.error("Cannot preload the configuration %s: %s", config_path, error)
+
+
+def _warm_up_worker() -> int:
+    """
+    Do nothing, so that a worker process gets started.
+
+    :return: The id of the worker process.
+    """
+    return os.getpid()
+
+
+def _get_config(config_path: str) -> dict:
+    """
+    Get a configuration, loaded once by the current worker process. Files are loaded again when they change.
+
+    :param config_path: Path, URL or Cove URI to the configuration file.
+    :return: A copy of the configuration, which the grading can modify.
+    """
+    modification_time = os.stat(config_path).st_mtime_ns if os.path.isfile(config_path) else 0
+    cached = _configs.get(config_path)
+
+    if cached is None or cached[0] != modification_time:
+        cached = (modification_time, load_config(config_path))
+        _configs[config_path] = cached
+
+    return copy.deepcopy(cached[1])
+
+
+def _grade_job(
+    queue_path: Optional[str],
+    job_id: str,
+    project_path: str,
+    student_id: Optional[str],
+    config_path: str,
+    verbose: bool,
+    verbosity: int,
+    is_keeping_venv: bool,
+    is_skipping_venv_creation: bool,
+    is_collecting_timings: bool,
+) -> GradedJob:
+    """
+    Grade a job inside a worker process, reporting its progress.
+
+    With a job queue, the result of each check is recorded in it, and the checks recorded by a previous attempt
+    are not run again.
+
+    :param queue_path: Optional path to the job queue.
+    :param job_id: The id of the job.
+    :param project_path: The path to the project directory or zip archive.
+    :param student_id: The student's id, used as the run id.
+    :param config_path: The configuration of the job.
+    :param verbose: Whether to include the info and error fields in the report.
+    :param verbosity: The verbosity of the logger.
+    :param is_keeping_venv: Whether to keep the virtual environment after grading.
+    :param is_skipping_venv_creation: Whether to skip virtual environment creation.
+    :param is_collecting_timings: Whether to add the time and resources used by each stage to the report.
+    :raises GraderError: If the grading fails for a reason which is not transient.
+    :return: The JSON report of the job, or the error if the grading failed for a transient reason.
+    """
+    _send_event(job_id, "started", worker=os.getpid())
+    run_id = student_id or job_id
+    log = setup_logger(run_id, verbosity=verbosity, suppress_info=True)
+    work_directory = os.path.join(const.WORK_DIR, job_id)
+
+    with (
+        JobQueue(queue_path) if queue_path is not None else nullcontext() as queue,
+        _ProgressInstrumentation(job_id) as instrumentation,
+    ):
+        try:
+            config = _get_config(config_path)
+            grader = Grader(
+                run_id,
+                project_path,
+                log,
+                config_path=config_path,
+                is_keeping_venv=is_keeping_venv,
+                is_skipping_venv_creation=is_skipping_venv_creation,
+                work_directory=work_directory,
+                # The checks are measured for the progress events, even if the report has no timings
+                is_collecting_timings=True,
+                config=config,
+                results_cache=JobResultsCache(queue, job_id, config) if queue is not None else None,
+            )
+            check_results = grader.grade()
+        except GraderError as error:
+            if not is_transient_error(error):
+                raise
+
+            log.warning("Grading %s failed for a transient reason: %s", job_id, error)
+            return None, str(error)
+        finally:
+            shutil.rmtree(work_directory, ignore_errors=True)
+
+        if queue is not None:
+            queue.complete(job_id, check_results)
+
+    timings = instrumentation.stages if is_collecting_timings else None
+    return JSONResultsReporter().to_string(check_results, verbose, timings), None
+
+
+class GradingRequestHandler(BaseHTTPRequestHandler):
+    """Handles the requests to the HTTP API of a grading server."""
+
+    server: "GradingHTTPServer | GradingUnixServer"
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Handle the GET requests: the health of the server, and the status, events and result of the jobs."""
+        parts = urlparse(self.path).path.strip("/").split("/")
+        grading_server = self.server.grading_server
+
+        if parts == ["health"]:
+            self.__send_json(HTTPStatus.OK, grading_server.get_health())
+            return
+
+        if len(parts) not in (2, 3) or parts[0] != "jobs":
+            self.__send_error(HTTPStatus.NOT_FOUND, f"Unknown endpoint: {self.path}")
+            return
+
+        job = grading_server.get_job(parts[1])
+        if job is None:
+            self.__send_error(HTTPStatus.NOT_FOUND, f"Unknown job: {parts[1]}")
+            return
+
+        match parts[2:]:
+            case []:
+                self.__send_json(HTTPStatus.OK, grading_server.describe(job))
+            case ["events"]:
+                self.__stream_events(grading_server, job)
+            case ["result"]:
+                self.__send_result(grading_server.wait(job))
+            case _:
+                self.__send_error(HTTPStatus.NOT_FOUND, f"Unknown endpoint: {self.path}")
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """Handle the submission of a job, by the path to the project or with its zip archive in the body."""
+        url = urlparse(self.path)
+        if url.path.rstrip("/") != "/jobs":
+            self.__send_error(HTTPStatus.NOT_FOUND, f"Unknown endpoint: {self.path}")
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > const.SERVER_MAX_UPLOAD_SIZE:
+            self.__send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "The submission is too large")
+            return
+
+        body = self.rfile.read(length)
+        grading_server = self.server.grading_server
+
+        # Only the archives uploaded in the body are removed once graded, never a path chosen by the client
+        is_upload = self.headers.get_content_type() == "application/zip"
+
+        try:
+            if is_upload:
+                options: dict[str, Any] = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                options["project_path"] = grading_server.save_upload(body)
+                options["verbose"] = options.get("verbose", "false").lower() in ("1", "true")
+            else:
+                options = json.loads(body)
+                if not isinstance(options, dict) or not isinstance(options.get("project_path"), str):
+                    raise TypeError("expected a JSON object with a project_path")
+
+            job = grading_server.submit(
+                options["project_path"],
+                student_id=options.get("student_id"),
+                config_path=options.get("config"),
+                verbose=bool(options.get("verbose", False)),
+                is_upload=is_upload,
+            )
+        except (json.JSONDecodeError, TypeError, KeyError) as error:
+            self.__send_error(HTTPStatus.BAD_REQUEST, f"Invalid job: {error}")
+            return
+        except GraderError as error:
+            self.__send_error(HTTPStatus.BAD_REQUEST, str(error))
+            return
+
+        self.__send_json(HTTPStatus.ACCEPTED, grading_server.describe(job))
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        """
+        Log a request to the grader log. Unix socket clients have no address.
+
+        :param format: The format of the message.
+        :param args: The arguments of the message.
+        """
+        logger.debug("%s %s", self.command, format % args)
+
+    def __stream_events(self, grading_server: "GradingServer", job: Job) -> None:
+        """
+        Stream the events of a job as newline-delimited JSON, until it finishes.
+
+        :param grading_server: The grading server.
+        :param job: The job.
+        """
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+
+        try:
+            for event in grading_server.iter_events(job):
+                self.wfile.write(json.dumps(event).encode("utf-8") + b"\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            logger.debug("Client stopped following job %s", job.id)
+
+    def __send_result(self, job: Job) -> None:
+        """
+        Send the report of a finished job, as written by JSONResultsReporter, or its error.
+
+        :param job: The finished job.
+        """
+        if job.report is None:
+            self.__send_error(HTTPStatus.INTERNAL_SERVER_ERROR, job.error or "Grading failed")
+            return
+
+        self.__send_body(HTTPStatus.OK, job.report.encode("utf-8"))
+
+    def __send_json(self, status: HTTPStatus, content: dict[str, Any]) -> None:
+        """
+        Send a JSON response.
+
+        :param status: The status of the response.
+        :param content: The content of the response.
+        """
+        self.__send_body(status, json.dumps(content, indent=4).encode("utf-8"))
+
+    def __send_error(self, status: HTTPStatus, message: str) -> None:
+        """
+        Send an error as a JSON response.
+
+        :param status: The status of the response.
+        :param message: The error message.
+        """
+        self.__send_json(status, {"error": message})
+
+    def __send_body(self, status: HTTPStatus, body: bytes) -> None:
+        """
+        Send a JSON body.
+
+        :param status: The status of the response.
+        :param body: The encoded JSON body.
+        """
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class GradingHTTPServer(ThreadingHTTPServer):
+    """Serves the API of a grading server on a TCP port."""
+
+    def __init__(self, address: tuple[str, int], grading_server: GradingServer) -> None:
+        """
+        Initialize the HTTP server.
+
+        :param address: The host and port to listen on.
+        :param grading_server: The grading server handling the jobs.
+        """
+        self.grading_server = grading_server
+        super().__init__(address, GradingRequestHandler)
+
+
+class GradingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves the API of a grading server on a Unix socket."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, grading_server: GradingServer) -> None:
+        """
+        Initialize the Unix socket server, replacing a socket left behind by a previous server.
+
+        :param socket_path: The path of the socket.
+        :param grading_server: The grading server handling the jobs.
+        """
+        self.grading_server = grading_server
+
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+        super().__init__(socket_path, GradingRequestHandler)
+
+
+def serve(
+    grading_server: GradingServer,
+    host: str = const.DEFAULT_SERVER_HOST,
+    port: int = const.DEFAULT_SERVER_PORT,
+    socket_path: Optional[str] = None,
+) -> None:
+    """
+    Start a grading server and serve its API until interrupted.
+
+    :param grading_server: The grading server.
+    :param host: The host to listen on.
+    :param port: The port to listen on.
+    :param socket_path: A Unix socket to listen on, instead of the host and port.
+    """
+    grading_server.start()
+
+    try:
+        if socket_path is not None:
+            http_server: GradingHTTPServer | GradingUnixServer = GradingUnixServer(socket_path, grading_server)
+            logger.info("Serving on %s", socket_path)
+        else:
+            http_server = GradingHTTPServer((host, port), grading_server)
+            logger.info("Serving on http://%s:%d", host, http_server.server_port)
+
+        with http_server:
+            try:
+                http_server.serve_forever()
+            except KeyboardInterrupt:
+                logger.info("Stopping the grading server")
+    finally:
+        grading_server.stop()
+
+        if socket_path is not None and os.path.exists(socket_path):
+            os.remove(socket_path)
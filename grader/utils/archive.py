@@ -0,0 +1,228 @@
+"""
+Module containing the zip extraction engine.
+
+Archives are checked against the extraction limits before anything is written, and the members are streamed to the
+disk while counting their bytes, so archives declaring false sizes are stopped too.
+"""
+
+import logging
+import os
+import shutil
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+import grader.utils.constants as const
+from grader.exceptions import ArchiveError, InvalidConfigError
+from grader.utils.project_index import is_ignored_directory
+
+logger = logging.getLogger("grader")
+
+
+@dataclass(frozen=True)
+class ExtractionLimits:
+    """Class representing the limits for extracting an archive. None disables a limit."""
+
+    max_total_size: Optional[int] = const.DEFAULT_ARCHIVE_MAX_TOTAL_SIZE
+    max_entries: Optional[int] = const.DEFAULT_ARCHIVE_MAX_ENTRIES
+    max_compression_ratio: Optional[float] = const.DEFAULT_ARCHIVE_MAX_COMPRESSION_RATIO
+
+    @staticmethod
+    def from_dict(raw_object: dict) -> "ExtractionLimits":
+        """
+        Parse the archive section of the configuration into extraction limits.
+
+        :param raw_object: The archive section of the configuration.
+        :type raw_object: dict
+        :raises InvalidConfigError: If a limit is not a positive number or null.
+        :return: The extraction limits, with the defaults for the limits which are not set.
+        :rtype: ExtractionLimits
+        """
+        limits = {}
+
+        for key in ("max_total_size", "max_entries", "max_compression_ratio"):
+            if key not in raw_object:
+                continue
+
+            value = raw_object[key]
+            is_valid_number = isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+
+            if value is not None and not is_valid_number:
+                raise InvalidConfigError(f"archive.{key} must be a positive number or null")
+
+            limits[key] = value
+
+        return ExtractionLimits(**limits)
+
+
+def is_safe_member_name(name: str) -> bool:
+    """
+    Check if the name of an archive member stays inside the directory the archive is extracted into.
+
+    :param name: The name of the member.
+    :return: True if the name is relative and has no .. components, False otherwise.
+    """
+    normalized = name.replace("\\", "/")
+    return not normalized.startswith("/") and ".." not in normalized.split("/") and ":" not in normalized
+
+
+def is_ignored_member(name: str) -> bool:
+    """
+    Check if an archive member is inside one of IGNORE_DIRS, e.g. __MACOSX or a virtual environment.
+
+    :param name: The name of the member.
+    :return: True if the member is ignored, False otherwise.
+    """
+    parts = name.split("/")[:-1]
+    return any(is_ignored_directory("/".join(parts[: index + 1])) for index in range(len(parts)))
+
+
+def select_members(archive: zipfile.ZipFile, limits: ExtractionLimits) -> list[zipfile.ZipInfo]:
+    """
+    Select the members of an archive to extract, and check them against the extraction limits.
+
+    Members with unsafe names and members inside ignored directories are skipped.
+
+    :param archive: The archive.
+    :param limits: The extraction limits.
+    :raises ArchiveError: If the archive exceeds the extraction limits.
+    :return: The members to extract.
+    """
+    members = [
+        info
+        for info in archive.infolist()
+        if is_safe_member_name(info.filename) and not is_ignored_member(info.filename)
+    ]
+
+    if limits.max_entries is not None and len(members) > limits.max_entries:
+        raise ArchiveError(f"The archive has {len(members)} entries, the limit is {limits.max_entries}")
+
+    total_size = sum(info.file_size for info in members)
+
+    if limits.max_total_size is not None and total_size > limits.max_total_size:
+        raise ArchiveError(f"The archive has {total_size} bytes uncompressed, the limit is {limits.max_total_size}")
+
+    if limits.max_compression_ratio is not None:
+        for info in members:
+            ratio = info.file_size / max(info.compress_size, 1)
+
+            if info.file_size >= const.ARCHIVE_RATIO_MIN_SIZE and ratio > limits.max_compression_ratio:
+                raise ArchiveError(f"{info.filename} has a compression ratio of {ratio:.0f}, which is suspicious")
+
+    return members
+
+
+def extract_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo, target_directory: str) -> None:
+    """
+    Extract a single file of an archive, stopping if it is larger than declared.
+
+    :param archive: The archive.
+    :param info: The member to extract.
+    :param target_directory: The directory to extract the archive into.
+    :raises ArchiveError: If the member is larger than declared in the archive.
+    """
+    path = os.path.join(target_directory, *info.filename.replace("\\", "/").split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    written = 0
+
+    with archive.open(info) as source, open(path, "wb") as destination:
+        while chunk := source.read(const.ARCHIVE_CHUNK_SIZE):
+            written += len(chunk)
+
+            if written > info.file_size:
+                raise ArchiveError(f"{info.filename} is larger than declared in the archive")
+
+            destination.write(chunk)
+
+
+def extract_members(archive_path: str, members: list[zipfile.ZipInfo], target_directory: str) -> None:
+    """
+    Extract files of an archive, opening the archive separately, so that it can run in its own thread.
+
+    :param archive_path: The path to the archive.
+    :param members: The members to extract.
+    :param target_directory: The directory to extract the archive into.
+    :raises ArchiveError: If a member is larger than declared in the archive.
+    """
+    with zipfile.ZipFile(archive_path, "r") as archive:
+        for info in members:
+            extract_member(archive, info, target_directory)
+
+
+def split_by_size(members: list[zipfile.ZipInfo], parts: int) -> list[list[zipfile.ZipInfo]]:
+    """
+    Split the members of an archive into parts of about the same uncompressed size.
+
+    :param members: The members to split.
+    :param parts: The number of parts.
+    :return: The non-empty parts.
+    """
+    buckets: list[list[zipfile.ZipInfo]] = [[] for _ in range(parts)]
+    sizes = [0] * parts
+
+    for info in sorted(members, key=lambda member: member.file_size, reverse=True):
+        smallest = sizes.index(min(sizes))
+        buckets[smallest].append(info)
+        sizes[smallest] += info.file_size
+
+    return [bucket for bucket in buckets if bucket]
+
+
+def extract_archive(
+    archive_path: str,
+    target_directory: str,
+    limits: Optional[ExtractionLimits] = None,
+    jobs: Optional[int] = None,
+) -> None:
+    """
+    Extract a zip archive safely.
+
+    The archive is checked against the limits before anything is written. Members with unsafe names and members
+    inside ignored directories are skipped. If the extraction fails, the files extracted so far are removed.
+
+    :param archive_path: The path to the archive.
+    :param target_directory: The directory to extract the archive into.
+    :param limits: Optional extraction limits, the default limits if not given.
+    :param jobs: Optional number of threads to decompress large archives in (0 - one per CPU).
+                 By default, archives are extracted in a single thread.
+    :raises ArchiveError: If the archive exceeds the extraction limits.
+    :raises zipfile.BadZipFile: If the archive cannot be read.
+    :raises OSError: If the archive cannot be read or the files cannot be written.
+    """
+    with zipfile.ZipFile(archive_path, "r") as archive:
+        members = select_members(archive, limits or ExtractionLimits())
+
+    directories = [info for info in members if info.is_dir()]
+    files = [info for info in members if not info.is_dir()]
+    total_size = sum(info.file_size for info in files)
+
+    workers = 1
+    if jobs is not None and total_size >= const.ARCHIVE_PARALLEL_MIN_SIZE:
+        workers = min(jobs or os.cpu_count() or 1, len(files))
+
+    is_new_directory = not os.path.exists(target_directory)
+
+    try:
+        for info in directories:
+            os.makedirs(os.path.join(target_directory, *info.filename.rstrip("/").split("/")), exist_ok=True)
+
+        if workers <= 1:
+            extract_members(archive_path, files, target_directory)
+            return
+
+        logger.debug("Extracting %s in %d threads", archive_path, workers)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(extract_members, archive_path, part, target_directory)
+                for part in split_by_size(files, workers)
+            ]
+
+            for future in futures:
+                future.result()
+    except (ArchiveError, OSError, zipfile.BadZipFile):
+        if is_new_directory:
+            shutil.rmtree(target_directory, ignore_errors=True)
+        raise
@@ -15,6 +15,30 @@ TEMP_FILES_DIR = os.path.join(ROOT_DIR, "temp_files")  # TODO - Change this to b
 
 WORK_DIR = os.path.join("/tmp", "pygrader")
 
+# Scheduling
+DEFAULT_MAX_PARALLEL_CHECKS = os.cpu_count() or 1
+
+# Grading server
+DEFAULT_SERVER_HOST = "127.0.0.1"
+DEFAULT_SERVER_PORT = 8765
+SERVER_MAX_UPLOAD_SIZE = 128 * 1024 * 1024
+SERVER_MAX_FINISHED_JOBS = 1000  # Older finished jobs are forgotten
+
+# Job queue
+DEFAULT_JOB_MAX_ATTEMPTS = 3
+DEFAULT_JOB_RETRY_DELAY = 30.0  # Seconds before the first retry, doubled after each attempt
+JOB_QUEUE_LOCK_TIMEOUT = 30.0  # Seconds to wait for another process writing to the queue
+
+# Subprocesses
+PROCESS_MAX_OUTPUT_SIZE = 32 * 1024 * 1024  # Characters of each output stream kept in memory, half from its start
+PROCESS_MAX_LINE_LENGTH = 64 * 1024  # Longer lines are passed to the line callbacks in pieces
+PROCESS_READ_SIZE = 64 * 1024
+PROCESS_KILL_GRACE_PERIOD = 2  # Seconds the output of a killed command is still read for, by processes which left it
+DEFAULT_CHECK_TIMEOUT = 15 * 60  # Seconds a check running the student's code may take, see the limits of the check
+CGROUP_NAME_PREFIX = "pygrader-"  # Child cgroups are named <prefix><grader pid>-<counter>
+CGROUP_REMOVE_ATTEMPTS = 20  # The killed processes of a cgroup take a moment to leave it
+CGROUP_REMOVE_DELAY = 0.05
+
 # Python
 PYTHON_BIN_WINDOWS = "python.exe"
 PYTHON_BIN_UNIX = "python3"
@@ -44,6 +68,10 @@ MYPY_LINE_COUNT_REPORT = os.path.join(REPORTS_TEMP_DIR, "linecount.txt")
 MYPY_PATH_WINDOWS = os.path.join(VENV_NAME, "Scripts", MYPY_BIN)
 MYPY_PATH_UNIX = os.path.join(VENV_NAME, "bin", MYPY_BIN)
 MYPY_PATH = MYPY_PATH_WINDOWS if os.name == "nt" else MYPY_PATH_UNIX
+# Checks running mypy share its report directory
+MYPY_RESOURCE = "mypy"
+TYPE_HINTS_ENGINE_MYPY = "mypy"
+TYPE_HINTS_ENGINE_AST = "ast"
 
 
 # Pylint constants
@@ -52,6 +80,7 @@ PYLINT_BIN_UNIX = os.path.join("bin", "pylint")
 PYLINT_BIN = PYLINT_BIN_WINDOWS if os.name == "nt" else PYLINT_BIN_UNIX
 PYLINT_PATH = os.path.join(VENV_NAME, PYLINT_BIN)
 PYLINTRC = str(files("config").joinpath("2024.pylintrc"))
+PYLINT_OUTPUT_FORMAT = "json2"
 
 # Pytest constants
 PYTEST_BIN_WINDOWS = "pytest.exe"
@@ -61,10 +90,13 @@ PYTEST_BIN = PYTEST_BIN_WINDOWS if os.name == "nt" else PYTEST_BIN_UNIX
 PYTEST_PATH_WINDOWS = os.path.join(VENV_NAME, "Scripts", PYTEST_BIN)
 PYTEST_PATH_UNIX = os.path.join(VENV_NAME, "bin", PYTEST_BIN)
 PYTEST_PATH = PYTEST_PATH_WINDOWS if os.name == "nt" else PYTEST_PATH_UNIX
-PYTEST_ARGS = ["--no-header", "-r A"]
+PYTEST_ARGS = ["--no-header", "-q", "-o", "junit_family=xunit1"]  # xunit1 reports the file of each test
 PYTEST_ROOT_DIR_ARG = "--rootdir={}"
+PYTEST_JUNIT_XML_ARG = "--junitxml={}"
 
 PYTEST_CACHE = ".pytest_cache"
+# Checks running the project tests share its cache and the files the tests create
+PYTEST_RESOURCE = "pytest"
 
 # Coverage constants
 COVERAGE_BIN_WINDOWS = "coverage.exe"
@@ -95,3 +127,11 @@ IGNORE_DIRS = [
     os.path.join("build", "lib"),
     *POSSIBLE_VENV_DIRS,
 ]
+
+# Archive extraction limits
+DEFAULT_ARCHIVE_MAX_TOTAL_SIZE = 512 * 1024 * 1024
+DEFAULT_ARCHIVE_MAX_ENTRIES = 10_000
+DEFAULT_ARCHIVE_MAX_COMPRESSION_RATIO = 100
+ARCHIVE_RATIO_MIN_SIZE = 1024 * 1024  # Smaller files are not checked for their compression ratio
+ARCHIVE_PARALLEL_MIN_SIZE = 32 * 1024 * 1024  # Smaller archives are always extracted in a single thread
+ARCHIVE_CHUNK_SIZE = 1024 * 1024
@@ -13,8 +13,9 @@ from cove_sdk import BaseItem, JSONItem, PythonItem, fetch_uri, is_cove_uri
 from cove_sdk.exceptions import CoveAPIError, URIParseError
 from dotenv import load_dotenv
 
+import grader.utils.constants as const
 from grader.exceptions import ExternalResourceError
-from grader.utils.constants import TEMP_FILES_DIR
+from grader.utils.instrumentation import measure
 from grader.utils.logger import VERBOSE
 
 logger = logging.getLogger("grader")
@@ -42,6 +43,38 @@ def is_resource_cove(resource_path: str) -> bool:
     return is_cove_uri(resource_path)
 
 
+def download_resource(resource_path: str) -> str:
+    """
+    Download a file if it is a remote or a Cove resource.
+
+    :param resource_path: The path, URL or Cove URI of the file
+    :raises ExternalResourceError: If the file cannot be downloaded
+    :return: The path to the local file
+    """
+    if is_resource_cove(resource_path):
+        return download_python_file_from_cove(resource_path)
+
+    if is_resource_remote(resource_path):
+        return download_file_from_url(resource_path)
+
+    return resource_path
+
+
+def get_local_paths(resource_paths: list[str], base_dir: Optional[str] = None) -> Optional[list[str]]:
+    """
+    Get the paths to files which are all local, without downloading anything.
+
+    :param resource_paths: The paths, URLs or Cove URIs of the files
+    :param base_dir: Optional directory the relative paths are relative to, instead of the working directory
+    :return: The paths to the files, or None if one of them is a remote or a Cove resource
+    """
+    if any(is_resource_cove(path) or is_resource_remote(path) for path in resource_paths):
+        return None
+
+    return [os.path.join(base_dir, path) if base_dir is not None else path for path in resource_paths]
+
+
+@measure("download")
 def download_file_from_url(url: str, filename: Optional[str] = None) -> str:
     """
     Download a file from a URL and save it in temp_files under the pygrader root directory.
@@ -52,11 +85,11 @@ def download_file_from_url(url: str, filename: Optional[str] = None) -> str:
     """
     logger.log(VERBOSE, "Downloading file from %s", url)
 
-    os.makedirs(TEMP_FILES_DIR, exist_ok=True)
+    os.makedirs(const.TEMP_FILES_DIR, exist_ok=True)
 
     if filename is None:
         filename = os.path.basename(urlparse(url).path) or "downloaded_file"
-    file_path = os.path.join(TEMP_FILES_DIR, filename)
+    file_path = os.path.join(const.TEMP_FILES_DIR, filename)
 
     token = os.getenv("github_token")
 
@@ -104,7 +137,7 @@ def download_python_file_from_cove(cove_uri: str, filename: Optional[str] = None
     """
     logger.log(VERBOSE, "Downloading file from Cove URI %s", cove_uri)
 
-    os.makedirs(TEMP_FILES_DIR, exist_ok=True)
+    os.makedirs(const.TEMP_FILES_DIR, exist_ok=True)
 
     result = fetch_from_cove(cove_uri)
 
@@ -114,7 +147,7 @@ def download_python_file_from_cove(cove_uri: str, filename: Optional[str] = None
     if filename is None:
         filename = result.key
 
-    file_path = os.path.join(TEMP_FILES_DIR, f"{filename}.py")
+    file_path = os.path.join(const.TEMP_FILES_DIR, f"{filename}.py")
 
     with open(file_path, "w+", encoding="utf-8") as file:
         file.write(result.python_value)
@@ -140,6 +173,7 @@ def fetch_json_from_cove(cove_uri: str) -> dict:
     return result.json_value
 
 
+@measure("download")
 def fetch_from_cove(cove_uri: str) -> BaseItem:
     """
     Fetch a resource from a cove URI.
@@ -0,0 +1,79 @@
+"""
+Module containing a persistent cache of per-file results.
+
+Each entry is a JSON file named after its key, so the cache can be shared between workers.
+Entries are written atomically and invalid entries are treated as missing.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Callable, Optional, TypeVar
+
+logger = logging.getLogger("grader")
+
+T = TypeVar("T")
+
+
+class FileCache:
+    """Persistent cache of JSON entries, one file per entry."""
+
+    def __init__(self, cache_dir: str, name: str):
+        """
+        Initialize the cache.
+
+        :param cache_dir: The directory where the entries are stored.
+        :param name: The name of the cache, used in the log messages.
+        """
+        self.__cache_dir = cache_dir
+        self.__name = name
+
+    @staticmethod
+    def compute_key(parts: dict[str, Any]) -> str:
+        """
+        Compute the key of an entry.
+
+        :param parts: Everything the entry depends on. The values must be JSON serializable.
+        :return: The key.
+        """
+        content = json.dumps(parts, sort_keys=True)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def load(self, key: str, parse: Callable[[Any], T]) -> Optional[T]:
+        """
+        Load an entry.
+
+        :param key: The key of the entry.
+        :param parse: Builds the result from the JSON entry, raising KeyError or TypeError if the entry is invalid.
+        :return: The result, or None if it is not cached or the entry is invalid.
+        """
+        try:
+            with open(os.path.join(self.__cache_dir, f"{key}.json"), "r", encoding="utf-8") as entry_file:
+                return parse(json.load(entry_file))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as error:
+            logger.warning("Invalid %s cache entry %s: %s", self.__name, key, error)
+            return None
+
+    def store(self, key: str, entry: Any) -> None:
+        """
+        Store an entry. Failing to store is not fatal.
+
+        :param key: The key of the entry.
+        :param entry: The entry. It must be JSON serializable.
+        """
+        entry_path = os.path.join(self.__cache_dir, f"{key}.json")
+        temp_entry_path = f"{entry_path}.tmp-{os.getpid()}-{threading.get_ident()}"
+
+        try:
+            os.makedirs(self.__cache_dir, exist_ok=True)
+
+            with open(temp_entry_path, "w", encoding="utf-8") as entry_file:
+                json.dump(entry, entry_file)
+
+            os.replace(temp_entry_path, entry_path)
+        except OSError as error:
+            logger.warning("Failed to store %s cache entry %s: %s", self.__name, key, error)
@@ -6,62 +6,30 @@ from pathlib import Path
 from typing import Optional
 
 import grader.utils.constants as const
-from grader.utils.structure_validator import StructureValidator
+from grader.utils.archive import extract_archive
+from grader.utils.project_index import ProjectIndex
 
 
-def find_all_python_files(project_root_dir: str) -> list[str]:
+def find_all_python_files(project_root_dir: str, project_index: Optional[ProjectIndex] = None) -> list[str]:
     """
     Find all python files in the project directory.
 
     :param project_root_dir: The path to the project directory
+    :param project_index: Optional index of the project, shared with other checks. If not given, the project is walked
     :return: A list of all python files in the project directory
     """
-    python_structure = StructureValidator(name="Python Files", required=False, patterns=["**/*.py"])
-    python_files = python_structure.get_matching_files(project_root_dir)
-    return [file for file in python_files if all(ignore_path not in file for ignore_path in const.IGNORE_DIRS)]
+    return (project_index or ProjectIndex(project_root_dir)).python_files
 
 
-def find_all_source_files(project_root_dir: str) -> list[str]:
+def find_all_source_files(project_root_dir: str, project_index: Optional[ProjectIndex] = None) -> list[str]:
     """
     Find all source files in the project directory.
 
     :param project_root_dir: The path to the project directory
+    :param project_index: Optional index of the project, shared with other checks. If not given, the project is walked
     :return: A list of all source files in the project directory
     """
-    all_files = find_all_python_files(project_root_dir)
-    tests_directory = get_tests_directory_name(project_root_dir)
-    test_files = find_all_test_files(tests_directory)
-
-    return [file for file in all_files if file not in test_files]
-
-
-def find_all_test_files(tests_directory: Optional[str] = None) -> list[str]:
-    """
-    Find all test files in the project directory.
-
-    :param tests_directory: The tests directory, defaults to None
-    :return: A list of all test files in the project directory. If no tests directory is found, return an empty list
-    """
-    if tests_directory is None:
-        return []
-
-    test_structure = StructureValidator(name="Test Files", required=False, patterns=["**/*.py"])
-    return test_structure.get_matching_files(tests_directory)
-
-
-def get_tests_directory_name(project_root_dir: str) -> Optional[str]:
-    """
-    Check if the project directory contains a tests directory.
-
-    :param project_root_dir: The path to the project directory
-    :returns: The path to the tests directory if found, otherwise None
-    """
-    for possible_directory in const.POSSIBLE_TEST_DIRS:
-        possible_tests_path = os.path.join(project_root_dir, possible_directory)
-        if os.path.exists(possible_tests_path):
-            return possible_tests_path
-
-    return None
+    return (project_index or ProjectIndex(project_root_dir)).source_files
 
 
 def find_all_files_under_directory(directory: str, extension: str) -> list[str]:
@@ -92,16 +60,16 @@ def is_path_zip(path: str) -> bool:
 
 def unzip_archive(archive_path: str, target_directory: Optional[str] = None) -> str:
     """
-    Unzip the archive containing the project.
+    Unzip the archive containing the project, within the default extraction limits.
 
     :param archive_path: The path to the archive to unzip
     :param target_directory: The path to the target directory where the archive will be unzipped.
+    :raises ArchiveError: If the archive exceeds the extraction limits.
     :return: The path to the target directory.
     """
     archive_stem = Path(archive_path).stem
     working_directory = target_directory or os.path.join(const.WORK_DIR, archive_stem)
 
-    with zipfile.ZipFile(archive_path, "r") as zip_ref:
-        zip_ref.extractall(working_directory)
+    extract_archive(archive_path, working_directory)
 
     return working_directory
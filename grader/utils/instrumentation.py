@@ -0,0 +1,186 @@
+"""
+Module containing the instrumentation of the grading stages.
+
+While an Instrumentation is active, the stages of a run (each check, the virtual environment setup and teardown,
+the downloads and the archive extraction) are measured with the measure context manager.
+Each stage gets its wall time, the CPU time of its thread and the resources used by the subprocesses it ran
+(CPU time, peak RSS and block I/O), which process.run reports when each subprocess exits.
+The start time, thread and process of each stage place it on a timeline, which can be exported as a trace.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+_LOCAL = threading.local()
+
+
+@dataclass
+class StageMetrics:
+    """The resources used by a single stage of a run. Nested stages are included in the outer stages."""
+
+    name: str
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    subprocesses: int = 0
+    subprocesses_cpu_time: float = 0.0
+    subprocesses_peak_rss: int = 0
+    subprocesses_read_blocks: int = 0
+    subprocesses_write_blocks: int = 0
+    start_time: float = 0.0
+    thread_id: int = 0
+    process_id: int = 0
+
+
+@dataclass
+class StageSummary:
+    """The resources used by all runs of a stage, e.g. across all submissions of a batch."""
+
+    name: str
+    runs: int
+    total_wall_time: float
+    max_wall_time: float
+    total_cpu_time: float
+    max_peak_rss: int
+
+
+class Instrumentation:
+    """
+    Collects the metrics of the stages measured while it is active. Used as a context manager.
+
+    Instrumentations can be nested: the stages measured by the inner one are collected by the outer one too.
+    """
+
+    active: Optional[Instrumentation] = None
+
+    def __init__(self) -> None:
+        """Initialize the instrumentation, without any stages."""
+        self.__stages: list[StageMetrics] = []
+        self.__lock = threading.Lock()
+        self.__previous: Optional[Instrumentation] = None
+
+    def __enter__(self) -> Instrumentation:
+        """Start collecting the metrics of the measured stages, from all threads."""
+        self.__previous = Instrumentation.active
+        Instrumentation.active = self
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:  # type: ignore
+        """Stop collecting the metrics."""
+        Instrumentation.active = self.__previous
+
+    @property
+    def stages(self) -> list[StageMetrics]:
+        """
+        Get the metrics of the measured stages.
+
+        :returns: The metrics of each stage, in the order the stages finished.
+        :rtype: list[StageMetrics]
+        """
+        with self.__lock:
+            return list(self.__stages)
+
+    def add(self, metrics: StageMetrics) -> None:
+        """
+        Add the metrics of a finished stage.
+
+        :param metrics: The metrics of the stage.
+        """
+        with self.__lock:
+            self.__stages.append(metrics)
+
+        if self.__previous is not None:
+            self.__previous.add(metrics)
+
+
+def _get_running_stages() -> list[StageMetrics]:
+    """
+    Get the stages running in the current thread.
+
+    :return: The stages, from the outermost to the innermost.
+    """
+    if not hasattr(_LOCAL, "stages"):
+        _LOCAL.stages = []
+
+    return _LOCAL.stages
+
+
+def is_measuring() -> bool:
+    """
+    Check if a stage is being measured in the current thread.
+
+    :return: True if the resources used by the subprocesses should be reported, False otherwise.
+    """
+    return Instrumentation.active is not None and len(_get_running_stages()) > 0
+
+
+@contextmanager
+def measure(name: str) -> Iterator[None]:
+    """
+    Measure a stage, if instrumentation is active. Otherwise, do nothing.
+
+    :param name: The name of the stage, e.g. "check:pylint".
+    """
+    instrumentation = Instrumentation.active
+
+    if instrumentation is None:
+        yield
+        return
+
+    metrics = StageMetrics(name, start_time=time.time(), thread_id=threading.get_native_id(), process_id=os.getpid())
+    running_stages = _get_running_stages()
+    running_stages.append(metrics)
+
+    start_wall_time = time.perf_counter()
+    start_cpu_time = time.thread_time()
+
+    try:
+        yield
+    finally:
+        metrics.wall_time = time.perf_counter() - start_wall_time
+        metrics.cpu_time = time.thread_time() - start_cpu_time
+        running_stages.remove(metrics)
+        instrumentation.add(metrics)
+
+
+def record_subprocess_usage(cpu_time: float, peak_rss: int, read_blocks: int, write_blocks: int) -> None:
+    """
+    Add the resources used by a finished subprocess to the stages running in the current thread.
+
+    :param cpu_time: The user and system CPU time of the subprocess, in seconds.
+    :param peak_rss: The peak resident set size of the subprocess, in KiB.
+    :param read_blocks: The amount of blocks the subprocess read from the disk.
+    :param write_blocks: The amount of blocks the subprocess wrote to the disk.
+    """
+    for metrics in _get_running_stages():
+        metrics.subprocesses += 1
+        metrics.subprocesses_cpu_time += cpu_time
+        metrics.subprocesses_peak_rss = max(metrics.subprocesses_peak_rss, peak_rss)
+        metrics.subprocesses_read_blocks += read_blocks
+        metrics.subprocesses_write_blocks += write_blocks
+
+
+def summarize_stages(stages: list[StageMetrics]) -> list[StageSummary]:
+    """
+    Aggregate the metrics of the runs of each stage.
+
+    :param stages: The metrics of the stages, e.g. of all submissions of a batch.
+    :return: A summary of each stage, in the order the stages first appear, with the CPU time of the subprocesses
+             included in the total CPU time.
+    """
+    summaries: dict[str, StageSummary] = {}
+
+    for metrics in stages:
+        summary = summaries.setdefault(metrics.name, StageSummary(metrics.name, 0, 0.0, 0.0, 0.0, 0))
+        summary.runs += 1
+        summary.total_wall_time += metrics.wall_time
+        summary.max_wall_time = max(summary.max_wall_time, metrics.wall_time)
+        summary.total_cpu_time += metrics.cpu_time + metrics.subprocesses_cpu_time
+        summary.max_peak_rss = max(summary.max_peak_rss, metrics.subprocesses_peak_rss)
+
+    return list(summaries.values())
@@ -0,0 +1,411 @@
+"""
+Module containing the durable queue of grading jobs.
+
+The queue is a SQLite database, which records the state of each submission and the result of each of its checks
+as soon as it is known. A batch or a server restarted on the same queue (e.g. after a crash or a reboot) resumes
+where it stopped: finished submissions are not graded again, interrupted ones are graded again without the checks
+which already have a result, and submissions which failed for a transient reason (a download or a package
+installation failing) are retried with an exponential backoff.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import grader.utils.constants as const
+from grader.checks.abstract_check import CheckResult
+from grader.exceptions import ExternalResourceError, JobQueueError, VirtualEnvironmentError
+from grader.utils.results_cache import ResultsCache, parse_check_result, serialize_check_result
+
+logger = logging.getLogger("grader")
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+# Bump when the schema of the queue changes
+JOB_QUEUE_FORMAT_VERSION = 1
+
+# Failures which may not happen again, e.g. a network error while downloading a resource or installing packages
+TRANSIENT_ERRORS = (ExternalResourceError, VirtualEnvironmentError)
+
+JOB_QUEUE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    options TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    results TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS check_results (
+    job_id TEXT NOT NULL REFERENCES jobs (id) ON DELETE CASCADE,
+    key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (job_id, key)
+);
+"""
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    Check if an error, or one of the errors which caused it, may not happen again when retrying.
+
+    :param error: The error.
+    :return: True if the job is worth retrying, False otherwise.
+    """
+    current: Optional[BaseException] = error
+
+    while current is not None:
+        if isinstance(current, TRANSIENT_ERRORS):
+            return True
+        current = current.__cause__ or current.__context__
+
+    return False
+
+
+@dataclass
+class QueuedJob:
+    """A job recorded in the queue."""
+
+    id: str
+    path: str
+    options: dict[str, Any] = field(default_factory=dict)
+    status: str = JOB_PENDING
+    attempts: int = 0
+    next_attempt_at: float = 0.0
+    results: Optional[list[CheckResult]] = None
+    error: Optional[str] = None
+
+    @property
+    def is_finished(self) -> bool:
+        """
+        Check if the job is finished, successfully or not.
+
+        :returns: True if the job is done or failed for good, False if it still has to run.
+        :rtype: bool
+        """
+        return self.status in (JOB_DONE, JOB_FAILED)
+
+
+class JobQueue:
+    """Durable queue of grading jobs, shared by the processes grading them. Used as a context manager."""
+
+    def __init__(
+        self,
+        path: str,
+        max_attempts: int = const.DEFAULT_JOB_MAX_ATTEMPTS,
+        retry_delay: float = const.DEFAULT_JOB_RETRY_DELAY,
+    ):
+        """
+        Open the queue, creating it if needed.
+
+        :param path: The path to the SQLite database of the queue.
+        :param max_attempts: The amount of attempts of a job failing with transient errors before it fails for good.
+        :param retry_delay: The delay before the first retry of a job, in seconds. Doubled after each attempt.
+        :raises JobQueueError: If the queue cannot be opened, or was created by an incompatible version.
+        """
+        self.__path = path
+        self.__max_attempts = max_attempts
+        self.__retry_delay = retry_delay
+        # The checks of a submission record their results from several threads
+        self.__lock = threading.Lock()
+
+        try:
+            self.__connection = sqlite3.connect(path, timeout=const.JOB_QUEUE_LOCK_TIMEOUT, check_same_thread=False)
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute("PRAGMA foreign_keys=ON")
+            version = self.__connection.execute("PRAGMA user_version").fetchone()[0]
+
+            if version not in (0, JOB_QUEUE_FORMAT_VERSION):
+                self.__connection.close()
+                raise JobQueueError(f"Job queue {path} has format {version}, expected {JOB_QUEUE_FORMAT_VERSION}")
+
+            with self.__connection:
+                self.__connection.executescript(JOB_QUEUE_SCHEMA)
+                self.__connection.execute(f"PRAGMA user_version = {JOB_QUEUE_FORMAT_VERSION}")
+        except sqlite3.Error as error:
+            raise JobQueueError(f"Cannot open the job queue {path}: {error}") from error
+
+    def __enter__(self) -> JobQueue:
+        """Use the queue until the end of the block."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:  # type: ignore
+        """Close the queue."""
+        self.close()
+
+    @property
+    def path(self) -> str:
+        """
+        Get the path to the database of the queue.
+
+        :returns: The path, to open the queue from another process.
+        :rtype: str
+        """
+        return self.__path
+
+    def close(self) -> None:
+        """Close the connection to the queue."""
+        with self.__lock:
+            self.__connection.close()
+
+    def add(self, job_id: str, path: str, options: Optional[dict[str, Any]] = None) -> bool:
+        """
+        Add a job to the queue, unless a job with the same id is already recorded.
+
+        :param job_id: The id of the job, e.g. the id of the submission.
+        :param path: The path to the project to grade.
+        :param options: The options of the job, which must be JSON serializable.
+        :return: True if the job was added, False if it was already in the queue.
+        """
+        return (
+            self.__execute(
+                "INSERT OR IGNORE INTO jobs (id, path, options, status, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, path, json.dumps(options or {}), JOB_PENDING, time.time()),
+            )
+            > 0
+        )
+
+    def requeue_interrupted(self) -> int:
+        """
+        Queue again the jobs which were running when the previous process stopped.
+
+        Must be called before any job is claimed, as the claimed jobs are running too.
+
+        :return: The amount of interrupted jobs.
+        """
+        return self.__execute(
+            "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?", (JOB_PENDING, time.time(), JOB_RUNNING)
+        )
+
+    def claim(self, limit: int) -> list[QueuedJob]:
+        """
+        Take the oldest jobs ready to run, and mark them as running.
+
+        :param limit: The maximal amount of jobs to take.
+        :return: The claimed jobs, in the order they were added.
+        """
+        if limit <= 0:
+            return []
+
+        now = time.time()
+
+        with self.__lock, self.__connection:
+            rows = self.__connection.execute(
+                "SELECT * FROM jobs WHERE status = ? AND next_attempt_at <= ? ORDER BY rowid LIMIT ?",
+                (JOB_PENDING, now, limit),
+            ).fetchall()
+            self.__connection.executemany(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?", [(JOB_RUNNING, now, row[0]) for row in rows]
+            )
+
+        return [JobQueue.__parse_job(row, status=JOB_RUNNING) for row in rows]
+
+    def get_next_attempt_delay(self) -> Optional[float]:
+        """
+        Get the time until the next pending job is ready to run.
+
+        :return: The delay in seconds, 0 if a job is ready, or None if no job is pending.
+        """
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT MIN(next_attempt_at) FROM jobs WHERE status = ?", (JOB_PENDING,)
+            ).fetchone()
+
+        if row[0] is None:
+            return None
+
+        return max(0.0, row[0] - time.time())
+
+    def complete(self, job_id: str, results: list[CheckResult]) -> None:
+        """
+        Record the results of a finished job. The job will not run again.
+
+        :param job_id: The id of the job.
+        :param results: The results of the checks of the job.
+        """
+        self.__execute(
+            "UPDATE jobs SET status = ?, results = ?, error = NULL, updated_at = ? WHERE id = ?",
+            (JOB_DONE, json.dumps([serialize_check_result(result) for result in results]), time.time(), job_id),
+        )
+
+    def fail(self, job_id: str, error: str, is_transient: bool) -> bool:
+        """
+        Record a failed attempt of a job, and schedule a retry if the failure is transient.
+
+        :param job_id: The id of the job.
+        :param error: The error of the attempt.
+        :param is_transient: Whether the failure may not happen again.
+        :return: True if the job will be retried, False if it failed for good.
+        """
+        job = self.get(job_id)
+        if job is None:
+            return False
+
+        attempts = job.attempts + 1
+        is_retrying = is_transient and attempts < self.__max_attempts
+        status = JOB_PENDING if is_retrying else JOB_FAILED
+        next_attempt_at = time.time() + self.__retry_delay * 2 ** (attempts - 1) if is_retrying else 0.0
+
+        self.__execute(
+            "UPDATE jobs SET status = ?, attempts = ?, next_attempt_at = ?, error = ?, updated_at = ? WHERE id = ?",
+            (status, attempts, next_attempt_at, error, time.time(), job_id),
+        )
+
+        if is_retrying:
+            logger.warning(
+                "Job %s failed (attempt %d of %d), retrying: %s", job_id, attempts, self.__max_attempts, error
+            )
+
+        return is_retrying
+
+    def get(self, job_id: str) -> Optional[QueuedJob]:
+        """
+        Get a job by its id.
+
+        :param job_id: The id of the job.
+        :return: The job, or None if it is not in the queue.
+        """
+        with self.__lock:
+            row = self.__connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+        return JobQueue.__parse_job(row) if row is not None else None
+
+    def get_jobs(self) -> list[QueuedJob]:
+        """
+        Get all jobs of the queue.
+
+        :return: The jobs, in the order they were added.
+        """
+        with self.__lock:
+            rows = self.__connection.execute("SELECT * FROM jobs ORDER BY rowid").fetchall()
+
+        return [JobQueue.__parse_job(row) for row in rows]
+
+    def record_check_result(self, job_id: str, key: str, result: CheckResult) -> None:
+        """
+        Record the result of a check of a job, before the job finishes.
+
+        :param job_id: The id of the job.
+        :param key: The key of the check, which changes with the project files and the configuration of the check.
+        :param result: The result of the check.
+        """
+        self.__execute(
+            "INSERT OR REPLACE INTO check_results (job_id, key, name, result) VALUES (?, ?, ?, ?)",
+            (job_id, key, result.name, json.dumps(serialize_check_result(result))),
+        )
+
+    def get_check_result(self, job_id: str, key: str) -> Optional[CheckResult]:
+        """
+        Get the recorded result of a check of a job.
+
+        :param job_id: The id of the job.
+        :param key: The key of the check.
+        :return: The result, or None if the check has no recorded result.
+        """
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT result FROM check_results WHERE job_id = ? AND key = ?", (job_id, key)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        try:
+            return parse_check_result(json.loads(row[0]))
+        except (ValueError, KeyError, TypeError) as error:
+            logger.warning("Invalid recorded result of job %s: %s", job_id, error)
+            return None
+
+    def __execute(self, statement: str, parameters: tuple) -> int:
+        """
+        Run a statement in its own transaction.
+
+        :param statement: The SQL statement.
+        :param parameters: The parameters of the statement.
+        :return: The amount of changed rows.
+        """
+        with self.__lock, self.__connection:
+            return self.__connection.execute(statement, parameters).rowcount
+
+    @staticmethod
+    def __parse_job(row: tuple, status: Optional[str] = None) -> QueuedJob:
+        """
+        Build a job from a row of the jobs table.
+
+        :param row: The row.
+        :param status: The status of the job, if it changed since the row was read.
+        :return: The job.
+        """
+        job_id, path, options, row_status, attempts, next_attempt_at, results, error, _ = row
+
+        return QueuedJob(
+            job_id,
+            path,
+            json.loads(options),
+            status or row_status,
+            attempts,
+            next_attempt_at,
+            [parse_check_result(entry) for entry in json.loads(results)] if results is not None else None,
+            error,
+        )
+
+
+class JobResultsCache(ResultsCache):
+    """
+    Records the result of each check of a queued job in the queue, so a resumed job only runs the missing checks.
+
+    The results cache directory of the configuration, if any, is still used for the checks missing from the queue.
+    """
+
+    def __init__(self, queue: JobQueue, job_id: str, config: dict):
+        """
+        Initialize the results cache of a job.
+
+        :param queue: The queue of the job.
+        :param job_id: The id of the job.
+        :param config: The configuration of the grader.
+        """
+        cache_dir = config.get("results_cache_dir")
+        super().__init__(cache_dir if isinstance(cache_dir, str) else "", config)
+        self.__queue = queue
+        self.__job_id = job_id
+        self.__is_using_cache_dir = isinstance(cache_dir, str) and cache_dir != ""
+
+    def get(self, key: str) -> Optional[CheckResult]:
+        """
+        Get the result of a check, recorded by a previous attempt of the job or cached in the cache directory.
+
+        :param key: The cache key of the check.
+        :return: The result, or None if the check has to run.
+        """
+        result = self.__queue.get_check_result(self.__job_id, key)
+
+        if result is None and self.__is_using_cache_dir:
+            result = super().get(key)
+
+        return result
+
+    def put(self, key: str, result: CheckResult) -> None:
+        """
+        Record the result of a check in the queue, and in the cache directory if any.
+
+        :param key: The cache key of the check.
+        :param result: The result of the check.
+        """
+        self.__queue.record_check_result(self.__job_id, key, result)
+
+        if self.__is_using_cache_dir:
+            super().put(key, result)
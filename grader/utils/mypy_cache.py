@@ -0,0 +1,128 @@
+"""
+Module containing the per-file mypy linecount cache.
+
+The linecount report of mypy has a row per module, with the counts of that module only,
+so each file is checked once and its row is stored. The totals are then summed from the per-file rows.
+
+Mypy disables its own incremental cache (and the daemon ignores reports) when a report is requested,
+which is why the rows are cached here instead.
+"""
+
+import hashlib
+import os
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from grader.utils.file_cache import FileCache
+
+# Bump when the format of the cache entries changes
+MYPY_CACHE_FORMAT_VERSION = 1
+
+
+@dataclass
+class MypyFileResult:
+    """The row of a single module in the mypy linecount report."""
+
+    annotated_lines: int
+    lines: int
+    annotated_functions: int
+    functions: int
+
+
+def get_module_name(path: str) -> str:
+    """
+    Get the name mypy gives to the module of a file.
+
+    Mypy crawls up the directories with an __init__.py file to find the package of the file.
+
+    :param path: The path to the file.
+    :return: The full name of the module.
+    """
+    directory, file_name = os.path.split(os.path.abspath(path))
+    module_name = os.path.splitext(file_name)[0]
+    parts = [] if module_name == "__init__" else [module_name]
+
+    while os.path.isfile(os.path.join(directory, "__init__.py")):
+        directory, package_name = os.path.split(directory)
+        parts.insert(0, package_name)
+
+    return ".".join(parts)
+
+
+def parse_linecount_report(report_path: str) -> dict[str, MypyFileResult]:
+    """
+    Read the per-module rows of a mypy linecount report.
+
+    Each row contains the annotated lines, the lines, the annotated functions, the functions and the module name.
+    The first row contains the totals and is skipped.
+
+    :param report_path: The path to the report.
+    :raises OSError: If the report cannot be read.
+    :raises ValueError: If a row is invalid.
+    :return: The rows, keyed by the module name.
+    """
+    results = {}
+
+    with open(report_path, "r", encoding="utf-8") as report_file:
+        next(report_file, None)
+
+        for row in report_file:
+            if not row.strip():
+                continue
+
+            *counts, module_name = row.split()
+            annotated_lines, lines, annotated_functions, functions = (int(count) for count in counts)
+            results[module_name] = MypyFileResult(annotated_lines, lines, annotated_functions, functions)
+
+    return results
+
+
+class MypyCache:
+    """Persistent cache of per-file mypy linecount rows."""
+
+    def __init__(self, cache_dir: str):
+        """
+        Initialize the mypy cache.
+
+        :param cache_dir: The directory where the rows are stored.
+        """
+        self.__cache = FileCache(cache_dir, "mypy")
+
+    @staticmethod
+    def compute_key(relative_path: str, source: bytes, config_hash: str, mypy_version: str) -> str:
+        """
+        Compute the cache key of a file.
+
+        :param relative_path: The path of the file, relative to the project root (it determines the module name).
+        :param source: The contents of the file.
+        :param config_hash: The hash of the mypy configuration.
+        :param mypy_version: The version of mypy.
+        :return: The cache key.
+        """
+        return FileCache.compute_key(
+            {
+                "format": MYPY_CACHE_FORMAT_VERSION,
+                "path": relative_path,
+                "source": hashlib.sha256(source).hexdigest(),
+                "config": config_hash,
+                "mypy": mypy_version,
+            }
+        )
+
+    def get(self, key: str) -> Optional[MypyFileResult]:
+        """
+        Get the cached row of a file.
+
+        :param key: The cache key.
+        :return: The row, or None if it is not cached (or the entry is invalid).
+        """
+        return self.__cache.load(key, lambda entry: MypyFileResult(**entry))
+
+    def put(self, key: str, result: MypyFileResult) -> None:
+        """
+        Store the row of a file. Failing to store is not fatal.
+
+        :param key: The cache key.
+        :param result: The row of the file.
+        """
+        self.__cache.store(key, asdict(result))
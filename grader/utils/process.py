@@ -1,29 +1,727 @@
-"""Module containing a wrapper for launching shell commands."""
+"""
+Module containing a wrapper for launching shell commands.
 
+The output of a command is read while it runs, so it is not limited by the memory of the grader: only the start and
+the end of each output stream are kept (a test printing in an infinite loop cannot fill the memory), and each line
+can be handed to a callback as soon as it is printed.
+
+Commands running the student's code get limits: on POSIX systems, they run in a process group of their own, which is
+killed as a whole (e.g. pytest and the processes the tests started) when the command runs for too long.
+Their memory, file sizes and processes can be limited as well, with resource limits or in a cgroup of their own
+on Linux, so a single student cannot starve the other gradings running on the same host.
+"""
+
+import codecs
+import errno
+import io
+import itertools
+import locale
 import logging
+import math
 import os
+import signal
 import subprocess
-from typing import Optional
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import IO, Any, Callable, Optional, TextIO
+
+import grader.utils.constants as const
+from grader.exceptions import InvalidConfigError, ProcessLimitError, ProcessTimeoutError
+from grader.utils.instrumentation import Instrumentation, is_measuring, measure, record_subprocess_usage
+
+if sys.platform != "win32":
+    import resource
 
 # from grader.utils.logger import VERBOSE
 
 logger = logging.getLogger("grader")
 
+LineCallback = Callable[[str], None]
+
+
+@dataclass(frozen=True)
+class ProcessLimits:
+    """
+    Class representing the limits of a command and of the processes it starts. None disables a limit.
+
+    The memory and processes limits apply to the whole command when it runs in a cgroup. Otherwise, they are resource
+    limits: the memory limit applies to each process, and the processes limit to the user running the grader.
+    """
+
+    timeout: Optional[float] = const.DEFAULT_CHECK_TIMEOUT  # Wall-clock seconds
+    cpu_time: Optional[float] = None  # CPU seconds of each process, enforced on POSIX systems only
+    memory: Optional[int] = None  # Bytes of memory (address space without a cgroup), POSIX only
+    file_size: Optional[int] = None  # Bytes of each file written, POSIX only
+    processes: Optional[int] = None  # Processes running at once, POSIX only
+    cgroup: Optional[str] = None  # cgroup v2 directory the command runs in a child cgroup of, Linux only
+
+    @staticmethod
+    def from_dict(raw_object: Any) -> "ProcessLimits":
+        """
+        Parse the limits section of the configuration of a check.
+
+        :param raw_object: The limits section of the check.
+        :type raw_object: Any
+        :raises InvalidConfigError: If the section is not an object, or a limit is unknown or not a positive number
+            (an integer for sizes and counts, a path for the cgroup) or null.
+        :return: The limits, with the defaults for the limits which are not set.
+        :rtype: ProcessLimits
+        """
+        if not isinstance(raw_object, dict):
+            raise InvalidConfigError("limits must be an object")
+
+        number_keys = {"timeout", "cpu_time"}
+        integer_keys = {"memory", "file_size", "processes"}
+
+        unknown_keys = set(raw_object) - number_keys - integer_keys - {"cgroup"}
+        if unknown_keys:
+            raise InvalidConfigError(f"Unknown limits: {', '.join(sorted(unknown_keys))}")
+
+        for key, value in raw_object.items():
+            if value is None:
+                continue
+
+            if key == "cgroup":
+                if not isinstance(value, str) or not value:
+                    raise InvalidConfigError("limits.cgroup must be the path to a cgroup or null")
+                continue
+
+            allowed_types = (int, float) if key in number_keys else (int,)
+            if not isinstance(value, allowed_types) or isinstance(value, bool) or value <= 0:
+                kind = "number" if key in number_keys else "integer"
+                raise InvalidConfigError(f"limits.{key} must be a positive {kind} or null")
+
+        return ProcessLimits(**raw_object)
+
+
+class _Cgroup:
+    """
+    A cgroup (v2) created for a single command, under the cgroup of its limits, and removed once the command exited.
+
+    The memory and processes limits are set on the cgroup, so they apply to the command and to every process it
+    starts, even to the processes leaving its process group. The grader must be allowed to create cgroups in the
+    parent cgroup, and to move its own processes into them (e.g. a cgroup delegated to the grader by systemd).
+    """
+
+    __counter = itertools.count()
+
+    def __init__(self, limits: ProcessLimits):
+        """
+        Initialize the cgroup of a command, without creating it.
+
+        :param limits: The limits of the command, with a cgroup.
+        """
+        self.__parent = str(limits.cgroup)
+        self.__limits = limits
+        self.__path = os.path.join(self.__parent, f"{const.CGROUP_NAME_PREFIX}{os.getpid()}-{next(_Cgroup.__counter)}")
+        self.__procs_file: Optional[IO[bytes]] = None
+
+    @property
+    def path(self) -> str:
+        """
+        Get the path to the cgroup.
+
+        :returns: The path to the directory of the cgroup.
+        :rtype: str
+        """
+        return self.__path
+
+    def __enter__(self) -> "_Cgroup":
+        """
+        Create the cgroup and set its limits.
+
+        :raises ProcessLimitError: If the parent is not a cgroup v2, misses a controller, or cannot be written to.
+        :return: The cgroup.
+        """
+        if sys.platform != "linux":
+            raise ProcessLimitError("cgroups are only available on Linux")
+
+        if not os.path.isfile(os.path.join(self.__parent, "cgroup.procs")):
+            raise ProcessLimitError(f"{self.__parent} is not a cgroup v2 directory")
+
+        required_controllers = {
+            controller
+            for controller, limit in (("memory", self.__limits.memory), ("pids", self.__limits.processes))
+            if limit is not None
+        }
+        missing_controllers = required_controllers - self.__get_enabled_controllers()
+        if missing_controllers:
+            raise ProcessLimitError(
+                f"The {', '.join(sorted(missing_controllers))} controllers are not enabled in {self.__parent}"
+            )
+
+        try:
+            os.mkdir(self.__path)
+
+            if self.__limits.memory is not None:
+                self.__write("memory.max", str(self.__limits.memory))
+                # Without it, the processes of the cgroup would swap instead of being stopped
+                if os.path.exists(os.path.join(self.__path, "memory.swap.max")):
+                    self.__write("memory.swap.max", "0")
+
+            if self.__limits.processes is not None:
+                self.__write("pids.max", str(self.__limits.processes))
+
+            # Opened beforehand, so the new process only writes to it before it runs the command
+            self.__procs_file = open(os.path.join(self.__path, "cgroup.procs"), "wb", buffering=0)
+        except OSError as error:
+            self.__remove()
+            raise ProcessLimitError(f"Cannot create the cgroup {self.__path}: {error}") from error
+
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        """Kill the processes left in the cgroup, and remove it."""
+        if self.__procs_file is not None:
+            self.__procs_file.close()
+            self.__procs_file = None
+
+        self.kill()
+        self.__remove()
+
+    def join(self) -> None:
+        """
+        Move the calling process into the cgroup.
+
+        Called in the new process, between fork and exec: it only makes a system call with a file opened beforehand.
+        """
+        if self.__procs_file is not None:
+            os.write(self.__procs_file.fileno(), b"0")
+
+    def kill(self) -> None:
+        """Kill every process in the cgroup, if the kernel supports it (Linux 5.14 and later)."""
+        kill_path = os.path.join(self.__path, "cgroup.kill")
+
+        if os.path.exists(kill_path):
+            try:
+                self.__write("cgroup.kill", "1")
+            except OSError as error:
+                logger.warning("Cannot kill the processes of the cgroup %s: %s", self.__path, error)
+
+    def get_oom_kills(self) -> int:
+        """
+        Get the amount of processes of the cgroup killed for going over its memory limit.
+
+        :returns: The oom_kill count of the memory events of the cgroup, or 0 if it cannot be read.
+        :rtype: int
+        """
+        try:
+            with open(os.path.join(self.__path, "memory.events"), "r", encoding="utf-8") as events_file:
+                for line in events_file:
+                    name, _, count = line.partition(" ")
+                    if name == "oom_kill":
+                        return int(count)
+        except (OSError, ValueError):
+            pass
+
+        return 0
+
+    def __get_enabled_controllers(self) -> set[str]:
+        """
+        Get the controllers the parent cgroup enables for its children.
+
+        :returns: The names of the controllers, e.g. {"memory", "pids"}.
+        :rtype: set[str]
+        """
+        try:
+            with open(os.path.join(self.__parent, "cgroup.subtree_control"), "r", encoding="utf-8") as control_file:
+                return set(control_file.read().split())
+        except OSError:
+            return set()
+
+    def __write(self, name: str, value: str) -> None:
+        """
+        Write to an interface file of the cgroup.
+
+        :param name: The name of the file, e.g. "memory.max".
+        :param value: The value to write.
+        """
+        with open(os.path.join(self.__path, name), "w", encoding="utf-8") as interface_file:
+            interface_file.write(value)
+
+    def __remove(self) -> None:
+        """Remove the cgroup, once the processes killed in it exited."""
+        for attempt in range(const.CGROUP_REMOVE_ATTEMPTS):
+            try:
+                os.rmdir(self.__path)
+                return
+            except FileNotFoundError:
+                return
+            except OSError as error:
+                # EBUSY: some processes of the cgroup have not exited yet
+                if error.errno != errno.EBUSY or attempt == const.CGROUP_REMOVE_ATTEMPTS - 1:
+                    logger.warning("Cannot remove the cgroup %s: %s", self.__path, error)
+                    return
+
+                time.sleep(const.CGROUP_REMOVE_DELAY)
+
+
+class OutputCapture:
+    """
+    Captures an output stream of a process, keeping only its start and its end in memory.
+
+    The characters dropped from the middle of the stream are written to a spill file, if any.
+    Each line is passed to a callback as soon as it is complete.
+    """
+
+    def __init__(
+        self,
+        max_size: Optional[int] = const.PROCESS_MAX_OUTPUT_SIZE,
+        spill_path: Optional[str] = None,
+        on_line: Optional[LineCallback] = None,
+    ):
+        """
+        Initialize the capture.
+
+        :param max_size: The amount of characters kept in memory, half of them from the start of the stream and half
+            from its end. None keeps the whole stream.
+        :param spill_path: Optional file receiving the characters dropped from the middle of the stream.
+        :param on_line: Optional callback receiving each line, without its line ending. After the callback raises,
+            the next lines are not passed to it anymore.
+        """
+        self.__head_size = max_size // 2 if max_size is not None else None
+        self.__tail_size = max_size - max_size // 2 if max_size is not None else 0
+        self.__head: list[str] = []
+        self.__head_length = 0
+        self.__tail: deque[str] = deque()
+        self.__tail_length = 0
+        self.__size = 0
+        self.__spill_path = spill_path
+        self.__spill_file: Optional[TextIO] = None
+        self.__on_line = on_line
+        self.__partial_line = ""
+        self.error: Optional[Exception] = None
+
+    @property
+    def size(self) -> int:
+        """
+        Get the size of the whole stream.
+
+        :returns: The amount of characters written to the capture.
+        :rtype: int
+        """
+        return self.__size
+
+    @property
+    def is_truncated(self) -> bool:
+        """
+        Check if characters were dropped from the middle of the stream.
+
+        :returns: True if the captured output is not the whole stream, False otherwise.
+        :rtype: bool
+        """
+        return self.__size > self.__head_length + self.__tail_length
+
+    def write(self, text: str) -> None:
+        """
+        Capture the next characters of the stream.
+
+        :param text: The characters.
+        """
+        if not text:
+            return
+
+        self.__size += len(text)
+
+        if self.__on_line is not None:
+            self.__split_lines(text)
+
+        if self.__head_size is None or self.__head_length < self.__head_size:
+            kept = text if self.__head_size is None else text[: self.__head_size - self.__head_length]
+            OutputCapture.__append(self.__head, kept)
+            self.__head_length += len(kept)
+            text = text[len(kept) :]
+
+        if not text:
+            return
+
+        OutputCapture.__append(self.__tail, text)
+        self.__tail_length += len(text)
+
+        while self.__tail_length > self.__tail_size:
+            excess = self.__tail_length - self.__tail_size
+            chunk = self.__tail[0]
+
+            if len(chunk) <= excess:
+                self.__tail.popleft()
+            else:
+                self.__tail[0] = chunk[excess:]
+
+            dropped = chunk[:excess]
+            self.__tail_length -= len(dropped)
+            self.__spill(dropped)
+
+    def close(self) -> None:
+        """Pass the last line to the callback, even without a line ending, and close the spill file."""
+        if self.__partial_line:
+            self.__call(self.__partial_line)
+            self.__partial_line = ""
+
+        if self.__spill_file is not None:
+            self.__spill_file.close()
+            self.__spill_file = None
+
+    def getvalue(self) -> str:
+        """
+        Get the captured output.
+
+        :return: The whole stream, or its start and its end around a note on the amount of dropped characters.
+        """
+        head = "".join(self.__head)
+        tail = "".join(self.__tail)
+
+        if not self.is_truncated:
+            return head + tail
+
+        omitted = self.__size - self.__head_length - self.__tail_length
+        location = f", written to {self.__spill_path}" if self.__spill_path is not None else ""
+        return f"{head}\n[... {omitted} characters omitted{location} ...]\n{tail}"
+
+    def __split_lines(self, text: str) -> None:
+        """
+        Pass the lines completed by the next characters to the callback.
+
+        :param text: The characters.
+        """
+        lines = (self.__partial_line + text).split("\n")
+        self.__partial_line = lines.pop()
+
+        for line in lines:
+            self.__call(line)
+
+        # A line never ending cannot be kept in memory either
+        while len(self.__partial_line) > const.PROCESS_MAX_LINE_LENGTH:
+            self.__call(self.__partial_line[: const.PROCESS_MAX_LINE_LENGTH])
+            self.__partial_line = self.__partial_line[const.PROCESS_MAX_LINE_LENGTH :]
+
+    def __call(self, line: str) -> None:
+        """
+        Pass a line to the callback, unless it raised before.
+
+        :param line: The line.
+        """
+        if self.__on_line is None or self.error is not None:
+            return
+
+        try:
+            self.__on_line(line)
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            # Raised by run once the process exits, as the reader must keep draining the pipe
+            self.error = error
+
+    def __spill(self, text: str) -> None:
+        """
+        Write characters dropped from the middle of the stream to the spill file.
+
+        :param text: The characters.
+        """
+        if self.__spill_path is None:
+            return
+
+        try:
+            if self.__spill_file is None:
+                # Closed by close, once the stream ends
+                self.__spill_file = open(  # pylint: disable=consider-using-with
+                    self.__spill_path, "w", encoding="utf-8"
+                )
+            self.__spill_file.write(text)
+        except OSError as error:
+            logger.warning("Cannot write the output of the process to %s: %s", self.__spill_path, error)
+            self.__spill_path = None
+
+    @staticmethod
+    def __append(chunks: Any, text: str) -> None:
+        """
+        Append characters to a list of chunks, merging them into the last chunk while it is small.
+
+        Processes flushing their output often are read in tiny chunks, which would cost more than their size.
+
+        :param chunks: The list (or deque) of chunks.
+        :param text: The characters.
+        """
+        if chunks and len(chunks[-1]) < const.PROCESS_READ_SIZE:
+            chunks[-1] += text
+        else:
+            chunks.append(text)
+
+
+class _MeasuredPopen(subprocess.Popen):
+    """A Popen which keeps the resource usage of the process when it is reaped."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Start the process, without any resource usage until it exits."""
+        self.rusage: Optional[Any] = None
+        super().__init__(*args, **kwargs)
+
+    def _try_wait(self, wait_flags: int) -> tuple[int, int]:
+        """Wait for the process with wait4 instead of waitpid, so the resource usage of the process is returned."""
+        try:
+            pid, status, rusage = os.wait4(self.pid, wait_flags)
+        except ChildProcessError:
+            # Same as Popen: the process was already reaped, e.g. because SIGCHLD is ignored
+            return self.pid, 0
+
+        if pid == self.pid:
+            self.rusage = rusage
+        return pid, status
+
+
+def _read_output(stream: Optional[IO[bytes]], capture: OutputCapture) -> None:
+    """
+    Read an output stream of a process until the process closes it, decoding it like a text mode Popen, then close it.
+
+    :param stream: The stream.
+    :param capture: The capture of the stream.
+    """
+    if stream is None:
+        return
+
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder(locale.getpreferredencoding(False))(errors="replace"), translate=True
+    )
+    descriptor = stream.fileno()
+
+    try:
+        while chunk := os.read(descriptor, const.PROCESS_READ_SIZE):
+            capture.write(decoder.decode(chunk))
+    finally:
+        # The reader owns the stream, so its descriptor is not closed (and reused) while it is read
+        stream.close()
+
+    capture.write(decoder.decode(b"", final=True))
+    capture.close()
+
+
+def _get_resource_limits(limits: ProcessLimits) -> list[tuple[int, tuple[int, int]]]:
+    """
+    Get the resource limits to set in the process of a command, which its children inherit.
+
+    :param limits: The limits of the command.
+    :return: The resource and its soft and hard limits, for each limit enforced with setrlimit.
+    """
+    resource_limits: list[tuple[int, tuple[int, int]]] = []
+
+    if sys.platform == "win32":
+        return resource_limits
+
+    if limits.cpu_time is not None:
+        # The process gets SIGXCPU once over the soft limit, and SIGKILL a second later if it survives it
+        cpu_time = math.ceil(limits.cpu_time)
+        resource_limits.append((resource.RLIMIT_CPU, (cpu_time, cpu_time + 1)))
+
+    if limits.file_size is not None:
+        # Python ignores SIGXFSZ, so writing past the limit raises an OSError (EFBIG) instead of killing the process
+        resource_limits.append((resource.RLIMIT_FSIZE, (limits.file_size, limits.file_size)))
+
+    # In a cgroup, the memory and the processes of the whole command are limited by the cgroup instead
+    if limits.memory is not None and limits.cgroup is None:
+        resource_limits.append((resource.RLIMIT_AS, (limits.memory, limits.memory)))
+
+    if limits.processes is not None and limits.cgroup is None and hasattr(resource, "RLIMIT_NPROC"):
+        resource_limits.append((resource.RLIMIT_NPROC, (limits.processes, limits.processes)))
+
+    # An unprivileged process cannot raise its hard limits, so the limits already set for the grader are kept
+    for index, (resource_name, (soft_limit, hard_limit)) in enumerate(resource_limits):
+        current_hard_limit = resource.getrlimit(resource_name)[1]
+
+        if current_hard_limit != resource.RLIM_INFINITY:
+            hard_limit = min(hard_limit, current_hard_limit)
+            resource_limits[index] = (resource_name, (min(soft_limit, hard_limit), hard_limit))
+
+    return resource_limits
+
+
+def _kill(process: subprocess.Popen, is_group: bool, cgroup: Optional[_Cgroup] = None) -> None:
+    """
+    Kill a process, or its whole process group, and every process of its cgroup.
+
+    :param process: The process.
+    :param is_group: Whether the process leads a process group of its own.
+    :param cgroup: Optional cgroup the process runs in.
+    """
+    if cgroup is not None:
+        cgroup.kill()
+
+    if not is_group or sys.platform == "win32":
+        process.kill()
+        return
+
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        # Every process of the group already exited
+        pass
+
+
+def _run(
+    command: list[str],
+    current_directory: Optional[str],
+    env_vars: Optional[dict[str, str]],
+    stdout: OutputCapture,
+    stderr: OutputCapture,
+    limits: Optional[ProcessLimits],
+) -> subprocess.CompletedProcess[str]:
+    """
+    Execute a command, reading its output while it runs, and record its resource usage if a stage is being measured.
+
+    :param command: The command to execute
+    :param current_directory: The directory to execute the command in
+    :param env_vars: The environment variables of the subprocess
+    :param stdout: The capture of the stdout of the command
+    :param stderr: The capture of the stderr of the command
+    :param limits: Optional limits of the command
+    :raises ProcessTimeoutError: If the command exceeded its time limits, once it and its children are killed
+    :raises ProcessLimitError: If the command exceeded its other limits, or its cgroup cannot be created
+    :return: The output of the command (returncode, stdout, stderr)
+    """
+    # The standard input is closed, so a call to input() fails instead of waiting forever
+    popen_args: dict[str, Any] = {
+        "stdin": subprocess.DEVNULL,
+        "stdout": subprocess.PIPE,
+        "stderr": subprocess.PIPE,
+        "cwd": current_directory,
+    }
+    is_group = limits is not None and os.name == "posix"
+    resource_limits = _get_resource_limits(limits) if limits is not None else []
+    cgroup = _Cgroup(limits) if limits is not None and limits.cgroup is not None else None
+
+    if is_group:
+        popen_args["start_new_session"] = True
+
+    if (resource_limits or cgroup is not None) and sys.platform != "win32":
+
+        def prepare_process() -> None:
+            # Runs between fork and exec: setrlimit and write take no lock, so it is safe with the threads of the grader
+            if cgroup is not None:
+                cgroup.join()
+            for resource_limit in resource_limits:
+                resource.setrlimit(*resource_limit)
+
+        popen_args["preexec_fn"] = prepare_process
+
+    is_measured = is_measuring() and hasattr(os, "wait4")
+    timeout = limits.timeout if limits is not None else None
+    is_timed_out = False
+    deadline: Optional[float] = None
+    oom_kills = 0
+
+    with ExitStack() as stack:
+        if cgroup is not None:
+            stack.enter_context(cgroup)
+
+        process = stack.enter_context(
+            _MeasuredPopen(command, env=env_vars, **popen_args)
+            if is_measured
+            else subprocess.Popen(command, env=env_vars, **popen_args)
+        )
+        readers = [
+            threading.Thread(target=_read_output, args=(process.stdout, stdout), daemon=True),
+            threading.Thread(target=_read_output, args=(process.stderr, stderr), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+
+        try:
+            if is_group or timeout is not None:
+                try:
+                    process.wait(timeout)
+                except subprocess.TimeoutExpired:
+                    is_timed_out = True
+
+                # The processes the command left behind would keep the output open
+                if is_timed_out or is_group:
+                    _kill(process, is_group, cgroup)
+                    deadline = time.monotonic() + const.PROCESS_KILL_GRACE_PERIOD
+
+            for reader in readers:
+                reader.join(None if deadline is None else max(deadline - time.monotonic(), 0))
+
+            if any(reader.is_alive() for reader in readers):
+                # A process which left the group of the command (e.g. with setsid) still holds the output open.
+                # The daemon readers are abandoned, closing the streams once that process closes them.
+                logger.warning(
+                    "%s left processes holding its output open, stopped reading it", os.path.basename(command[0])
+                )
+                process.stdout = process.stderr = None
+
+            process.wait()
+        except BaseException:
+            _kill(process, is_group, cgroup)
+            raise
+
+        if cgroup is not None:
+            oom_kills = cgroup.get_oom_kills()
+
+    if isinstance(process, _MeasuredPopen) and process.rusage is not None:
+        # ru_maxrss is in bytes on macOS and in KiB elsewhere
+        peak_rss = process.rusage.ru_maxrss // 1024 if sys.platform == "darwin" else process.rusage.ru_maxrss
+        record_subprocess_usage(
+            process.rusage.ru_utime + process.rusage.ru_stime,
+            peak_rss,
+            process.rusage.ru_inblock,
+            process.rusage.ru_oublock,
+        )
+
+    executable = os.path.basename(command[0])
+
+    if is_timed_out:
+        raise ProcessTimeoutError(f"{executable} did not finish within {timeout:g} seconds")
+
+    if limits is not None and sys.platform != "win32":
+        if limits.cpu_time is not None and process.returncode == -signal.SIGXCPU:
+            raise ProcessTimeoutError(f"{executable} used more than {limits.cpu_time:g} seconds of CPU time")
+
+        if limits.file_size is not None and process.returncode == -signal.SIGXFSZ:
+            raise ProcessLimitError(f"{executable} wrote a file larger than {limits.file_size} bytes")
+
+        if oom_kills > 0 and process.returncode == -signal.SIGKILL:
+            raise ProcessLimitError(f"{executable} was killed for using more than {limits.memory} bytes of memory")
+
+    return subprocess.CompletedProcess(command, process.returncode, stdout.getvalue(), stderr.getvalue())
+
 
 def run(
-    command: list[str], current_directory: Optional[str] = None, env_vars: Optional[dict[str, str]] = None
+    command: list[str],
+    current_directory: Optional[str] = None,
+    env_vars: Optional[dict[str, str]] = None,
+    on_stdout_line: Optional[LineCallback] = None,
+    on_stderr_line: Optional[LineCallback] = None,
+    max_output_size: Optional[int] = const.PROCESS_MAX_OUTPUT_SIZE,
+    spill_path: Optional[str] = None,
+    limits: Optional[ProcessLimits] = None,
 ) -> subprocess.CompletedProcess[str]:
     """
     Execute a command in the terminal.
 
-    Wraps the subprocess.run function, with the check=False, capture_output=True and text=True flags.
+    Works like the subprocess.run function with the check=False, capture_output=True and text=True flags, except
+    that the output is read while the command runs: each stream keeps only its first and last max_output_size / 2
+    characters, and its lines are passed to the callbacks as they are printed.
 
     If the command passes, log the stdout.
     If the command fails, log the returncode, stdout and stderr.
+    If instrumentation is active, the command is measured as a stage of its own ("process:<executable>"),
+    and its resource usage is added to the stages running around it as well.
+    With limits, the command runs in a process group of its own (and in a cgroup of its own, if the limits have one),
+    killed as a whole when the command exceeds its time limit, or once the command exits, so no process it started
+    survives it. A process which left the group is not waited for: its output is read for a grace period at most.
 
     :param command: The command to execute
     :param current_directory: The directory to execute the command in
     :param env_vars: A dictionary of environment variables to set for the subprocess
+    :param on_stdout_line: Optional callback receiving each line of the stdout, without its line ending
+    :param on_stderr_line: Optional callback receiving each line of the stderr, without its line ending
+    :param max_output_size: The amount of characters of each stream kept in memory, or None to keep everything
+    :param spill_path: Optional path prefix of the files (<spill_path>.stdout and <spill_path>.stderr) receiving
+        the characters dropped from the middle of each stream
+    :param limits: Optional time and resource limits of the command
+    :raises ProcessTimeoutError: If the command exceeded its time limits, once it and its children are killed
+    :raises ProcessLimitError: If the command was killed for exceeding its memory or file size limits, or if its
+        cgroup cannot be created
+    :raises Exception: The first error raised by a callback, once the command exited
     :return: The output of the command (returncode, stdout, stderr)
     """
     logger.debug(
@@ -39,7 +737,20 @@ def run(
             if key not in env_vars:
                 env_vars[key] = value
 
-    output = subprocess.run(command, check=False, capture_output=True, text=True, cwd=current_directory, env=env_vars)
+    stdout = OutputCapture(max_output_size, f"{spill_path}.stdout" if spill_path is not None else None, on_stdout_line)
+    stderr = OutputCapture(max_output_size, f"{spill_path}.stderr" if spill_path is not None else None, on_stderr_line)
+
+    if Instrumentation.active is not None:
+        with measure(f"process:{os.path.basename(command[0])}"):
+            output = _run(command, current_directory, env_vars, stdout, stderr, limits)
+    else:
+        output = _run(command, current_directory, env_vars, stdout, stderr, limits)
+
+    for name, capture in (("stdout", stdout), ("stderr", stderr)):
+        if capture.is_truncated:
+            logger.warning("The %s of %s was truncated, it printed %d characters", name, command[0], capture.size)
+        if capture.error is not None:
+            raise capture.error
 
     if output.returncode != 0:
         logger.debug("Command failed: %d %s %s", output.returncode, output.stdout, output.stderr)
@@ -0,0 +1,421 @@
+"""
+Module containing the project index.
+
+The index lists the files and directories of a project with a single walk of the tree,
+so the checks do not walk the project again for each question they ask about its files.
+"""
+
+import hashlib
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+import grader.utils.constants as const
+
+
+def glob_to_regex(pattern: str) -> re.Pattern[str]:
+    """
+    Translate a glob pattern, like the ones accepted by Path.glob, into a regex matching relative paths.
+
+    `**` matches any amount of directories, `*` and `?` do not match the path separator.
+    Like Path.glob from Python 3.13, a trailing `**` matches both files and directories.
+
+    :param pattern: The glob pattern. It must use / as the path separator.
+    :return: The compiled regex, matching paths which use / as the separator.
+    """
+    parts = [part for part in pattern.split("/") if part not in ("", ".")]
+    regex = ""
+
+    for index, part in enumerate(parts):
+        is_last = index == len(parts) - 1
+
+        if part == "**" and not is_last:
+            regex += "(?:[^/]+/)*"
+            continue
+
+        # A trailing ** matches the directory it starts from too
+        if part == "**":
+            regex = f"{regex[:-1]}(?:/[^/]+)*" if regex.endswith("/") else f"{regex}[^/]+(?:/[^/]+)*"
+            continue
+
+        regex += translate_glob_part(part)
+
+        if not is_last:
+            regex += "/"
+
+    return re.compile(regex, re.IGNORECASE if os.name == "nt" else 0)
+
+
+def translate_glob_part(part: str) -> str:
+    """
+    Translate a single component of a glob pattern into a regex.
+
+    :param part: The component, without path separators.
+    :return: The regex.
+    """
+    regex = ""
+    index = 0
+
+    while index < len(part):
+        char = part[index]
+        index += 1
+
+        if char == "*":
+            regex += "[^/]*"
+            continue
+
+        if char == "?":
+            regex += "[^/]"
+            continue
+
+        # A ] right after [ or [! is part of the set, not its end
+        end = part.find("]", index + 1 if part[index : index + 1] in ("!", "]") else index) if char == "[" else -1
+
+        if end == -1:
+            regex += re.escape(char)
+            continue
+
+        characters = part[index:end].replace("\\", "\\\\")
+        regex += f"[^{characters[1:]}]" if characters.startswith("!") else f"[{characters}]"
+        index = end + 1
+
+    return regex
+
+
+@dataclass(frozen=True)
+class GitignoreRule:
+    """Class representing a single pattern of a .gitignore file."""
+
+    base_directory: str
+    regex: re.Pattern[str]
+    is_negated: bool
+    is_directory_only: bool
+
+    def matches(self, relative_path: str, is_directory: bool) -> bool:
+        """
+        Check if the rule matches a path.
+
+        :param relative_path: The path, relative to the project root and with / as the separator.
+        :param is_directory: Whether the path is a directory.
+        :return: True if the rule matches the path, False otherwise.
+        """
+        if self.is_directory_only and not is_directory:
+            return False
+
+        if not relative_path.startswith(self.base_directory):
+            return False
+
+        return re.fullmatch(self.regex, relative_path[len(self.base_directory) :]) is not None
+
+
+def parse_gitignore(content: str, base_directory: str) -> list[GitignoreRule]:
+    """
+    Parse the patterns of a .gitignore file.
+
+    :param content: The contents of the .gitignore file.
+    :param base_directory: The directory of the file, relative to the project root, with a trailing / (or empty).
+    :return: The rules of the file, in order.
+    """
+    lines = content.splitlines()
+    rules = []
+
+    for line in lines:
+        pattern = line.rstrip()
+
+        if not pattern or pattern.startswith("#"):
+            continue
+
+        is_negated = pattern.startswith("!")
+        pattern = pattern[1:] if is_negated else pattern.removeprefix("\\")
+
+        is_directory_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+
+        # Patterns without a slash (except a trailing one) match at any depth below the .gitignore file
+        if "/" not in pattern:
+            pattern = f"**/{pattern}"
+
+        if pattern:
+            rules.append(GitignoreRule(base_directory, glob_to_regex(pattern), is_negated, is_directory_only))
+
+    return rules
+
+
+def is_ignored_directory(relative_path: str) -> bool:
+    """
+    Check if a directory is one of IGNORE_DIRS, comparing whole path components.
+
+    :param relative_path: The path to the directory, relative to the project root and with / as the separator.
+    :return: True if the directory is ignored, False otherwise.
+    """
+    for ignored in const.IGNORE_DIRS:
+        ignored = ignored.replace(os.sep, "/")
+
+        if relative_path == ignored or relative_path.endswith(f"/{ignored}"):
+            return True
+
+    return False
+
+
+def is_ignored_by_gitignore(relative_path: str, is_directory: bool, rules: list[GitignoreRule]) -> bool:
+    """
+    Check if a path is ignored by .gitignore rules. Like git, the last matching rule decides.
+
+    :param relative_path: The path, relative to the project root and with / as the separator.
+    :param is_directory: Whether the path is a directory.
+    :param rules: The rules, in the order they are read - parent directories first.
+    :return: True if the path is ignored, False otherwise.
+    """
+    for rule in reversed(rules):
+        if rule.matches(relative_path, is_directory):
+            return not rule.is_negated
+
+    return False
+
+
+class ProjectIndex:
+    """
+    Index of the files and directories of a project.
+
+    The project is walked once, on first use. The directories in IGNORE_DIRS are skipped as a whole,
+    and so are the files and directories ignored by .gitignore files, if enabled.
+    The index can be shared between checks running in different threads.
+    """
+
+    def __init__(self, project_root: str, is_respecting_gitignore: bool = False):
+        """
+        Initialize the project index.
+
+        :param project_root: The root directory of the project.
+        :param is_respecting_gitignore: Whether to skip the files and directories ignored by .gitignore files.
+        """
+        self.__project_root = project_root
+        self.__is_respecting_gitignore = is_respecting_gitignore
+        self.__lock = threading.Lock()
+        self.__files: Optional[list[str]] = None
+        self.__directories: Optional[list[str]] = None
+
+    @property
+    def project_root(self) -> str:
+        """
+        Get the root directory of the project.
+
+        :returns: The root directory of the project.
+        :rtype: str
+        """
+        return self.__project_root
+
+    @property
+    def python_files(self) -> list[str]:
+        """
+        Get all python files of the project.
+
+        :returns: The absolute paths to the python files.
+        :rtype: list[str]
+        """
+        return [self.__to_path(file) for file in self.__get_files() if file.endswith(".py")]
+
+    @property
+    def source_files(self) -> list[str]:
+        """
+        Get the python files of the project which are not in the tests directory.
+
+        :returns: The absolute paths to the source files.
+        :rtype: list[str]
+        """
+        tests_directory = self.tests_directory
+
+        if tests_directory is None:
+            return self.python_files
+
+        return [
+            self.__to_path(file)
+            for file in self.__get_files()
+            if file.endswith(".py") and not file.startswith(f"{tests_directory}/")
+        ]
+
+    @property
+    def tests_directory(self) -> Optional[str]:
+        """
+        Get the name of the tests directory of the project.
+
+        :returns: The name of the first of POSSIBLE_TEST_DIRS in the project root, or None if there is none.
+        :rtype: Optional[str]
+        """
+        top_level_entries = {entry for entry in self.entries if "/" not in entry}
+        return next((directory for directory in const.POSSIBLE_TEST_DIRS if directory in top_level_entries), None)
+
+    @property
+    def entries(self) -> list[str]:
+        """
+        Get all files and directories of the project.
+
+        :returns: The paths to the files and directories, relative to the project root and with / as the separator.
+        :rtype: list[str]
+        """
+        return self.__get_files() + self.__get_directories()
+
+    def glob(self, pattern: str) -> list[str]:
+        """
+        Get the files and directories matching a glob pattern, relative to the project root.
+
+        :param pattern: The glob pattern, e.g. src/**/*.py.
+        :return: The absolute paths to the matching files and directories.
+        """
+        regex = glob_to_regex(pattern.replace(os.sep, "/"))
+        return [self.__to_path(entry) for entry in self.entries if regex.fullmatch(entry)]
+
+    def compute_fingerprint(self, is_including_contents: bool = True) -> str:
+        """
+        Compute a fingerprint of the project, which changes whenever a file or directory of the index changes.
+
+        :param is_including_contents: Whether the contents of the files are part of the fingerprint,
+                                      or only the paths of the files and directories.
+        :return: The fingerprint.
+        """
+        digest = hashlib.sha256()
+
+        for file in self.__get_files():
+            file_hash = self._hash_file(file) if is_including_contents else ""
+            digest.update(f"f {file} {file_hash}\n".encode("utf-8"))
+
+        for directory in self.__get_directories():
+            digest.update(f"d {directory}\n".encode("utf-8"))
+
+        return digest.hexdigest()
+
+    def __get_files(self) -> list[str]:
+        """
+        Get the files of the project, walking the project on first use.
+
+        :return: The paths to the files, relative to the project root and with / as the separator.
+        """
+        self.__build()
+        assert self.__files is not None
+        return self.__files
+
+    def __get_directories(self) -> list[str]:
+        """
+        Get the directories of the project, walking the project on first use.
+
+        :return: The paths to the directories, relative to the project root and with / as the separator.
+        """
+        self.__build()
+        assert self.__directories is not None
+        return self.__directories
+
+    def __build(self) -> None:
+        """Walk the project, unless it was already walked."""
+        with self.__lock:
+            if self.__files is not None:
+                return
+
+            files: list[str] = []
+            directories: list[str] = []
+            self.__walk("", files, directories, [])
+
+            self.__files = files
+            self.__directories = directories
+
+    def _list_directory(self, relative_directory: str) -> list[tuple[str, bool, bool]]:
+        """
+        List the entries of a directory of the project.
+
+        :param relative_directory: The directory, relative to the project root, with a trailing / (or empty).
+        :return: The name of each entry, whether it is a directory and whether it is a symlink.
+                 If the directory cannot be read, an empty list.
+        """
+        try:
+            with os.scandir(os.path.join(self.__project_root, relative_directory)) as entries:
+                listing = []
+
+                for entry in entries:
+                    try:
+                        listing.append((entry.name, entry.is_dir(), entry.is_symlink()))
+                    except OSError:
+                        continue
+
+                return listing
+        except OSError:
+            return []
+
+    def _read_text(self, relative_path: str) -> Optional[str]:
+        """
+        Read a text file of the project.
+
+        :param relative_path: The path to the file, relative to the project root and with / as the separator.
+        :return: The contents of the file, or None if it cannot be read.
+        """
+        path = os.path.join(self.__project_root, *relative_path.split("/"))
+
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as text_file:
+                return text_file.read()
+        except OSError:
+            return None
+
+    def _hash_file(self, relative_path: str) -> str:
+        """
+        Hash the contents of a file of the project.
+
+        :param relative_path: The path to the file, relative to the project root and with / as the separator.
+        :return: The hash of the contents, or an empty string if the file cannot be read.
+        """
+        path = os.path.join(self.__project_root, *relative_path.split("/"))
+
+        try:
+            with open(path, "rb") as file:
+                return hashlib.file_digest(file, "sha256").hexdigest()
+        except OSError:
+            return ""
+
+    def __walk(
+        self,
+        relative_directory: str,
+        files: list[str],
+        directories: list[str],
+        gitignore_rules: list[GitignoreRule],
+    ) -> None:
+        """
+        Walk a directory recursively, skipping the ignored directories.
+
+        :param relative_directory: The directory, relative to the project root, with a trailing / (or empty).
+        :param files: The list the relative paths of the files are added to.
+        :param directories: The list the relative paths of the directories are added to.
+        :param gitignore_rules: The .gitignore rules of the parent directories.
+        """
+        entries = sorted(self._list_directory(relative_directory))
+
+        if self.__is_respecting_gitignore and any(name == ".gitignore" for name, _, _ in entries):
+            content = self._read_text(f"{relative_directory}.gitignore")
+            gitignore_rules = gitignore_rules + parse_gitignore(content or "", relative_directory)
+
+        for name, is_directory, is_symlink in entries:
+            relative_path = f"{relative_directory}{name}"
+
+            if is_ignored_by_gitignore(relative_path, is_directory, gitignore_rules):
+                continue
+
+            if not is_directory:
+                files.append(relative_path)
+                continue
+
+            if is_ignored_directory(relative_path):
+                continue
+
+            directories.append(relative_path)
+
+            # Symlinked directories are listed, but not walked, to avoid cycles
+            if not is_symlink:
+                self.__walk(f"{relative_path}/", files, directories, gitignore_rules)
+
+    def __to_path(self, relative_path: str) -> str:
+        """
+        Turn a path relative to the project root into an absolute path.
+
+        :param relative_path: The relative path, with / as the separator.
+        :return: The absolute path.
+        """
+        return os.path.join(os.path.abspath(self.__project_root), *relative_path.split("/"))
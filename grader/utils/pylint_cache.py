@@ -0,0 +1,182 @@
+"""
+Module containing the per-file pylint results cache.
+
+Pylint messages of a file depend on its contents and path, the pylint configuration and the other linted files
+(e.g. import-error, cyclic-import or duplicate-code), so the messages and statement count of each file are stored
+under a fingerprint of all the linted files. The global score is then recomputed from the per-file data,
+the same way pylint computes it.
+"""
+
+import ast
+import hashlib
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+from grader.utils.file_cache import FileCache
+
+# Bump when the format of the cache entries changes
+PYLINT_CACHE_FORMAT_VERSION = 2
+
+# Options in the rcfile which change how the score is computed - the score cannot be recomputed with them
+PYLINT_EVALUATION_OPTION_PATTERN = re.compile(r"^\s*evaluation\s*=", re.MULTILINE)
+
+
+@dataclass
+class PylintMessage:
+    """A single pylint message."""
+
+    line: int
+    column: int
+    msg_id: str
+    text: str
+
+    @property
+    def category(self) -> str:
+        """Return the category of the message - (C)onvention, (R)efactor, (W)arning, (E)rror, (F)atal or (I)nfo."""
+        return self.msg_id[0]
+
+
+@dataclass
+class PylintFileResult:
+    """The pylint results of a single file."""
+
+    statements: int
+    messages: list[PylintMessage] = field(default_factory=list)
+
+
+def count_statements(source: bytes) -> int:
+    """
+    Count the statements in a python file, the way pylint does.
+
+    Pylint counts the statement nodes of the astroid tree. Astroid does not keep docstrings as statements
+    and treats except handlers as statements, which is accounted for here.
+
+    :param source: The contents of the file.
+    :return: The amount of statements, or 0 if the file cannot be parsed.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return 0
+
+    statements = 0
+
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.stmt, ast.ExceptHandler)):
+            statements += 1
+
+        if isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            if ast.get_docstring(node, clean=False) is not None:
+                statements -= 1
+
+    return statements
+
+
+def group_pylint_messages(messages: list[dict]) -> dict[str, list[PylintMessage]]:
+    """
+    Group the messages from the pylint JSON report by file.
+
+    :param messages: The messages from the pylint JSON report.
+    :return: The messages, keyed by the absolute path of their file.
+    """
+    messages_by_file: dict[str, list[PylintMessage]] = {}
+
+    for message in messages:
+        path = os.path.normpath(message["absolutePath"])
+        text = f"{message['message']} ({message['symbol']})"
+        messages_by_file.setdefault(path, []).append(
+            PylintMessage(message["line"], message["column"], message["messageId"], text)
+        )
+
+    return messages_by_file
+
+
+def compute_pylint_score(results: list[PylintFileResult]) -> Optional[float]:
+    """
+    Compute the global pylint score from per-file results, using pylint's default evaluation.
+
+    :param results: The results of all linted files.
+    :return: The score out of 10, or None if there are no statements (pylint does not rate such code).
+    """
+    statements = sum(result.statements for result in results)
+
+    if statements == 0:
+        return None
+
+    categories = [message.category for result in results for message in result.messages]
+
+    if "F" in categories:
+        return 0.0
+
+    weighted = 5 * categories.count("E") + categories.count("W") + categories.count("R") + categories.count("C")
+    return max(0.0, 10.0 - (weighted / statements) * 10)
+
+
+class PylintCache:
+    """Persistent cache of per-file pylint results."""
+
+    def __init__(self, cache_dir: str):
+        """
+        Initialize the pylint cache.
+
+        :param cache_dir: The directory where the results are stored.
+        """
+        self.__cache = FileCache(cache_dir, "pylint")
+
+    @staticmethod
+    def compute_project_fingerprint(sources: dict[str, bytes]) -> str:
+        """
+        Compute the fingerprint of all the linted files, as the messages of a file depend on the other files.
+
+        :param sources: The contents of each linted file, keyed by its path relative to the project root.
+        :return: The fingerprint.
+        """
+        return FileCache.compute_key(
+            {relative_path: hashlib.sha256(source).hexdigest() for relative_path, source in sources.items()}
+        )
+
+    @staticmethod
+    def compute_key(relative_path: str, project_fingerprint: str, rcfile_hash: str, pylint_version: str) -> str:
+        """
+        Compute the cache key of a file.
+
+        :param relative_path: The path of the file, relative to the project root (it is part of the messages).
+        :param project_fingerprint: The fingerprint of all the linted files, see compute_project_fingerprint.
+        :param rcfile_hash: The hash of the pylint configuration.
+        :param pylint_version: The version of pylint.
+        :return: The cache key.
+        """
+        return FileCache.compute_key(
+            {
+                "format": PYLINT_CACHE_FORMAT_VERSION,
+                "path": relative_path,
+                "project": project_fingerprint,
+                "rcfile": rcfile_hash,
+                "pylint": pylint_version,
+            }
+        )
+
+    def get(self, key: str) -> Optional[PylintFileResult]:
+        """
+        Get the cached results of a file.
+
+        :param key: The cache key.
+        :return: The results, or None if they are not cached (or the entry is invalid).
+        """
+        return self.__cache.load(
+            key,
+            lambda entry: PylintFileResult(
+                entry["statements"], [PylintMessage(**message) for message in entry["messages"]]
+            ),
+        )
+
+    def put(self, key: str, result: PylintFileResult) -> None:
+        """
+        Store the results of a file. Failing to store is not fatal.
+
+        :param key: The cache key.
+        :param result: The results of the file.
+        """
+        self.__cache.store(key, asdict(result))
@@ -0,0 +1,148 @@
+"""
+Module containing the shared pytest session.
+
+The tests and coverage checks both run the project tests. When they run the same tests,
+the tests are executed once under coverage and both checks read the results of that single run.
+"""
+
+import logging
+import os
+import threading
+import uuid
+from subprocess import CompletedProcess
+from typing import Optional
+
+import grader.utils.constants as const
+from grader.exceptions import ProcessLimitError
+from grader.utils import process
+from grader.utils.constants import (
+    COVERAGE_PATH,
+    COVERAGE_RUN_ARGS,
+    COVERAGE_RUN_PYTEST_ARGS,
+    PYTEST_ARGS,
+    PYTEST_JUNIT_XML_ARG,
+    PYTEST_ROOT_DIR_ARG,
+)
+from grader.utils.logger import VERBOSE
+
+logger = logging.getLogger("grader")
+
+
+def new_junit_report_path() -> str:
+    """
+    Get a unique path for a pytest JUnit XML report, in the temporary files directory.
+
+    Pytest creates the directory of the report if it does not exist.
+
+    :return: The path to the report.
+    """
+    return os.path.join(const.TEMP_FILES_DIR, f"junit-{uuid.uuid4().hex}.xml")
+
+
+def remove_junit_report(report_path: Optional[str]) -> None:
+    """
+    Remove a pytest JUnit XML report once it is read, so the reports do not pile up in a long-running worker.
+
+    :param report_path: Optional path to the report. Nothing is removed if the report does not exist.
+    """
+    if report_path is None:
+        return
+
+    try:
+        os.remove(report_path)
+    except FileNotFoundError:
+        pass
+    except OSError as error:
+        logger.warning("Cannot remove the pytest report %s: %s", report_path, error)
+
+
+class PytestSession:
+    """A single pytest run under coverage, shared by the checks which need it."""
+
+    def __init__(
+        self,
+        project_root: str,
+        env_vars: Optional[dict[str, str]] = None,
+        limits: Optional[process.ProcessLimits] = None,
+    ):
+        """
+        Initialize the pytest session.
+
+        :param project_root: The root directory of the project.
+        :param env_vars: Optional environment variables for the run.
+        :param limits: Optional limits of the run.
+        """
+        self.__project_root = project_root
+        self.__env_vars = env_vars
+        self.__limits = limits
+        self.__lock = threading.Lock()
+        self.__result: Optional[CompletedProcess] = None
+        self.__limit_error: Optional[ProcessLimitError] = None
+        self.__report_path: Optional[str] = None
+
+    @property
+    def report_path(self) -> Optional[str]:
+        """
+        Get the path to the JUnit XML report of the run.
+
+        :returns: The path to the report, or None if the tests have not been run yet.
+        :rtype: Optional[str]
+        """
+        return self.__report_path
+
+    def run(self, tests_path: list[str]) -> CompletedProcess:
+        """
+        Run the tests under coverage, unless they were already run by another check.
+
+        The coverage data file is left in the project root, for the coverage report.
+        The per-test results are written to a JUnit XML report, see report_path.
+
+        :param tests_path: The paths to the test files.
+        :raises OSError: If the tests cannot be run.
+        :raises ValueError: If the tests cannot be run.
+        :raises ProcessLimitError: If the run exceeded its limits.
+        :return: The result of the run - the pytest output and return code.
+        """
+        with self.__lock:
+            # A run which exceeded its limits is not run again for the next check, it would exceed them as well
+            if self.__limit_error is not None:
+                raise self.__limit_error
+
+            if self.__result is None:
+                try:
+                    self.__result = self.__run(tests_path)
+                except ProcessLimitError as error:
+                    self.__limit_error = error
+                    raise
+            else:
+                logger.log(VERBOSE, "Reusing the results of the shared pytest run")
+
+            return self.__result
+
+    def __run(self, tests_path: list[str]) -> CompletedProcess:
+        """
+        Run pytest under coverage.
+
+        :param tests_path: The paths to the test files.
+        :return: The result of the run.
+        """
+        if os.path.isabs(self.__project_root):
+            pytest_root_dir = PYTEST_ROOT_DIR_ARG.format(self.__project_root)
+        else:
+            pytest_root_dir = PYTEST_ROOT_DIR_ARG.format(os.path.join(os.getcwd(), self.__project_root))
+
+        self.__report_path = new_junit_report_path()
+
+        command = [COVERAGE_PATH] + COVERAGE_RUN_ARGS + COVERAGE_RUN_PYTEST_ARGS + PYTEST_ARGS + [pytest_root_dir]
+        command += [PYTEST_JUNIT_XML_ARG.format(self.__report_path)] + tests_path
+
+        pythonpath_env = process.extend_env_variable("PYTHONPATH", self.__project_root)
+
+        if self.__env_vars is not None:
+            merged_env = {**self.__env_vars, **pythonpath_env}
+        else:
+            merged_env = pythonpath_env
+
+        logger.log(VERBOSE, "Running the shared pytest run under coverage")
+
+        return process.run(command, current_directory=self.__project_root, env_vars=merged_env, limits=self.__limits)
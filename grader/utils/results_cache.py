@@ -0,0 +1,155 @@
+"""
+Module containing the persistent cache of check results.
+
+The result of a check depends on the project, the configuration of the check (and the contents of the files it points
+to, e.g. a pylintrc or the instructor's tests), the root-level configuration and the versions of the grader and of
+the tools it installs. Each check has its own entry, keyed by all of them, so regrading an unchanged submission
+returns the stored results, and only the checks whose inputs changed run again.
+"""
+
+import hashlib
+from dataclasses import asdict
+from typing import Any, Optional
+
+import grader.utils.constants as const
+from grader.checks.abstract_check import CheckResult, NonScoredCheckResult, ScoredCheckResult
+from grader.utils.file_cache import FileCache
+
+# Bump when the format of the cache entries changes
+RESULTS_CACHE_FORMAT_VERSION = 2
+
+# Root-level options which do not change the results of the checks
+RESULTS_CACHE_IGNORED_OPTIONS = {"checks", "max_parallel_checks", "results_cache_dir", "archive"}
+
+
+def get_tools_fingerprint() -> str:
+    """
+    Hash the requirements of the grader tools (pylint, mypy, pytest...) installed in the virtual environments.
+
+    :return: The hash of the requirements, or an empty string if they cannot be read.
+    """
+    try:
+        with open(const.GRADER_REQUIREMENTS, "rb") as requirements_file:
+            return hashlib.sha256(requirements_file.read()).hexdigest()
+    except OSError:
+        return ""
+
+
+def compute_files_fingerprint(paths: list[str]) -> str:
+    """
+    Hash the contents of the files the configuration of a check points to.
+
+    :param paths: The paths to the files.
+    :return: The hash of the paths and of the contents of the files, missing files included as such.
+    """
+    digest = hashlib.sha256()
+
+    for path in paths:
+        try:
+            with open(path, "rb") as file:
+                file_hash = hashlib.file_digest(file, "sha256").hexdigest()
+        except OSError:
+            file_hash = "missing"
+
+        digest.update(f"{path} {file_hash}\n".encode("utf-8"))
+
+    return digest.hexdigest()
+
+
+def serialize_check_result(result: CheckResult) -> dict[str, Any]:
+    """
+    Turn a check result into a cache entry.
+
+    :param result: The result of a check.
+    :return: The cache entry.
+    """
+    match result:
+        case ScoredCheckResult():
+            kind = "scored"
+        case NonScoredCheckResult():
+            kind = "non-scored"
+        case _:
+            kind = "plain"
+
+    return {"kind": kind, **asdict(result)}
+
+
+def parse_check_result(entry: dict[str, Any]) -> CheckResult:
+    """
+    Build a check result from a cache entry.
+
+    :param entry: The cache entry.
+    :raises KeyError: If the entry is incomplete or of an unknown kind.
+    :return: The result of the check.
+    """
+    fields = (entry["name"], entry["result"], entry["info"], entry["error"])
+
+    match entry["kind"]:
+        case "scored":
+            return ScoredCheckResult(*fields, entry["max_score"], entry["metrics"], entry.get("is_timed_out", False))
+        case "non-scored":
+            return NonScoredCheckResult(*fields)
+        case "plain":
+            return CheckResult(*fields)
+
+    raise KeyError(f"Unknown check result kind: {entry['kind']}")
+
+
+class ResultsCache:
+    """Persistent cache of check results."""
+
+    def __init__(self, cache_dir: str, config: dict):
+        """
+        Initialize the results cache.
+
+        :param cache_dir: The directory where the results are stored.
+        :param config: The configuration of the grader. The root-level options which change the results
+                       are part of the keys.
+        """
+        self.__cache = FileCache(cache_dir, "results")
+        self.__shared_config = {key: value for key, value in config.items() if key not in RESULTS_CACHE_IGNORED_OPTIONS}
+        self.__tools_fingerprint = get_tools_fingerprint()
+
+    def compute_key(
+        self, check_name: str, check_config: dict, project_fingerprint: str, files_fingerprint: str = ""
+    ) -> str:
+        """
+        Compute the cache key of a check.
+
+        :param check_name: The name of the class of the check.
+        :param check_config: The configuration of the check.
+        :param project_fingerprint: The fingerprint of the project files the check depends on.
+        :param files_fingerprint: The fingerprint of the files the configuration of the check points to,
+                                  see compute_files_fingerprint.
+        :return: The cache key.
+        """
+        return FileCache.compute_key(
+            {
+                "format": RESULTS_CACHE_FORMAT_VERSION,
+                "grader": const.VERSION,
+                "tools": self.__tools_fingerprint,
+                "check": check_name,
+                "check_config": check_config,
+                "config": self.__shared_config,
+                "project": project_fingerprint,
+                "files": files_fingerprint,
+            }
+        )
+
+    def get(self, key: str) -> Optional[CheckResult]:
+        """
+        Get the cached result of a check.
+
+        :param key: The cache key.
+        :return: The result, or None if it is not cached (or the entry is invalid).
+        """
+        return self.__cache.load(key, parse_check_result)
+
+    def put(self, key: str, result: CheckResult) -> None:
+        """
+        Store the result of a check. Failing to store is not fatal.
+
+        :param key: The cache key.
+        :param result: The result of the check.
+        """
+        self.__cache.store(key, serialize_check_result(result))
@@ -3,9 +3,11 @@
 import json
 import sys
 from abc import ABC, abstractmethod
-from typing import TextIO
+from dataclasses import asdict
+from typing import Optional, TextIO
 
 from grader.checks.abstract_check import CheckResult, NonScoredCheckResult, ScoredCheckResult
+from grader.utils.instrumentation import StageMetrics, StageSummary, summarize_stages
 
 
 class ResultsReporter(ABC):
@@ -21,6 +23,7 @@ class ResultsReporter(ABC):
         results: list[CheckResult],
         verbose: bool,
         file_descriptor: TextIO = sys.stdout,
+        timings: Optional[list[StageMetrics]] = None,
     ) -> None:
         """
         Display the results in a specific format.
@@ -28,18 +31,55 @@ class ResultsReporter(ABC):
         :param results: A list of CheckResult objects to display.
         :param verbose: Whether to include info and error fields in the output.
         :param file_descriptor: The file descriptor to write the output to, defaults to sys.stdout.
+        :param timings: The metrics of the stages of the grading, included in the output if given.
         """
 
     @abstractmethod
-    def to_string(self, results: list[CheckResult], verbose: bool) -> str:
+    def to_string(self, results: list[CheckResult], verbose: bool, timings: Optional[list[StageMetrics]] = None) -> str:
         """
         Convert the results to a string in a specific format.
 
         :param results: A list of CheckResult objects to convert.
         :param verbose: Whether to include info and error fields in the output.
+        :param timings: The metrics of the stages of the grading, included in the output if given.
         :return: A string representation of the results in a specific format.
         """
 
+    @abstractmethod
+    def batch_to_string(
+        self,
+        results: dict[str, list[CheckResult]],
+        verbose: bool,
+        timings: Optional[dict[str, list[StageMetrics]]] = None,
+    ) -> str:
+        """
+        Convert the results of multiple submissions to a single string in a specific format.
+
+        :param results: A mapping of submission id to the list of CheckResult objects of that submission.
+        :param verbose: Whether to include info and error fields in the output.
+        :param timings: A mapping of submission id to the metrics of the stages of that submission.
+                        If given, they are included in the output, with a summary of each stage across the batch.
+        :return: A string representation of the aggregated results in a specific format.
+        """
+
+    def display_batch(
+        self,
+        results: dict[str, list[CheckResult]],
+        verbose: bool,
+        file_descriptor: TextIO = sys.stdout,
+        timings: Optional[dict[str, list[StageMetrics]]] = None,
+    ) -> None:
+        """
+        Display the results of multiple submissions as one report.
+
+        :param results: A mapping of submission id to the list of CheckResult objects of that submission.
+        :param verbose: Whether to include info and error fields in the output.
+        :param file_descriptor: The file descriptor to write the output to, defaults to sys.stdout.
+        :param timings: A mapping of submission id to the metrics of the stages of that submission.
+        """
+        output = self.batch_to_string(results, verbose, timings)
+        self._to_file_descriptor(output, file_descriptor)
+
     def _to_file_descriptor(self, content: str, file_descriptor: TextIO) -> None:
         """Write the content to the specified file descriptor.
 
@@ -62,6 +102,7 @@ class JSONResultsReporter(ResultsReporter):
         results: list[CheckResult],
         verbose: bool,
         file_descriptor: TextIO = sys.stdout,
+        timings: Optional[list[StageMetrics]] = None,
     ) -> None:
         """
         Display the results in JSON format.
@@ -69,35 +110,113 @@ class JSONResultsReporter(ResultsReporter):
         :param results: A list of CheckResult objects to display.
         :param verbose: Whether to include info and error fields in the output.
         :param file_descriptor: The file descriptor to write the output to.
+        :param timings: The metrics of the stages of the grading, included in the output if given.
         """
-        output = self.to_string(results, verbose)
+        output = self.to_string(results, verbose, timings)
         self._to_file_descriptor(output, file_descriptor)
 
-    def to_string(self, results: list[CheckResult], verbose: bool) -> str:
+    def to_string(self, results: list[CheckResult], verbose: bool, timings: Optional[list[StageMetrics]] = None) -> str:
         """
         Convert the results to a JSON string.
 
         :param results: A list of CheckResult objects to convert.
         :param verbose: Whether to include info and error fields in the output.
+        :param timings: The metrics of the stages of the grading, added as a "timings" list if given.
         :return: A string representation of the results in JSON format.
         """
-        scored_results = [result for result in results if isinstance(result, ScoredCheckResult)]
-        total_score = sum(scored_result.result for scored_result in scored_results)
-        total_max_score = sum(result.max_score for result in scored_results)
-
-        content = {
-            "scored_checks": [result_to_json(result, verbose) for result in scored_results],
-            "non_scored_checks": [
-                result_to_json(result, verbose) for result in results if isinstance(result, NonScoredCheckResult)
-            ],
-            "total_score": total_score,
-            "total_max_score": total_max_score,
-        }
+        content = results_to_json(results, verbose)
+        if timings is not None:
+            content["timings"] = [asdict(metrics) for metrics in timings]
 
         output = json.dumps(content, indent=4)
 
         return output
 
+    def batch_to_string(
+        self,
+        results: dict[str, list[CheckResult]],
+        verbose: bool,
+        timings: Optional[dict[str, list[StageMetrics]]] = None,
+    ) -> str:
+        """
+        Convert the results of multiple submissions to a JSON string.
+
+        :param results: A mapping of submission id to the list of CheckResult objects of that submission.
+        :param verbose: Whether to include info and error fields in the output.
+        :param timings: A mapping of submission id to the metrics of the stages of that submission.
+                        If given, each submission gets a "timings" list, and the report a "timings_summary".
+        :return: A string representation of the aggregated results in JSON format.
+        """
+        submissions = {
+            submission_id: results_to_json(submission_results, verbose)
+            for submission_id, submission_results in results.items()
+        }
+        content: dict = {"submissions": submissions, "total_submissions": len(results)}
+
+        if timings is not None:
+            for submission_id, submission_timings in timings.items():
+                submissions[submission_id]["timings"] = [asdict(metrics) for metrics in submission_timings]
+            content["timings_summary"] = [asdict(summary) for summary in summarize_batch_timings(timings)]
+
+        return json.dumps(content, indent=4)
+
+
+def results_to_json(results: list[CheckResult], verbose: bool) -> dict:
+    """
+    Convert the results of a single submission to a JSON-compatible dictionary.
+
+    :param results: A list of CheckResult objects to convert.
+    :type results: list[CheckResult]
+    :param verbose: Whether to include info and error fields.
+    :type verbose: bool
+    :return: A dictionary with the scored and non-scored checks, and the total scores.
+    :rtype: dict
+    """
+    scored_results = [result for result in results if isinstance(result, ScoredCheckResult)]
+    total_score = sum(scored_result.result for scored_result in scored_results)
+    total_max_score = sum(result.max_score for result in scored_results)
+
+    return {
+        "scored_checks": [result_to_json(result, verbose) for result in scored_results],
+        "non_scored_checks": [
+            result_to_json(result, verbose) for result in results if isinstance(result, NonScoredCheckResult)
+        ],
+        "total_score": total_score,
+        "total_max_score": total_max_score,
+    }
+
+
+def results_from_json(content: dict) -> list[CheckResult]:
+    """
+    Read the results of a single submission back from its JSON report.
+
+    The info and error fields are empty unless the report is verbose.
+
+    :param content: The JSON report of a single submission, as built by results_to_json.
+    :type content: dict
+    :raises KeyError: If the report is incomplete.
+    :return: The scored results, followed by the non-scored results.
+    :rtype: list[CheckResult]
+    """
+    scored_results: list[CheckResult] = [
+        ScoredCheckResult(
+            result["name"],
+            result["score"],
+            result.get("info", ""),
+            result.get("error", ""),
+            result["max_score"],
+            result.get("metrics"),
+            result.get("timed_out", False),
+        )
+        for result in content["scored_checks"]
+    ]
+    non_scored_results: list[CheckResult] = [
+        NonScoredCheckResult(result["name"], result["result"], result.get("info", ""), result.get("error", ""))
+        for result in content["non_scored_checks"]
+    ]
+
+    return scored_results + non_scored_results
+
 
 def result_to_json(check_result: CheckResult, verbose: bool) -> dict:
     """
@@ -161,6 +280,11 @@ def scored_result_to_dict(scored_result: ScoredCheckResult, verbose: bool) -> di
             result_dict["info"] = scored_result.info
         if scored_result.error:
             result_dict["error"] = scored_result.error
+    # The raw metrics are always kept, so the report can be rescored later
+    if scored_result.metrics is not None:
+        result_dict["metrics"] = scored_result.metrics
+    if scored_result.is_timed_out:
+        result_dict["timed_out"] = True
     return result_dict
 
 
@@ -175,6 +299,7 @@ class CSVResultsReporter(ResultsReporter):
         results: list[CheckResult],
         verbose: bool,
         file_descriptor: TextIO = sys.stdout,
+        timings: Optional[list[StageMetrics]] = None,
     ) -> None:
         """
         Display the results in CSV format.
@@ -182,16 +307,18 @@ class CSVResultsReporter(ResultsReporter):
         :param results: A list of CheckResult objects to display.
         :param verbose: Whether to include info and error fields in the output.
         :param file_descriptor: The file descriptor to write the output to.
+        :param timings: The metrics of the stages of the grading, included in the output if given.
         """
-        output = self.to_string(results, verbose)
+        output = self.to_string(results, verbose, timings)
         self._to_file_descriptor(output, file_descriptor)
 
-    def to_string(self, results: list[CheckResult], verbose: bool) -> str:
+    def to_string(self, results: list[CheckResult], verbose: bool, timings: Optional[list[StageMetrics]] = None) -> str:
         """
         Convert the results to a CSV string.
 
         :param results: A list of CheckResult objects to convert.
         :param verbose: Whether to include info and error fields in the output.
+        :param timings: The metrics of the stages of the grading, added as a second table if given.
         :return: A string representation of the results in CSV format.
         """
         scored_results = [result for result in results if isinstance(result, ScoredCheckResult)]
@@ -205,6 +332,47 @@ class CSVResultsReporter(ResultsReporter):
         output += [result_to_csv(check_result, verbose) for check_result in results]
         output.append(f"Total,{total_score},{total_max_score}")
 
+        if timings is not None:
+            output += ["", STAGE_METRICS_CSV_HEADER]
+            output += [stage_metrics_to_csv(metrics) for metrics in timings]
+
+        return "\n".join(output) + "\n"
+
+    def batch_to_string(
+        self,
+        results: dict[str, list[CheckResult]],
+        verbose: bool,
+        timings: Optional[dict[str, list[StageMetrics]]] = None,
+    ) -> str:
+        """
+        Convert the results of multiple submissions to a single CSV string.
+
+        Each row is prefixed with the id of the submission it belongs to.
+        If timings are given, they follow as a second table, and the summary of each stage as a third one.
+
+        :param results: A mapping of submission id to the list of CheckResult objects of that submission.
+        :param verbose: Whether to include info and error fields in the output.
+        :param timings: A mapping of submission id to the metrics of the stages of that submission.
+        :return: A string representation of the aggregated results in CSV format.
+        """
+        if verbose:
+            output = ["Submission,Check,Score,Max Score,Info,Error"]
+        else:
+            output = ["Submission,Check,Score,Max Score"]
+
+        for submission_id, submission_results in results.items():
+            # Skip the header of the single submission report
+            rows = self.to_string(submission_results, verbose).splitlines()[1:]
+            output += [f"{submission_id},{row}" for row in rows]
+
+        if timings is not None:
+            output += ["", f"Submission,{STAGE_METRICS_CSV_HEADER}"]
+            for submission_id, submission_timings in timings.items():
+                output += [f"{submission_id},{stage_metrics_to_csv(metrics)}" for metrics in submission_timings]
+
+            output += ["", STAGE_SUMMARY_CSV_HEADER]
+            output += [stage_summary_to_csv(summary) for summary in summarize_batch_timings(timings)]
+
         return "\n".join(output) + "\n"
 
 
@@ -244,6 +412,7 @@ class PlainTextResultsReporter(ResultsReporter):
         results: list[CheckResult],
         verbose: bool,
         file_descriptor: TextIO = sys.stdout,
+        timings: Optional[list[StageMetrics]] = None,
     ) -> None:
         """
         Display the results in plain text format.
@@ -251,16 +420,18 @@ class PlainTextResultsReporter(ResultsReporter):
         :param results: A list of CheckResult objects to display.
         :param verbose: Whether to include info and error fields in the output.
         :param file_descriptor: The file descriptor to write the output to.
+        :param timings: The metrics of the stages of the grading, included in the output if given.
         """
-        output = self.to_string(results, verbose)
+        output = self.to_string(results, verbose, timings)
         self._to_file_descriptor(output, file_descriptor)
 
-    def to_string(self, results: list[CheckResult], verbose: bool) -> str:
+    def to_string(self, results: list[CheckResult], verbose: bool, timings: Optional[list[StageMetrics]] = None) -> str:
         """
         Convert the results to a plain-text string.
 
         :param results: A list of CheckResult objects to convert.
         :param verbose: Whether to include info and error fields in the output.
+        :param timings: The metrics of the stages of the grading, listed after the total score if given.
         :return: A string representation of the results in plain-text format.
         """
         scored_results = [result for result in results if isinstance(result, ScoredCheckResult)]
@@ -269,8 +440,40 @@ class PlainTextResultsReporter(ResultsReporter):
 
         output = [result_to_plain_text(check_result, verbose) for check_result in results]
         output.append(f"Total Score: {total_score}/{total_max_score}")
+
+        if timings is not None:
+            output.append("Timings:")
+            output += [stage_metrics_to_text(metrics) for metrics in timings]
+
         return "\n".join(output) + "\n"
 
+    def batch_to_string(
+        self,
+        results: dict[str, list[CheckResult]],
+        verbose: bool,
+        timings: Optional[dict[str, list[StageMetrics]]] = None,
+    ) -> str:
+        """
+        Convert the results of multiple submissions to a single plain-text string.
+
+        :param results: A mapping of submission id to the list of CheckResult objects of that submission.
+        :param verbose: Whether to include info and error fields in the output.
+        :param timings: A mapping of submission id to the metrics of the stages of that submission.
+                        If given, they are listed under each submission, followed by a summary of each stage.
+        :return: A string representation of the aggregated results in plain-text format.
+        """
+        output = []
+        for submission_id, submission_results in results.items():
+            submission_timings = None if timings is None else timings.get(submission_id, [])
+            submission_output = self.to_string(submission_results, verbose, submission_timings)
+            output.append(f"Submission: {submission_id}\n{submission_output}")
+
+        if timings is not None:
+            summaries = [stage_summary_to_text(summary) for summary in summarize_batch_timings(timings)]
+            output.append("\n".join(["Timings summary:", *summaries]) + "\n")
+
+        return "\n".join(output)
+
 
 def result_to_plain_text(check_result: CheckResult, verbose: bool) -> str:
     """
@@ -305,6 +508,8 @@ def scored_result_to_text(scored_result: ScoredCheckResult, verbose: bool) -> st
     :rtype: str.
     """
     parts = [f"Check: {scored_result.name}, Score: {scored_result.result}/{scored_result.max_score}"]
+    if scored_result.is_timed_out:
+        parts.append("Timed out")
     if verbose:
         if scored_result.info:
             parts.append(f"Info: {scored_result.info}")
@@ -331,3 +536,87 @@ def non_scored_result_to_text(non_scored_result: NonScoredCheckResult, verbose:
         if non_scored_result.error:
             parts.append(f"Error: {non_scored_result.error}")
     return ". ".join(parts)
+
+
+STAGE_METRICS_CSV_HEADER = (
+    "Stage,Wall Time,CPU Time,Subprocesses,Subprocesses CPU Time,Subprocesses Peak RSS (KiB),"
+    "Subprocesses Read Blocks,Subprocesses Write Blocks"
+)
+STAGE_SUMMARY_CSV_HEADER = "Stage,Runs,Total Wall Time,Max Wall Time,Total CPU Time,Max Peak RSS (KiB)"
+
+
+def summarize_batch_timings(timings: dict[str, list[StageMetrics]]) -> list[StageSummary]:
+    """
+    Aggregate the metrics of each stage across all submissions of a batch.
+
+    :param timings: A mapping of submission id to the metrics of the stages of that submission.
+    :type timings: dict[str, list[StageMetrics]]
+    :return: A summary of each stage.
+    :rtype: list[StageSummary]
+    """
+    return summarize_stages([metrics for submission_timings in timings.values() for metrics in submission_timings])
+
+
+def stage_metrics_to_csv(metrics: StageMetrics) -> str:
+    """
+    Convert the metrics of a stage to a CSV-compatible string. Times are in seconds.
+
+    :param metrics: The metrics of the stage.
+    :type metrics: StageMetrics
+    :return: A CSV-compatible string representation of the metrics.
+    :rtype: str
+    """
+    return (
+        f"{metrics.name},{metrics.wall_time:.3f},{metrics.cpu_time:.3f},{metrics.subprocesses},"
+        f"{metrics.subprocesses_cpu_time:.3f},{metrics.subprocesses_peak_rss},"
+        f"{metrics.subprocesses_read_blocks},{metrics.subprocesses_write_blocks}"
+    )
+
+
+def stage_summary_to_csv(summary: StageSummary) -> str:
+    """
+    Convert the summary of a stage to a CSV-compatible string. Times are in seconds.
+
+    :param summary: The summary of the stage.
+    :type summary: StageSummary
+    :return: A CSV-compatible string representation of the summary.
+    :rtype: str
+    """
+    return (
+        f"{summary.name},{summary.runs},{summary.total_wall_time:.3f},{summary.max_wall_time:.3f},"
+        f"{summary.total_cpu_time:.3f},{summary.max_peak_rss}"
+    )
+
+
+def stage_metrics_to_text(metrics: StageMetrics) -> str:
+    """
+    Convert the metrics of a stage to a plain text string.
+
+    :param metrics: The metrics of the stage.
+    :type metrics: StageMetrics
+    :return: A plain text string representation of the metrics.
+    :rtype: str
+    """
+    text = f"Stage: {metrics.name}, Wall time: {metrics.wall_time:.3f}s, CPU time: {metrics.cpu_time:.3f}s"
+    if metrics.subprocesses > 0:
+        text += (
+            f", Subprocesses: {metrics.subprocesses} ({metrics.subprocesses_cpu_time:.3f}s CPU, "
+            f"{metrics.subprocesses_peak_rss} KiB peak RSS)"
+        )
+    return text
+
+
+def stage_summary_to_text(summary: StageSummary) -> str:
+    """
+    Convert the summary of a stage to a plain text string.
+
+    :param summary: The summary of the stage.
+    :type summary: StageSummary
+    :return: A plain text string representation of the summary.
+    :rtype: str
+    """
+    return (
+        f"Stage: {summary.name}, Runs: {summary.runs}, Total wall time: {summary.total_wall_time:.3f}s, "
+        f"Max wall time: {summary.max_wall_time:.3f}s, Total CPU time: {summary.total_cpu_time:.3f}s, "
+        f"Max peak RSS: {summary.max_peak_rss} KiB"
+    )
@@ -0,0 +1,54 @@
+"""
+Module containing the StructureMatcher class.
+
+It checks all elements of a structure file with a single pass over the files of the project.
+"""
+
+import os
+import re
+
+from grader.utils.project_index import ProjectIndex, glob_to_regex
+from grader.utils.structure_validator import StructureValidator
+
+
+class StructureMatcher:
+    """Class matching the patterns of all structure elements at once."""
+
+    def __init__(self, elements: list[StructureValidator]):
+        """
+        Compile the patterns of the structure elements.
+
+        Patterns shared by several elements are compiled and matched only once.
+
+        :param elements: The structure elements.
+        """
+        self.__elements = elements
+        self.__regexes: dict[str, re.Pattern[str]] = {
+            pattern: glob_to_regex(pattern.replace(os.sep, "/")) for element in elements for pattern in element.patterns
+        }
+
+    def get_invalid_elements(
+        self, project_index: ProjectIndex, is_required_only: bool = False
+    ) -> list[StructureValidator]:
+        """
+        Get the elements with at least one pattern that matches no file or directory of the project.
+
+        The entries of the project are read once, and the matching stops as soon as all patterns are matched.
+
+        :param project_index: The index of the project.
+        :param is_required_only: Whether to check only the required elements, which allows stopping earlier.
+        :return: The invalid elements, in the order of the structure file.
+        """
+        elements = [element for element in self.__elements if element.required or not is_required_only]
+        pending = {pattern: self.__regexes[pattern] for element in elements for pattern in element.patterns}
+
+        for entry in project_index.entries:
+            matched = [pattern for pattern, regex in pending.items() if regex.fullmatch(entry)]
+
+            for pattern in matched:
+                del pending[pattern]
+
+            if not pending:
+                break
+
+        return [element for element in elements if any(pattern in pending for pattern in element.patterns)]
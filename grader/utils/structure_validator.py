@@ -1,6 +1,9 @@
 """Module containing the StructureValidator class."""
 
 from pathlib import Path
+from typing import Optional
+
+from grader.utils.project_index import ProjectIndex
 
 
 class StructureValidator:
@@ -18,30 +21,40 @@ class StructureValidator:
         self.required = required
         self.patterns = patterns
 
-    def is_structure_valid(self, project_root: str) -> bool:
+    def is_structure_valid(self, project_root: str, project_index: Optional[ProjectIndex] = None) -> bool:
         """
         Check if all patterns match at least one file in the project.
 
         :param project_root: The root directory of the project
         :type project_root: str
+        :param project_index: Optional index of the project to match the patterns against, instead of the file system
+        :type project_index: Optional[ProjectIndex]
         :return: Whether the structure is valid
         :rtype: bool
         """
+        if project_index is not None:
+            return all(project_index.glob(pattern) for pattern in self.patterns)
+
         path = Path(project_root)
         for pattern in self.patterns:
             if not any(path.glob(pattern)):
                 return False
         return True
 
-    def get_matching_files(self, project_root: str) -> list[str]:
+    def get_matching_files(self, project_root: str, project_index: Optional[ProjectIndex] = None) -> list[str]:
         """
         Get the paths of all files that match the patterns.
 
         :param project_root: The root directory of the project
         :type project_root: str
+        :param project_index: Optional index of the project to match the patterns against, instead of the file system
+        :type project_index: Optional[ProjectIndex]
         :return: A list of paths to files matching the patterns
         :rtype: list[str]
         """
+        if project_index is not None:
+            return [file for pattern in self.patterns for file in project_index.glob(pattern)]
+
         path = Path(project_root)
         return [str(file.resolve()) for pattern in self.patterns for file in path.glob(pattern)]
 
@@ -0,0 +1,133 @@
+"""
+Module containing the shared grader tools environment.
+
+Instead of installing pylint, mypy, pytest, coverage, etc. into every project virtual environment,
+they are installed once in an immutable tools environment, which the project environments inherit through a .pth file.
+"""
+
+import logging
+import os
+import shutil
+from typing import Optional
+
+import grader.utils.constants as const
+from grader.exceptions import VirtualEnvironmentError
+from grader.utils.logger import VERBOSE
+from grader.utils.process import run
+from grader.utils.venv_cache import (
+    VenvCache,
+    find_site_packages,
+    get_python_version,
+    read_requirements,
+    relocate_scripts,
+)
+
+logger = logging.getLogger("grader")
+
+TOOLS_PTH_FILENAME = "pygrader-tools.pth"
+
+
+class ToolsEnvironment:
+    """
+    Pre-built environment containing the grader dependencies.
+
+    Each version of the grader requirements (and of the python interpreter) gets its own environment,
+    so tools environments are never modified after they are built.
+    """
+
+    def __init__(self, tools_dir: str):
+        """
+        Initialize the tools environment.
+
+        :param tools_dir: The directory where the tools environments are built.
+        """
+        self.__tools_dir = tools_dir
+        self.__environments = VenvCache(tools_dir)
+        self.__key: Optional[str] = None
+
+    def setup(self) -> str:
+        """
+        Build the tools environment, unless it is already built.
+
+        :raises VirtualEnvironmentError: If the tools environment cannot be built.
+        :return: The key of the tools environment.
+        """
+        if self.__key is not None:
+            return self.__key
+
+        grader_dependencies = read_requirements(const.GRADER_REQUIREMENTS)
+        python_version = get_python_version()
+
+        if grader_dependencies is None or python_version is None:
+            raise VirtualEnvironmentError("Cannot determine the version of the grader tools environment")
+
+        key = VenvCache.compute_key([], grader_dependencies, python_version)
+
+        if not self.__environments.is_cached(key):
+            self.__build(key)
+
+        self.__key = key
+        return key
+
+    def attach(self, venv_path: str) -> None:
+        """
+        Make the tools available in a project virtual environment.
+
+        The site-packages of the tools environment are appended to the path of the project environment,
+        so the packages of the project take precedence. The tools scripts are copied into the project environment.
+
+        :param venv_path: The path to the project virtual environment.
+        :raises VirtualEnvironmentError: If the tools cannot be attached.
+        """
+        key = self.setup()
+        tools_venv_path = self.__environments.get_venv_path(key)
+
+        tools_site_packages = find_site_packages(tools_venv_path)
+        venv_site_packages = find_site_packages(venv_path)
+
+        if tools_site_packages is None or venv_site_packages is None:
+            raise VirtualEnvironmentError("Cannot find the site-packages of the grader tools environment")
+
+        try:
+            with open(os.path.join(venv_site_packages, TOOLS_PTH_FILENAME), "w", encoding="utf-8") as pth_file:
+                pth_file.write(os.path.abspath(tools_site_packages) + "\n")
+
+            scripts_dir = os.path.dirname(const.PIP_PATH)
+            relocate_scripts(
+                os.path.join(tools_venv_path, scripts_dir),
+                os.path.join(venv_path, scripts_dir),
+                self.__environments.get_original_venv_path(key),
+            )
+        except (OSError, KeyError) as error:
+            logger.error("Failed to attach the grader tools environment: %s", error)
+            raise VirtualEnvironmentError("Failed to attach the grader tools environment") from error
+
+    def __build(self, key: str) -> None:
+        """
+        Build the tools environment and store it under the given key.
+
+        :param key: The key of the tools environment.
+        :raises VirtualEnvironmentError: If the tools environment cannot be built.
+        """
+        logger.log(VERBOSE, "Building grader tools environment")
+
+        build_path = os.path.join(self.__tools_dir, f"build-{os.getpid()}")
+        shutil.rmtree(build_path, ignore_errors=True)
+
+        try:
+            create_venv_result = run([const.PYTHON_BIN, "-m", "venv", build_path])
+            if create_venv_result.returncode != 0:
+                logger.error("Failed to create the grader tools environment")
+                raise VirtualEnvironmentError("Failed to create the grader tools environment")
+
+            install_result = run([os.path.join(build_path, const.PIP_PATH), "install", "-r", const.GRADER_REQUIREMENTS])
+            if install_result.returncode != 0:
+                logger.error("Failed to install the grader tools")
+                raise VirtualEnvironmentError("Failed to install the grader tools")
+
+            self.__environments.store(key, build_path)
+        finally:
+            shutil.rmtree(build_path, ignore_errors=True)
+
+        if not self.__environments.is_cached(key):
+            raise VirtualEnvironmentError("Failed to store the grader tools environment")
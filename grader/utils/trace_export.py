@@ -0,0 +1,210 @@
+"""
+Module exporting the measured stages of a run as a trace.
+
+Every stage becomes a span on the timeline of its thread: the Chrome trace format can be opened in
+chrome://tracing or https://ui.perfetto.dev, and the OTLP export sends the same spans to an OpenTelemetry collector.
+Each submission (or the single graded project) is a separate process of the trace.
+"""
+
+import json
+import logging
+import os
+import secrets
+from typing import Any, Optional
+
+import requests
+
+from grader.exceptions import TraceExportError
+from grader.utils.instrumentation import StageMetrics
+
+logger = logging.getLogger("grader")
+
+TRACE_SERVICE_NAME = "pygrader"
+OTLP_TIMEOUT = 10
+
+
+def get_stage_category(name: str) -> str:
+    """
+    Get the category of a stage from its name, e.g. "check" for "check:pylint".
+
+    :param name: The name of the stage.
+    :return: The category of the stage.
+    """
+    return name.split(":", 1)[0]
+
+
+def get_stage_attributes(metrics: StageMetrics) -> dict[str, Any]:
+    """
+    Get the resources used by a stage, attached to its span.
+
+    :param metrics: The metrics of the stage.
+    :return: The attributes of the span.
+    """
+    return {
+        "cpu_time": metrics.cpu_time,
+        "subprocesses": metrics.subprocesses,
+        "subprocesses_cpu_time": metrics.subprocesses_cpu_time,
+        "subprocesses_peak_rss": metrics.subprocesses_peak_rss,
+        "subprocesses_read_blocks": metrics.subprocesses_read_blocks,
+        "subprocesses_write_blocks": metrics.subprocesses_write_blocks,
+    }
+
+
+def to_chrome_trace(timings: dict[str, list[StageMetrics]]) -> dict[str, Any]:
+    """
+    Convert the measured stages to the Chrome trace event format.
+
+    :param timings: A mapping of submission id to the metrics of the stages of that submission.
+    :return: The trace, with a complete event for each stage, timed from the start of the earliest stage.
+    """
+    start_times = [metrics.start_time for stages in timings.values() for metrics in stages]
+    origin = min(start_times, default=0.0)
+    events: list[dict[str, Any]] = []
+
+    for process_index, (submission_id, stages) in enumerate(timings.items(), start=1):
+        events.append({"name": "process_name", "ph": "M", "pid": process_index, "args": {"name": submission_id}})
+        events += [
+            {
+                "name": metrics.name,
+                "cat": get_stage_category(metrics.name),
+                "ph": "X",
+                "ts": round((metrics.start_time - origin) * 1_000_000),
+                "dur": round(metrics.wall_time * 1_000_000),
+                "pid": process_index,
+                "tid": metrics.thread_id,
+                "args": get_stage_attributes(metrics),
+            }
+            for metrics in stages
+        ]
+
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_chrome_trace(timings: dict[str, list[StageMetrics]], trace_path: str) -> None:
+    """
+    Write the measured stages to a Chrome trace file.
+
+    :param timings: A mapping of submission id to the metrics of the stages of that submission.
+    :param trace_path: The path of the trace file.
+    :raises TraceExportError: If the file cannot be written.
+    """
+    directory = os.path.dirname(trace_path)
+
+    try:
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with open(trace_path, "w", encoding="utf-8") as trace_file:
+            json.dump(to_chrome_trace(timings), trace_file)
+    except OSError as error:
+        raise TraceExportError(f"Cannot write the trace file {trace_path}: {error}") from error
+
+    logger.debug("Trace written to %s", trace_path)
+
+
+def find_parent(metrics: StageMetrics, stages: list[StageMetrics]) -> Optional[StageMetrics]:
+    """
+    Find the stage a stage ran in: the shortest stage of the same thread which contains it.
+
+    :param metrics: The metrics of the stage.
+    :param stages: The metrics of all stages of the run.
+    :return: The parent stage, or None if the stage is not nested.
+    """
+    end_time = metrics.start_time + metrics.wall_time
+    parents = [
+        stage
+        for stage in stages
+        if stage is not metrics
+        and (stage.process_id, stage.thread_id) == (metrics.process_id, metrics.thread_id)
+        and stage.start_time <= metrics.start_time
+        and end_time <= stage.start_time + stage.wall_time
+        and stage.wall_time > metrics.wall_time
+    ]
+
+    return min(parents, key=lambda stage: stage.wall_time, default=None)
+
+
+def to_otlp_attribute(key: str, value: Any) -> dict[str, Any]:
+    """
+    Convert an attribute of a span to its OTLP/JSON representation.
+
+    :param key: The name of the attribute.
+    :param value: The value of the attribute.
+    :return: The attribute, with its value tagged with its type.
+    """
+    match value:
+        case bool():
+            typed_value: dict[str, Any] = {"boolValue": value}
+        case int():
+            # 64-bit integers are strings in OTLP/JSON
+            typed_value = {"intValue": str(value)}
+        case float():
+            typed_value = {"doubleValue": value}
+        case _:
+            typed_value = {"stringValue": str(value)}
+
+    return {"key": key, "value": typed_value}
+
+
+def to_otlp_spans(timings: dict[str, list[StageMetrics]]) -> dict[str, Any]:
+    """
+    Convert the measured stages to an OTLP/JSON trace export request.
+
+    Each submission is a separate trace, and nested stages are children of the stages they ran in.
+
+    :param timings: A mapping of submission id to the metrics of the stages of that submission.
+    :return: The body of the export request.
+    """
+    resource_spans = []
+
+    for submission_id, stages in timings.items():
+        trace_id = secrets.token_hex(16)
+        span_ids = {id(metrics): secrets.token_hex(8) for metrics in stages}
+        spans = []
+
+        for metrics in stages:
+            parent = find_parent(metrics, stages)
+            attributes = {"submission": submission_id, **get_stage_attributes(metrics)}
+            spans.append(
+                {
+                    "traceId": trace_id,
+                    "spanId": span_ids[id(metrics)],
+                    "parentSpanId": span_ids[id(parent)] if parent is not None else "",
+                    "name": metrics.name,
+                    "kind": 1,
+                    "startTimeUnixNano": str(round(metrics.start_time * 1e9)),
+                    "endTimeUnixNano": str(round((metrics.start_time + metrics.wall_time) * 1e9)),
+                    "attributes": [to_otlp_attribute(key, value) for key, value in attributes.items()],
+                }
+            )
+
+        resource_spans.append(
+            {
+                "resource": {
+                    "attributes": [
+                        to_otlp_attribute("service.name", TRACE_SERVICE_NAME),
+                        to_otlp_attribute("submission", submission_id),
+                    ]
+                },
+                "scopeSpans": [{"scope": {"name": "grader"}, "spans": spans}],
+            }
+        )
+
+    return {"resourceSpans": resource_spans}
+
+
+def export_otlp(timings: dict[str, list[StageMetrics]], endpoint: str) -> None:
+    """
+    Send the measured stages to an OpenTelemetry collector, with the OTLP/HTTP JSON protocol.
+
+    :param timings: A mapping of submission id to the metrics of the stages of that submission.
+    :param endpoint: The traces endpoint of the collector, e.g. http://localhost:4318/v1/traces.
+    :raises TraceExportError: If the collector cannot be reached or refuses the spans.
+    """
+    try:
+        response = requests.post(endpoint, json=to_otlp_spans(timings), timeout=OTLP_TIMEOUT)
+        response.raise_for_status()
+    except requests.RequestException as error:
+        raise TraceExportError(f"Cannot export the trace to {endpoint}: {error}") from error
+
+    logger.debug("Trace exported to %s", endpoint)
@@ -0,0 +1,193 @@
+"""
+Module containing the AST-based type hints counter.
+
+It counts the functions with type hints the same way the mypy linecount report does,
+without running mypy - the counts only depend on the syntax of the files.
+"""
+
+import ast
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Union
+
+FunctionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+
+# Comparison methods mypy generates for dataclasses with order=True
+DATACLASS_ORDER_METHODS = 4
+
+
+class FunctionCounter(ast.NodeVisitor):
+    """
+    Count the functions of a module and the functions with type hints.
+
+    Like mypy, functions nested in other functions are not counted, methods are.
+    The methods mypy generates for dataclasses are counted too, they always have type hints.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the counter."""
+        self.annotated_functions = 0
+        self.functions = 0
+        self.__dataclasses_with_fields: set[str] = set()
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:  # pylint: disable=invalid-name
+        """
+        Count a function, without visiting its body.
+
+        :param node: The function node.
+        """
+        self.__count(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:  # pylint: disable=invalid-name
+        """
+        Count an async function, without visiting its body.
+
+        :param node: The function node.
+        """
+        self.__count(node)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:  # pylint: disable=invalid-name
+        """
+        Count the methods mypy generates for a dataclass, then visit the class body.
+
+        :param node: The class node.
+        """
+        has_fields = any(isinstance(statement, ast.AnnAssign) for statement in node.body) or any(
+            isinstance(base, ast.Name) and base.id in self.__dataclasses_with_fields for base in node.bases
+        )
+
+        if has_fields:
+            self.__dataclasses_with_fields.add(node.name)
+
+        generated_methods = count_dataclass_methods(node, has_fields)
+        self.functions += generated_methods
+        self.annotated_functions += generated_methods
+
+        self.generic_visit(node)
+
+    def __count(self, node: FunctionNode) -> None:
+        """
+        Count a function.
+
+        :param node: The function node.
+        """
+        self.functions += 1
+
+        if is_annotated(node):
+            self.annotated_functions += 1
+
+
+def is_annotated(node: FunctionNode) -> bool:
+    """
+    Check if a function has type hints - an annotated argument or return value, or a type comment.
+
+    :param node: The function node.
+    :return: True if the function has type hints, False otherwise.
+    """
+    if node.returns is not None or node.type_comment is not None:
+        return True
+
+    arguments = node.args.posonlyargs + node.args.args + node.args.kwonlyargs
+    arguments += [argument for argument in (node.args.vararg, node.args.kwarg) if argument is not None]
+
+    return any(argument.annotation is not None or argument.type_comment is not None for argument in arguments)
+
+
+def count_dataclass_methods(node: ast.ClassDef, has_fields: bool) -> int:
+    """
+    Count the methods the dataclasses plugin of mypy adds to a class.
+
+    These are __init__ (unless the class has its own or no fields), the comparison methods with order=True,
+    an internal replace method, __replace__ (from Python 3.13) and an internal __post_init__ method.
+
+    :param node: The class node.
+    :param has_fields: Whether the class has fields, including the ones inherited from other dataclasses.
+    :return: The amount of generated methods, 0 if the class is not a dataclass.
+    """
+    decorator = next((decorator for decorator in node.decorator_list if is_dataclass_decorator(decorator)), None)
+
+    if decorator is None:
+        return 0
+
+    options = {
+        keyword.arg: keyword.value.value
+        for keyword in (decorator.keywords if isinstance(decorator, ast.Call) else [])
+        if isinstance(keyword.value, ast.Constant)
+    }
+    method_names = {
+        statement.name for statement in node.body if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef))
+    }
+    generated_methods = 1
+
+    if options.get("init", True) and has_fields and "__init__" not in method_names:
+        generated_methods += 1
+
+    if options.get("order", False):
+        generated_methods += DATACLASS_ORDER_METHODS
+
+    if sys.version_info >= (3, 13):
+        generated_methods += 1
+
+    if "__post_init__" in method_names:
+        generated_methods += 1
+
+    return generated_methods
+
+
+def is_dataclass_decorator(decorator: ast.expr) -> bool:
+    """
+    Check if a decorator is dataclass, dataclasses.dataclass or a call to one of them.
+
+    :param decorator: The decorator expression.
+    :return: True if the decorator makes a dataclass, False otherwise.
+    """
+    if isinstance(decorator, ast.Call):
+        decorator = decorator.func
+
+    if isinstance(decorator, ast.Name):
+        return decorator.id == "dataclass"
+
+    return isinstance(decorator, ast.Attribute) and decorator.attr == "dataclass"
+
+
+def count_annotated_functions(path: str) -> tuple[int, int]:
+    """
+    Count the functions with type hints and all functions in a python file.
+
+    :param path: The path to the file.
+    :raises OSError: If the file cannot be read.
+    :raises SyntaxError: If the file cannot be parsed.
+    :raises ValueError: If the file cannot be parsed.
+    :return: The amount of functions with type hints and the total amount of functions.
+    """
+    with open(path, "rb") as source_file:
+        tree = ast.parse(source_file.read(), filename=path, type_comments=True)
+
+    counter = FunctionCounter()
+    counter.visit(tree)
+
+    return counter.annotated_functions, counter.functions
+
+
+def count_all_annotated_functions(paths: list[str], jobs: Optional[int] = None) -> tuple[int, int]:
+    """
+    Count the functions with type hints and all functions in python files.
+
+    Like mypy, if any of the files cannot be parsed, nothing is counted.
+
+    :param paths: The paths to the files.
+    :param jobs: Optional number of processes to parse the files in (0 - one per CPU).
+                 By default, the files are parsed in the current process.
+    :raises OSError: If a file cannot be read.
+    :return: The amount of functions with type hints and the total amount of functions.
+    """
+    try:
+        if jobs is None:
+            counts = [count_annotated_functions(path) for path in paths]
+        else:
+            with ProcessPoolExecutor(max_workers=jobs or None) as executor:
+                counts = list(executor.map(count_annotated_functions, paths))
+    except (SyntaxError, ValueError):
+        return 0, 0
+
+    return sum(annotated for annotated, _ in counts), sum(total for _, total in counts)
@@ -0,0 +1,293 @@
+"""
+Module containing the content-addressed virtual environment cache.
+
+Virtual environments with the same dependencies are identical, so instead of reinstalling them for every project,
+a ready environment is stored once per dependency set and restored with hardlinks.
+"""
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tomllib
+from typing import Optional
+
+import grader.utils.constants as const
+from grader.utils.logger import VERBOSE
+from grader.utils.process import run
+
+logger = logging.getLogger("grader")
+
+CACHE_METADATA_FILENAME = "metadata.json"
+CACHE_VENV_DIRNAME = "venv"
+
+# Requirement lines which point to other files or local paths - their contents are not part of the cache key
+UNCACHEABLE_REQUIREMENT_PREFIXES = (
+    "-r",
+    "-c",
+    "-e",
+    "--requirement",
+    "--constraint",
+    "--editable",
+    ".",
+    "/",
+    "file:",
+)
+
+
+def read_requirements(requirements_path: str) -> Optional[list[str]]:
+    """
+    Read and normalize the requirements from a requirements file.
+
+    Comments, empty lines and duplicates are dropped, names are lowercased and the result is sorted,
+    so that equivalent requirement files produce the same list.
+
+    :param requirements_path: The path to the requirements file.
+    :return: The normalized requirements, or None if the file cannot be cached (e.g. includes other files).
+    """
+    try:
+        with open(requirements_path, "r", encoding="utf-8") as requirements_file:
+            lines = requirements_file.readlines()
+    except OSError:
+        return None
+
+    requirements = {line.split("#", 1)[0].strip().lower() for line in lines}
+    requirements.discard("")
+
+    if any(requirement.startswith(UNCACHEABLE_REQUIREMENT_PREFIXES) for requirement in requirements):
+        return None
+
+    return sorted(requirements)
+
+
+def read_pyproject_dependencies(pyproject_path: str) -> Optional[list[str]]:
+    """
+    Read and normalize the dependencies of a pyproject.toml file.
+
+    :param pyproject_path: The path to the pyproject.toml file.
+    :return: The normalized dependencies, or None if they cannot be determined statically.
+    """
+    try:
+        with open(pyproject_path, "rb") as pyproject_file:
+            pyproject = tomllib.load(pyproject_file)
+    except (OSError, tomllib.TOMLDecodeError):
+        return None
+
+    project = pyproject.get("project", {})
+
+    if "dependencies" in project.get("dynamic", []):
+        return None
+
+    return sorted({dependency.strip().lower() for dependency in project.get("dependencies", [])})
+
+
+def get_python_version() -> Optional[str]:
+    """
+    Get the version of the python interpreter used to create virtual environments.
+
+    :return: The version string (e.g. "Python 3.12.3"), or None if it cannot be determined.
+    """
+    output = run([const.PYTHON_BIN, "--version"])
+
+    if output.returncode != 0:
+        return None
+
+    return output.stdout.strip() or output.stderr.strip()
+
+
+def _link_or_copy(source: str, destination: str) -> None:
+    """
+    Hardlink a file, falling back to a copy when hardlinks are not possible (e.g. across filesystems).
+
+    :param source: The path to the source file.
+    :param destination: The path to the destination file.
+    """
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+def find_site_packages(venv_path: str) -> Optional[str]:
+    """
+    Find the site-packages directory of a virtual environment.
+
+    :param venv_path: The path to the virtual environment.
+    :return: The path to the site-packages directory, or None if it does not exist.
+    """
+    candidates = glob.glob(os.path.join(venv_path, "lib", "python*", "site-packages"))
+    candidates.append(os.path.join(venv_path, "Lib", "site-packages"))
+
+    return next((candidate for candidate in candidates if os.path.isdir(candidate)), None)
+
+
+def relocate_scripts(source_dir: str, destination_dir: str, original_venv_path: str) -> None:
+    """
+    Copy the scripts of one virtual environment into another, pointing them to the new environment.
+
+    Files that already exist in the new environment (the interpreter, the activation scripts) are kept.
+
+    :param source_dir: The scripts directory of the original environment.
+    :param destination_dir: The scripts directory of the new environment.
+    :param original_venv_path: The path the original environment was created at, to be replaced in the scripts.
+    """
+    new_venv_path = os.path.abspath(os.path.dirname(destination_dir))
+
+    for script in os.listdir(source_dir):
+        source = os.path.join(source_dir, script)
+        destination = os.path.join(destination_dir, script)
+
+        if os.path.lexists(destination) or os.path.islink(source) or not os.path.isfile(source):
+            continue
+
+        try:
+            with open(source, "r", encoding="utf-8") as script_file:
+                content = script_file.read()
+        except UnicodeDecodeError:
+            shutil.copy2(source, destination)
+            continue
+
+        with open(destination, "w", encoding="utf-8") as script_file:
+            script_file.write(content.replace(original_venv_path, new_venv_path))
+
+        shutil.copymode(source, destination)
+
+
+class VenvCache:
+    """
+    Persistent cache of ready virtual environments, keyed by the hash of everything that was installed in them.
+
+    Cache entries are treated as read-only - restored environments share their files with the cache via hardlinks.
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        Initialize the virtual environment cache.
+
+        :param cache_dir: The directory where the cached environments are stored.
+        """
+        self.__cache_dir = cache_dir
+
+    @staticmethod
+    def compute_key(dependencies: list[str], grader_dependencies: list[str], python_version: str) -> str:
+        """
+        Compute the cache key of an environment.
+
+        :param dependencies: The normalized dependencies of the project.
+        :param grader_dependencies: The normalized dependencies of the grader, installed in the same environment.
+        :param python_version: The version of the python interpreter of the environment.
+        :return: The cache key.
+        """
+        content = json.dumps(
+            {"python": python_version, "dependencies": dependencies, "grader_dependencies": grader_dependencies},
+            sort_keys=True,
+        )
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def is_cached(self, key: str) -> bool:
+        """
+        Check if there is a ready environment for the given key.
+
+        :param key: The cache key.
+        :return: True if the environment is cached, False otherwise.
+        """
+        return os.path.exists(os.path.join(self.__cache_dir, key, CACHE_METADATA_FILENAME))
+
+    def get_venv_path(self, key: str) -> str:
+        """
+        Get the path to the cached environment of the given key.
+
+        :param key: The cache key.
+        :return: The path to the cached environment.
+        """
+        return os.path.join(self.__cache_dir, key, CACHE_VENV_DIRNAME)
+
+    def get_original_venv_path(self, key: str) -> str:
+        """
+        Get the path the cached environment was created at, before it was stored.
+
+        :param key: The cache key.
+        :raises OSError: If the metadata of the entry cannot be read.
+        :raises KeyError: If the metadata of the entry is invalid.
+        :return: The original path of the cached environment.
+        """
+        with open(os.path.join(self.__cache_dir, key, CACHE_METADATA_FILENAME), "r", encoding="utf-8") as metadata_file:
+            return json.load(metadata_file)["venv_path"]
+
+    def restore(self, key: str, venv_path: str) -> bool:
+        """
+        Populate a freshly created virtual environment with the cached one.
+
+        The installed packages are hardlinked, the scripts are copied with their paths pointed to the new environment.
+
+        :param key: The cache key.
+        :param venv_path: The path to the freshly created virtual environment (created without pip).
+        :return: True if the environment was restored, False if there was no (valid) cache entry.
+        """
+        if not self.is_cached(key):
+            return False
+
+        try:
+            original_venv_path = self.get_original_venv_path(key)
+
+            for entry in os.scandir(self.get_venv_path(key)):
+                # Files (pyvenv.cfg) and symlinks (lib64) are already created together with the new environment
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+
+                if entry.name == os.path.dirname(const.PIP_PATH):
+                    relocate_scripts(entry.path, os.path.join(venv_path, entry.name), original_venv_path)
+                else:
+                    shutil.copytree(
+                        entry.path,
+                        os.path.join(venv_path, entry.name),
+                        symlinks=True,
+                        copy_function=_link_or_copy,
+                        dirs_exist_ok=True,
+                    )
+        except (OSError, KeyError, json.JSONDecodeError) as error:
+            logger.warning("Failed to restore cached virtual environment %s: %s", key, error)
+            return False
+
+        logger.log(VERBOSE, "Restored virtual environment from cache %s", key)
+        return True
+
+    def store(self, key: str, venv_path: str) -> None:
+        """
+        Store a ready virtual environment in the cache.
+
+        The entry is built in a temporary directory and renamed in place, so concurrent graders never see
+        a partially written entry. Failing to store is not fatal - the environment is just not cached.
+
+        :param key: The cache key.
+        :param venv_path: The path to the ready virtual environment.
+        """
+        if self.is_cached(key):
+            return
+
+        entry_path = os.path.join(self.__cache_dir, key)
+        temp_entry_path = f"{entry_path}.tmp-{os.getpid()}"
+
+        try:
+            os.makedirs(self.__cache_dir, exist_ok=True)
+            shutil.rmtree(temp_entry_path, ignore_errors=True)
+
+            shutil.copytree(
+                venv_path,
+                os.path.join(temp_entry_path, CACHE_VENV_DIRNAME),
+                symlinks=True,
+                copy_function=_link_or_copy,
+            )
+
+            with open(os.path.join(temp_entry_path, CACHE_METADATA_FILENAME), "w", encoding="utf-8") as metadata_file:
+                json.dump({"venv_path": os.path.abspath(venv_path)}, metadata_file)
+
+            os.rename(temp_entry_path, entry_path)
+        except OSError as error:
+            logger.warning("Failed to store virtual environment in cache %s: %s", key, error)
+            shutil.rmtree(temp_entry_path, ignore_errors=True)
+            return
+
+        logger.log(VERBOSE, "Stored virtual environment in cache %s", key)
@@ -5,11 +5,20 @@ from __future__ import annotations  # Python 3.14 will fix this
 import logging
 import os
 import shutil
+from typing import Optional
 
 import grader.utils.constants as const
 from grader.exceptions import VirtualEnvironmentError
+from grader.utils.instrumentation import measure
 from grader.utils.logger import VERBOSE
 from grader.utils.process import run
+from grader.utils.tools_environment import ToolsEnvironment
+from grader.utils.venv_cache import (
+    VenvCache,
+    get_python_version,
+    read_pyproject_dependencies,
+    read_requirements,
+)
 
 logger = logging.getLogger("grader")
 
@@ -29,6 +38,8 @@ class VirtualEnvironment:
         is_keeping_venv_after_run: bool = False,
         is_keeping_existing_venv: bool = False,
         name: str = const.VENV_NAME,
+        cache_dir: Optional[str] = None,
+        tools_dir: Optional[str] = None,
     ):
         """
         Initialize the virtual environment manager.
@@ -37,22 +48,34 @@ class VirtualEnvironment:
         :param is_keeping_venv_after_run: Whether to keep the venv after execution.
         :param is_keeping_existing_venv: Whether to keep existing venv directories.
         :param name: The name of the virtual environment directory.
+        :param cache_dir: Optional directory of a persistent cache of ready environments, keyed by their dependencies.
+        :param tools_dir: Optional directory of a shared, pre-built environment with the grader dependencies.
+            If set, the grader dependencies are not installed in the project environment.
         """
         self._project_path = project_path
         # TODO - To fully allow for a custom venv name, we need to rethink how we handle paths in the constants
         self._venv_path = os.path.join(project_path, name)
         self.__is_keeping_venv_after_run = is_keeping_venv_after_run
         self.__is_keeping_existing_venv = is_keeping_existing_venv
+        self.__cache = VenvCache(cache_dir) if cache_dir is not None else None
+        self.__tools = ToolsEnvironment(tools_dir) if tools_dir is not None else None
+
+        if self.__tools is not None and os.name == "nt":
+            # Windows scripts are executables with the interpreter path embedded, they cannot be relocated
+            logger.warning("Shared grader tools environment is not supported on Windows, installing tools per venv")
+            self.__tools = None
 
     def __enter__(self) -> VirtualEnvironment:
         """Enter the context manager and set up the virtual environment."""
-        self.setup()
+        with measure("venv:setup"):
+            self.setup()
         VirtualEnvironment.is_initialized = True
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:  # type: ignore
         """Exit the context manager and tear down the virtual environment."""
-        self.teardown()
+        with measure("venv:teardown"):
+            self.teardown()
         VirtualEnvironment.is_initialized = False
 
     def setup(self) -> None:
@@ -60,31 +83,63 @@ class VirtualEnvironment:
         Set up the virtual environment.
 
         Check if there is an existing venv, if so, delete it.
+        If a cache is configured and has an environment with the same dependencies, restore it.
+        Otherwise, create a new venv:
         Check if the project is a package, if yes, install.
-        If not, check for requirements.txt.
-        Create a new venv and install the requirements.
-        Install the grader dependencies as well.
+        If not, check for requirements.txt and install the requirements.
+        Install the grader dependencies as well, or attach the shared grader tools environment.
         """
         # Check for existing venv
         if not self.__is_keeping_existing_venv:
             self.__remove_existing_venv()
 
-        # Check for requirements.txt
+        if self.__tools is not None:
+            self.__tools.setup()
+
+        pyproject_path = os.path.join(self._project_path, const.PYPROJECT_FILENAME)
+        is_package = os.path.exists(pyproject_path)
+
+        cache_key = self.__get_cache_key()
+
+        if cache_key is not None and self.__restore_from_cache(cache_key):
+            if is_package:
+                logger.log(VERBOSE, "Installing project as package")
+                VirtualEnvironment.__install_project_as_package(
+                    self._venv_path, self._project_path, is_installing_dependencies=False
+                )
+        else:
+            self.__create(cache_key)
+
+        if self.__tools is not None:
+            logger.log(VERBOSE, "Attaching grader tools environment")
+            self.__tools.attach(self._venv_path)
+
+    def __create(self, cache_key: Optional[str]) -> None:
+        """
+        Create a new venv with the project and grader dependencies, storing it in the cache if possible.
+
+        :param cache_key: The cache key of the environment, or None if it should not be cached.
+        """
+        pyproject_path = os.path.join(self._project_path, const.PYPROJECT_FILENAME)
+        is_package = os.path.exists(pyproject_path)
 
         # Create new venv
         logger.log(VERBOSE, "Creating new venv")
-
-        create_venv_result = run([const.PYTHON_BIN, "-m", "venv", self._venv_path])
-        if create_venv_result.returncode != 0:
-            logger.error("Failed to create virtual environment")
-            raise VirtualEnvironmentError("Failed to create virtual environment")
+        VirtualEnvironment.__create_venv(self._venv_path)
 
         # Install project as package
         # note: we haven't shown them `setup.py` so we shouldn't look for it?
         # only support `pyproject.toml` configuration for now
-        if os.path.exists(os.path.join(self._project_path, const.PYPROJECT_FILENAME)):
+        if is_package and cache_key is None:
             logger.log(VERBOSE, "Installing project as package")
             VirtualEnvironment.__install_project_as_package(self._venv_path, self._project_path)
+        elif is_package:
+            # The project itself is not cached, only its dependencies - it is installed after storing the venv
+            logger.log(VERBOSE, "Installing project dependencies")
+            with measure("venv:install-requirements"):
+                VirtualEnvironment.__install_packages(
+                    self._venv_path, read_pyproject_dependencies(pyproject_path) or []
+                )
         else:
             # if it is not a packaged project, check for requirements.txt and install them
             requirements_path = os.path.join(self._project_path, const.REQUIREMENTS_FILENAME)
@@ -94,13 +149,73 @@ class VirtualEnvironment:
                 logger.debug("No requirements.txt file found in the project directory")
             else:
                 logger.log(VERBOSE, "Installing requirements")
-                VirtualEnvironment.__install_requirements(self._venv_path, requirements_path)
+                with measure("venv:install-requirements"):
+                    VirtualEnvironment.__install_requirements(self._venv_path, requirements_path)
+
+        # Install grader dependencies, unless they come from the shared tools environment
+        if self.__tools is None:
+            logger.log(VERBOSE, "Installing grader dependencies")
+
+            grader_requirements_path = const.GRADER_REQUIREMENTS
+            with measure("venv:install-grader-dependencies"):
+                VirtualEnvironment.__install_requirements(self._venv_path, grader_requirements_path)
+
+        if self.__cache is not None and cache_key is not None:
+            self.__cache.store(cache_key, self._venv_path)
+
+            if is_package:
+                logger.log(VERBOSE, "Installing project as package")
+                VirtualEnvironment.__install_project_as_package(
+                    self._venv_path, self._project_path, is_installing_dependencies=False
+                )
+
+    def __get_cache_key(self) -> Optional[str]:
+        """
+        Compute the cache key of the environment of the project.
+
+        :return: The cache key, or None if there is no cache or the dependencies cannot be determined statically.
+        """
+        if self.__cache is None:
+            return None
+
+        pyproject_path = os.path.join(self._project_path, const.PYPROJECT_FILENAME)
+        requirements_path = os.path.join(self._project_path, const.REQUIREMENTS_FILENAME)
+
+        dependencies: Optional[list[str]] = []
+        if os.path.exists(pyproject_path):
+            dependencies = read_pyproject_dependencies(pyproject_path)
+        elif os.path.exists(requirements_path):
+            dependencies = read_requirements(requirements_path)
+
+        # The grader dependencies are part of the environment only when they are not in a shared tools environment
+        grader_dependencies = read_requirements(const.GRADER_REQUIREMENTS) if self.__tools is None else []
+        python_version = get_python_version()
+
+        if dependencies is None or grader_dependencies is None or python_version is None:
+            logger.log(VERBOSE, "Dependencies of the project cannot be cached")
+            return None
+
+        return VenvCache.compute_key(dependencies, grader_dependencies, python_version)
+
+    def __restore_from_cache(self, cache_key: str) -> bool:
+        """
+        Create the virtual environment from the cache.
 
-        # Install grader dependencies
-        logger.log(VERBOSE, "Installing grader dependencies")
+        :param cache_key: The cache key of the environment.
+        :return: True if the environment was restored, False if it has to be created from scratch.
+        """
+        if self.__cache is None or not self.__cache.is_cached(cache_key):
+            return False
+
+        logger.log(VERBOSE, "Creating new venv from cache")
+        # pip is part of the cached environment
+        VirtualEnvironment.__create_venv(self._venv_path, is_installing_pip=False)
 
-        grader_requirements_path = const.GRADER_REQUIREMENTS
-        VirtualEnvironment.__install_requirements(self._venv_path, grader_requirements_path)
+        if not self.__cache.restore(cache_key, self._venv_path):
+            shutil.rmtree(self._venv_path, ignore_errors=True)
+            return False
+
+        return True
 
     def __remove_existing_venv(self) -> None:
         """Remove any existing virtual environment in the project directory."""
@@ -117,6 +232,50 @@ class VirtualEnvironment:
         if not self.__is_keeping_venv_after_run:
             shutil.rmtree(self._venv_path)
 
+    @staticmethod
+    @measure("venv:create")
+    def __create_venv(venv_path: str, is_installing_pip: bool = True) -> None:
+        """
+        Create an empty virtual environment.
+
+        :param venv_path: The path to the virtual environment.
+        :type venv_path: str
+        :param is_installing_pip: Whether to install pip in the virtual environment.
+        :type is_installing_pip: bool
+        :raises VirtualEnvironmentError: If the creation of the virtual environment fails.
+        """
+        command = [const.PYTHON_BIN, "-m", "venv", venv_path]
+
+        if not is_installing_pip:
+            command.append("--without-pip")
+
+        create_venv_result = run(command)
+        if create_venv_result.returncode != 0:
+            logger.error("Failed to create virtual environment")
+            raise VirtualEnvironmentError("Failed to create virtual environment")
+
+    @staticmethod
+    def __install_packages(venv_path: str, packages: list[str]) -> None:
+        """
+        Install the given packages into the virtual environment.
+
+        :param venv_path: The path to the virtual environment.
+        :type venv_path: str
+        :param packages: The requirement specifiers of the packages to install.
+        :type packages: list[str]
+        :raises VirtualEnvironmentError: If the installation of the packages fails.
+        """
+        if len(packages) == 0:
+            return
+
+        pip_path = os.path.join(venv_path, const.PIP_PATH)
+
+        output = run([pip_path, "install", *packages])
+
+        if output.returncode != 0:
+            logger.error("Failed to install packages %s", packages)
+            raise VirtualEnvironmentError(f"Failed to install packages {packages}")
+
     @staticmethod
     def __install_requirements(venv_path: str, requirements_path: str) -> None:
         """
@@ -139,7 +298,10 @@ class VirtualEnvironment:
             raise VirtualEnvironmentError(f"Failed to install requirements from {requirements_path}")
 
     @staticmethod
-    def __install_project_as_package(venv_path: str, project_path: str) -> None:
+    @measure("venv:install-project")
+    def __install_project_as_package(
+        venv_path: str, project_path: str, is_installing_dependencies: bool = True
+    ) -> None:
         """
         Install the project as a package into the virtual environment.
 
@@ -147,6 +309,8 @@ class VirtualEnvironment:
         :type venv_path: str
         :param project_path: The path to the project.
         :type project_path: str
+        :param is_installing_dependencies: Whether to install the dependencies of the project as well.
+        :type is_installing_dependencies: bool
         :raises VirtualEnvironmentError: If the installation of the project fails.
         :return: None
         :rtype: None.
@@ -154,7 +318,12 @@ class VirtualEnvironment:
         pip_path = os.path.join(venv_path, const.PIP_PATH)
 
         # Editable install fixes issues with directory structure renaming in pyproject.toml
-        output = run([pip_path, "install", "-e", project_path])
+        command = [pip_path, "install", "-e", project_path]
+
+        if not is_installing_dependencies:
+            command.append("--no-deps")
+
+        output = run(command)
 
         if output.returncode != 0:
             logger.error("Failed to install project from %s", project_path)
@@ -0,0 +1,169 @@
+"""
+Module containing the index of a project submitted as a zip archive.
+
+The files of the project are listed from the central directory of the archive, without extracting it.
+The archive is extracted only when the files are actually needed, e.g. by mypy, pylint or the virtual environment.
+"""
+
+import logging
+import os
+import threading
+import zipfile
+from typing import Optional
+
+import grader.utils.constants as const
+from grader.utils.archive import ExtractionLimits, extract_archive, is_safe_member_name
+from grader.utils.project_index import ProjectIndex
+
+logger = logging.getLogger("grader")
+
+
+class ZipProjectIndex(ProjectIndex):
+    """Index of a project submitted as a zip archive, extracted on demand."""
+
+    def __init__(
+        self,
+        archive_path: str,
+        target_directory: str,
+        is_respecting_gitignore: bool = False,
+        limits: Optional[ExtractionLimits] = None,
+        jobs: Optional[int] = None,
+    ):
+        """
+        Read the central directory of the archive.
+
+        Like for extracted archives, if the archive contains only one folder (except MACOS folders),
+        that folder is the project root.
+
+        :param archive_path: The path to the zip archive.
+        :param target_directory: The directory the archive is extracted into, when needed.
+        :param is_respecting_gitignore: Whether to skip the files and directories ignored by .gitignore files.
+        :param limits: Optional extraction limits, the default limits if not given.
+        :param jobs: Optional number of threads to decompress large archives in (0 - one per CPU).
+        :raises zipfile.BadZipFile: If the archive cannot be read.
+        """
+        self.__archive_path = archive_path
+        self.__target_directory = target_directory
+        self.__limits = limits
+        self.__jobs = jobs
+        self.__extract_lock = threading.Lock()
+        self.__is_extracted = False
+
+        with zipfile.ZipFile(archive_path, "r") as archive:
+            members = {info.filename: info for info in archive.infolist() if is_safe_member_name(info.filename)}
+
+        names = list(members)
+        self.__checksums = {name: f"{info.CRC:08x}-{info.file_size}" for name, info in members.items()}
+
+        top_level_directories = {name.split("/")[0] for name in names if "/" in name.rstrip("/")}
+        top_level_directories |= {name.rstrip("/") for name in names if name.endswith("/") and name.count("/") == 1}
+        top_level_directories -= set(const.IGNORE_DIRS)
+
+        self.__prefix = ""
+        if len(top_level_directories) == 1:
+            self.__prefix = f"{top_level_directories.pop()}/"
+
+        self.__tree = build_directory_tree(names, self.__prefix)
+
+        project_root = os.path.join(target_directory, self.__prefix.rstrip("/")) if self.__prefix else target_directory
+        super().__init__(project_root, is_respecting_gitignore)
+
+    @property
+    def archive_path(self) -> str:
+        """
+        Get the path to the zip archive.
+
+        :returns: The path to the zip archive.
+        :rtype: str
+        """
+        return self.__archive_path
+
+    @property
+    def is_extracted(self) -> bool:
+        """
+        Check if the archive was already extracted.
+
+        :returns: True if the archive was extracted, False otherwise.
+        :rtype: bool
+        """
+        return self.__is_extracted
+
+    def extract(self) -> str:
+        """
+        Extract the archive into the target directory, unless it was already extracted.
+
+        :raises ArchiveError: If the archive exceeds the extraction limits.
+        :raises zipfile.BadZipFile: If the archive cannot be extracted.
+        :raises OSError: If the archive cannot be extracted.
+        :return: The project root.
+        """
+        with self.__extract_lock:
+            if not self.__is_extracted:
+                logger.debug("Extracting %s into %s", self.__archive_path, self.__target_directory)
+                extract_archive(self.__archive_path, self.__target_directory, self.__limits, self.__jobs)
+
+                self.__is_extracted = True
+
+        return self.project_root
+
+    def _list_directory(self, relative_directory: str) -> list[tuple[str, bool, bool]]:
+        """
+        List the entries of a directory of the project, from the central directory of the archive.
+
+        :param relative_directory: The directory, relative to the project root, with a trailing / (or empty).
+        :return: The name of each entry, whether it is a directory and whether it is a symlink (never).
+        """
+        entries = self.__tree.get(relative_directory, {})
+        return [(name, is_directory, False) for name, is_directory in entries.items()]
+
+    def _hash_file(self, relative_path: str) -> str:
+        """
+        Get the checksum of a file of the project from the central directory of the archive, without decompressing it.
+
+        :param relative_path: The path to the file, relative to the project root and with / as the separator.
+        :return: The CRC32 and the size of the file, or an empty string if it is not in the archive.
+        """
+        return self.__checksums.get(f"{self.__prefix}{relative_path}", "")
+
+    def _read_text(self, relative_path: str) -> Optional[str]:
+        """
+        Read a text file of the project from the archive.
+
+        :param relative_path: The path to the file, relative to the project root and with / as the separator.
+        :return: The contents of the file, or None if it cannot be read.
+        """
+        try:
+            with zipfile.ZipFile(self.__archive_path, "r") as archive:
+                return archive.read(f"{self.__prefix}{relative_path}").decode("utf-8", errors="replace")
+        except (OSError, KeyError, zipfile.BadZipFile):
+            return None
+
+
+def build_directory_tree(names: list[str], prefix: str) -> dict[str, dict[str, bool]]:
+    """
+    Build the directory tree of the members of an archive under a prefix.
+
+    Directories without their own member (only implied by the paths of their files) are included.
+
+    :param names: The names of the members of the archive.
+    :param prefix: The prefix of the project root inside the archive, with a trailing / (or empty).
+    :return: The entries of each directory, relative to the prefix and with a trailing / (or empty),
+             mapped to whether they are directories.
+    """
+    tree: dict[str, dict[str, bool]] = {"": {}}
+
+    for name in names:
+        if not name.startswith(prefix) or name == prefix:
+            continue
+
+        is_directory = name.endswith("/")
+        parts = name[len(prefix) :].rstrip("/").split("/")
+        directory = ""
+
+        for index, part in enumerate(parts):
+            is_last = index == len(parts) - 1
+            entries = tree.setdefault(directory, {})
+            entries[part] = entries.get(part, False) or not is_last or is_directory
+            directory = f"{directory}{part}/"
+
+    return tree
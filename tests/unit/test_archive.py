@@ -0,0 +1,155 @@
+"""Unit tests for the archive module."""
+
+import io
+import os
+import shutil
+import unittest
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from grader.exceptions import ArchiveError, InvalidConfigError
+from grader.utils.archive import ExtractionLimits, extract_archive, extract_member, split_by_size
+
+
+class TestArchive(unittest.TestCase):
+    """Test cases for the zip extraction engine."""
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        """
+        Initialize the test case.
+
+        :param methodName: The name of the test method to run.
+        :type methodName: str
+        """
+        self.__sample_dir = os.path.abspath("sample_archive")
+        self.__archive_path = os.path.join(self.__sample_dir, "submission.zip")
+        self.__target_dir = os.path.join(self.__sample_dir, "extracted")
+        super().__init__(methodName)
+
+    def setUp(self) -> None:
+        """Set up the test environment."""
+        os.makedirs(self.__sample_dir, exist_ok=True)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        """Tear down the test environment."""
+        shutil.rmtree(self.__sample_dir, ignore_errors=True)
+        return super().tearDown()
+
+    def __write_archive(self, members: dict[str, bytes]) -> None:
+        """
+        Write the sample archive, compressed.
+
+        :param members: The names of the members of the archive, mapped to their contents.
+        """
+        with zipfile.ZipFile(self.__archive_path, "w", zipfile.ZIP_DEFLATED) as archive:
+            for name, content in members.items():
+                archive.writestr(name, content)
+
+    def test_01_extract(self) -> None:
+        """Verify that the archive is extracted, skipping ignored directories and unsafe names."""
+        # Arrange
+        self.__write_archive(
+            {
+                "project/main.py": b"print('hello')",
+                "project/empty/": b"",
+                "project/.venv/lib/site.py": b"",
+                "__MACOSX/project/._main.py": b"",
+                "../escaped.py": b"",
+            }
+        )
+
+        # Act
+        extract_archive(self.__archive_path, self.__target_dir)
+
+        # Assert
+        with open(os.path.join(self.__target_dir, "project", "main.py"), encoding="utf-8") as file:
+            self.assertEqual("print('hello')", file.read())
+        self.assertTrue(os.path.isdir(os.path.join(self.__target_dir, "project", "empty")))
+        self.assertFalse(os.path.exists(os.path.join(self.__target_dir, "project", ".venv")))
+        self.assertFalse(os.path.exists(os.path.join(self.__target_dir, "__MACOSX")))
+        self.assertFalse(os.path.exists(os.path.join(self.__sample_dir, "escaped.py")))
+
+    def test_02_limits(self) -> None:
+        """Verify that archives exceeding the limits are refused before anything is written."""
+        # Arrange
+        self.__write_archive({"a.py": b"a" * 100, "b.py": b"b" * 100, "zeros.bin": bytes(2 * 1024 * 1024)})
+        cases = [
+            ExtractionLimits(max_entries=2),
+            ExtractionLimits(max_total_size=1024),
+            ExtractionLimits(max_compression_ratio=10),
+        ]
+
+        # Act & Assert
+        for limits in cases:
+            with self.subTest(limits=limits):
+                with self.assertRaises(ArchiveError):
+                    extract_archive(self.__archive_path, self.__target_dir, limits)
+                self.assertFalse(os.path.exists(self.__target_dir))
+
+        extract_archive(self.__archive_path, self.__target_dir, ExtractionLimits(None, None, None))
+        self.assertTrue(os.path.exists(os.path.join(self.__target_dir, "zeros.bin")))
+
+    def test_03_member_larger_than_declared(self) -> None:
+        """Verify that the extraction stops if a member is larger than declared in the archive."""
+        # Arrange
+        archive = MagicMock()
+        archive.open.return_value = io.BytesIO(b"x" * 10)
+        info = zipfile.ZipInfo("main.py")
+        info.file_size = 5
+
+        # Act & Assert
+        with self.assertRaises(ArchiveError):
+            extract_member(archive, info, self.__target_dir)
+
+    def test_04_parallel_extraction(self) -> None:
+        """Verify that large archives are extracted in several threads if configured."""
+        # Arrange
+        members = {f"project/module_{index}.py": f"VALUE = {index}".encode() for index in range(8)}
+        self.__write_archive(members)
+
+        # Act
+        with (
+            patch("grader.utils.constants.ARCHIVE_PARALLEL_MIN_SIZE", 0),
+            patch("grader.utils.archive.ThreadPoolExecutor", wraps=ThreadPoolExecutor) as mock_executor,
+        ):
+            extract_archive(self.__archive_path, self.__target_dir, jobs=3)
+
+        # Assert
+        mock_executor.assert_called_once_with(max_workers=3)
+        for name, content in members.items():
+            with open(os.path.join(self.__target_dir, name), "rb") as file:
+                self.assertEqual(content, file.read())
+
+    def test_05_split_by_size(self) -> None:
+        """Verify that the members are split into parts of about the same size."""
+        # Arrange
+        members = []
+        for name, size in [("a", 10), ("b", 6), ("c", 5), ("d", 1)]:
+            info = zipfile.ZipInfo(name)
+            info.file_size = size
+            members.append(info)
+
+        # Act
+        parts = split_by_size(members, 2)
+
+        # Assert
+        self.assertEqual([["a", "d"], ["b", "c"]], [[info.filename for info in part] for part in parts])
+        self.assertEqual(1, len(split_by_size(members[:1], 3)))
+
+    def test_06_limits_from_dict(self) -> None:
+        """Verify that the limits are read from the archive section of the configuration."""
+        # Act
+        limits = ExtractionLimits.from_dict({"max_entries": 10, "max_total_size": None})
+
+        # Assert
+        self.assertEqual(10, limits.max_entries)
+        self.assertIsNone(limits.max_total_size)
+        self.assertEqual(ExtractionLimits().max_compression_ratio, limits.max_compression_ratio)
+        with self.assertRaises(InvalidConfigError):
+            ExtractionLimits.from_dict({"max_entries": True})
+
+
+if __name__ == "__main__":
+    unittest.main()
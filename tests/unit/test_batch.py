@@ -0,0 +1,208 @@
+"""Unit tests for the batch grading module."""
+
+import os
+import shutil
+import unittest
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import grader.utils.constants as const
+from grader.batch import BATCH_ERROR_CHECK_NAME, BatchGrader, _initialize_worker, find_submissions
+from grader.checks.abstract_check import CheckResult, NonScoredCheckResult, ScoredCheckResult
+from grader.exceptions import InvalidConfigError, InvalidProjectRootError
+from grader.utils.instrumentation import StageMetrics
+from grader.utils.job_queue import JobQueue
+
+
+class TestFindSubmissions(unittest.TestCase):
+    """Test cases for the find_submissions function."""
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        """
+        Initialize the test case.
+
+        :param methodName: The name of the test method to run.
+        :type methodName: str
+        """
+        self.__batch_dir = "sample_batch_dir"
+        super().__init__(methodName)
+
+    def setUp(self) -> None:
+        """Set up the test environment."""
+        os.makedirs(os.path.join(self.__batch_dir, "student_b"), exist_ok=True)
+        os.makedirs(os.path.join(self.__batch_dir, "__MACOSX"), exist_ok=True)
+
+        with zipfile.ZipFile(os.path.join(self.__batch_dir, "student_a.zip"), "w") as archive:
+            archive.writestr("main.py", "")
+
+        with open(os.path.join(self.__batch_dir, "notes.txt"), "w", encoding="utf-8") as notes:
+            notes.write("not a submission")
+
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        """Tear down the test environment."""
+        shutil.rmtree(self.__batch_dir, ignore_errors=True)
+        return super().tearDown()
+
+    def test_01_folders_and_archives_are_found(self) -> None:
+        """Verify that folders and zip archives are submissions, while ignored folders and other files are not."""
+        # Arrange
+        expected_submissions = {
+            "student_a": os.path.join(self.__batch_dir, "student_a.zip"),
+            "student_b": os.path.join(self.__batch_dir, "student_b"),
+        }
+
+        # Act
+        actual_submissions = find_submissions(self.__batch_dir)
+
+        # Assert
+        self.assertEqual(expected_submissions, actual_submissions)
+        self.assertEqual(["student_a", "student_b"], list(actual_submissions))
+
+    def test_02_missing_batch_directory(self) -> None:
+        """Verify that a missing batch directory raises InvalidProjectRootError."""
+        # Act & Assert
+        with self.assertRaises(InvalidProjectRootError):
+            find_submissions(os.path.join(self.__batch_dir, "missing"))
+
+    def test_03_colliding_submission_ids(self) -> None:
+        """Verify that a folder and an archive with the same id raise InvalidProjectRootError, neither is dropped."""
+        # Arrange
+        os.makedirs(os.path.join(self.__batch_dir, "student_a"))
+
+        # Act & Assert
+        with self.assertRaisesRegex(InvalidProjectRootError, "student_a"):
+            find_submissions(self.__batch_dir)
+
+
+class TestInitializeWorker(unittest.TestCase):
+    """Test cases for the _initialize_worker function."""
+
+    def setUp(self) -> None:
+        """Save the original directories, since the worker initializer overrides them."""
+        self.__original = (const.WORK_DIR, const.TEMP_FILES_DIR, const.REPORTS_TEMP_DIR, const.MYPY_LINE_COUNT_REPORT)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        """Restore the original directories."""
+        const.WORK_DIR, const.TEMP_FILES_DIR, const.REPORTS_TEMP_DIR, const.MYPY_LINE_COUNT_REPORT = self.__original
+        return super().tearDown()
+
+    def test_01_directories_are_isolated(self) -> None:
+        """Verify that all working directories of a worker are under its own private directory."""
+        # Arrange
+        worker_root = os.path.join("workers_root", f"worker-{os.getpid()}")
+
+        # Act
+        _initialize_worker("workers_root")
+
+        # Assert
+        for directory in (const.WORK_DIR, const.TEMP_FILES_DIR, const.REPORTS_TEMP_DIR, const.MYPY_LINE_COUNT_REPORT):
+            self.assertTrue(directory.startswith(worker_root))
+
+
+@patch("grader.batch._initialize_worker", MagicMock())
+@patch("grader.batch.ProcessPoolExecutor", ThreadPoolExecutor)
+class TestBatchGrader(unittest.TestCase):
+    """Test cases for the BatchGrader class."""
+
+    @patch("grader.batch._grade_submission")
+    @patch("grader.batch.find_submissions")
+    def test_01_results_are_aggregated(self, mock_find_submissions: MagicMock, mock_grade: MagicMock) -> None:
+        """Verify that the results of all submissions are returned, keyed by submission id."""
+        # Arrange
+        mock_find_submissions.return_value = {"student_a": "a", "student_b": "b"}
+        result_a = [ScoredCheckResult("pylint", 1, "", "", 2)]
+        result_b = [ScoredCheckResult("pylint", 2, "", "", 2)]
+        stages_a = [StageMetrics("check:pylint", wall_time=1.0)]
+        mock_grade.side_effect = lambda submission_id, *_: (
+            (result_a, stages_a) if submission_id == "student_a" else (result_b, [])
+        )
+        batch_grader = BatchGrader("batch", config_path="config.json", jobs=2, is_collecting_timings=True)
+
+        # Act
+        results = batch_grader.grade()
+
+        # Assert
+        self.assertEqual({"student_a": result_a, "student_b": result_b}, results)
+        self.assertEqual({"student_a": stages_a, "student_b": []}, batch_grader.stage_metrics)
+        self.assertEqual(2, mock_grade.call_count)
+        self.assertTrue(all(call.args[-1] for call in mock_grade.call_args_list))
+
+    @patch("grader.batch._grade_submission")
+    @patch("grader.batch.find_submissions")
+    def test_02_crashed_submission_does_not_stop_batch(
+        self, mock_find_submissions: MagicMock, mock_grade: MagicMock
+    ) -> None:
+        """Verify that a crashing submission gets a failed result while the others are still graded."""
+        # Arrange
+        mock_find_submissions.return_value = {"student_a": "a", "student_b": "b"}
+        result_b = [ScoredCheckResult("pylint", 2, "", "", 2)]
+
+        def grade_side_effect(submission_id: str, *_: object) -> tuple:
+            if submission_id == "student_a":
+                raise RuntimeError("worker crashed")
+            return result_b, []
+
+        mock_grade.side_effect = grade_side_effect
+
+        # Act
+        results = BatchGrader("batch", jobs=2).grade()
+
+        # Assert
+        self.assertEqual(
+            [NonScoredCheckResult(BATCH_ERROR_CHECK_NAME, False, "", "worker crashed")], results["student_a"]
+        )
+        self.assertEqual(result_b, results["student_b"])
+
+    @patch("grader.batch._grade_queued_submission")
+    @patch("grader.batch.find_submissions")
+    def test_03_queued_batch_resumes(self, mock_find_submissions: MagicMock, mock_grade: MagicMock) -> None:
+        """Verify that a batch restarted on its job queue only grades the submissions which are not finished."""
+        # Arrange
+        queue_dir = os.path.abspath("sample_batch_queue")
+        queue_path = os.path.join(queue_dir, "queue.sqlite3")
+        os.makedirs(queue_dir, exist_ok=True)
+        self.addCleanup(shutil.rmtree, queue_dir, ignore_errors=True)
+        mock_find_submissions.return_value = {"student_a": "a", "student_b": "b", "student_c": "c"}
+        result_a: list[CheckResult] = [ScoredCheckResult("pylint", 1, "", "", 2)]
+        result_b: list[CheckResult] = [ScoredCheckResult("pylint", 2, "", "", 2)]
+
+        with JobQueue(queue_path) as queue:
+            queue.add("student_a", "a")
+            queue.add("student_b", "b")
+            queue.claim(2)
+            queue.complete("student_a", result_a)
+
+        mock_grade.side_effect = lambda _, submission_id, *__: (
+            (result_b, [], None) if submission_id == "student_b" else ([], [], "Cannot install the requirements")
+        )
+
+        # Act
+        with patch("grader.batch.JobQueue", lambda path: JobQueue(path, max_attempts=1)):
+            results = BatchGrader("batch", jobs=2, queue_path=queue_path).grade()
+
+        # Assert
+        self.assertEqual(["student_b", "student_c"], sorted(call.args[1] for call in mock_grade.call_args_list))
+        self.assertEqual(result_a, results["student_a"])
+        self.assertEqual(result_b, results["student_b"])
+        self.assertEqual(
+            [NonScoredCheckResult(BATCH_ERROR_CHECK_NAME, False, "", "Cannot install the requirements")],
+            results["student_c"],
+        )
+
+    @patch("grader.batch.find_submissions")
+    def test_04_invalid_jobs(self, mock_find_submissions: MagicMock) -> None:
+        """Verify that a batch is refused without a positive amount of jobs, instead of using all CPUs or crashing."""
+        # Act & Assert
+        for jobs in (0, -3):
+            with self.assertRaises(InvalidConfigError):
+                BatchGrader("batch", jobs=jobs)
+
+        mock_find_submissions.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
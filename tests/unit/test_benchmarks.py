@@ -0,0 +1,184 @@
+"""Unit tests for the benchmarks."""
+
+import json
+import os
+import shutil
+import unittest
+import zipfile
+
+from benchmarks.compare import compare_results, get_threshold, load_thresholds
+from benchmarks.generators import PROFILES, SubmissionProfile, generate_submission
+from benchmarks.runner import LatencyStatistics, load_results, run_benchmark, save_results
+from benchmarks.scenarios import SCENARIOS, TOOL_CHECKS, Scenario, find_tool
+from grader.utils.instrumentation import measure
+
+
+def make_benchmark(median: float, stages: dict[str, float]) -> dict:
+    """
+    Build the results of a benchmark, as stored in a results file.
+
+    :param median: The median latency of the benchmark.
+    :param stages: The total wall time of each stage, measured in a single run.
+    :return: The results of the benchmark.
+    """
+    return {
+        "latency": {"median": median},
+        "stages": [{"name": name, "runs": 1, "total_wall_time": wall_time} for name, wall_time in stages.items()],
+    }
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Test cases for the benchmark generators, runner and comparison."""
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        """
+        Initialize the test case.
+
+        :param methodName: The name of the test method to run.
+        :type methodName: str
+        """
+        self.__sample_dir = os.path.abspath("sample_benchmarks")
+        super().__init__(methodName)
+
+    def tearDown(self) -> None:
+        """Tear down the test environment."""
+        shutil.rmtree(self.__sample_dir, ignore_errors=True)
+        return super().tearDown()
+
+    def test_01_generate_submission(self) -> None:
+        """Verify that a deep submission is generated as a directory and as an archive with the same files."""
+        # Arrange
+        profile = SubmissionProfile("deep", modules=4, functions_per_module=2, test_files=2, tests_per_file=3, depth=3)
+
+        # Act
+        submission = generate_submission(profile, self.__sample_dir)
+
+        # Assert
+        deepest_module = os.path.join(submission.project_root, "src", "app", "level_0", "level_1", "module_2.py")
+        self.assertTrue(os.path.exists(deepest_module))
+        self.assertTrue(os.path.exists(os.path.join(os.path.dirname(deepest_module), "__init__.py")))
+        with open(os.path.join(submission.project_root, "tests", "test_module_1.py"), encoding="utf-8") as test_file:
+            test_source = test_file.read()
+        self.assertIn("from app.level_0.module_1 import function_0", test_source)
+        self.assertEqual(3, test_source.count("def test_"))
+        with zipfile.ZipFile(submission.archive_path) as archive:
+            self.assertEqual(submission.files, len(archive.namelist()))
+
+    def test_02_latency_statistics(self) -> None:
+        """Verify the statistics of the measured latencies."""
+        # Act
+        latency = LatencyStatistics.from_samples([0.4, 0.1, 0.3, 0.2, 1.0])
+
+        # Assert
+        self.assertEqual(LatencyStatistics(0.1, 0.3, 0.4, 1.0, 1.0), latency)
+
+    def test_03_run_benchmark(self) -> None:
+        """Verify that a scenario runs after the warmup runs, and that its stages are aggregated."""
+        # Arrange
+        submission = generate_submission(PROFILES["small"], os.path.join(self.__sample_dir, "submission"))
+        runs: list[str] = []
+
+        def run(_: object, work_directory: str) -> None:
+            runs.append(work_directory)
+            with measure("check:sample"):
+                pass
+
+        # Act
+        result = run_benchmark(Scenario("sample", "", run), submission, self.__sample_dir, repeat=3, warmup=2)
+
+        # Assert
+        self.assertEqual(5, len(runs))
+        self.assertEqual("sample/small", result.name)
+        self.assertEqual(3, result.runs)
+        self.assertEqual([("check:sample", 3)], [(stage.name, stage.runs) for stage in result.stages])
+        self.assertGreater(result.files_per_second, 0)
+
+    def test_04_grade_scenario(self) -> None:
+        """Verify that the grading scenario grades the generated submission offline, measuring its checks."""
+        # Arrange
+        submission = generate_submission(PROFILES["small"], os.path.join(self.__sample_dir, "submission"))
+
+        # Act
+        result = run_benchmark(SCENARIOS["grade:archive"], submission, self.__sample_dir, repeat=1, warmup=0)
+
+        # Assert
+        self.assertEqual(
+            ["config:load", "check:requirements", "check:structure"], [stage.name for stage in result.stages]
+        )
+
+    def test_05_compare_results(self) -> None:
+        """Verify that slowdowns above the threshold and the minimal delta are regressions, for stages too."""
+        # Arrange
+        baseline = {
+            "grade/small": make_benchmark(1.0, {"check:pylint": 0.5}),
+            "grade/large": make_benchmark(0.001, {}),
+            "removed/small": make_benchmark(1.0, {}),
+        }
+        current = {
+            "grade/small": make_benchmark(1.1, {"check:pylint": 0.8}),
+            "grade/large": make_benchmark(0.002, {}),
+            "added/small": make_benchmark(1.0, {}),
+        }
+
+        # Act
+        comparisons = compare_results(current, baseline, {"*#check:*": 0.5}, default_threshold=0.2, min_delta=0.005)
+
+        # Assert
+        self.assertEqual(
+            [("grade/small", False), ("grade/small#check:pylint", True), ("grade/large", False)],
+            [(comparison.name, comparison.is_regression) for comparison in comparisons],
+        )
+        self.assertAlmostEqual(0.6, comparisons[1].change)
+
+    def test_06_thresholds(self) -> None:
+        """Verify that the last matching pattern gives the threshold, and that invalid thresholds are refused."""
+        # Arrange
+        thresholds_path = os.path.join(self.__sample_dir, "thresholds.json")
+        os.makedirs(self.__sample_dir, exist_ok=True)
+        with open(thresholds_path, "w", encoding="utf-8") as thresholds_file:
+            json.dump({"grade:*": 0.3, "grade:*/large": 0.5}, thresholds_file)
+
+        # Act
+        thresholds = load_thresholds(thresholds_path)
+
+        # Assert
+        self.assertEqual(0.5, get_threshold("grade:directory/large", thresholds, 0.2))
+        self.assertEqual(0.3, get_threshold("grade:directory/small", thresholds, 0.2))
+        self.assertEqual(0.2, get_threshold("index:build/small", thresholds, 0.2))
+
+        with open(thresholds_path, "w", encoding="utf-8") as thresholds_file:
+            json.dump({"grade:*": -1}, thresholds_file)
+        with self.assertRaises(ValueError):
+            load_thresholds(thresholds_path)
+
+    def test_07_results_file(self) -> None:
+        """Verify that the results survive a round trip through a results file."""
+        # Arrange
+        submission = generate_submission(PROFILES["small"], os.path.join(self.__sample_dir, "submission"))
+        result = run_benchmark(SCENARIOS["index:build"], submission, self.__sample_dir, repeat=2, warmup=0)
+        results_path = os.path.join(self.__sample_dir, "results.json")
+
+        # Act
+        save_results([result], results_path)
+        results = load_results(results_path)
+
+        # Assert
+        self.assertEqual(["index:build/small"], list(results))
+        self.assertEqual(result.latency.median, results["index:build/small"]["latency"]["median"])
+
+    def test_08_grade_directory_scenario(self) -> None:
+        """Verify that grading the submission directory runs the checks of the installed tools too."""
+        # Arrange
+        submission = generate_submission(PROFILES["small"], os.path.join(self.__sample_dir, "submission"))
+        tool_checks = [f"check:{name}" for name, path in TOOL_CHECKS.items() if find_tool(path) is not None]
+
+        # Act
+        result = run_benchmark(SCENARIOS["grade:directory"], submission, self.__sample_dir, repeat=1, warmup=0)
+
+        # Assert
+        stages = [stage.name for stage in result.stages if stage.name.startswith("check:")]
+        self.assertEqual(["check:requirements", "check:structure", "check:type-hints", *tool_checks], stages)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,8 +3,9 @@
 import unittest
 from unittest.mock import MagicMock, patch
 
-from grader.checks.checks_factory import create_checks
+from grader.checks.checks_factory import create_checks, create_project_index
 from grader.exceptions import InvalidCheckError, InvalidConfigError
+from grader.utils.archive import ExtractionLimits
 
 
 class TestChecksFactory(unittest.TestCase):
@@ -194,3 +195,120 @@ class TestChecksFactory(unittest.TestCase):
         self.assertEqual(len(non_venv_checks), 1)
         check = non_venv_checks[0]
         self.assertEqual(check.env_vars, {})
+
+    @patch("grader.checks.checks_factory.PytestSession")
+    def test_13_coverage_and_tests_with_same_tests_share_session(self, mock_session: MagicMock) -> None:
+        """Test that coverage and tests checks running the same tests share a single pytest session."""
+        # Arrange
+        tests_path = ["tests/test_sample.py"]
+        config = {
+            "checks": [
+                {"name": "tests", "max_points": 10, "is_venv_required": True, "tests_path": tests_path},
+                {"name": "coverage", "max_points": 2, "is_venv_required": True, "tests_path": tests_path},
+            ]
+        }
+
+        # Act
+        create_checks(config, "test_project")
+
+        # Assert
+        mock_session.assert_called_once()
+        self.assertEqual("test_project", mock_session.call_args.args[0])
+
+    @patch("grader.checks.checks_factory.PytestSession")
+    def test_14_coverage_discovering_tests_does_not_share_session(self, mock_session: MagicMock) -> None:
+        """Test that a coverage check without tests_path runs its own tests, separately from the tests check."""
+        # Arrange
+        config = {
+            "checks": [
+                {"name": "tests", "max_points": 10, "is_venv_required": True, "tests_path": ["tests/test_sample.py"]},
+                {"name": "coverage", "max_points": 2, "is_venv_required": True},
+            ]
+        }
+
+        # Act
+        create_checks(config, "test_project")
+
+        # Assert
+        mock_session.assert_not_called()
+
+    @patch("grader.checks.checks_factory.ProjectIndex")
+    def test_15_checks_share_project_index(self, mock_index: MagicMock) -> None:
+        """Test that a single project index, respecting .gitignore if configured, is shared by all checks."""
+        # Arrange
+        config = {
+            "respect_gitignore": True,
+            "checks": [
+                {"name": "pylint", "max_points": 3, "is_venv_required": True},
+                {"name": "type-hints", "max_points": 2, "is_venv_required": False},
+            ],
+        }
+
+        # Act
+        create_checks(config, "test_project")
+
+        # Assert
+        mock_index.assert_called_once_with("test_project", True)
+
+    def test_16_invalid_respect_gitignore(self) -> None:
+        """Test that a respect_gitignore which is not a boolean raises InvalidConfigError."""
+        # Arrange
+        config = {"respect_gitignore": "yes", "checks": []}
+
+        # Act & Assert
+        with self.assertRaises(InvalidConfigError):
+            create_checks(config, "test_project")
+
+    @patch("grader.checks.checks_factory.is_path_zip", return_value=True)
+    @patch("grader.checks.checks_factory.ZipProjectIndex")
+    def test_17_archive_limits(self, mock_index: MagicMock, _: MagicMock) -> None:
+        """Test that the archive section configures the extraction of zip submissions."""
+        # Arrange
+        config = {"archive": {"max_entries": 50, "max_compression_ratio": None, "jobs": 4}}
+
+        # Act
+        create_project_index(config, "submission.zip", "target")
+
+        # Assert
+        limits = ExtractionLimits(max_entries=50, max_compression_ratio=None)
+        mock_index.assert_called_once_with("submission.zip", "target", False, limits, 4)
+
+    @patch("grader.checks.checks_factory.is_path_zip", return_value=True)
+    def test_18_invalid_archive_config(self, _: MagicMock) -> None:
+        """Test that invalid archive limits raise InvalidConfigError."""
+        # Arrange
+        configs: list[dict] = [
+            {"archive": []},
+            {"archive": {"jobs": -1}},
+            {"archive": {"max_total_size": 0}},
+            {"archive": {"max_entries": "many"}},
+        ]
+
+        # Act & Assert
+        for config in configs:
+            with self.subTest(config=config), self.assertRaises(InvalidConfigError):
+                create_project_index(config, "submission.zip", "target")
+
+    @patch("grader.checks.checks_factory.PytestSession")
+    def test_19_checks_with_different_limits_do_not_share_session(self, mock_session: MagicMock) -> None:
+        """Test that coverage and tests checks with different limits run the tests separately."""
+        # Arrange
+        tests_path = ["tests/test_sample.py"]
+        config = {
+            "checks": [
+                {"name": "tests", "max_points": 10, "is_venv_required": True, "tests_path": tests_path},
+                {
+                    "name": "coverage",
+                    "max_points": 2,
+                    "is_venv_required": True,
+                    "tests_path": tests_path,
+                    "limits": {"timeout": 60},
+                },
+            ]
+        }
+
+        # Act
+        create_checks(config, "test_project")
+
+        # Assert
+        mock_session.assert_not_called()
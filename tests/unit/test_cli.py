@@ -41,6 +41,63 @@ class TestGetArgs(unittest.TestCase):
         expected = ("verbosity", 2)
         self.assertIn(expected, get_args().items())
 
+    @patch("sys.argv", ["cli.py", "path/to/submissions", "--batch", "-j", "4"])
+    def test_06_batch_arguments(self) -> None:
+        """Test 06: Test that the batch mode arguments are parsed correctly."""
+        args = get_args()
+        self.assertIn(("batch", True), args.items())
+        self.assertIn(("jobs", 4), args.items())
+
+    @patch("sys.argv", ["cli.py", "path/to/project"])
+    def test_07_batch_defaults(self) -> None:
+        """Test 07: Test that batch mode is disabled by default."""
+        args = get_args()
+        self.assertIn(("batch", False), args.items())
+        self.assertIn(("jobs", None), args.items())
+
+    @patch("sys.argv", ["cli.py", "report.json", "--rescore", "-c", "path/to/config"])
+    def test_08_rescore_argument(self) -> None:
+        """Test 08: Test that the rescore mode is parsed correctly, and disabled by default."""
+        self.assertIn(("rescore", True), get_args().items())
+
+        with patch("sys.argv", ["cli.py", "path/to/project"]):
+            self.assertIn(("rescore", False), get_args().items())
+
+    @patch("sys.argv", ["cli.py", "path/to/project", "--timings"])
+    def test_09_timings_argument(self) -> None:
+        """Test 09: Test that the timings flag is parsed correctly, and disabled by default."""
+        self.assertIn(("timings", True), get_args().items())
+
+        with patch("sys.argv", ["cli.py", "path/to/project"]):
+            self.assertIn(("timings", False), get_args().items())
+
+    @patch("sys.argv", ["cli.py", "path/to/project", "--trace", "trace.json", "--otlp-endpoint", "http://collector"])
+    def test_10_trace_arguments(self) -> None:
+        """Test 10: Test that the trace arguments are parsed correctly."""
+        args = get_args()
+        self.assertIn(("trace", "trace.json"), args.items())
+        self.assertIn(("otlp_endpoint", "http://collector"), args.items())
+
+    @patch("sys.argv", ["cli.py", "--serve", "-c", "path/to/config", "--socket", "grader.sock"])
+    def test_11_serve_arguments(self) -> None:
+        """Test 11: Test that the server mode needs no project root, while the other modes still do."""
+        args = get_args()
+        self.assertIn(("serve", True), args.items())
+        self.assertIn(("project_root", None), args.items())
+        self.assertIn(("socket", "grader.sock"), args.items())
+
+        with patch("sys.argv", ["cli.py", "-c", "path/to/config"]), patch("sys.stderr"):
+            with self.assertRaises(SystemExit):
+                get_args()
+
+    @patch("sys.stderr")
+    def test_12_jobs_must_be_positive(self, _: object) -> None:
+        """Test 12: Test that a jobs argument which is not a positive integer is refused."""
+        for jobs in ("0", "-3", "many"):
+            with patch("sys.argv", ["cli.py", "path/to/submissions", "--batch", "-j", jobs]):
+                with self.assertRaises(SystemExit):
+                    get_args()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -19,7 +19,7 @@ class TestCoverageCheck(unittest.TestCase):
         # This way, we have 3 ranges: 0-33, 34-66, 67-100
         return super().setUp()
 
-    @patch("subprocess.run")
+    @patch("grader.checks.coverage_check.run")
     def test_01_coverage_run_fail(self, mocked_run: MagicMock) -> None:
         """Test that a failed coverage run logs an error and raises an exception."""
         # Arrange
@@ -34,7 +34,7 @@ class TestCoverageCheck(unittest.TestCase):
         # Assert
         self.assertTrue(is_message_logged)
 
-    @patch("subprocess.run")
+    @patch("grader.checks.coverage_check.run")
     def test_02_coverage_report_fail(self, mocked_run: MagicMock) -> None:
         """Test that a failed coverage report logs an error and returns a score of 0.0."""
 
@@ -178,7 +178,7 @@ class TestCoverageCheck(unittest.TestCase):
         # Assert
         self.assertEqual(expected_score, actual_score)
 
-    @patch("subprocess.run")
+    @patch("grader.checks.coverage_check.run")
     def test_11_coverage_report_read_properly(self, mocked_run: MagicMock) -> None:
         """Test that the coverage report is read properly and returns the correct score."""
 
@@ -196,3 +196,19 @@ class TestCoverageCheck(unittest.TestCase):
 
         # Assert
         self.assertEqual(ScoredCheckResult("Coverage", 2, "Tests cover 100.00% of the code", "", 2), result)
+
+    @patch("grader.checks.coverage_check.CoverageCheck._CoverageCheck__coverage_report")
+    def test_12_shared_session_is_used(self, mocked_report: MagicMock) -> None:
+        """Test that a shared pytest session replaces the separate coverage run."""
+        # Arrange
+        mocked_report.return_value = 100
+        session = MagicMock()
+        session.run.return_value = CompletedProcess(args=["coverage", "run"], returncode=0)
+        self.coverage_check.share_session(session)
+
+        # Act
+        result = self.coverage_check.run()
+
+        # Assert
+        session.run.assert_called_once_with([])
+        self.assertEqual(ScoredCheckResult("Coverage", 2, "Tests cover 100.00% of the code", "", 2), result)
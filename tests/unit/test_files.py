@@ -11,8 +11,6 @@ from grader.utils.files import (
     find_all_files_under_directory,
     find_all_python_files,
     find_all_source_files,
-    find_all_test_files,
-    get_tests_directory_name,
     unzip_archive,
 )
 
@@ -27,34 +25,43 @@ class TestFindAllPythonFiles(unittest.TestCase):
         :param methodName: The name of the test method to run.
         :type methodName: str
         """
-        self.__sample_dir = "sample_dir"
+        self.__sample_dir = os.path.abspath("sample_dir")
         super().__init__(methodName)
 
-    @patch("grader.utils.structure_validator.StructureValidator.get_matching_files")
-    def test_01_find_all_python_files(self, mocked_function: MagicMock) -> None:
-        """
-        Verify that find_all_python_files returns the proper files.
+    def tearDown(self) -> None:
+        """Tear down the test environment."""
+        shutil.rmtree(self.__sample_dir, ignore_errors=True)
+        return super().tearDown()
 
-        :param mocked_function: Mocked find_all_files_under_directory function.
-        :type mocked_function: MagicMock
-        """
+    def test_01_find_all_python_files(self) -> None:
+        """Verify that find_all_python_files returns the proper files."""
         # Arrange
-        all_files, expected_files = self.__build_sample_files()
-        mocked_function.return_value = all_files
+        expected_files = self.__build_sample_files()
 
         # Act
         actual_files = find_all_python_files(self.__sample_dir)
 
         # Assert
-        self.assertEqual(expected_files, actual_files)
-        mocked_function.assert_called_once_with(self.__sample_dir)
+        self.assertEqual(sorted(expected_files), sorted(actual_files))
+
+    def test_02_find_all_python_files_with_project_index(self) -> None:
+        """Verify that find_all_python_files uses the given project index instead of walking the project."""
+        # Arrange
+        project_index = MagicMock()
+        project_index.python_files = ["main.py"]
 
-    def __build_sample_files(self) -> tuple[list[str], list[str]]:
+        # Act
+        actual_files = find_all_python_files(self.__sample_dir, project_index)
+
+        # Assert
+        self.assertEqual(["main.py"], actual_files)
+
+    def __build_sample_files(self) -> list[str]:
         """
         Build the sample files for the test.
 
-        :return: The list of all files and the list of expected files.
-        :rtype: tuple[list[str], list[str]]
+        :return: The list of expected files.
+        :rtype: list[str]
         """
         root_dir = self.__sample_dir
         folder_1 = os.path.join(root_dir, "folder1")
@@ -67,6 +74,7 @@ class TestFindAllPythonFiles(unittest.TestCase):
         all_files = [
             os.path.join(folder_1, "file2.py"),
             os.path.join(folder_1, "file3.py"),
+            os.path.join(folder_1, "notes.txt"),
             os.path.join(folder_2, "file5.py"),
             os.path.join(subfolder_2, "file9.py"),
             os.path.join(subfolder_3, "file10.py"),
@@ -76,6 +84,11 @@ class TestFindAllPythonFiles(unittest.TestCase):
             os.path.join(venv_dir_2, "file14.py"),
         ]
 
+        for file in all_files:
+            os.makedirs(os.path.dirname(file), exist_ok=True)
+            with open(file, "w", encoding="utf-8"):
+                pass
+
         expected_files = [
             os.path.join(folder_1, "file2.py"),
             os.path.join(folder_1, "file3.py"),
@@ -84,7 +97,7 @@ class TestFindAllPythonFiles(unittest.TestCase):
             os.path.join(subfolder_3, "file10.py"),
         ]
 
-        return all_files, expected_files
+        return expected_files
 
 
 class TestFindAllSourceFiles(unittest.TestCase):
@@ -97,190 +110,30 @@ class TestFindAllSourceFiles(unittest.TestCase):
         :param methodName: The name of the test method to run.
         :type methodName: str
         """
-        self.__sample_dir = "sample_dir"
-        super().__init__(methodName)
-
-    @patch("grader.utils.files.find_all_test_files")
-    @patch("grader.utils.files.find_all_python_files")
-    @patch("grader.utils.files.get_tests_directory_name")
-    def test_01_find_all_source_files(
-        self,
-        mocked_tests_directory_name: MagicMock,
-        mocked_all_python_files: MagicMock,
-        mocked_find_all_test_files: MagicMock,
-    ) -> None:
-        """
-        Verify that find_all_source_files returns the proper files.
-
-        :param mocked_tests_directory_name: Mocked get_tests_directory_name function.
-        :type mocked_tests_directory_name: MagicMock
-        :param mocked_all_python_files: Mocked find_all_python_files function.
-        :type mocked_all_python_files: MagicMock
-        :param mocked_find_all_test_files: Mocked find_all_test_files function.
-        :type mocked_find_all_test_files: MagicMock
-        """
-        # Arrange
-        python_file_names = [f"file{i}" for i in range(1, 11)]
-        python_file_paths = [
-            os.path.join(self.__sample_dir, python_file_name) for python_file_name in python_file_names
-        ]
-
-        test_file_names = [f"file{i}" for i in range(1, 11, 3)]
-        test_file_paths = [os.path.join(self.__sample_dir, test_file_name) for test_file_name in test_file_names]
-
-        mocked_all_python_files.return_value = python_file_paths
-        mocked_find_all_test_files.return_value = test_file_paths
-        mocked_tests_directory_name.return_value = self.__sample_dir
-
-        expected_files = list(set(python_file_paths) - set(test_file_paths))
-
-        # Act
-        actual_files = find_all_source_files(self.__sample_dir)
-
-        # Assert
-        self.assertEqual(sorted(expected_files), sorted(actual_files))
-        mocked_all_python_files.assert_called_once_with(self.__sample_dir)
-        mocked_find_all_test_files.assert_called_once_with(self.__sample_dir)
-        mocked_tests_directory_name.assert_called_once_with(self.__sample_dir)
-
-
-class TestFindAllTestFiles(unittest.TestCase):
-    """Test cases for the find_all_test_files function."""
-
-    def __init__(self, methodName: str = "runTest") -> None:
-        """
-        Initialize the test case.
-
-        :param methodName: The name of the test method to run.
-        :type methodName: str
-        """
-        self.__sample_dir = "sample_dir"
-        super().__init__(methodName)
-
-    @patch("grader.utils.files.find_all_files_under_directory")
-    def test_01_no_directory_provided(self, mocked_find_all_files_under_directory: MagicMock) -> None:
-        """
-        Verify that find_all_test_files returns an empty list when no directory is provided.
-
-        :param mocked_find_all_files_under_directory: Mocked find_all_files_under_directory function.
-        :type mocked_find_all_files_under_directory: MagicMock
-        """
-        # Arrange
-        expected_value: list[str] = []
-
-        # Act
-        actual_value = find_all_test_files(tests_directory=None)
-
-        # Assert
-        self.assertEqual(expected_value, actual_value)
-        mocked_find_all_files_under_directory.assert_not_called()
-
-    @patch("grader.utils.structure_validator.StructureValidator.get_matching_files")
-    def test_02_directory_provided(self, mocked_find_all_files_under_directory: MagicMock) -> None:
-        """
-        Verify that find_all_test_files returns the proper files when a directory is provided.
-
-        :param mocked_find_all_files_under_directory: Mocked find_all_files_under_directory function.
-        :type mocked_find_all_files_under_directory: MagicMock
-        """
-        # Arrange
-        expected_value: list[str] = [
-            os.path.join(self.__sample_dir, "file1.py"),
-            os.path.join(self.__sample_dir, "file2.py"),
-        ]
-
-        mocked_find_all_files_under_directory.return_value = expected_value
-
-        # Act
-        actual_value = find_all_test_files(self.__sample_dir)
-
-        # Assert
-        self.assertEqual(expected_value, actual_value)
-        mocked_find_all_files_under_directory.assert_called_once_with(self.__sample_dir)
-
-
-class TestGetTestsDirectoryName(unittest.TestCase):
-    """Test cases for the get_tests_directory_name function."""
-
-    def __init__(self, methodName: str = "runTest") -> None:
-        """
-        Initialize the test case.
-
-        :param methodName: The name of the test method to run.
-        :type methodName: str
-        """
-        self.__sample_dir = "sample_dir"
+        self.__sample_dir = os.path.abspath("sample_dir")
         super().__init__(methodName)
 
     def tearDown(self) -> None:
         """Tear down the test environment."""
-        if os.path.exists(self.__sample_dir):
-            shutil.rmtree(self.__sample_dir)
+        shutil.rmtree(self.__sample_dir, ignore_errors=True)
         return super().tearDown()
 
-    def test_01_tests_directory(self) -> None:
-        """Verify that get_tests_directory_name returns the proper directory name."""
-        # Arrange
-        test_dir_name = "tests"
-        expected_test_dir = os.path.join(self.__sample_dir, test_dir_name)
-        self.__create_structure(self.__sample_dir, test_dir_name)
-
-        # Act
-        actual_test_dir = get_tests_directory_name(self.__sample_dir)
-
-        # Assert
-        self.assertEqual(expected_test_dir, actual_test_dir)
-
-    def test_02_test_directory(self) -> None:
-        """Verify that get_tests_directory_name returns the proper directory name."""
-        # Arrange
-        test_dir_name = "test"
-        expected_test_dir = os.path.join(self.__sample_dir, test_dir_name)
-        self.__create_structure(self.__sample_dir, test_dir_name)
-
-        # Act
-        actual_test_dir = get_tests_directory_name(self.__sample_dir)
-
-        # Assert
-        self.assertEqual(expected_test_dir, actual_test_dir)
-
-    def test_03_tst_directory(self) -> None:
-        """Verify that get_tests_directory_name returns the proper directory name."""
+    def test_01_find_all_source_files(self) -> None:
+        """Verify that find_all_source_files returns the python files outside of the tests directory."""
         # Arrange
-        test_dir_name = "tst"
-        expected_test_dir = os.path.join(self.__sample_dir, test_dir_name)
-        self.__create_structure(self.__sample_dir, test_dir_name)
-
-        # Act
-        actual_test_dir = get_tests_directory_name(self.__sample_dir)
-
-        # Assert
-        self.assertEqual(expected_test_dir, actual_test_dir)
+        python_file_paths = [os.path.join(self.__sample_dir, f"file{i}.py") for i in range(1, 11)]
+        test_file_paths = [os.path.join(self.__sample_dir, "tests", f"test_file{i}.py") for i in range(1, 11, 3)]
 
-    def test_04_no_directory(self) -> None:
-        """Verify that get_tests_directory_name returns None when there is no tests directory."""
-        # Arrange
-        test_dir_name = "some_other_name"
-        self.__create_structure(self.__sample_dir, test_dir_name)
+        os.makedirs(os.path.join(self.__sample_dir, "tests"))
+        for file in python_file_paths + test_file_paths:
+            with open(file, "w", encoding="utf-8"):
+                pass
 
         # Act
-        actual_test_dir = get_tests_directory_name(self.__sample_dir)
+        actual_files = find_all_source_files(self.__sample_dir)
 
         # Assert
-        self.assertIsNone(actual_test_dir)
-
-    @staticmethod
-    def __create_structure(root_dir: str, tests_dir: str) -> None:
-        """
-        Create the directory structure for the test.
-
-        :param root_dir: The root directory.
-        :type root_dir: str
-        :param tests_dir: The tests directory.
-        :type tests_dir: str
-        """
-        full_path = os.path.join(root_dir, tests_dir)
-        os.makedirs(full_path)
+        self.assertEqual(sorted(python_file_paths), sorted(actual_files))
 
 
 class TestFindAllFilesUnderDirectory(unittest.TestCase):
@@ -426,32 +279,28 @@ class TestFindAllFilesUnderDirectory(unittest.TestCase):
 class TestUnzipArchive(unittest.TestCase):
     """Test cases for the unzip_archive function."""
 
-    @patch("zipfile.ZipFile")
-    def test_01_unzip_to_default_directory(self, mock_zipfile: MagicMock) -> None:
+    @patch("grader.utils.files.extract_archive")
+    def test_01_unzip_to_default_directory(self, mock_extract_archive: MagicMock) -> None:
         """Verify that unzip_archive extracts to the default directory and returns the correct path."""
         # Setup
-        mock_zip = MagicMock()
-        mock_zipfile.return_value.__enter__.return_value = mock_zip
         archive_path = "/fake/path/test_archive.zip"
 
         # Act
         result_dir = unzip_archive(archive_path)
 
         # Assert
-        mock_zip.extractall.assert_called_once()
+        mock_extract_archive.assert_called_once_with(archive_path, result_dir)
         self.assertIn("test_archive", result_dir)
 
-    @patch("zipfile.ZipFile")
-    def test_02_unzip_to_custom_directory(self, mock_zipfile: MagicMock) -> None:
+    @patch("grader.utils.files.extract_archive")
+    def test_02_unzip_to_custom_directory(self, mock_extract_archive: MagicMock) -> None:
         """Verify that unzip_archive extracts to a custom target directory."""
-        mock_zip = MagicMock()
-        mock_zipfile.return_value.__enter__.return_value = mock_zip
         archive_path = "/fake/path/test_archive.zip"
         custom_dir = "/custom/dir"
         # Act
         result_dir = unzip_archive(archive_path, target_directory=custom_dir)
         # Assert
-        mock_zip.extractall.assert_called_once_with(custom_dir)
+        mock_extract_archive.assert_called_once_with(archive_path, custom_dir)
         self.assertEqual(result_dir, custom_dir)
 
     @patch("zipfile.ZipFile", side_effect=zipfile.BadZipFile)
@@ -1,7 +1,11 @@
 """Unit tests for the Grader class."""
 
+import json
 import os
+import shutil
+import threading
 import unittest
+import zipfile
 from unittest.mock import MagicMock, patch
 
 from grader.checks.abstract_check import (
@@ -300,3 +304,316 @@ class TestGrader(unittest.TestCase):
             grader.grade()
 
         os.rmdir(sample_project_path)
+
+    @patch("grader.grader.load_config")
+    @patch("grader.grader.VirtualEnvironment")
+    @patch("grader.grader.create_checks")
+    def test_12_concurrent_venv_checks_keep_their_order(
+        self, mock_create_checks: MagicMock, mock_virtualenv: MagicMock, mock_load_config: MagicMock
+    ) -> None:
+        """Test that venv checks run concurrently while their results keep the order of the checks."""
+        # Arrange
+        sample_config_path = os.path.join("config", "full_single_point.json")
+        sample_project_path = os.path.join("/tmp", "project_root")
+        os.makedirs(sample_project_path, exist_ok=True)
+
+        mock_load_config.return_value = {"checks": [], "max_parallel_checks": 2}
+
+        second_check_done = threading.Event()
+
+        mock_venv_check1 = MagicMock()
+        mock_venv_check2 = MagicMock()
+        mock_venv_check1.exclusive_resource = None
+        mock_venv_check2.exclusive_resource = None
+
+        # The first check can only finish after the second one, which is only possible if they run concurrently
+        def run_second_check() -> str:
+            second_check_done.set()
+            return "venv_result2"
+
+        mock_venv_check1.run.side_effect = lambda: "venv_result1" if second_check_done.wait(5) else "timeout"
+        mock_venv_check2.run.side_effect = run_second_check
+        mock_create_checks.return_value = ([], [mock_venv_check1, mock_venv_check2])
+
+        mock_virtualenv.return_value.__enter__.return_value = MagicMock()
+        mock_virtualenv.return_value.__exit__.return_value = None
+
+        grader = Grader("student_id", sample_project_path, config_path=sample_config_path, logger=MagicMock())
+
+        # Act
+        results = grader.grade()
+
+        os.rmdir(sample_project_path)
+
+        # Assert
+        self.assertEqual(results, ["venv_result1", "venv_result2"])
+
+    @patch("grader.grader.VirtualEnvironment")
+    @patch("grader.grader.create_checks")
+    def test_13_checks_sharing_a_resource_do_not_overlap(
+        self, mock_create_checks: MagicMock, mock_virtualenv: MagicMock
+    ) -> None:
+        """Test that venv checks needing the same exclusive resource run one after another, in order."""
+        # Arrange
+        sample_config_path = os.path.join("config", "full_single_point.json")
+        sample_project_path = os.path.join("/tmp", "project_root")
+        os.makedirs(sample_project_path, exist_ok=True)
+
+        calls: list[str] = []
+
+        mock_venv_check1 = MagicMock()
+        mock_venv_check2 = MagicMock()
+        mock_venv_check1.exclusive_resource = "pytest"
+        mock_venv_check2.exclusive_resource = "pytest"
+
+        def run_check(index: int) -> str:
+            calls.extend([f"start{index}", f"end{index}"])
+            return f"venv_result{index}"
+
+        mock_venv_check1.run.side_effect = lambda: run_check(1)
+        mock_venv_check2.run.side_effect = lambda: run_check(2)
+        mock_create_checks.return_value = ([], [mock_venv_check1, mock_venv_check2])
+
+        mock_virtualenv.return_value.__enter__.return_value = MagicMock()
+        mock_virtualenv.return_value.__exit__.return_value = None
+
+        grader = Grader("student_id", sample_project_path, config_path=sample_config_path, logger=MagicMock())
+
+        # Act
+        results = grader.grade()
+
+        os.rmdir(sample_project_path)
+
+        # Assert
+        self.assertEqual(results, ["venv_result1", "venv_result2"])
+        self.assertEqual(calls, ["start1", "end1", "start2", "end2"])
+
+    @patch("grader.grader.load_config")
+    def test_14_invalid_max_parallel_checks(self, mock_load_config: MagicMock) -> None:
+        """Test that a max_parallel_checks which is not a positive integer raises InvalidConfigError."""
+        for max_parallel_checks in (0, -1, "2", True):
+            with self.subTest(max_parallel_checks=max_parallel_checks):
+                # Arrange
+                mock_load_config.return_value = {"checks": [], "max_parallel_checks": max_parallel_checks}
+
+                # Act & Assert
+                with self.assertRaises(InvalidConfigError):
+                    Grader("student_id", "project_root", config_path="config_path", logger=MagicMock())
+
+    @patch("grader.grader.create_checks")
+    def test_15_zip_submission_extracted_on_demand(self, mock_create_checks: MagicMock) -> None:
+        """Test that a zip submission is only extracted when a check needs the files on the disk."""
+        # Arrange
+        sample_config_path = os.path.join("config", "full_single_point.json")
+        sample_dir = os.path.abspath("sample_zip_submission")
+        archive_path = os.path.join(sample_dir, "submission.zip")
+        work_directory = os.path.join(sample_dir, "work")
+        os.makedirs(sample_dir, exist_ok=True)
+        self.addCleanup(shutil.rmtree, sample_dir, ignore_errors=True)
+
+        with zipfile.ZipFile(archive_path, "w") as archive:
+            archive.writestr("project/main.py", "")
+
+        index_only_check = MagicMock()
+        index_only_check.is_reading_project_files = False
+        index_only_check.run.return_value = "structure_result"
+        file_reading_check = MagicMock()
+        file_reading_check.is_reading_project_files = True
+        file_reading_check.run.side_effect = lambda: os.path.exists(os.path.join(work_directory, "project", "main.py"))
+
+        for checks, is_extracted in (([index_only_check], False), ([index_only_check, file_reading_check], True)):
+            with self.subTest(is_extracted=is_extracted):
+                mock_create_checks.return_value = (checks, [])
+                grader = Grader(
+                    "student_id",
+                    archive_path,
+                    config_path=sample_config_path,
+                    logger=MagicMock(),
+                    work_directory=work_directory,
+                )
+
+                # Act
+                results = grader.grade()
+
+                # Assert
+                self.assertEqual(os.path.join(work_directory, "project"), mock_create_checks.call_args.args[1])
+                self.assertEqual(is_extracted, os.path.exists(work_directory))
+                self.assertEqual(["structure_result", True][: len(checks)], results)
+
+    @patch("grader.grader.create_checks")
+    def test_16_results_cache(self, mock_create_checks: MagicMock) -> None:
+        """Test that cached results are reused while the project is unchanged, and failed checks are not cached."""
+        # Arrange
+        sample_dir = os.path.abspath("sample_results_cache_project")
+        project_path = os.path.join(sample_dir, "project")
+        config_path = os.path.join(sample_dir, "config.json")
+        os.makedirs(project_path, exist_ok=True)
+        self.addCleanup(shutil.rmtree, sample_dir, ignore_errors=True)
+
+        with open(config_path, "w", encoding="utf-8") as config_file:
+            json.dump(
+                {
+                    "results_cache_dir": os.path.join(sample_dir, "cache"),
+                    "checks": [
+                        {"name": "pylint", "max_points": 10, "is_venv_required": False},
+                        {"name": "type-hints", "max_points": 5, "is_venv_required": False},
+                    ],
+                },
+                config_file,
+            )
+        with open(os.path.join(project_path, "main.py"), "w", encoding="utf-8") as main_file:
+            main_file.write("print('hello')")
+
+        passing_check = MagicMock(spec=ScoredCheck)
+        passing_check.name = "pylint"
+        passing_check.is_reading_project_files = True
+        passing_check.referenced_files = []
+        passing_check.run.return_value = ScoredCheckResult("pylint", 8.0, "", "", 10)
+        failing_check = MagicMock(spec=ScoredCheck)
+        failing_check.name = "type-hints"
+        failing_check.max_points = 5
+        failing_check.is_reading_project_files = True
+        failing_check.referenced_files = []
+        failing_check.run.side_effect = CheckError("fail")
+        mock_create_checks.return_value = ([passing_check, failing_check], [])
+
+        def grade() -> list:
+            return Grader("student_id", project_path, config_path=config_path, logger=MagicMock()).grade()
+
+        # Act
+        first_results = grade()
+        second_results = grade()
+
+        with open(os.path.join(project_path, "main.py"), "w", encoding="utf-8") as main_file:
+            main_file.write("print('changed')")
+        grade()
+
+        # Assert
+        self.assertEqual(first_results, second_results)
+        self.assertEqual(2, passing_check.run.call_count)
+        self.assertEqual(3, failing_check.run.call_count)
+
+    @patch("grader.grader.create_checks")
+    def test_17_timings_are_collected(self, mock_create_checks: MagicMock) -> None:
+        """Test that each check is measured when timings are collected, and nothing is measured otherwise."""
+        # Arrange
+        sample_config_path = os.path.join("config", "full_single_point.json")
+        sample_project_path = os.path.abspath("sample_timings_project")
+        os.makedirs(sample_project_path, exist_ok=True)
+        self.addCleanup(shutil.rmtree, sample_project_path, ignore_errors=True)
+
+        passing_check = MagicMock(spec=ScoredCheck)
+        passing_check.name = "pylint"
+        passing_check.run.return_value = ScoredCheckResult("pylint", 8.0, "", "", 10)
+        failing_check = MagicMock(spec=ScoredCheck)
+        failing_check.name = "type-hints"
+        failing_check.max_points = 5
+        failing_check.run.side_effect = CheckError("fail")
+        mock_create_checks.return_value = ([passing_check, failing_check], [])
+
+        def create_grader(is_collecting_timings: bool) -> Grader:
+            return Grader(
+                "student_id",
+                sample_project_path,
+                config_path=sample_config_path,
+                logger=MagicMock(),
+                is_collecting_timings=is_collecting_timings,
+            )
+
+        timed_grader = create_grader(True)
+        untimed_grader = create_grader(False)
+
+        # Act
+        timed_grader.grade()
+        untimed_grader.grade()
+
+        # Assert
+        self.assertEqual(["check:pylint", "check:type-hints"], [stage.name for stage in timed_grader.stage_metrics])
+        self.assertTrue(all(stage.wall_time >= 0 for stage in timed_grader.stage_metrics))
+        self.assertEqual([], untimed_grader.stage_metrics)
+
+    @patch("grader.grader.create_checks")
+    def test_18_results_cache_follows_referenced_files(self, mock_create_checks: MagicMock) -> None:
+        """Test that editing a file the configuration points to invalidates the cache, and remote ones disable it."""
+        # Arrange
+        sample_dir = os.path.abspath("sample_results_cache_files")
+        project_path = os.path.join(sample_dir, "project")
+        config_path = os.path.join(sample_dir, "config.json")
+        pylintrc_path = os.path.join(sample_dir, "pylintrc")
+        os.makedirs(project_path, exist_ok=True)
+        self.addCleanup(shutil.rmtree, sample_dir, ignore_errors=True)
+
+        with open(config_path, "w", encoding="utf-8") as config_file:
+            json.dump(
+                {
+                    "results_cache_dir": os.path.join(sample_dir, "cache"),
+                    "checks": [
+                        {"name": "pylint", "max_points": 10, "pylintrc_path": pylintrc_path},
+                        {"name": "tests", "max_points": 5, "tests_path": ["https://example.com/test_sample.py"]},
+                    ],
+                },
+                config_file,
+            )
+        with open(pylintrc_path, "w", encoding="utf-8") as pylintrc_file:
+            pylintrc_file.write("[MAIN]\n")
+
+        pylint_check = MagicMock(spec=ScoredCheck)
+        pylint_check.name = "pylint"
+        pylint_check.is_reading_project_files = True
+        pylint_check.referenced_files = [pylintrc_path]
+        pylint_check.run.return_value = ScoredCheckResult("pylint", 8.0, "", "", 10)
+        remote_tests_check = MagicMock(spec=ScoredCheck)
+        remote_tests_check.name = "tests"
+        remote_tests_check.is_reading_project_files = True
+        remote_tests_check.referenced_files = None
+        remote_tests_check.run.return_value = ScoredCheckResult("tests", 5.0, "", "", 5)
+        mock_create_checks.return_value = ([pylint_check, remote_tests_check], [])
+
+        def grade() -> list:
+            return Grader("student_id", project_path, config_path=config_path, logger=MagicMock()).grade()
+
+        # Act
+        grade()
+        grade()
+
+        with open(pylintrc_path, "w", encoding="utf-8") as pylintrc_file:
+            pylintrc_file.write("[MAIN]\ndisable=all\n")
+        grade()
+
+        # Assert
+        self.assertEqual(2, pylint_check.run.call_count)
+        self.assertEqual(3, remote_tests_check.run.call_count)
+
+    @patch("grader.grader.create_checks")
+    def test_19_temporary_files_are_removed_without_venv(self, mock_create_checks: MagicMock) -> None:
+        """Verify that the temporary files of the checks are removed when no virtual environment is created."""
+        # Arrange
+        sample_project_path = os.path.abspath("sample_cleanup_project")
+        os.makedirs(sample_project_path, exist_ok=True)
+        temp_files_dir = os.path.abspath("sample_cleanup_temp_files")
+
+        def run_check() -> ScoredCheckResult:
+            os.makedirs(temp_files_dir, exist_ok=True)
+            with open(os.path.join(temp_files_dir, "junit-report.xml"), "w", encoding="utf-8") as report_file:
+                report_file.write("<testsuites />")
+            return ScoredCheckResult("tests", 1.0, "", "", 1)
+
+        tests_check = MagicMock(spec=ScoredCheck)
+        tests_check.run.side_effect = run_check
+        mock_create_checks.return_value = ([tests_check], [])
+
+        # Act
+        with patch("grader.utils.constants.TEMP_FILES_DIR", temp_files_dir):
+            Grader(
+                "student_id",
+                sample_project_path,
+                config_path=os.path.join("config", "full_single_point.json"),
+                logger=MagicMock(),
+                is_skipping_venv_creation=True,
+            ).grade()
+
+        shutil.rmtree(sample_project_path, ignore_errors=True)
+
+        # Assert
+        tests_check.run.assert_called_once()
+        self.assertFalse(os.path.exists(temp_files_dir))
@@ -0,0 +1,139 @@
+"""Unit tests for the instrumentation module."""
+
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+from grader.utils.instrumentation import (
+    Instrumentation,
+    StageMetrics,
+    is_measuring,
+    measure,
+    record_subprocess_usage,
+    summarize_stages,
+)
+from grader.utils.process import run
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Test cases for the measurement of the grading stages."""
+
+    def test_01_measure_inactive(self) -> None:
+        """Verify that nothing is measured without an active instrumentation."""
+        # Act
+        with measure("check:pylint"):
+            is_measuring_stage = is_measuring()
+            record_subprocess_usage(1.0, 100, 0, 0)
+
+        # Assert
+        self.assertFalse(is_measuring_stage)
+        self.assertIsNone(Instrumentation.active)
+
+    def test_02_nested_stages(self) -> None:
+        """Verify that the subprocesses of a nested stage are added to the outer stages as well."""
+        # Act
+        with Instrumentation() as instrumentation:
+            self.assertFalse(is_measuring())
+            with measure("venv:setup"):
+                record_subprocess_usage(1.0, 100, 1, 2)
+                with measure("download"):
+                    self.assertTrue(is_measuring())
+                    record_subprocess_usage(0.5, 300, 3, 4)
+
+        # Assert
+        self.assertIsNone(Instrumentation.active)
+        download, setup = instrumentation.stages
+        self.assertEqual(("download", 1, 0.5, 300, 3, 4), (download.name, *astuple_usage(download)))
+        self.assertEqual(("venv:setup", 2, 1.5, 300, 4, 6), (setup.name, *astuple_usage(setup)))
+        self.assertGreaterEqual(setup.wall_time, download.wall_time)
+
+    def test_03_failing_stage_is_measured(self) -> None:
+        """Verify that a stage is measured even if it raises."""
+        # Act
+        with Instrumentation() as instrumentation:
+            with self.assertRaises(ValueError):
+                with measure("check:pylint"):
+                    raise ValueError("fail")
+
+        # Assert
+        self.assertEqual(["check:pylint"], [stage.name for stage in instrumentation.stages])
+
+    def test_04_summarize_stages(self) -> None:
+        """Verify that the runs of each stage are aggregated, including the CPU time of the subprocesses."""
+        # Arrange
+        stages = [
+            StageMetrics("check:pylint", 2.0, 0.5, 1, 1.5, 100),
+            StageMetrics("venv:setup", 10.0, 1.0, 3, 6.0, 50),
+            StageMetrics("check:pylint", 4.0, 0.5, 1, 3.5, 200),
+        ]
+
+        # Act
+        pylint, setup = summarize_stages(stages)
+
+        # Assert
+        self.assertEqual(("check:pylint", 2, 6.0, 4.0, 6.0, 200), tuple(vars(pylint).values()))
+        self.assertEqual(("venv:setup", 1, 10.0, 10.0, 7.0, 50), tuple(vars(setup).values()))
+
+    @unittest.skipUnless(hasattr(os, "wait4"), "Resource usage of the subprocesses needs os.wait4")
+    def test_05_subprocess_usage_is_recorded(self) -> None:
+        """Verify that process.run measures each command, and adds its resource usage to the stages around it."""
+        # Act
+        with Instrumentation() as instrumentation:
+            with measure("check:tests"):
+                output = run([sys.executable, "-c", "print(sum(range(100000)))"])
+
+        # Assert
+        self.assertEqual(0, output.returncode)
+        self.assertEqual(f"{sum(range(100000))}\n", output.stdout)
+        process, stage = instrumentation.stages
+        self.assertEqual(f"process:{os.path.basename(sys.executable)}", process.name)
+        self.assertEqual(process.thread_id, stage.thread_id)
+        self.assertLessEqual(stage.start_time, process.start_time)
+        for metrics in (process, stage):
+            self.assertEqual(1, metrics.subprocesses)
+            self.assertGreater(metrics.subprocesses_peak_rss, 0)
+
+    @patch("grader.utils.process.record_subprocess_usage")
+    def test_06_subprocess_run_without_instrumentation(self, mock_record: MagicMock) -> None:
+        """Verify that process.run does not measure the commands when nothing is measured."""
+        # Act
+        output = run([sys.executable, "-c", "print('unmeasured')"])
+
+        # Assert
+        self.assertEqual("unmeasured\n", output.stdout)
+        mock_record.assert_not_called()
+
+    def test_07_nested_instrumentations(self) -> None:
+        """Verify that the stages measured by an inner instrumentation are collected by the outer one too."""
+        # Act
+        with Instrumentation() as outer:
+            with measure("config:load"):
+                pass
+            with Instrumentation() as inner:
+                with measure("check:pylint"):
+                    pass
+
+        # Assert
+        self.assertEqual(["check:pylint"], [stage.name for stage in inner.stages])
+        self.assertEqual(["config:load", "check:pylint"], [stage.name for stage in outer.stages])
+
+
+def astuple_usage(metrics: StageMetrics) -> tuple[int, float, int, int, int]:
+    """
+    Get the resources used by the subprocesses of a stage.
+
+    :param metrics: The metrics of the stage.
+    :return: The amount of subprocesses, their CPU time, peak RSS, read blocks and write blocks.
+    """
+    return (
+        metrics.subprocesses,
+        metrics.subprocesses_cpu_time,
+        metrics.subprocesses_peak_rss,
+        metrics.subprocesses_read_blocks,
+        metrics.subprocesses_write_blocks,
+    )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,209 @@
+"""Unit tests for the job queue."""
+
+import os
+import shutil
+import sqlite3
+import time
+import unittest
+
+from grader.checks.abstract_check import CheckResult, NonScoredCheckResult, ScoredCheckResult
+from grader.exceptions import CheckError, ExternalResourceError, JobQueueError
+from grader.utils.job_queue import (
+    JOB_DONE,
+    JOB_FAILED,
+    JOB_RUNNING,
+    JobQueue,
+    JobResultsCache,
+    is_transient_error,
+)
+
+
+class TestJobQueue(unittest.TestCase):
+    """Test cases for the JobQueue class."""
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        """
+        Initialize the test case.
+
+        :param methodName: The name of the test method to run.
+        :type methodName: str
+        """
+        self.__sample_dir = os.path.abspath("sample_job_queue")
+        self.__queue_path = os.path.join(self.__sample_dir, "queue.sqlite3")
+        super().__init__(methodName)
+
+    def setUp(self) -> None:
+        """Set up the test environment."""
+        os.makedirs(self.__sample_dir, exist_ok=True)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        """Tear down the test environment."""
+        shutil.rmtree(self.__sample_dir, ignore_errors=True)
+        return super().tearDown()
+
+    def test_01_add_claim_and_complete(self) -> None:
+        """Verify that jobs are claimed once, in order, and that their results survive reopening the queue."""
+        # Arrange
+        results: list[CheckResult] = [
+            ScoredCheckResult("pylint", 7.5, "info", "", 10),
+            NonScoredCheckResult("requirements", True, "", ""),
+        ]
+
+        with JobQueue(self.__queue_path) as queue:
+            added = [queue.add("first", "/first", {"student_id": "1"}), queue.add("second", "/second")]
+            duplicate = queue.add("first", "/elsewhere")
+
+            # Act
+            claimed = queue.claim(1)
+            queue.complete("first", results)
+            claimed_again = queue.claim(5)
+
+        with JobQueue(self.__queue_path) as queue:
+            jobs = queue.get_jobs()
+
+        # Assert
+        self.assertEqual([True, True], added)
+        self.assertFalse(duplicate)
+        self.assertEqual([("first", "/first", {"student_id": "1"})], [(j.id, j.path, j.options) for j in claimed])
+        self.assertEqual(["second"], [job.id for job in claimed_again])
+        self.assertEqual([JOB_DONE, JOB_RUNNING], [job.status for job in jobs])
+        self.assertEqual(results, jobs[0].results)
+
+    def test_02_transient_failures_are_retried_with_backoff(self) -> None:
+        """Verify that transient failures are retried later and later, until the job runs out of attempts."""
+        # Arrange
+        with JobQueue(self.__queue_path, max_attempts=3, retry_delay=0.2) as queue:
+            queue.add("job", "/project")
+            queue.claim(1)
+
+            # Act
+            first_retry = queue.fail("job", "download failed", is_transient=True)
+            first_delay = queue.get_next_attempt_delay()
+            not_ready = queue.claim(1)
+            time.sleep(0.25)
+            ready = queue.claim(1)
+            second_retry = queue.fail("job", "download failed", is_transient=True)
+            second_delay = queue.get_next_attempt_delay()
+            time.sleep(0.45)
+            queue.claim(1)
+            last_retry = queue.fail("job", "download failed", is_transient=True)
+            job = queue.get("job")
+
+        # Assert
+        self.assertTrue(first_retry)
+        self.assertAlmostEqual(0.2, first_delay or 0.0, delta=0.05)
+        self.assertEqual([], not_ready)
+        self.assertEqual(["job"], [job.id for job in ready])
+        self.assertTrue(second_retry)
+        self.assertAlmostEqual(0.4, second_delay or 0.0, delta=0.05)
+        self.assertFalse(last_retry)
+        assert job is not None
+        self.assertEqual((JOB_FAILED, 3, "download failed"), (job.status, job.attempts, job.error))
+
+    def test_03_permanent_failure(self) -> None:
+        """Verify that a failure which is not transient fails the job at its first attempt."""
+        # Arrange
+        with JobQueue(self.__queue_path) as queue:
+            queue.add("job", "/project")
+            queue.claim(1)
+
+            # Act
+            is_retrying = queue.fail("job", "invalid project", is_transient=False)
+            job = queue.get("job")
+            delay = queue.get_next_attempt_delay()
+
+        # Assert
+        self.assertFalse(is_retrying)
+        assert job is not None
+        self.assertEqual((JOB_FAILED, 1), (job.status, job.attempts))
+        self.assertTrue(job.is_finished)
+        self.assertIsNone(delay)
+
+    def test_04_requeue_interrupted(self) -> None:
+        """Verify that the jobs running when the previous process stopped are queued again."""
+        # Arrange
+        with JobQueue(self.__queue_path) as queue:
+            queue.add("done", "/done")
+            queue.add("interrupted", "/interrupted")
+            queue.add("pending", "/pending")
+            queue.claim(2)
+            queue.complete("done", [])
+
+        # Act
+        with JobQueue(self.__queue_path) as queue:
+            requeued = queue.requeue_interrupted()
+            claimed = queue.claim(5)
+
+        # Assert
+        self.assertEqual(1, requeued)
+        self.assertEqual(["interrupted", "pending"], [job.id for job in claimed])
+
+    def test_05_check_results(self) -> None:
+        """Verify that the results of the checks are recorded per job and per key."""
+        # Arrange
+        result = ScoredCheckResult("pylint", 7.5, "info", "", 10)
+
+        with JobQueue(self.__queue_path) as queue:
+            queue.add("job", "/project")
+            queue.add("other", "/other")
+
+            # Act
+            queue.record_check_result("job", "key", result)
+
+            # Assert
+            self.assertEqual(result, queue.get_check_result("job", "key"))
+            self.assertIsNone(queue.get_check_result("job", "other key"))
+            self.assertIsNone(queue.get_check_result("other", "key"))
+
+    def test_06_job_results_cache(self) -> None:
+        """Verify that the results cache of a job records its results in the queue, and in the cache directory."""
+        # Arrange
+        cache_dir = os.path.join(self.__sample_dir, "cache")
+        result = ScoredCheckResult("pylint", 7.5, "info", "", 10)
+
+        with JobQueue(self.__queue_path) as queue:
+            queue.add("job", "/project")
+            queue.add("other", "/other")
+            cache = JobResultsCache(queue, "job", {"checks": [], "results_cache_dir": cache_dir})
+            key = cache.compute_key("PylintCheck", {"name": "pylint"}, "fingerprint")
+
+            # Act
+            cache.put(key, result)
+
+            # Assert
+            self.assertEqual(result, queue.get_check_result("job", key))
+            other_cache = JobResultsCache(queue, "other", {"checks": [], "results_cache_dir": cache_dir})
+            self.assertEqual(result, other_cache.get(key))
+            self.assertIsNone(JobResultsCache(queue, "other", {"checks": []}).get(key))
+
+    def test_07_transient_errors(self) -> None:
+        """Verify that an error is transient when it, or an error which caused it, is transient."""
+        # Arrange
+        try:
+            try:
+                raise ExternalResourceError("Connection reset")
+            except ExternalResourceError as error:
+                raise CheckError("Cannot download the tests") from error
+        except CheckError as error:
+            chained_error = error
+
+        # Act & Assert
+        self.assertTrue(is_transient_error(ExternalResourceError("Connection reset")))
+        self.assertTrue(is_transient_error(chained_error))
+        self.assertFalse(is_transient_error(CheckError("pylint crashed")))
+
+    def test_08_incompatible_format(self) -> None:
+        """Verify that a queue created by an incompatible version is refused."""
+        # Arrange
+        with sqlite3.connect(self.__queue_path) as connection:
+            connection.execute("PRAGMA user_version = 99")
+        connection.close()
+
+        # Act & Assert
+        with self.assertRaises(JobQueueError):
+            JobQueue(self.__queue_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
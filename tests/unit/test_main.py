@@ -71,6 +71,17 @@ class TestRunGrader(unittest.TestCase):
             "suppress_info": False,
             "keep_venv": False,
             "skip_venv_creation": False,
+            "batch": False,
+            "jobs": None,
+            "rescore": False,
+            "timings": False,
+            "trace": None,
+            "otlp_endpoint": None,
+            "serve": False,
+            "host": "127.0.0.1",
+            "port": 8765,
+            "socket": None,
+            "queue": None,
         }
         # Act
         with patch("desktop.main.Grader"), patch("desktop.main.setup_logger"):
@@ -93,6 +104,17 @@ class TestRunGrader(unittest.TestCase):
             "suppress_info": False,
             "keep_venv": False,
             "skip_venv_creation": False,
+            "batch": False,
+            "jobs": None,
+            "rescore": False,
+            "timings": False,
+            "trace": None,
+            "otlp_endpoint": None,
+            "serve": False,
+            "host": "127.0.0.1",
+            "port": 8765,
+            "socket": None,
+            "queue": None,
         }
 
         expected_suppress_info = True
@@ -119,6 +141,17 @@ class TestRunGrader(unittest.TestCase):
             "suppress_info": False,
             "keep_venv": False,
             "skip_venv_creation": False,
+            "batch": False,
+            "jobs": None,
+            "rescore": False,
+            "timings": False,
+            "trace": None,
+            "otlp_endpoint": None,
+            "serve": False,
+            "host": "127.0.0.1",
+            "port": 8765,
+            "socket": None,
+            "queue": None,
         }
 
         expected_suppress_info = True
@@ -145,6 +178,17 @@ class TestRunGrader(unittest.TestCase):
             "suppress_info": True,
             "keep_venv": False,
             "skip_venv_creation": False,
+            "batch": False,
+            "jobs": None,
+            "rescore": False,
+            "timings": False,
+            "trace": None,
+            "otlp_endpoint": None,
+            "serve": False,
+            "host": "127.0.0.1",
+            "port": 8765,
+            "socket": None,
+            "queue": None,
         }
 
         expected_suppress_info = True
@@ -171,6 +215,17 @@ class TestRunGrader(unittest.TestCase):
             "suppress_info": False,
             "keep_venv": False,
             "skip_venv_creation": False,
+            "batch": False,
+            "jobs": None,
+            "rescore": False,
+            "timings": False,
+            "trace": None,
+            "otlp_endpoint": None,
+            "serve": False,
+            "host": "127.0.0.1",
+            "port": 8765,
+            "socket": None,
+            "queue": None,
         }
 
         expected_suppress_info = False
@@ -201,6 +256,17 @@ class TestRunGrader(unittest.TestCase):
             "suppress_info": expected_suppress_info,
             "keep_venv": False,
             "skip_venv_creation": False,
+            "batch": False,
+            "jobs": None,
+            "rescore": False,
+            "timings": False,
+            "trace": None,
+            "otlp_endpoint": None,
+            "serve": False,
+            "host": "127.0.0.1",
+            "port": 8765,
+            "socket": None,
+            "queue": None,
         }
 
         # Act
@@ -235,6 +301,17 @@ class TestRunGrader(unittest.TestCase):
             "suppress_info": False,
             "keep_venv": expected_keep_venv,
             "skip_venv_creation": expected_skip_venv_creation,
+            "batch": False,
+            "jobs": None,
+            "rescore": False,
+            "timings": False,
+            "trace": None,
+            "otlp_endpoint": None,
+            "serve": False,
+            "host": "127.0.0.1",
+            "port": 8765,
+            "socket": None,
+            "queue": None,
         }
 
         # Act
@@ -248,6 +325,7 @@ class TestRunGrader(unittest.TestCase):
             is_keeping_venv=expected_keep_venv,
             is_skipping_venv_creation=expected_skip_venv_creation,
             config_path=expected_config_path,
+            is_collecting_timings=False,
         )
 
     @patch("desktop.main.get_args")
@@ -265,6 +343,17 @@ class TestRunGrader(unittest.TestCase):
             "suppress_info": False,
             "keep_venv": False,
             "skip_venv_creation": False,
+            "batch": False,
+            "jobs": None,
+            "rescore": False,
+            "timings": False,
+            "trace": None,
+            "otlp_endpoint": None,
+            "serve": False,
+            "host": "127.0.0.1",
+            "port": 8765,
+            "socket": None,
+            "queue": None,
         }
         # Act
         with patch("desktop.main.Grader"), patch("desktop.main.setup_logger"):
@@ -296,6 +385,17 @@ class TestRunGrader(unittest.TestCase):
             "suppress_info": False,
             "keep_venv": False,
             "skip_venv_creation": False,
+            "batch": False,
+            "jobs": None,
+            "rescore": False,
+            "timings": False,
+            "trace": None,
+            "otlp_endpoint": None,
+            "serve": False,
+            "host": "127.0.0.1",
+            "port": 8765,
+            "socket": None,
+            "queue": None,
         }
         mock_build_reporter.return_value = mock_results_reporter
 
@@ -308,3 +408,165 @@ class TestRunGrader(unittest.TestCase):
 
         # Assert
         mock_results_reporter.display.assert_called_once()
+
+    @patch("desktop.main.get_args")
+    @patch("desktop.main.build_reporter")
+    @patch("desktop.main.Grader")
+    @patch("desktop.main.BatchGrader")
+    def test_09_batch_grader_used_in_batch_mode(
+        self,
+        mock_batch_grader: MagicMock,
+        mock_grader: MagicMock,
+        mock_build_reporter: MagicMock,
+        mock_get_args: MagicMock,
+    ) -> None:
+        """Test if the batch grader is used and its results are displayed as one report when --batch is passed."""
+        # Arrange
+        mock_get_args.return_value = {
+            "student_id": None,
+            "project_root": "/path/to/submissions",
+            "config": "/path/to/config",
+            "report_format": "json",
+            "verbosity": 0,
+            "suppress_info": False,
+            "keep_venv": False,
+            "skip_venv_creation": False,
+            "batch": True,
+            "jobs": 4,
+            "rescore": False,
+            "timings": False,
+            "trace": None,
+            "otlp_endpoint": None,
+            "serve": False,
+            "host": "127.0.0.1",
+            "port": 8765,
+            "socket": None,
+            "queue": None,
+        }
+
+        # Act
+        with patch("desktop.main.setup_logger"):
+            run_grader()
+
+        # Assert
+        mock_grader.assert_not_called()
+        mock_batch_grader.assert_called_once_with(
+            "/path/to/submissions",
+            config_path="/path/to/config",
+            jobs=4,
+            verbosity=0,
+            is_keeping_venv=False,
+            is_skipping_venv_creation=False,
+            is_collecting_timings=False,
+            queue_path=None,
+        )
+        mock_build_reporter.return_value.display_batch.assert_called_once_with(
+            mock_batch_grader.return_value.grade.return_value, verbose=False, timings=None
+        )
+
+    @patch("desktop.main.get_args")
+    @patch("desktop.main.build_reporter")
+    @patch("desktop.main.Grader")
+    @patch("desktop.main.BatchGrader")
+    @patch("desktop.main.Rescorer")
+    @patch("desktop.main.load_report")
+    def test_10_rescore_mode(
+        self,
+        mock_load_report: MagicMock,
+        mock_rescorer: MagicMock,
+        mock_batch_grader: MagicMock,
+        mock_grader: MagicMock,
+        mock_build_reporter: MagicMock,
+        mock_get_args: MagicMock,
+    ) -> None:
+        """Test if a batch report is rescored without grading anything when --rescore is passed."""
+        # Arrange
+        mock_get_args.return_value = {
+            "student_id": None,
+            "project_root": "/path/to/report.json",
+            "config": "/path/to/config",
+            "report_format": "json",
+            "verbosity": 0,
+            "suppress_info": False,
+            "keep_venv": False,
+            "skip_venv_creation": False,
+            "batch": False,
+            "jobs": None,
+            "rescore": True,
+            "timings": False,
+            "trace": None,
+            "otlp_endpoint": None,
+            "serve": False,
+            "host": "127.0.0.1",
+            "port": 8765,
+            "socket": None,
+            "queue": None,
+        }
+        mock_load_report.return_value = {"submissions": {}, "total_submissions": 0}
+
+        # Act
+        with patch("desktop.main.setup_logger"):
+            run_grader()
+
+        # Assert
+        mock_grader.assert_not_called()
+        mock_batch_grader.assert_not_called()
+        mock_rescorer.assert_called_once_with("/path/to/config")
+        mock_load_report.assert_called_once_with("/path/to/report.json")
+        mock_build_reporter.return_value.display_batch.assert_called_once_with(
+            mock_rescorer.return_value.rescore_batch_report.return_value, verbose=False
+        )
+
+    @patch("desktop.main.get_args")
+    @patch("desktop.main.Grader")
+    @patch("desktop.main.GradingServer")
+    @patch("desktop.main.serve")
+    def test_11_serve_mode(
+        self,
+        mock_serve: MagicMock,
+        mock_grading_server: MagicMock,
+        mock_grader: MagicMock,
+        mock_get_args: MagicMock,
+    ) -> None:
+        """Test if the grading server is served, without grading anything, when --serve is passed."""
+        # Arrange
+        mock_get_args.return_value = {
+            "student_id": None,
+            "project_root": None,
+            "config": "/path/to/config",
+            "report_format": None,
+            "verbosity": 0,
+            "suppress_info": False,
+            "keep_venv": False,
+            "skip_venv_creation": False,
+            "batch": False,
+            "jobs": 2,
+            "rescore": False,
+            "timings": True,
+            "trace": None,
+            "otlp_endpoint": None,
+            "serve": True,
+            "host": "127.0.0.1",
+            "port": 8765,
+            "socket": "/run/grader.sock",
+            "queue": "/var/lib/grader/queue.sqlite3",
+        }
+
+        # Act
+        with patch("desktop.main.setup_logger"):
+            run_grader()
+
+        # Assert
+        mock_grader.assert_not_called()
+        mock_grading_server.assert_called_once_with(
+            "/path/to/config",
+            jobs=2,
+            verbosity=0,
+            is_keeping_venv=False,
+            is_skipping_venv_creation=False,
+            is_collecting_timings=True,
+            queue_path="/var/lib/grader/queue.sqlite3",
+        )
+        mock_serve.assert_called_once_with(
+            mock_grading_server.return_value, host="127.0.0.1", port=8765, socket_path="/run/grader.sock"
+        )
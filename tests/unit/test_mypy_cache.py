@@ -0,0 +1,108 @@
+"""Unit tests for the mypy linecount cache."""
+
+import os
+import shutil
+import unittest
+
+from grader.utils.mypy_cache import MypyCache, MypyFileResult, get_module_name, parse_linecount_report
+
+
+class TestMypyCacheFunctions(unittest.TestCase):
+    """Test cases for the helper functions of the mypy cache."""
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        """
+        Initialize the test case.
+
+        :param methodName: The name of the test method to run.
+        :type methodName: str
+        """
+        self.__project_root = os.path.abspath("sample_mypy_project")
+        super().__init__(methodName)
+
+    def tearDown(self) -> None:
+        """Tear down the test environment."""
+        shutil.rmtree(self.__project_root, ignore_errors=True)
+        return super().tearDown()
+
+    def test_01_get_module_name(self) -> None:
+        """Verify that the module name includes the packages, up to the first directory without __init__.py."""
+        # Arrange
+        package = os.path.join(self.__project_root, "src", "pkg", "sub")
+        os.makedirs(package)
+        for directory in (os.path.dirname(package), package):
+            with open(os.path.join(directory, "__init__.py"), "w", encoding="utf-8"):
+                pass
+
+        # Act & Assert
+        self.assertEqual("main", get_module_name(os.path.join(self.__project_root, "main.py")))
+        self.assertEqual("pkg.sub.module", get_module_name(os.path.join(package, "module.py")))
+        self.assertEqual("pkg.sub", get_module_name(os.path.join(package, "__init__.py")))
+
+    def test_02_parse_linecount_report(self) -> None:
+        """Verify that the per-module rows are read and the totals row is skipped."""
+        # Arrange
+        report_path = os.path.join(self.__project_root, "linecount.txt")
+        os.makedirs(self.__project_root)
+        with open(report_path, "w", encoding="utf-8") as report_file:
+            report_file.write("      2       6      1      4 total\n")
+            report_file.write("      2       2      1      1 pkg.sub.m\n")
+            report_file.write("      0       4      0      3 main\n")
+
+        # Act
+        report = parse_linecount_report(report_path)
+
+        # Assert
+        self.assertEqual({"pkg.sub.m": MypyFileResult(2, 2, 1, 1), "main": MypyFileResult(0, 4, 0, 3)}, report)
+
+
+class TestMypyCache(unittest.TestCase):
+    """Test cases for the MypyCache class."""
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        """
+        Initialize the test case.
+
+        :param methodName: The name of the test method to run.
+        :type methodName: str
+        """
+        self.__cache_dir = "sample_mypy_cache"
+        super().__init__(methodName)
+
+    def tearDown(self) -> None:
+        """Tear down the test environment."""
+        shutil.rmtree(self.__cache_dir, ignore_errors=True)
+        return super().tearDown()
+
+    def test_01_key_depends_on_all_inputs(self) -> None:
+        """Verify that the key changes with the path, the contents, the configuration and the mypy version."""
+        # Arrange
+        key = MypyCache.compute_key("main.py", b"x = 1", "config", "mypy 1.13.0")
+
+        # Act & Assert
+        self.assertEqual(key, MypyCache.compute_key("main.py", b"x = 1", "config", "mypy 1.13.0"))
+        self.assertNotEqual(key, MypyCache.compute_key("other.py", b"x = 1", "config", "mypy 1.13.0"))
+        self.assertNotEqual(key, MypyCache.compute_key("main.py", b"x = 2", "config", "mypy 1.13.0"))
+        self.assertNotEqual(key, MypyCache.compute_key("main.py", b"x = 1", "other", "mypy 1.13.0"))
+        self.assertNotEqual(key, MypyCache.compute_key("main.py", b"x = 1", "config", "mypy 1.14.0"))
+
+    def test_02_put_and_get(self) -> None:
+        """Verify that stored rows are returned, and that missing or invalid entries are not."""
+        # Arrange
+        cache = MypyCache(self.__cache_dir)
+        result = MypyFileResult(2, 4, 1, 2)
+
+        # Act
+        cache.put("key", result)
+        with open(os.path.join(self.__cache_dir, "invalid.json"), "w", encoding="utf-8") as entry_file:
+            entry_file.write('{"lines": 4}')
+
+        # Assert
+        self.assertEqual(result, cache.get("key"))
+        self.assertIsNone(cache.get("missing"))
+        with self.assertLogs(level="WARNING"):
+            self.assertIsNone(cache.get("invalid"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,40 +1,75 @@
 """Unit tests for the process module."""
 
-import subprocess
+import os
+import shutil
+import signal
+import sys
+import time
 import unittest
-from unittest.mock import MagicMock, patch
 
-from grader.utils.process import run
+from grader.exceptions import InvalidConfigError, ProcessLimitError, ProcessTimeoutError
+from grader.utils.process import OutputCapture, ProcessLimits, run
+
+
+def is_running(pid: int) -> bool:
+    """
+    Check whether a process is running, a killed process not reaped yet (a zombie) being considered stopped.
+
+    :param pid: The id of the process.
+    :return: True if the process is running.
+    """
+    try:
+        with open(f"/proc/{pid}/stat", encoding="utf-8") as stat_file:
+            return stat_file.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        pass
+    except OSError:
+        return True
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
 
 
 class TestRunProcess(unittest.TestCase):
     """Test cases for the run function in the process module."""
 
-    @patch("subprocess.run")
-    def test_01_non_zero_return_code(self, mocked_subprocess: MagicMock) -> None:
+    def __init__(self, methodName: str = "runTest") -> None:
+        """
+        Initialize the test case.
+
+        :param methodName: The name of the test method to run.
+        :type methodName: str
+        """
+        self.__sample_dir = os.path.abspath("sample_process")
+        super().__init__(methodName)
+
+    def tearDown(self) -> None:
+        """Tear down the test environment."""
+        shutil.rmtree(self.__sample_dir, ignore_errors=True)
+        return super().tearDown()
+
+    def test_01_non_zero_return_code(self) -> None:
         """
         Test that the run function logs the correct messages and returns the expected result.
 
         Tests when the subprocess returns a non-zero return code.
         """
         # Arrange
-        expected_command = "dummy"
+        script = "import sys; print('stdout'); print('stderr', file=sys.stderr); sys.exit(1)"
+        expected_command = [sys.executable, "-c", script]
         expected_returncode = 1
-        expected_stdout = "stdout"
-        expected_stderr = "stderr"
+        expected_stdout = "stdout\n"
+        expected_stderr = "stderr\n"
 
-        expected_subprocess_result = subprocess.CompletedProcess(
-            expected_command, expected_returncode, expected_stdout, expected_stderr
-        )
-
-        expected_line = f"DEBUG:grader:Running command: {expected_command}"
+        expected_line = f"DEBUG:grader:Running command: {' '.join(expected_command)}"
         expected_line += f", from directory: {None}, with environment variables: {None}"
 
-        mocked_subprocess.return_value = expected_subprocess_result
-
         # Act
         with self.assertLogs("grader", level="DEBUG") as log:
-            actual_subprocess_result = run([expected_command])
+            actual_subprocess_result = run(expected_command)
 
             is_command_name_logged = expected_line in log.output
             is_additional_information_logged = (
@@ -42,42 +77,242 @@ class TestRunProcess(unittest.TestCase):
             )
 
         # Assert
-        self.assertEqual(expected_subprocess_result, actual_subprocess_result)
+        self.assertEqual(expected_returncode, actual_subprocess_result.returncode)
+        self.assertEqual(expected_stdout, actual_subprocess_result.stdout)
+        self.assertEqual(expected_stderr, actual_subprocess_result.stderr)
         self.assertTrue(is_command_name_logged)
         self.assertTrue(is_additional_information_logged)
-        mocked_subprocess.assert_called_once_with(
-            [expected_command], check=False, capture_output=True, text=True, cwd=None, env=None
-        )
 
-    @patch("subprocess.run")
-    def test_02_zero_return_code(self, mocked_subprocess: MagicMock) -> None:
+    def test_02_zero_return_code(self) -> None:
         """
         Test that the run function logs the correct messages and returns the expected result.
 
         Tests when the subprocess returns a zero return code.
         """
         # Arrange
-        expected_command = "dummy"
+        expected_command = [sys.executable, "-c", "print('stdout')"]
         expected_returncode = 0
-        expected_stdout = "stdout"
+        expected_stdout = "stdout\n"
 
-        expected_subprocess_result = subprocess.CompletedProcess(expected_command, expected_returncode, expected_stdout)
-
-        expected_line = f"DEBUG:grader:Running command: {expected_command}"
+        expected_line = f"DEBUG:grader:Running command: {' '.join(expected_command)}"
         expected_line += f", from directory: {None}, with environment variables: {None}"
 
-        mocked_subprocess.return_value = expected_subprocess_result
-
         # Act
         with self.assertLogs("grader", level="DEBUG") as log:
-            actual_subprocess_result = run([expected_command])
+            actual_subprocess_result = run(expected_command)
             is_command_name_logged = expected_line in log.output
             is_additional_information_logged = f"DEBUG:grader:Command succeeded: {expected_stdout}" in log.output
 
         # Assert
-        self.assertEqual(expected_subprocess_result, actual_subprocess_result)
+        self.assertEqual(expected_returncode, actual_subprocess_result.returncode)
+        self.assertEqual(expected_stdout, actual_subprocess_result.stdout)
+        self.assertEqual("", actual_subprocess_result.stderr)
         self.assertTrue(is_command_name_logged)
         self.assertTrue(is_additional_information_logged)
-        mocked_subprocess.assert_called_once_with(
-            [expected_command], check=False, capture_output=True, text=True, cwd=None, env=None
+
+    def test_03_output_is_truncated_and_spilled(self) -> None:
+        """Verify that only the start and the end of a long output are kept, the rest going to the spill file."""
+        # Arrange
+        os.makedirs(self.__sample_dir, exist_ok=True)
+        spill_path = os.path.join(self.__sample_dir, "spill")
+        command = [sys.executable, "-c", "for i in range(100000): print(f'{i:05}')"]
+
+        # Act
+        with self.assertLogs("grader", level="WARNING"):
+            output = run(command, max_output_size=12, spill_path=spill_path)
+
+        # Assert
+        omitted = 100000 * 6 - 12
+        self.assertEqual(
+            f"00000\n\n[... {omitted} characters omitted, written to {spill_path}.stdout ...]\n99999\n", output.stdout
+        )
+        with open(f"{spill_path}.stdout", encoding="utf-8") as spill_file:
+            spilled = spill_file.read()
+        self.assertEqual(omitted, len(spilled))
+        self.assertTrue(spilled.startswith("00001\n") and spilled.endswith("99998\n"))
+        self.assertFalse(os.path.exists(f"{spill_path}.stderr"))
+
+    def test_04_line_callbacks(self) -> None:
+        """Verify that the callbacks receive each line without its line ending, including the last unended one."""
+        # Arrange
+        stdout_lines: list[str] = []
+        stderr_lines: list[str] = []
+        script = "import sys; print('a\\r\\nb'); print('c', file=sys.stderr); print('d', end='')"
+        command = [sys.executable, "-c", script]
+
+        # Act
+        output = run(command, on_stdout_line=stdout_lines.append, on_stderr_line=stderr_lines.append)
+
+        # Assert
+        self.assertEqual(["a", "b", "d"], stdout_lines)
+        self.assertEqual(["c"], stderr_lines)
+        self.assertEqual("a\nb\nd", output.stdout)
+
+    def test_05_failing_line_callback(self) -> None:
+        """Verify that the error of a callback is raised once the command exited, without blocking it."""
+        # Arrange
+        lines: list[str] = []
+
+        def on_line(line: str) -> None:
+            lines.append(line)
+            raise ValueError(f"Cannot parse {line}")
+
+        # Act & Assert
+        with self.assertRaisesRegex(ValueError, "Cannot parse 0"):
+            run([sys.executable, "-c", "for i in range(100000): print(i)"], on_stdout_line=on_line)
+        self.assertEqual(["0"], lines)
+
+    def test_06_timeout_kills_process_group(self) -> None:
+        """Verify that a command running for too long is killed, with the processes it started."""
+        # Arrange
+        os.makedirs(self.__sample_dir, exist_ok=True)
+        pid_path = os.path.join(self.__sample_dir, "child.pid")
+        script = (
+            "import subprocess, sys, time\n"
+            "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+            f"open({pid_path!r}, 'w').write(str(child.pid))\n"
+            "time.sleep(60)\n"
         )
+        start_time = time.monotonic()
+
+        # Act
+        with self.assertRaises(ProcessTimeoutError):
+            run([sys.executable, "-c", script], limits=ProcessLimits(timeout=2))
+
+        # Assert
+        self.assertLess(time.monotonic() - start_time, 10)
+        with open(pid_path, encoding="utf-8") as pid_file:
+            child_pid = int(pid_file.read())
+        if os.name == "posix":
+            time.sleep(0.1)
+            self.assertFalse(is_running(child_pid))
+
+    @unittest.skipUnless(os.name == "posix", "CPU time limits are enforced on POSIX systems only")
+    def test_07_cpu_time_limit(self) -> None:
+        """Verify that a command using more CPU time than its limit is killed."""
+        # Act & Assert
+        with self.assertRaisesRegex(ProcessTimeoutError, "CPU time"):
+            run([sys.executable, "-c", "while True: pass"], limits=ProcessLimits(timeout=30, cpu_time=1))
+
+    def test_08_limits_from_dict(self) -> None:
+        """Verify that the limits of a check are parsed with their defaults, and invalid limits are refused."""
+        # Act & Assert
+        self.assertEqual(
+            ProcessLimits(timeout=60, cpu_time=30.5), ProcessLimits.from_dict({"timeout": 60, "cpu_time": 30.5})
+        )
+        self.assertEqual(ProcessLimits(None), ProcessLimits.from_dict({"timeout": None}))
+        self.assertIsNotNone(ProcessLimits.from_dict({}).timeout)
+        self.assertEqual(
+            ProcessLimits(memory=2**30, processes=64, cgroup="/sys/fs/cgroup/grader"),
+            ProcessLimits.from_dict({"memory": 2**30, "processes": 64, "cgroup": "/sys/fs/cgroup/grader"}),
+        )
+
+        invalid_limits: list[object] = [
+            [],
+            {"timeout": 0},
+            {"cpu_time": "1m"},
+            {"timeout": True},
+            {"memory": 1.5},
+            {"processes": -1},
+            {"cgroup": ""},
+            {"stack": 1024},
+        ]
+        for limits in invalid_limits:
+            with self.subTest(limits=limits), self.assertRaises(InvalidConfigError):
+                ProcessLimits.from_dict(limits)
+
+    @unittest.skipUnless(os.name == "posix", "Resource limits are enforced on POSIX systems only")
+    def test_09_memory_and_file_size_limits(self) -> None:
+        """Verify that a command cannot allocate more memory, or write larger files, than its limits."""
+        # Arrange
+        os.makedirs(self.__sample_dir, exist_ok=True)
+        file_path = os.path.join(self.__sample_dir, "large.txt")
+        limits = ProcessLimits(memory=512 * 1024 * 1024, file_size=1024 * 1024)
+
+        # Act
+        allocation = run([sys.executable, "-c", "data = bytearray(1024 * 1024 * 1024)"], limits=limits)
+        writing = run([sys.executable, "-c", f"open({file_path!r}, 'wb').write(bytes(2 * 1024 * 1024))"], limits=limits)
+        small_writing = run([sys.executable, "-c", f"open({file_path!r}, 'wb').write(bytes(1024))"], limits=limits)
+
+        # Assert
+        self.assertNotEqual(0, allocation.returncode)
+        self.assertIn("MemoryError", allocation.stderr)
+        self.assertNotEqual(0, writing.returncode)
+        self.assertIn("File too large", writing.stderr)
+        self.assertEqual(0, small_writing.returncode)
+
+    @unittest.skipUnless(sys.platform == "linux", "cgroups are available on Linux only")
+    def test_10_cgroup(self) -> None:
+        """Verify that a command is placed in a cgroup of its own, with the limits of the whole command."""
+        # Arrange
+        cgroup_path = os.path.join(self.__sample_dir, "cgroup")
+        os.makedirs(cgroup_path)
+        for name, content in (("cgroup.procs", ""), ("cgroup.subtree_control", "memory")):
+            with open(os.path.join(cgroup_path, name), "w", encoding="utf-8") as interface_file:
+                interface_file.write(content)
+
+        # Act
+        # The interface files of a directory posing as a cgroup are regular files, so it cannot be removed
+        with self.assertLogs("grader", level="WARNING"):
+            output = run([sys.executable, "-c", "pass"], limits=ProcessLimits(memory=2**30, cgroup=cgroup_path))
+
+        with self.assertRaisesRegex(ProcessLimitError, "pids"):
+            run([sys.executable, "-c", "pass"], limits=ProcessLimits(processes=64, cgroup=cgroup_path))
+
+        # Assert
+        self.assertEqual(0, output.returncode)
+        (child_name,) = [name for name in os.listdir(cgroup_path) if name.startswith("pygrader-")]
+        child_files = {}
+        for name in sorted(os.listdir(os.path.join(cgroup_path, child_name))):
+            with open(os.path.join(cgroup_path, child_name, name), encoding="utf-8") as interface_file:
+                child_files[name] = interface_file.read()
+        self.assertEqual({"cgroup.procs": "0", "memory.max": str(2**30)}, child_files)
+
+    @unittest.skipUnless(os.name == "posix", "Sessions exist on POSIX systems only")
+    def test_11_timeout_with_process_leaving_the_session(self) -> None:
+        """Verify that a timed out command is not waited for while a process which left its session holds its output."""
+        # Arrange
+        os.makedirs(self.__sample_dir, exist_ok=True)
+        pid_path = os.path.join(self.__sample_dir, "child.pid")
+        script = (
+            "import subprocess, sys, time\n"
+            "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'], start_new_session=True)\n"
+            f"open({pid_path!r}, 'w').write(str(child.pid))\n"
+            "time.sleep(30)\n"
+        )
+        start_time = time.monotonic()
+
+        # Act
+        try:
+            with self.assertLogs("grader", level="WARNING"), self.assertRaises(ProcessTimeoutError):
+                run([sys.executable, "-c", script], limits=ProcessLimits(timeout=2))
+        finally:
+            with open(pid_path, encoding="utf-8") as pid_file:
+                os.kill(int(pid_file.read()), signal.SIGKILL)
+
+        # Assert
+        self.assertLess(time.monotonic() - start_time, 10)
+
+
+class TestOutputCapture(unittest.TestCase):
+    """Test cases for the OutputCapture class."""
+
+    def test_01_long_lines_are_split(self) -> None:
+        """Verify that a line longer than the maximal line length reaches the callback in pieces."""
+        # Arrange
+        lines: list[str] = []
+        capture = OutputCapture(max_size=None, on_line=lines.append)
+
+        # Act
+        for _ in range(3):
+            capture.write("x" * 50_000)
+        capture.close()
+
+        # Assert
+        self.assertEqual([65536, 65536, 18928], [len(line) for line in lines])
+        self.assertEqual(150_000, len(capture.getvalue()))
+        self.assertFalse(capture.is_truncated)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+"""Unit tests for the ProjectIndex class."""
+
+import os
+import shutil
+import unittest
+from unittest.mock import patch
+
+from grader.utils.project_index import ProjectIndex, glob_to_regex
+
+
+class TestProjectIndex(unittest.TestCase):
+    """Test cases for the ProjectIndex class."""
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        """
+        Initialize the test case.
+
+        :param methodName: The name of the test method to run.
+        :type methodName: str
+        """
+        self.__project_root = os.path.abspath("sample_index_project")
+        super().__init__(methodName)
+
+    def setUp(self) -> None:
+        """Set up the test environment."""
+        files = [
+            "main.py",
+            "README.md",
+            os.path.join("src", "__init__.py"),
+            os.path.join("src", "pkg", "module.py"),
+            os.path.join("tests", "test_main.py"),
+            os.path.join(".venv", "lib", "site.py"),
+            os.path.join("src", "__pycache__", "cached.py"),
+            os.path.join("build", "lib", "built.py"),
+            os.path.join("build", "generated.py"),
+        ]
+
+        for file in files:
+            path = os.path.join(self.__project_root, file)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8"):
+                pass
+
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        """Tear down the test environment."""
+        shutil.rmtree(self.__project_root, ignore_errors=True)
+        return super().tearDown()
+
+    def __path(self, *parts: str) -> str:
+        """
+        Build the absolute path to a file of the sample project.
+
+        :param parts: The components of the path, relative to the project root.
+        :return: The absolute path.
+        """
+        return os.path.join(self.__project_root, *parts)
+
+    def test_01_python_files_skip_ignored_directories(self) -> None:
+        """Verify that the files in the ignored directories are not indexed."""
+        # Arrange
+        project_index = ProjectIndex(self.__project_root)
+        expected_files = [
+            self.__path("build", "generated.py"),
+            self.__path("main.py"),
+            self.__path("src", "__init__.py"),
+            self.__path("src", "pkg", "module.py"),
+            self.__path("tests", "test_main.py"),
+        ]
+
+        # Act
+        python_files = project_index.python_files
+
+        # Assert
+        self.assertEqual(expected_files, sorted(python_files))
+
+    def test_02_source_files_exclude_tests_directory(self) -> None:
+        """Verify that the source files are the python files outside of the tests directory."""
+        # Arrange
+        project_index = ProjectIndex(self.__project_root)
+
+        # Act & Assert
+        self.assertEqual("tests", project_index.tests_directory)
+        self.assertNotIn(self.__path("tests", "test_main.py"), project_index.source_files)
+        self.assertIn(self.__path("main.py"), project_index.source_files)
+
+    def test_03_glob(self) -> None:
+        """Verify that glob patterns match like Path.glob."""
+        # Arrange
+        project_index = ProjectIndex(self.__project_root)
+
+        # Act & Assert
+        self.assertEqual(
+            [self.__path("src", "__init__.py"), self.__path("src", "pkg", "module.py")],
+            sorted(project_index.glob("src/**/*.py")),
+        )
+        self.assertEqual([self.__path("README.md")], project_index.glob("*.md"))
+        self.assertEqual([self.__path("main.py")], project_index.glob("./[lm]ain.py"))
+        self.assertEqual([self.__path("src")], project_index.glob("s?c"))
+        self.assertEqual([], project_index.glob("requirements.txt"))
+
+    def test_04_walked_once(self) -> None:
+        """Verify that the project is walked only once, however many times the index is used."""
+        # Arrange
+        project_index = ProjectIndex(self.__project_root)
+
+        # Act
+        with patch("os.scandir", wraps=os.scandir) as mocked_scandir:
+            _ = project_index.python_files
+            calls_after_first_use = mocked_scandir.call_count
+            _ = project_index.source_files
+            _ = project_index.glob("**/*.py")
+
+        # Assert
+        self.assertEqual(calls_after_first_use, mocked_scandir.call_count)
+
+    def test_05_missing_project_root(self) -> None:
+        """Verify that a missing project root gives an empty index."""
+        # Arrange
+        project_index = ProjectIndex(self.__path("missing"))
+
+        # Act & Assert
+        self.assertEqual([], project_index.python_files)
+        self.assertIsNone(project_index.tests_directory)
+
+    def test_06_glob_to_regex(self) -> None:
+        """Verify that ** matches any amount of directories and * does not match the path separator."""
+        # Arrange
+        regex = glob_to_regex("src/**/*.py")
+
+        # Act & Assert
+        self.assertIsNotNone(regex.fullmatch("src/main.py"))
+        self.assertIsNotNone(regex.fullmatch("src/a/b/main.py"))
+        self.assertIsNone(regex.fullmatch("main.py"))
+        self.assertIsNone(glob_to_regex("*.py").fullmatch("src/main.py"))
+        self.assertIsNotNone(glob_to_regex("[!a]*.py").fullmatch("main.py"))
+        self.assertIsNone(glob_to_regex("[!m]*.py").fullmatch("main.py"))
+
+    def test_07_gitignore(self) -> None:
+        """Verify that, if enabled, the files and directories ignored by .gitignore files are skipped."""
+        # Arrange
+        with open(self.__path(".gitignore"), "w", encoding="utf-8") as gitignore_file:
+            gitignore_file.write("# Generated files\nbuild/\n*.md\n/main.py\n")
+        with open(self.__path("src", ".gitignore"), "w", encoding="utf-8") as gitignore_file:
+            gitignore_file.write("pkg/*.py\n!pkg/module.py\n__init__.py\n")
+
+        expected_files = [self.__path("src", "pkg", "module.py"), self.__path("tests", "test_main.py")]
+
+        # Act
+        python_files = ProjectIndex(self.__project_root, is_respecting_gitignore=True).python_files
+        all_python_files = ProjectIndex(self.__project_root).python_files
+
+        # Assert
+        self.assertEqual(expected_files, sorted(python_files))
+        self.assertIn(self.__path("main.py"), all_python_files)
+
+    def test_08_fingerprint(self) -> None:
+        """Verify that the fingerprint changes with the files, and optionally ignores their contents."""
+        # Arrange
+        project_index = ProjectIndex(self.__project_root)
+        fingerprint = project_index.compute_fingerprint()
+        tree_fingerprint = project_index.compute_fingerprint(is_including_contents=False)
+
+        with open(self.__path("main.py"), "w", encoding="utf-8") as main_file:
+            main_file.write("print('changed')")
+        with open(self.__path(".venv", "lib", "site.py"), "w", encoding="utf-8") as site_file:
+            site_file.write("ignored")
+
+        # Act
+        changed_index = ProjectIndex(self.__project_root)
+
+        # Assert
+        self.assertNotEqual(fingerprint, changed_index.compute_fingerprint())
+        self.assertEqual(tree_fingerprint, changed_index.compute_fingerprint(is_including_contents=False))
+
+        os.remove(self.__path("README.md"))
+        self.assertNotEqual(
+            tree_fingerprint, ProjectIndex(self.__project_root).compute_fingerprint(is_including_contents=False)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+"""Unit tests for the pylint results cache."""
+
+import os
+import shutil
+import unittest
+
+from grader.utils.pylint_cache import (
+    PylintCache,
+    PylintFileResult,
+    PylintMessage,
+    compute_pylint_score,
+    count_statements,
+    group_pylint_messages,
+)
+
+
+class TestPylintCacheFunctions(unittest.TestCase):
+    """Test cases for the helper functions of the pylint cache."""
+
+    def test_01_count_statements(self) -> None:
+        """Verify that docstrings are not counted as statements, while except handlers are."""
+        # Arrange
+        source = b'''"""Module docstring."""
+import os
+
+
+def main() -> None:
+    """Function docstring."""
+    try:
+        print(os.getcwd())
+    except OSError:
+        pass
+'''
+
+        # Act
+        statements = count_statements(source)
+
+        # Assert
+        # import, def, try, print, except, pass
+        self.assertEqual(6, statements)
+
+    def test_02_count_statements_syntax_error(self) -> None:
+        """Verify that a file which cannot be parsed has no statements."""
+        # Act & Assert
+        self.assertEqual(0, count_statements(b"def main(:\n"))
+
+    def test_03_group_messages(self) -> None:
+        """Verify that messages from the JSON report are grouped by the absolute path of their file."""
+        # Arrange
+        messages = [
+            {
+                "messageId": "C0114",
+                "symbol": "missing-module-docstring",
+                "message": "Missing module docstring",
+                "line": 1,
+                "column": 0,
+                "absolutePath": "/project/main.py",
+            },
+            {
+                "messageId": "E0401",
+                "symbol": "import-error",
+                "message": "Unable to import 'numpy'",
+                "line": 2,
+                "column": 4,
+                "absolutePath": "/project/main.py",
+            },
+        ]
+
+        # Act
+        messages_by_file = group_pylint_messages(messages)
+
+        # Assert
+        self.assertEqual(
+            {
+                os.path.normpath("/project/main.py"): [
+                    PylintMessage(1, 0, "C0114", "Missing module docstring (missing-module-docstring)"),
+                    PylintMessage(2, 4, "E0401", "Unable to import 'numpy' (import-error)"),
+                ]
+            },
+            messages_by_file,
+        )
+
+    def test_04_compute_score(self) -> None:
+        """Verify that the score is computed with pylint's default evaluation over all files."""
+        # Arrange
+        results = [
+            PylintFileResult(10, [PylintMessage(1, 0, "C0114", ""), PylintMessage(2, 0, "E0401", "")]),
+            PylintFileResult(10, [PylintMessage(1, 0, "W0611", ""), PylintMessage(2, 0, "I0021", "")]),
+        ]
+
+        # Act
+        score = compute_pylint_score(results)
+
+        # Assert
+        # 10 - (5 * 1 error + 1 warning + 1 convention) / 20 statements * 10
+        self.assertAlmostEqual(6.5, score or 0)
+
+    def test_05_compute_score_fatal_and_empty(self) -> None:
+        """Verify that fatal messages give 0 and that code without statements is not rated."""
+        # Act & Assert
+        self.assertEqual(0.0, compute_pylint_score([PylintFileResult(5, [PylintMessage(1, 0, "F0001", "")])]))
+        self.assertIsNone(compute_pylint_score([PylintFileResult(0, [])]))
+
+
+class TestPylintCache(unittest.TestCase):
+    """Test cases for the PylintCache class."""
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        """
+        Initialize the test case.
+
+        :param methodName: The name of the test method to run.
+        :type methodName: str
+        """
+        self.__cache_dir = "sample_pylint_cache"
+        super().__init__(methodName)
+
+    def tearDown(self) -> None:
+        """Tear down the test environment."""
+        shutil.rmtree(self.__cache_dir, ignore_errors=True)
+        return super().tearDown()
+
+    def test_01_key_depends_on_all_inputs(self) -> None:
+        """Verify that the key changes with the path, the linted files, the configuration and the pylint version."""
+        # Arrange
+        key = PylintCache.compute_key("main.py", "project", "rc", "pylint 3.3.1")
+
+        # Act & Assert
+        self.assertEqual(key, PylintCache.compute_key("main.py", "project", "rc", "pylint 3.3.1"))
+        self.assertNotEqual(key, PylintCache.compute_key("other.py", "project", "rc", "pylint 3.3.1"))
+        self.assertNotEqual(key, PylintCache.compute_key("main.py", "other", "rc", "pylint 3.3.1"))
+        self.assertNotEqual(key, PylintCache.compute_key("main.py", "project", "other", "pylint 3.3.1"))
+        self.assertNotEqual(key, PylintCache.compute_key("main.py", "project", "rc", "pylint 3.3.2"))
+
+    def test_02_put_and_get(self) -> None:
+        """Verify that stored results are returned, and that missing entries are not."""
+        # Arrange
+        cache = PylintCache(self.__cache_dir)
+        result = PylintFileResult(3, [PylintMessage(1, 0, "C0114", "Missing module docstring")])
+
+        # Act
+        cache.put("key", result)
+
+        # Assert
+        self.assertEqual(result, cache.get("key"))
+        self.assertIsNone(cache.get("missing"))
+
+    def test_03_project_fingerprint(self) -> None:
+        """Verify that the fingerprint changes when any linted file is changed, added or removed."""
+        # Arrange
+        fingerprint = PylintCache.compute_project_fingerprint({"main.py": b"x = 1", "lib.py": b"y = 1"})
+
+        # Act & Assert
+        self.assertEqual(
+            fingerprint, PylintCache.compute_project_fingerprint({"lib.py": b"y = 1", "main.py": b"x = 1"})
+        )
+        self.assertNotEqual(
+            fingerprint, PylintCache.compute_project_fingerprint({"main.py": b"x = 1", "lib.py": b"y = 2"})
+        )
+        self.assertNotEqual(fingerprint, PylintCache.compute_project_fingerprint({"main.py": b"x = 1"}))
+        self.assertNotEqual(
+            fingerprint,
+            PylintCache.compute_project_fingerprint({"main.py": b"x = 1", "lib.py": b"y = 1", "new.py": b""}),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,8 @@
 """Unit tests for the PylintCheck class."""
 
+import json
+import os
+import shutil
 import unittest
 from subprocess import CompletedProcess
 from unittest.mock import MagicMock, patch
@@ -296,16 +299,27 @@ class TestPylintCheck(unittest.TestCase):
         :return: The sample pylint output.
         :rtype: str
         """
-        content = [
-            "************* Module main",
-            "/tmp/temp_project/main.py:1:0: C0114: Missing module docstring (missing-module-docstring)",
-            "/tmp/temp_project/main.py:2:0: E0401: Unable to import 'numpy' (import-error)",
-            '/tmp/temp_project/main.py:2:0: C0413: Import "import numpy as np" should be placed at the top of module',
-            "",
-            "------------------------------------------------------------------",
-            "Your code has been rated at {score:.2f}/10 (previous run: 1.25/10, +0.00)]",
+        messages = [
+            ("/tmp/temp_project/main.py", 1, "C0114", "missing-module-docstring", "Missing module docstring"),
+            ("/tmp/temp_project/main.py", 2, "E0401", "import-error", "Unable to import 'numpy'"),
+            ("/tmp/temp_project/main.py", 2, "C0413", "wrong-import-position", "Import should be placed at the top"),
         ]
-        return "\n".join(content).format(score=score)
+        report = {
+            "messages": [
+                {
+                    "messageId": message_id,
+                    "symbol": symbol,
+                    "message": message,
+                    "line": line,
+                    "column": 0,
+                    "path": "main.py",
+                    "absolutePath": path,
+                }
+                for path, line, message_id, symbol, message in messages
+            ],
+            "statistics": {"score": score},
+        }
+        return json.dumps(report)
 
     @patch("grader.utils.process.run")
     @patch("os.path.exists")
@@ -346,3 +360,127 @@ class TestPylintCheck(unittest.TestCase):
         mocked_pylint.assert_called_once()
         self.assertNotIn("--rcfile", called_with[0][0])
         self.assertNotIn(custom_pylintrc, called_with[0][0])
+
+    @patch("grader.utils.process.run")
+    def test_14_cached_files_are_not_linted_again(self, mocked_run: MagicMock) -> None:
+        """Test that with a cache, a second run does not lint unchanged files and gives the same result."""
+        # Arrange
+        project_root = os.path.abspath("sample_pylint_project")
+        cache_dir = os.path.abspath("sample_pylint_project_cache")
+        os.makedirs(project_root, exist_ok=True)
+        with open(os.path.join(project_root, "main.py"), "w", encoding="utf-8") as main_file:
+            main_file.write("import os\n\nprint(os.getcwd())\n")
+
+        def mocked_run_side_effect(command: list[str], **_: dict) -> CompletedProcess:
+            if "--version" in command:
+                return CompletedProcess(command, 0, "pylint 3.3.1\nastroid 3.3.5")
+            message = {
+                "messageId": "C0114",
+                "symbol": "missing-module-docstring",
+                "message": "Missing module docstring",
+                "line": 1,
+                "column": 0,
+                "path": "main.py",
+                "absolutePath": os.path.join(project_root, "main.py"),
+            }
+            return CompletedProcess(command, 0, json.dumps({"messages": [message], "statistics": {"score": 5.0}}))
+
+        mocked_run.side_effect = mocked_run_side_effect
+
+        # Act
+        first_result = PylintCheck("pylint", project_root, 2, is_venv_required=False, cache_dir=cache_dir).run()
+        lint_calls_after_first_run = mocked_run.call_count
+        second_result = PylintCheck("pylint", project_root, 2, is_venv_required=False, cache_dir=cache_dir).run()
+
+        shutil.rmtree(project_root, ignore_errors=True)
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+        # Assert
+        # 1 convention message for 2 statements - 10 - (1 / 2) * 10 = 5.0, the middle of the 3 regions
+        self.assertEqual(1, first_result.result)
+        self.assertEqual("main.py: Missing module docstring (missing-module-docstring)", first_result.info)
+        self.assertEqual(first_result, second_result)
+        self.assertEqual(2, lint_calls_after_first_run)
+        self.assertEqual(3, mocked_run.call_count)
+
+    @patch("grader.utils.process.run")
+    def test_15_jobs_and_json_output(self, mocked_run: MagicMock) -> None:
+        """Test that pylint is run with the configured jobs and the JSON reporter, and the report is summarized."""
+        # Arrange
+        pylint_check = PylintCheck("pylint", "sample_dir", 2, is_venv_required=False, jobs=4)
+        mocked_run.return_value = CompletedProcess("pylint", 0, self.__create_sample_pylint_output(10))
+
+        # Act
+        result = pylint_check.run()
+        command = mocked_run.call_args[0][0]
+
+        # Assert
+        self.assertIn("--jobs=4", command)
+        self.assertIn(f"--output-format={const.PYLINT_OUTPUT_FORMAT}", command)
+        self.assertEqual(2, result.result)
+        self.assertEqual(
+            "main.py: Missing module docstring (missing-module-docstring)\n"
+            "main.py: Unable to import 'numpy' (import-error)\n"
+            "main.py: Import should be placed at the top (wrong-import-position)",
+            result.info,
+        )
+
+    @patch("grader.utils.process.run")
+    def test_16_invalid_report(self, mocked_run: MagicMock) -> None:
+        """Test that a pylint report which is not valid JSON makes the check fail with CheckError."""
+        # Arrange
+        mocked_run.return_value = CompletedProcess("pylint", 0, "Your code has been rated at 10.00/10")
+
+        # Act & Assert
+        with self.assertRaises(CheckError):
+            self.pylint_check.run()
+
+    @patch("grader.utils.process.run")
+    def test_17_changed_sibling_module_lints_all_files(self, mocked_run: MagicMock) -> None:
+        """Test that with a cache, changing a module lints the unchanged modules too, as their messages depend on it."""
+        # Arrange
+        project_root = os.path.abspath("sample_pylint_project")
+        cache_dir = os.path.abspath("sample_pylint_project_cache")
+        main_path = os.path.join(project_root, "main.py")
+        lib_path = os.path.join(project_root, "lib.py")
+        os.makedirs(project_root, exist_ok=True)
+        with open(main_path, "w", encoding="utf-8") as main_file:
+            main_file.write('"""Main."""\n\nfrom lib import VALUE\n\nprint(VALUE)\n')
+        with open(lib_path, "w", encoding="utf-8") as lib_file:
+            lib_file.write('"""Library."""\n\nVALUE = 1\n')
+
+        def mocked_run_side_effect(command: list[str], **_: dict) -> CompletedProcess:
+            if "--version" in command:
+                return CompletedProcess(command, 0, "pylint 3.3.1\nastroid 3.3.5")
+            with open(lib_path, encoding="utf-8") as lib_file:
+                if "VALUE" in lib_file.read():
+                    return CompletedProcess(command, 0, json.dumps({"messages": [], "statistics": {"score": 10.0}}))
+            message = {
+                "messageId": "E0611",
+                "symbol": "no-name-in-module",
+                "message": "No name 'VALUE' in module 'lib'",
+                "line": 3,
+                "column": 0,
+                "path": "main.py",
+                "absolutePath": main_path,
+            }
+            return CompletedProcess(command, 0, json.dumps({"messages": [message], "statistics": {"score": 0.0}}))
+
+        mocked_run.side_effect = mocked_run_side_effect
+
+        # Act
+        first_result = PylintCheck("pylint", project_root, 2, is_venv_required=False, cache_dir=cache_dir).run()
+        with open(lib_path, "w", encoding="utf-8") as lib_file:
+            lib_file.write('"""Library."""\n\nOTHER = 1\n')
+        second_result = PylintCheck("pylint", project_root, 2, is_venv_required=False, cache_dir=cache_dir).run()
+        lint_commands = [call[0][0] for call in mocked_run.call_args_list if "--version" not in call[0][0]]
+
+        shutil.rmtree(project_root, ignore_errors=True)
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+        # Assert
+        self.assertEqual(2, first_result.result)
+        self.assertEqual("main.py: No name 'VALUE' in module 'lib' (no-name-in-module)", second_result.info)
+        self.assertLess(second_result.result, first_result.result)
+        self.assertEqual(2, len(lint_commands))
+        self.assertIn(main_path, lint_commands[1])
@@ -0,0 +1,69 @@
+"""Unit tests for the PytestSession class."""
+
+import unittest
+from subprocess import CompletedProcess
+from unittest.mock import MagicMock, patch
+
+from grader.exceptions import ProcessTimeoutError
+from grader.utils.constants import COVERAGE_PATH
+from grader.utils.process import ProcessLimits
+from grader.utils.pytest_session import PytestSession
+
+
+class TestPytestSession(unittest.TestCase):
+    """Test cases for the PytestSession class."""
+
+    @patch("grader.utils.process.run")
+    def test_01_tests_run_once_under_coverage(self, mocked_run: MagicMock) -> None:
+        """Verify that the tests are run under coverage, and only once for all checks sharing the session."""
+        # Arrange
+        expected_result = CompletedProcess(args=[], returncode=0, stdout="PASSED test.py::TestA::test_a")
+        mocked_run.return_value = expected_result
+        session = PytestSession("/project")
+
+        # Act
+        first_result = session.run(["tests/test_a.py"])
+        second_result = session.run(["tests/test_a.py"])
+
+        # Assert
+        mocked_run.assert_called_once()
+        command = mocked_run.call_args.args[0]
+        self.assertEqual(COVERAGE_PATH, command[0])
+        self.assertIn("pytest", command)
+        self.assertEqual("tests/test_a.py", command[-1])
+        self.assertIs(expected_result, first_result)
+        self.assertIs(expected_result, second_result)
+
+    @patch("grader.utils.process.run")
+    def test_02_project_root_is_in_pythonpath(self, mocked_run: MagicMock) -> None:
+        """Verify that the project root is added to PYTHONPATH, on top of the session environment variables."""
+        # Arrange
+        mocked_run.return_value = CompletedProcess(args=[], returncode=0, stdout="")
+        session = PytestSession("/project", {"VAR": "value"})
+
+        # Act
+        session.run([])
+
+        # Assert
+        env_vars = mocked_run.call_args.kwargs["env_vars"]
+        self.assertEqual("value", env_vars["VAR"])
+        self.assertIn("/project", env_vars["PYTHONPATH"])
+
+    @patch("grader.utils.process.run")
+    def test_03_timed_out_run_is_not_repeated(self, mocked_run: MagicMock) -> None:
+        """Verify that a run which timed out fails for every check sharing the session, without running again."""
+        # Arrange
+        mocked_run.side_effect = ProcessTimeoutError("coverage did not finish within 60 seconds")
+        limits = ProcessLimits(timeout=60)
+        session = PytestSession("/project", limits=limits)
+
+        # Act & Assert
+        for _ in range(2):
+            with self.assertRaises(ProcessTimeoutError):
+                session.run([])
+        mocked_run.assert_called_once()
+        self.assertEqual(limits, mocked_run.call_args.kwargs["limits"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+"""Unit tests for the rescoring of reports."""
+
+import json
+import os
+import shutil
+import unittest
+
+from grader.checks.abstract_check import CheckResult, NonScoredCheckResult, ScoredCheckResult
+from grader.exceptions import InvalidConfigError, InvalidReportError
+from grader.rescore import Rescorer, is_batch_report, load_report
+from grader.utils.results_reporter import results_from_json, results_to_json
+
+
+class TestRescorer(unittest.TestCase):
+    """Test cases for the Rescorer class."""
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        """
+        Initialize the test case.
+
+        :param methodName: The name of the test method to run.
+        :type methodName: str
+        """
+        self.__sample_dir = os.path.abspath("sample_rescore")
+        self.__config_path = os.path.join(self.__sample_dir, "config.json")
+        self.__report_path = os.path.join(self.__sample_dir, "report.json")
+        super().__init__(methodName)
+
+    def setUp(self) -> None:
+        """Set up the test environment."""
+        os.makedirs(self.__sample_dir, exist_ok=True)
+        self.__write_json(
+            self.__config_path,
+            {
+                "checks": [
+                    {"name": "requirements", "max_points": 1, "is_venv_required": False},
+                    {"name": "pylint", "max_points": 4, "is_venv_required": True},
+                    {"name": "type-hints", "max_points": 2, "is_venv_required": True},
+                    {"name": "coverage", "max_points": 3, "is_venv_required": True},
+                    {
+                        "name": "tests",
+                        "max_points": 3,
+                        "is_venv_required": True,
+                        "tests_path": ["tests"],
+                        "test_score_mapping": {"TestMain": 1, "test_add": 2},
+                    },
+                ]
+            },
+        )
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        """Tear down the test environment."""
+        shutil.rmtree(self.__sample_dir, ignore_errors=True)
+        return super().tearDown()
+
+    @staticmethod
+    def __write_json(path: str, content: dict) -> None:
+        """
+        Write a JSON file.
+
+        :param path: The path to the file.
+        :param content: The contents of the file.
+        """
+        with open(path, "w", encoding="utf-8") as json_file:
+            json.dump(content, json_file)
+
+    def test_01_rescore(self) -> None:
+        """Verify that the scores are recomputed from the metrics with the scoring of the configuration."""
+        # Arrange
+        results: list[CheckResult] = [
+            NonScoredCheckResult("requirements", True, "", ""),
+            ScoredCheckResult("pylint", 1, "", "", 1, {"pylint_score": 7.5}),
+            ScoredCheckResult("type-hints", 1, "", "", 1, {"annotated_functions": 3, "functions": 4}),
+            ScoredCheckResult("coverage", 1, "", "", 1, {"coverage": 80}),
+            ScoredCheckResult(
+                "tests", 1, "", "", 1, {"passed": [["TestMain", "test_add"]], "failed": [["TestMain", "test_sub"]]}
+            ),
+        ]
+
+        # Act
+        rescored = Rescorer(self.__config_path).rescore(results)
+
+        # Assert
+        self.assertEqual(results[0], rescored[0])
+        self.assertEqual(
+            [("pylint", 3, 4), ("type-hints", 2, 2), ("coverage", 3, 3), ("tests", 2, 3)],
+            [(result.name, result.result, result.max_score) for result in rescored[1:]],  # type: ignore
+        )
+
+    def test_02_results_which_cannot_be_rescored(self) -> None:
+        """Verify that results without metrics or without a check keep their score, and invalid metrics are reported."""
+        # Arrange
+        results: list[CheckResult] = [
+            ScoredCheckResult("pylint", 0, "", "Pylint score not found", 1),
+            ScoredCheckResult("custom", 5, "", "", 5, {"value": 1}),
+            ScoredCheckResult("coverage", 2, "", "", 3, {"lines": 10}),
+        ]
+
+        # Act
+        rescored = Rescorer(self.__config_path).rescore(results)
+
+        # Assert
+        self.assertEqual(ScoredCheckResult("pylint", 0, "", "Pylint score not found", 4), rescored[0])
+        self.assertEqual(results[1], rescored[1])
+        self.assertEqual(2, rescored[2].result)
+        self.assertIn("Invalid metrics", rescored[2].error)
+
+    def test_03_rescore_batch_report(self) -> None:
+        """Verify that a JSON batch report, with the metrics, is read back and rescored."""
+        # Arrange
+        results: list[CheckResult] = [ScoredCheckResult("coverage", 1, "", "", 1, {"coverage": 50})]
+        self.__write_json(
+            self.__report_path, {"submissions": {"student": results_to_json(results, False)}, "total_submissions": 1}
+        )
+
+        # Act
+        report = load_report(self.__report_path)
+        rescored = Rescorer(self.__config_path).rescore_batch_report(report)
+
+        # Assert
+        self.assertTrue(is_batch_report(report))
+        self.assertEqual({"student": [ScoredCheckResult("coverage", 2, "", "", 3)]}, rescored)
+        parsed_result = results_from_json(report["submissions"]["student"])[0]
+        self.assertEqual({"coverage": 50}, parsed_result.metrics)  # type: ignore
+
+    def test_04_invalid_inputs(self) -> None:
+        """Verify that missing configurations and invalid reports are reported."""
+        # Arrange
+        with open(self.__report_path, "w", encoding="utf-8") as report_file:
+            report_file.write("not json")
+
+        # Act & Assert
+        with self.assertRaises(InvalidConfigError):
+            Rescorer(None)
+        with self.assertRaises(InvalidReportError):
+            load_report(self.__report_path)
+        with self.assertRaises(InvalidReportError):
+            Rescorer(self.__config_path).rescore_report({"scored_checks": [{"name": "pylint"}]})
+
+
+if __name__ == "__main__":
+    unittest.main()
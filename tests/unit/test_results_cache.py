@@ -0,0 +1,116 @@
+"""Unit tests for the check results cache."""
+
+import os
+import shutil
+import unittest
+
+from grader.checks.abstract_check import CheckResult, NonScoredCheckResult, ScoredCheckResult
+from grader.utils.results_cache import (
+    ResultsCache,
+    compute_files_fingerprint,
+    parse_check_result,
+    serialize_check_result,
+)
+
+
+class TestResultsCache(unittest.TestCase):
+    """Test cases for the ResultsCache class."""
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        """
+        Initialize the test case.
+
+        :param methodName: The name of the test method to run.
+        :type methodName: str
+        """
+        self.__cache_dir = os.path.abspath("sample_results_cache")
+        super().__init__(methodName)
+
+    def tearDown(self) -> None:
+        """Tear down the test environment."""
+        shutil.rmtree(self.__cache_dir, ignore_errors=True)
+        return super().tearDown()
+
+    def test_01_serialize_and_parse(self) -> None:
+        """Verify that every kind of check result survives a round trip through a cache entry."""
+        # Arrange
+        results: list[CheckResult] = [
+            ScoredCheckResult("pylint", 7.5, "info", "", 10),
+            NonScoredCheckResult("requirements", False, "", "error"),
+            CheckResult("plain", 1, "", ""),
+        ]
+
+        # Act & Assert
+        for result in results:
+            with self.subTest(result=result):
+                parsed = parse_check_result(serialize_check_result(result))
+                self.assertEqual(result, parsed)
+                self.assertIs(type(result), type(parsed))
+
+    def test_02_put_and_get(self) -> None:
+        """Verify that stored results are returned, and missing or invalid entries are not."""
+        # Arrange
+        cache = ResultsCache(self.__cache_dir, {"checks": []})
+        key = cache.compute_key("PylintCheck", {"name": "pylint", "max_points": 10}, "fingerprint")
+        result = ScoredCheckResult("pylint", 7.5, "info", "", 10)
+
+        # Act
+        cache.put(key, result)
+
+        # Assert
+        self.assertEqual(result, cache.get(key))
+        self.assertIsNone(cache.get("missing"))
+
+        with open(os.path.join(self.__cache_dir, f"{key}.json"), "w", encoding="utf-8") as entry_file:
+            entry_file.write('{"kind": "unknown"}')
+        self.assertIsNone(cache.get(key))
+
+    def test_03_key_inputs(self) -> None:
+        """Verify that the key changes with the inputs of the check, but not with the scheduling options."""
+        # Arrange
+        check_config = {"name": "pylint", "max_points": 10}
+        cache = ResultsCache(self.__cache_dir, {"checks": [check_config], "max_parallel_checks": 1})
+        key = cache.compute_key("PylintCheck", check_config, "fingerprint")
+
+        # Act & Assert
+        self.assertEqual(
+            key,
+            ResultsCache(self.__cache_dir, {"checks": [], "max_parallel_checks": 4}).compute_key(
+                "PylintCheck", check_config, "fingerprint"
+            ),
+        )
+        self.assertNotEqual(key, cache.compute_key("PylintCheck", {**check_config, "max_points": 5}, "fingerprint"))
+        self.assertNotEqual(key, cache.compute_key("PylintCheck", check_config, "other fingerprint"))
+        self.assertNotEqual(key, cache.compute_key("CoverageCheck", check_config, "fingerprint"))
+        self.assertNotEqual(
+            key,
+            ResultsCache(self.__cache_dir, {"venv": {"python_version": "3.12"}}).compute_key(
+                "PylintCheck", check_config, "fingerprint"
+            ),
+        )
+        self.assertNotEqual(key, cache.compute_key("PylintCheck", check_config, "fingerprint", "files fingerprint"))
+
+    def test_04_files_fingerprint(self) -> None:
+        """Verify that the fingerprint of the files changes with their contents, and tells missing files apart."""
+        # Arrange
+        os.makedirs(self.__cache_dir, exist_ok=True)
+        rcfile_path = os.path.join(self.__cache_dir, "pylintrc")
+        missing_path = os.path.join(self.__cache_dir, "missing")
+
+        with open(rcfile_path, "w", encoding="utf-8") as rcfile:
+            rcfile.write("[MAIN]\n")
+        fingerprint = compute_files_fingerprint([rcfile_path])
+
+        # Act
+        with open(rcfile_path, "w", encoding="utf-8") as rcfile:
+            rcfile.write("[MAIN]\ndisable=all\n")
+        edited_fingerprint = compute_files_fingerprint([rcfile_path])
+
+        # Assert
+        self.assertNotEqual(fingerprint, edited_fingerprint)
+        self.assertEqual(edited_fingerprint, compute_files_fingerprint([rcfile_path]))
+        self.assertNotEqual(compute_files_fingerprint([]), compute_files_fingerprint([missing_path]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""Unit tests for the results reporters."""
+
+import json
+import unittest
+
+from grader.checks.abstract_check import CheckResult, NonScoredCheckResult, ScoredCheckResult
+from grader.utils.instrumentation import StageMetrics
+from grader.utils.results_reporter import (
+    CSVResultsReporter,
+    JSONResultsReporter,
+    PlainTextResultsReporter,
+    results_from_json,
+)
+
+
+class TestResultsReporterTimings(unittest.TestCase):
+    """Test cases for the timings in the reports."""
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        """
+        Initialize the test case.
+
+        :param methodName: The name of the test method to run.
+        :type methodName: str
+        """
+        self.__results: list[CheckResult] = [
+            ScoredCheckResult("pylint", 8.0, "", "", 10),
+            NonScoredCheckResult("requirements", True, "", ""),
+        ]
+        self.__timings = [
+            StageMetrics("venv:setup", 10.0, 1.0, 3, 6.0, 50_000, 10, 20),
+            StageMetrics("check:pylint", 2.0, 0.5, 1, 1.5, 100_000),
+        ]
+        super().__init__(methodName)
+
+    def test_01_json_report(self) -> None:
+        """Verify that the timings are only in the JSON report if given."""
+        # Act
+        report = json.loads(JSONResultsReporter().to_string(self.__results, False, self.__timings))
+        report_without_timings = json.loads(JSONResultsReporter().to_string(self.__results, False))
+
+        # Assert
+        self.assertEqual(["venv:setup", "check:pylint"], [stage["name"] for stage in report["timings"]])
+        self.assertEqual(50_000, report["timings"][0]["subprocesses_peak_rss"])
+        self.assertNotIn("timings", report_without_timings)
+
+    def test_02_json_batch_report(self) -> None:
+        """Verify that the batch JSON report has the timings of each submission and a summary of each stage."""
+        # Act
+        report = json.loads(
+            JSONResultsReporter().batch_to_string(
+                {"student_a": self.__results, "student_b": self.__results},
+                False,
+                {"student_a": self.__timings, "student_b": self.__timings[1:]},
+            )
+        )
+
+        # Assert
+        self.assertEqual(2, len(report["submissions"]["student_a"]["timings"]))
+        self.assertEqual(1, len(report["submissions"]["student_b"]["timings"]))
+        pylint_summary = report["timings_summary"][1]
+        self.assertEqual(
+            ("check:pylint", 2, 4.0), tuple(pylint_summary[key] for key in ("name", "runs", "total_wall_time"))
+        )
+
+    def test_03_csv_report(self) -> None:
+        """Verify that the timings are a separate table of the CSV report, after the scores."""
+        # Act
+        report = CSVResultsReporter().to_string(self.__results, False, self.__timings).splitlines()
+        batch_report = CSVResultsReporter().batch_to_string(
+            {"student_a": self.__results}, False, {"student_a": self.__timings}
+        )
+
+        # Assert
+        self.assertEqual("Total,8.0,10", report[3])
+        self.assertEqual("", report[4])
+        self.assertTrue(report[5].startswith("Stage,Wall Time,CPU Time"))
+        self.assertEqual("venv:setup,10.000,1.000,3,6.000,50000,10,20", report[6])
+        self.assertIn("student_a,check:pylint,2.000,0.500,1,1.500,100000,0,0", batch_report.splitlines())
+        self.assertIn("check:pylint,1,2.000,2.000,2.000,100000", batch_report.splitlines())
+
+    def test_04_plain_text_report(self) -> None:
+        """Verify that the timings are listed after the total score in the plain text report."""
+        # Act
+        report = PlainTextResultsReporter().to_string(self.__results, False, self.__timings)
+
+        # Assert
+        self.assertIn("Total Score: 8.0/10\nTimings:\nStage: venv:setup, Wall time: 10.000s", report)
+        self.assertNotIn("Timings", PlainTextResultsReporter().to_string(self.__results, False))
+
+
+class TestResultsReporterTimeouts(unittest.TestCase):
+    """Test cases for the checks which timed out in the reports."""
+
+    def test_01_timed_out_results(self) -> None:
+        """Verify that a timed out check is marked in the reports, and read back from the JSON report."""
+        # Arrange
+        results: list[CheckResult] = [
+            ScoredCheckResult("tests", 0, "", "Tests run timed out", 10, is_timed_out=True),
+            ScoredCheckResult("pylint", 8.0, "", "", 10),
+        ]
+
+        # Act
+        report = json.loads(JSONResultsReporter().to_string(results, True))
+        text_report = PlainTextResultsReporter().to_string(results, False)
+
+        # Assert
+        self.assertTrue(report["scored_checks"][0]["timed_out"])
+        self.assertNotIn("timed_out", report["scored_checks"][1])
+        self.assertEqual(results, results_from_json(report))
+        self.assertIn("Check: tests, Score: 0/10. Timed out", text_report)
+
+
+if __name__ == "__main__":
+    unittest.main()
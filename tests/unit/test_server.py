@@ -0,0 +1,281 @@
+"""Unit tests for the grading server."""
+
+import http.client
+import json
+import os
+import shutil
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from unittest.mock import MagicMock, patch
+
+import grader.server
+from grader.exceptions import CheckError, InvalidProjectRootError
+from grader.server import (
+    JOB_FAILED,
+    JOB_FINISHED,
+    GradedJob,
+    GradingHTTPServer,
+    GradingServer,
+    _get_config,
+    _send_event,
+)
+from grader.utils.job_queue import JobQueue
+
+
+def create_thread_pool(
+    max_workers: int, initializer: Callable[..., None], initargs: tuple, **_: object
+) -> ThreadPoolExecutor:
+    """
+    Create a pool of threads in place of the pool of worker processes.
+
+    :param max_workers: The amount of workers.
+    :param initializer: The initializer of each worker.
+    :param initargs: The arguments of the initializer.
+    :param _: The other arguments of the pool of worker processes (e.g. its multiprocessing context), unused.
+    :return: The pool of threads.
+    """
+    return ThreadPoolExecutor(max_workers, initializer=initializer, initargs=initargs)
+
+
+def grade_job(
+    queue_path: Optional[str], job_id: str, project_path: str, student_id: Optional[str], *_: object
+) -> GradedJob:
+    """
+    Grade a job the way a worker does, without running any check.
+
+    :param queue_path: Optional path to the job queue.
+    :param job_id: The id of the job.
+    :param project_path: The path to the project.
+    :param student_id: The student's id.
+    :raises CheckError: If the project is named "broken".
+    :return: The JSON report of the job, and no transient error.
+    """
+    _send_event(job_id, "started", worker=os.getpid())
+    _send_event(job_id, "stage", name="check:pylint", wall_time=0.5)
+
+    if os.path.basename(project_path) == "broken":
+        raise CheckError("pylint crashed")
+
+    if queue_path is not None:
+        with JobQueue(queue_path) as queue:
+            queue.complete(job_id, [])
+
+    return json.dumps({"student_id": student_id, "total_score": 1.0}, indent=4), None
+
+
+@patch("grader.server._initialize_worker", MagicMock())
+@patch("grader.server.signal.signal", MagicMock())
+@patch("grader.server._grade_job", grade_job)
+@patch("grader.server.ProcessPoolExecutor", create_thread_pool)
+class TestGradingServer(unittest.TestCase):
+    """Test cases for the GradingServer class and its HTTP API."""
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        """
+        Initialize the test case.
+
+        :param methodName: The name of the test method to run.
+        :type methodName: str
+        """
+        self.__sample_dir = os.path.abspath("sample_server")
+        self.__config_path = os.path.join(self.__sample_dir, "config.json")
+        self.__project_path = os.path.join(self.__sample_dir, "project")
+        super().__init__(methodName)
+
+    def setUp(self) -> None:
+        """Set up the test environment."""
+        os.makedirs(self.__project_path, exist_ok=True)
+        os.makedirs(os.path.join(self.__sample_dir, "broken"), exist_ok=True)
+
+        with open(self.__config_path, "w", encoding="utf-8") as config_file:
+            json.dump({"checks": []}, config_file)
+
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        """Tear down the test environment."""
+        grader.server._events = None  # pylint: disable=protected-access
+        shutil.rmtree(self.__sample_dir, ignore_errors=True)
+        return super().tearDown()
+
+    def test_01_job_progress_and_report(self) -> None:
+        """Verify that the events of a job are streamed in order, up to its report."""
+        # Arrange
+        grading_server = GradingServer(self.__config_path, jobs=2)
+        grading_server.start()
+
+        # Act
+        try:
+            job = grading_server.submit(self.__project_path, student_id="12345")
+            events = list(grading_server.iter_events(job))
+        finally:
+            grading_server.stop()
+
+        # Assert
+        self.assertEqual(["queued", "started", "stage", "finished"], [event["event"] for event in events])
+        self.assertEqual("check:pylint", events[2]["name"])
+        self.assertEqual({"student_id": "12345", "total_score": 1.0}, events[3]["report"])
+        self.assertEqual(JOB_FINISHED, job.status)
+
+    def test_02_failed_job(self) -> None:
+        """Verify that a job failing in its worker ends with a failed event, and does not stop the server."""
+        # Arrange
+        grading_server = GradingServer(self.__config_path, jobs=1)
+        grading_server.start()
+
+        # Act
+        try:
+            failed_job = grading_server.wait(grading_server.submit(os.path.join(self.__sample_dir, "broken")))
+            job = grading_server.wait(grading_server.submit(self.__project_path))
+            health = grading_server.get_health()
+        finally:
+            grading_server.stop()
+
+        # Assert
+        self.assertEqual(JOB_FAILED, failed_job.status)
+        self.assertEqual("pylint crashed", failed_job.error)
+        self.assertEqual(JOB_FINISHED, job.status)
+        self.assertEqual({"queued": 0, "running": 0, "finished": 1, "failed": 1}, health["jobs"])
+
+    def test_03_missing_project(self) -> None:
+        """Verify that a job for a missing project is refused."""
+        # Arrange
+        grading_server = GradingServer(self.__config_path, jobs=1)
+
+        # Act & Assert
+        with self.assertRaises(InvalidProjectRootError):
+            grading_server.submit(os.path.join(self.__sample_dir, "missing"))
+
+    def test_04_http_api(self) -> None:
+        """Verify that jobs are submitted, followed and answered over HTTP, with the report of the worker."""
+        # Arrange
+        grading_server = GradingServer(self.__config_path, jobs=1)
+        grading_server.start()
+        http_server = GradingHTTPServer(("127.0.0.1", 0), grading_server)
+        threading.Thread(target=http_server.serve_forever, daemon=True).start()
+
+        def request(method: str, path: str, body: Any = None, headers: Optional[dict] = None) -> tuple[int, bytes]:
+            connection = http.client.HTTPConnection("127.0.0.1", http_server.server_port, timeout=10)
+            connection.request(method, path, body, headers or {})
+            response = connection.getresponse()
+            return response.status, response.read()
+
+        # Act
+        try:
+            status, body = request("POST", "/jobs", json.dumps({"project_path": self.__project_path}))
+            job_id = json.loads(body)["id"]
+            result = request("GET", f"/jobs/{job_id}/result")
+            events = request("GET", f"/jobs/{job_id}/events")
+            empty_archive = b"PK\x05\x06" + bytes(18)
+            upload = request("POST", "/jobs?student_id=67890", empty_archive, {"Content-Type": "application/zip"})
+            upload_result = request("GET", f"/jobs/{json.loads(upload[1])['id']}/result")
+            invalid = request("POST", "/jobs", b"[]")
+            unknown = request("GET", "/jobs/unknown")
+        finally:
+            http_server.shutdown()
+            http_server.server_close()
+            grading_server.stop()
+
+        # Assert
+        self.assertEqual(202, status)
+        self.assertEqual((200, str(grade_job(None, job_id, self.__project_path, None)[0]).encode("utf-8")), result)
+        self.assertEqual(
+            ["queued", "started", "stage", "finished"],
+            [json.loads(line)["event"] for line in events[1].decode("utf-8").splitlines()],
+        )
+        self.assertEqual(202, upload[0])
+        self.assertEqual("67890", json.loads(upload_result[1])["student_id"])
+        self.assertEqual(400, invalid[0])
+        self.assertEqual(404, unknown[0])
+
+    def test_05_configs_are_reloaded_when_changed(self) -> None:
+        """Verify that a worker loads a configuration once, and again after the file changes."""
+        # Arrange
+        with patch("grader.server.load_config", side_effect=[{"checks": []}, {"checks": [{"name": "pylint"}]}]):
+            # Act
+            first = _get_config(self.__config_path)
+            first["checks"].append("modified by the grading")
+            cached = _get_config(self.__config_path)
+            os.utime(self.__config_path, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+            reloaded = _get_config(self.__config_path)
+
+        # Assert
+        self.assertEqual({"checks": []}, cached)
+        self.assertEqual({"checks": [{"name": "pylint"}]}, reloaded)
+
+    def test_06_jobs_are_restored_from_the_queue(self) -> None:
+        """Verify that a server restarted on its job queue restores the finished jobs and resumes the others."""
+        # Arrange
+        queue_path = os.path.join(self.__sample_dir, "queue.sqlite3")
+        grading_server = GradingServer(self.__config_path, jobs=1, queue_path=queue_path)
+        grading_server.start()
+        try:
+            finished_job = grading_server.wait(grading_server.submit(self.__project_path, student_id="12345"))
+        finally:
+            grading_server.stop()
+
+        with JobQueue(queue_path) as queue:
+            queue.add("interrupted", self.__project_path, {"student_id": "67890"})
+            queue.claim(1)
+
+        # Act
+        restarted_server = GradingServer(self.__config_path, jobs=1, queue_path=queue_path)
+        restarted_server.start()
+        try:
+            restored_job = restarted_server.get_job(finished_job.id)
+            interrupted_job = restarted_server.get_job("interrupted")
+            assert interrupted_job is not None
+            resumed_job = restarted_server.wait(interrupted_job)
+        finally:
+            restarted_server.stop()
+
+        # Assert
+        assert restored_job is not None
+        self.assertEqual(JOB_FINISHED, restored_job.status)
+        self.assertEqual(0.0, json.loads(str(restored_job.report))["total_score"])
+        self.assertEqual(JOB_FINISHED, resumed_job.status)
+        self.assertEqual("67890", json.loads(str(resumed_job.report))["student_id"])
+
+    def test_07_client_paths_are_not_removed(self) -> None:
+        """Verify that only the uploaded archives are removed once graded, not a path a client marks as an upload."""
+        # Arrange
+        archive_path = os.path.join(self.__sample_dir, "project.zip")
+        with open(archive_path, "wb") as archive:
+            archive.write(b"PK\x05\x06" + bytes(18))
+        queue_path = os.path.join(self.__sample_dir, "queue.sqlite3")
+        with JobQueue(queue_path) as queue:
+            queue.add("recorded", archive_path, {"is_upload": True})
+
+        grading_server = GradingServer(self.__config_path, jobs=1, queue_path=queue_path)
+        grading_server.start()
+        http_server = GradingHTTPServer(("127.0.0.1", 0), grading_server)
+        threading.Thread(target=http_server.serve_forever, daemon=True).start()
+
+        # Act
+        try:
+            recorded_job = grading_server.get_job("recorded")
+            assert recorded_job is not None
+            grading_server.wait(recorded_job)
+
+            connection = http.client.HTTPConnection("127.0.0.1", http_server.server_port, timeout=10)
+            connection.request("POST", "/jobs", json.dumps({"project_path": archive_path, "is_upload": True}))
+            job = grading_server.get_job(json.loads(connection.getresponse().read())["id"])
+            assert job is not None
+            grading_server.wait(job)
+        finally:
+            http_server.shutdown()
+            http_server.server_close()
+            grading_server.stop()
+
+        # Assert
+        self.assertEqual(JOB_FINISHED, recorded_job.status)
+        self.assertEqual(JOB_FINISHED, job.status)
+        self.assertFalse(job.is_upload)
+        self.assertTrue(os.path.exists(archive_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,6 +7,7 @@ from unittest.mock import MagicMock, patch
 from grader.checks.abstract_check import NonScoredCheckResult
 from grader.checks.structure_check import StructureCheck
 from grader.exceptions import CheckError, ExternalResourceError
+from grader.utils.structure_validator import StructureValidator
 
 
 class TestStructureCheck(unittest.TestCase):
@@ -15,6 +16,9 @@ class TestStructureCheck(unittest.TestCase):
     def setUp(self) -> None:
         """Set up the test environment."""
         self.structure_check = StructureCheck("structure", "sample_dir", "structure.json", is_venv_required=False)
+        self.project_index = MagicMock()
+        self.project_index.entries = ["main.py", "src", "src/__init__.py", "src/app.py"]
+        self.structure_check.share_project_index(self.project_index)
         return super().setUp()
 
     @patch("grader.checks.structure_check.StructureCheck._StructureCheck__load_structure_file")
@@ -22,7 +26,7 @@ class TestStructureCheck(unittest.TestCase):
         """Verify that the run method returns True when all structure elements are valid."""
         # Arrange
         mock_element = MagicMock()
-        mock_element.is_structure_valid.return_value = True
+        mock_element.patterns = ["main.py"]
         mock_element.required = True
         mock_load_structure_file.return_value = [mock_element]
         expected = NonScoredCheckResult(self.structure_check.name, True, "Structure is valid", "")
@@ -40,7 +44,7 @@ class TestStructureCheck(unittest.TestCase):
         mock_element = MagicMock()
         expected_element_name = "foo"
         mock_element.name = expected_element_name
-        mock_element.is_structure_valid.return_value = False
+        mock_element.patterns = ["missing.py"]
         mock_element.required = True
         mock_load_structure_file.return_value = [mock_element]
 
@@ -58,7 +62,7 @@ class TestStructureCheck(unittest.TestCase):
         """Verify that the run method returns True when a non-required structure element is invalid."""
         # Arrange
         mock_element = MagicMock()
-        mock_element.is_structure_valid.return_value = False
+        mock_element.patterns = ["missing.py"]
         mock_element.required = False
         mock_load_structure_file.return_value = [mock_element]
 
@@ -88,7 +92,7 @@ class TestStructureCheck(unittest.TestCase):
         """Verify that the run method logs the validity of each structure element."""
         # Arrange
         mock_element = MagicMock()
-        mock_element.is_structure_valid.return_value = True
+        mock_element.patterns = ["main.py"]
         mock_element.required = True
         mock_element.name = "test_element"
         mock_load_structure_file.return_value = [mock_element]
@@ -116,11 +120,11 @@ class TestStructureCheck(unittest.TestCase):
         """Verify that the run method returns True when all structure elements are valid."""
         # Arrange
         mock_element1 = MagicMock()
-        mock_element1.is_structure_valid.return_value = True
+        mock_element1.patterns = ["main.py"]
         mock_element1.required = True
 
         mock_element2 = MagicMock()
-        mock_element2.is_structure_valid.return_value = True
+        mock_element2.patterns = ["main.py"]
         mock_element2.required = False
 
         mock_load_structure_file.return_value = [mock_element1, mock_element2]
@@ -137,14 +141,14 @@ class TestStructureCheck(unittest.TestCase):
         """Verify that the run method returns False when one required structure element is invalid."""
         # Arrange
         mock_element1 = MagicMock()
-        mock_element1.is_structure_valid.return_value = True
+        mock_element1.patterns = ["main.py"]
         mock_element1.required = True
 
         mock_element2 = MagicMock()
         expected_element_name = "bar"
         mock_element2.name = expected_element_name
         expected_info = f"Structure for '{expected_element_name}' is invalid."
-        mock_element2.is_structure_valid.return_value = False
+        mock_element2.patterns = ["missing.py"]
         mock_element2.required = True
 
         mock_load_structure_file.return_value = [mock_element1, mock_element2]
@@ -161,11 +165,11 @@ class TestStructureCheck(unittest.TestCase):
         """Verify that the run method returns True when only non-required structure elements are invalid."""
         # Arrange
         mock_element1 = MagicMock()
-        mock_element1.is_structure_valid.return_value = True
+        mock_element1.patterns = ["main.py"]
         mock_element1.required = True
 
         mock_element2 = MagicMock()
-        mock_element2.is_structure_valid.return_value = False
+        mock_element2.patterns = ["missing.py"]
         mock_element2.required = False
 
         mock_load_structure_file.return_value = [mock_element1, mock_element2]
@@ -184,13 +188,13 @@ class TestStructureCheck(unittest.TestCase):
         mock_element1 = MagicMock()
         expected_element1_name = "foo"
         mock_element1.name = expected_element1_name
-        mock_element1.is_structure_valid.return_value = False
+        mock_element1.patterns = ["missing.py"]
         mock_element1.required = True
 
         mock_element2 = MagicMock()
         expected_element2_name = "bar"
         mock_element2.name = expected_element2_name
-        mock_element2.is_structure_valid.return_value = False
+        mock_element2.patterns = ["missing.py"]
         mock_element2.required = False
 
         mock_load_structure_file.return_value = [mock_element1, mock_element2]
@@ -204,12 +208,9 @@ class TestStructureCheck(unittest.TestCase):
         # Assert
         self.assertEqual(result, expected)
 
-    @patch("grader.utils.structure_validator.StructureValidator.is_structure_valid")
     @patch("grader.checks.structure_check.open", create=True)
     @patch("grader.checks.structure_check.json.load")
-    def test_11_load_structure_file_valid(
-        self, mock_safe_load: MagicMock, mock_open: MagicMock, mock_structure_valid: MagicMock
-    ) -> None:
+    def test_11_load_structure_file_valid(self, mock_safe_load: MagicMock, mock_open: MagicMock) -> None:
         """Verify that run correctly processes a valid structure file."""
         # Arrange
         mock_safe_load.return_value = {
@@ -221,7 +222,6 @@ class TestStructureCheck(unittest.TestCase):
             "readme": {"name": "Readme file", "required": False, "patterns": ["README.md"]},
         }
         mock_open.return_value.__enter__.return_value = MagicMock()
-        mock_structure_valid.return_value = True
 
         # Act
         result = self.structure_check.run()
@@ -297,6 +297,27 @@ class TestStructureCheck(unittest.TestCase):
             structure_check.run()
         self.assertIn("Cannot read structure file", str(context.exception))
 
+    @patch("grader.checks.structure_check.StructureCheck._StructureCheck__load_structure_file")
+    def test_17_reports_all_invalid_required_elements(self, mock_load_structure_file: MagicMock) -> None:
+        """Verify that the run method reports every invalid required element, not only the first one."""
+        # Arrange
+        elements = [
+            StructureValidator("foo", True, ["missing.py"]),
+            StructureValidator("main", True, ["main.py"]),
+            StructureValidator("bar", True, ["src/**/missing.py"]),
+            StructureValidator("baz", False, ["missing.txt"]),
+        ]
+        mock_load_structure_file.return_value = elements
+
+        expected_info = "Structure for 'foo', 'bar' is invalid."
+        expected = NonScoredCheckResult(self.structure_check.name, False, expected_info, "")
+
+        # Act
+        result = self.structure_check.run()
+
+        # Assert
+        self.assertEqual(result, expected)
+
 
 class TestStructureCheckFromCove(unittest.TestCase):
     """Test cases for loading the structure file of the StructureCheck class from Cove."""
@@ -305,18 +326,19 @@ class TestStructureCheckFromCove(unittest.TestCase):
         """Set up the test environment."""
         self.cove_uri = "cove://example/structure"
         self.structure_check = StructureCheck("structure", "sample_dir", self.cove_uri, is_venv_required=False)
+        self.project_index = MagicMock()
+        self.project_index.entries = ["main.py", "src", "src/app.py"]
+        self.structure_check.share_project_index(self.project_index)
         return super().setUp()
 
-    @patch("grader.utils.structure_validator.StructureValidator.is_structure_valid")
     @patch("grader.checks.structure_check.fetch_json_from_cove")
-    def test_01_valid_structure_from_cove(self, mock_fetch_json: MagicMock, mock_structure_valid: MagicMock) -> None:
+    def test_01_valid_structure_from_cove(self, mock_fetch_json: MagicMock) -> None:
         """Verify that the structure file is fetched from Cove and validated."""
         # Arrange
         mock_fetch_json.return_value = {
             "source": {"name": "Source files", "required": True, "patterns": ["src/**/*.py"]},
             "main": {"name": "Main file", "required": True, "patterns": ["main.py"]},
         }
-        mock_structure_valid.return_value = True
         expected = NonScoredCheckResult(self.structure_check.name, True, "Structure is valid", "")
 
         # Act
@@ -326,16 +348,14 @@ class TestStructureCheckFromCove(unittest.TestCase):
         self.assertEqual(result, expected)
         mock_fetch_json.assert_called_once_with(self.cove_uri)
 
-    @patch("grader.utils.structure_validator.StructureValidator.is_structure_valid")
     @patch("grader.checks.structure_check.fetch_json_from_cove")
-    def test_02_invalid_structure_from_cove(self, mock_fetch_json: MagicMock, mock_structure_valid: MagicMock) -> None:
+    def test_02_invalid_structure_from_cove(self, mock_fetch_json: MagicMock) -> None:
         """Verify that an invalid required element from a Cove structure file fails the check."""
         # Arrange
         expected_element_name = "Main file"
         mock_fetch_json.return_value = {
-            "main": {"name": expected_element_name, "required": True, "patterns": ["main.py"]},
+            "main": {"name": expected_element_name, "required": True, "patterns": ["README.md"]},
         }
-        mock_structure_valid.return_value = False
         expected_info = f"Structure for '{expected_element_name}' is invalid."
         expected = NonScoredCheckResult(self.structure_check.name, False, expected_info, "")
 
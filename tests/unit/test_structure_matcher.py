@@ -0,0 +1,63 @@
+"""Unit tests for the StructureMatcher class."""
+
+import unittest
+from unittest.mock import MagicMock
+
+from grader.utils.structure_matcher import StructureMatcher
+from grader.utils.structure_validator import StructureValidator
+
+
+class TestStructureMatcher(unittest.TestCase):
+    """Test cases for the StructureMatcher class."""
+
+    def setUp(self) -> None:
+        """Set up the test environment."""
+        self.project_index = MagicMock()
+        self.project_index.entries = ["README.md", "main.py", "src", "src/__init__.py", "src/pkg/app.py"]
+        self.elements = [
+            StructureValidator("Source files", True, ["src/**/*.py"]),
+            StructureValidator("Main file", True, ["main.py", "app.py"]),
+            StructureValidator("Tests", False, ["tests/**/*.py"]),
+            StructureValidator("Readme", False, ["README.md"]),
+        ]
+        return super().setUp()
+
+    def test_01_get_invalid_elements(self) -> None:
+        """Verify that an element is invalid if any of its patterns matches nothing."""
+        # Arrange
+        matcher = StructureMatcher(self.elements)
+
+        # Act
+        invalid_elements = matcher.get_invalid_elements(self.project_index)
+
+        # Assert
+        self.assertEqual([self.elements[1], self.elements[2]], invalid_elements)
+
+    def test_02_required_only(self) -> None:
+        """Verify that only the required elements are checked if requested."""
+        # Arrange
+        matcher = StructureMatcher(self.elements)
+
+        # Act
+        invalid_elements = matcher.get_invalid_elements(self.project_index, is_required_only=True)
+
+        # Assert
+        self.assertEqual([self.elements[1]], invalid_elements)
+
+    def test_03_stops_when_all_patterns_match(self) -> None:
+        """Verify that the entries are not read further once every pattern is matched."""
+        # Arrange
+        entries = iter(["main.py", "src/app.py", "other.py"])
+        self.project_index.entries = entries
+        matcher = StructureMatcher([StructureValidator("Main file", True, ["main.py"])])
+
+        # Act
+        invalid_elements = matcher.get_invalid_elements(self.project_index)
+
+        # Assert
+        self.assertEqual([], invalid_elements)
+        self.assertEqual("src/app.py", next(entries))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -146,3 +146,19 @@ class TestStructureValidator(unittest.TestCase):
         # Act
         with self.assertRaises(FileNotFoundError):
             self.validator.get_matching_files("invalid_path")
+
+    @patch("pathlib.Path.glob")
+    def test_10_is_structure_valid_with_project_index(self, mocked_glob: MagicMock) -> None:
+        """Test that is_structure_valid matches the patterns against the project index, not the file system."""
+        # Arrange
+        project_index = MagicMock()
+        project_index.glob.side_effect = [["main.py"], []]
+
+        # Act
+        result = self.validator.is_structure_valid(self.project_root, project_index)
+
+        # Assert
+        self.assertFalse(result)
+        project_index.glob.assert_any_call("*.py")
+        project_index.glob.assert_any_call("tests/*.py")
+        mocked_glob.assert_not_called()
@@ -1,11 +1,13 @@
 """Unit tests for the TestsCheck class."""
 
+import os
+import shutil
 import unittest
 from unittest.mock import MagicMock, patch
 
 from grader.checks.abstract_check import ScoredCheckResult
 from grader.checks.run_tests_check import RunTestsCheck
-from grader.exceptions import CheckError
+from grader.exceptions import CheckError, CheckTimeoutError, ProcessLimitError, ProcessTimeoutError
 from grader.utils.logger import VERBOSE
 
 
@@ -137,12 +139,22 @@ class TestTestsCheck(unittest.TestCase):
             self.test_score_mapping,
         )
 
+        self.__reports_dir = "sample_tests_check_reports"
+        os.makedirs(self.__reports_dir, exist_ok=True)
+
+    def tearDown(self) -> None:
+        """Tear down the test environment."""
+        shutil.rmtree(self.__reports_dir, ignore_errors=True)
+        return super().tearDown()
+
     @patch("grader.checks.run_tests_check.RunTestsCheck._RunTestsCheck__pytest_run")
     def test_01_all_tests_pass(self, mock_pytest_run: MagicMock) -> None:
         """Verify run calculates the correct score when all tests pass."""
         # Arrange
         expected_info = "Test test_1::test_1 passed.\nTest test_2::test_2 passed."
-        mock_pytest_run.return_value = "PASSED ::test_1::test_1\nPASSED ::test_2::test_2"
+        mock_pytest_run.return_value = self.__write_report(
+            [("test_1", "test_1", "passed"), ("test_2", "test_2", "passed")]
+        )
         expected_score = ScoredCheckResult(self.name, 50.0, expected_info, "", self.max_points)
 
         # Act
@@ -156,7 +168,9 @@ class TestTestsCheck(unittest.TestCase):
         """Verify run calculates the correct score when some tests fail."""
         # Arrange
         expected_info = "Test test_1::test_1 passed.\nTest test_2::test_2 failed."
-        mock_pytest_run.return_value = "PASSED ::test_1::test_1\nFAILED ::test_2::test_2"
+        mock_pytest_run.return_value = self.__write_report(
+            [("test_1", "test_1", "passed"), ("test_2", "test_2", "failed")]
+        )
         expected_score = ScoredCheckResult(self.name, 20.0, expected_info, "", self.max_points)
 
         # Act
@@ -181,7 +195,9 @@ class TestTestsCheck(unittest.TestCase):
             test_score_mapping,
         )
 
-        mock_pytest_run.return_value = "PASSED ::test_1::test_1\nPASSED ::test_2::test_2\nPASSED ::test_3::test_3"
+        mock_pytest_run.return_value = self.__write_report(
+            [("test_1", "test_1", "passed"), ("test_2", "test_2", "passed"), ("test_3", "test_3", "passed")]
+        )
 
         # Act & Assert
         with self.assertRaises(CheckError):
@@ -191,7 +207,9 @@ class TestTestsCheck(unittest.TestCase):
     def test_04_logs_correct_passed_and_failed_counts(self, mock_pytest_run: MagicMock) -> None:
         """Verify run logs the correct number of passed and failed tests."""
         # Arrange
-        mock_pytest_run.return_value = "PASSED ::test_1::test_1\nFAILED ::test_2::test_2"
+        mock_pytest_run.return_value = self.__write_report(
+            [("test_1", "test_1", "passed"), ("test_2", "test_2", "failed")]
+        )
 
         # Act
         with self.assertLogs("grader", level=VERBOSE) as log:
@@ -205,7 +223,7 @@ class TestTestsCheck(unittest.TestCase):
     def test_05_empty_test_results(self, mock_pytest_run: MagicMock) -> None:
         """Verify run handles empty test results gracefully."""
         # Arrange
-        mock_pytest_run.return_value = ""
+        mock_pytest_run.return_value = self.__write_report([])
         expected_score = ScoredCheckResult(self.name, 0.0, "", "", self.max_points)
 
         # Act
@@ -215,17 +233,17 @@ class TestTestsCheck(unittest.TestCase):
         self.assertEqual(score, expected_score)
 
     @patch("grader.checks.run_tests_check.RunTestsCheck._RunTestsCheck__pytest_run")
-    def test_06_invalid_pytest_output(self, mock_pytest_run: MagicMock) -> None:
-        """Verify run handles invalid pytest output gracefully."""
+    def test_06_invalid_pytest_report(self, mock_pytest_run: MagicMock) -> None:
+        """Verify run raises CheckError when the pytest report is not valid XML."""
         # Arrange
-        mock_pytest_run.return_value = "INVALID OUTPUT"
-        expected_score = ScoredCheckResult(self.name, 0.0, "", "", self.max_points)
+        report_path = os.path.join(self.__reports_dir, "invalid.xml")
+        with open(report_path, "w", encoding="utf-8") as report:
+            report.write("INVALID OUTPUT")
+        mock_pytest_run.return_value = report_path
 
-        # Act
-        score = self.tests_check.run()
-
-        # Assert
-        self.assertEqual(score, expected_score)
+        # Act & Assert
+        with self.assertRaises(CheckError):
+            self.tests_check.run()
 
     @patch("grader.utils.process.run")
     def test_07_pytest_raises_os_error(self, mock_run: MagicMock) -> None:
@@ -261,7 +279,9 @@ class TestTestsCheck(unittest.TestCase):
     def test_10_class_scored(self, mock_pytest_run: MagicMock) -> None:
         """Verify run calculates the correct score when there is class-based scoring."""
         # Arrange
-        mock_pytest_run.return_value = "PASSED ::ClassB::test_1\nPASSED ::ClassB::test_2\nPASSED ::ClassA::test_3"
+        mock_pytest_run.return_value = self.__write_report(
+            [("ClassB", "test_1", "passed"), ("ClassB", "test_2", "passed"), ("ClassA", "test_3", "passed")]
+        )
         expected_info = "Test ClassB::test_1 passed.\nTest ClassB::test_2 passed.\nTest ClassA::test_3 passed."
 
         expected_score = ScoredCheckResult(self.name, 65.0, expected_info, "", self.max_points)
@@ -276,7 +296,9 @@ class TestTestsCheck(unittest.TestCase):
     def test_11_test_scored_both_name_and_class(self, mock_pytest_run: MagicMock) -> None:
         """Verify run calculates the correct score when there is name and class-based scoring."""
         # Arrange
-        mock_pytest_run.return_value = "PASSED ::ClassB::test_1\nPASSED ::ClassB::test_2\nPASSED ::ClassA::test_3"
+        mock_pytest_run.return_value = self.__write_report(
+            [("ClassB", "test_1", "passed"), ("ClassB", "test_2", "passed"), ("ClassA", "test_3", "passed")]
+        )
         expected_info = "Test ClassB::test_1 passed.\nTest ClassB::test_2 passed.\nTest ClassA::test_3 passed."
 
         expected_score = ScoredCheckResult(self.name, 100.0, expected_info, "", self.max_points)
@@ -300,7 +322,9 @@ class TestTestsCheck(unittest.TestCase):
     def test_12_test_default_scored(self, mock_pytest_run: MagicMock) -> None:
         """Verify run calculates the correct score when there is name and class-based scoring."""
         # Arrange
-        mock_pytest_run.return_value = "PASSED ::ClassB::test_1\nPASSED ::ClassB::test_2\nPASSED ::ClassA::test_3"
+        mock_pytest_run.return_value = self.__write_report(
+            [("ClassB", "test_1", "passed"), ("ClassB", "test_2", "passed"), ("ClassA", "test_3", "passed")]
+        )
         expected_info = "Test ClassB::test_1 passed.\nTest ClassB::test_2 passed.\nTest ClassA::test_3 passed."
         expected_score = ScoredCheckResult(self.name, 60.0, expected_info, "", self.max_points)
 
@@ -318,3 +342,142 @@ class TestTestsCheck(unittest.TestCase):
 
         # Assert
         self.assertEqual(score, expected_score)
+
+    @patch("grader.checks.run_tests_check.RunTestsCheck._RunTestsCheck__pytest_run")
+    def test_13_parametrized_errors_and_skips(self, mock_pytest_run: MagicMock) -> None:
+        """Verify parametrized tests are scored by their base name, errors fail and skipped tests are not counted."""
+        # Arrange
+        mock_pytest_run.return_value = self.__write_report(
+            [
+                ("ClassB", "test_1[1-2]", "passed"),
+                ("ClassB", "test_1[3-4]", "failed"),
+                ("ClassB", "test_2", "error"),
+                ("ClassB", "test_3", "skipped"),
+            ]
+        )
+        expected_info = (
+            "Test ClassB::test_1[1-2] passed.\nTest ClassB::test_1[3-4] failed.\nTest ClassB::test_2 failed."
+        )
+        expected_score = ScoredCheckResult(self.name, 20.0, expected_info, "", self.max_points)
+
+        # Act
+        score = self.tests_check.run()
+
+        # Assert
+        self.assertEqual(score, expected_score)
+
+    @patch("grader.utils.process.run")
+    def test_14_missing_pytest_report(self, mock_run: MagicMock) -> None:
+        """Verify run raises CheckError when pytest does not write a report."""
+        # Arrange
+        mock_run.return_value.returncode = 0
+
+        # Act & Assert
+        with self.assertRaises(CheckError):
+            self.tests_check.run()
+
+    @patch("grader.utils.process.run")
+    def test_15_pytest_timeout(self, mock_run: MagicMock) -> None:
+        """Verify run raises CheckTimeoutError when pytest exceeds its time limits."""
+        # Arrange
+        mock_run.side_effect = ProcessTimeoutError("pytest did not finish within 900 seconds")
+
+        # Act & Assert
+        with self.assertRaises(CheckTimeoutError):
+            self.tests_check.run()
+
+    @patch("grader.utils.process.run")
+    def test_16_pytest_resource_limits(self, mock_run: MagicMock) -> None:
+        """Verify run raises CheckError, and not CheckTimeoutError, when pytest exceeds its memory limit."""
+        # Arrange
+        mock_run.side_effect = ProcessLimitError("pytest was killed for using more than 1073741824 bytes of memory")
+
+        # Act
+        with self.assertRaises(CheckError) as context:
+            self.tests_check.run()
+
+        # Assert
+        self.assertNotIsInstance(context.exception, CheckTimeoutError)
+        self.assertIn("memory", str(context.exception))
+
+    @patch("grader.checks.run_tests_check.RunTestsCheck._RunTestsCheck__pytest_run")
+    def test_17_plain_test_functions_belong_to_their_file(self, mock_pytest_run: MagicMock) -> None:
+        """Verify that plain test functions are identified, and scored, by the path to their test file."""
+        # Arrange
+        tests_check = RunTestsCheck(
+            self.name,
+            self.project_root,
+            self.max_points,
+            self.is_venv_required,
+            self.tests_path,
+            self.default_test_score,
+            {"tests/test_module.py": 20.0},
+        )
+        mock_pytest_run.return_value = self.__write_report(
+            [("", "test_1", "passed"), ("TestClass", "test_2", "passed")]
+        )
+        expected_info = "Test tests/test_module.py::test_1 passed.\nTest TestClass::test_2 passed."
+
+        # Act
+        score = tests_check.run()
+
+        # Assert
+        self.assertEqual(ScoredCheckResult(self.name, 30.0, expected_info, "", self.max_points), score)
+
+    def test_18_referenced_files(self) -> None:
+        """Verify that local test files are resolved from the project root, and remote ones are not fingerprinted."""
+        # Arrange
+        local_check = RunTestsCheck(self.name, self.project_root, self.max_points, False, ["tests/test_sample.py"])
+        remote_check = RunTestsCheck(
+            self.name, self.project_root, self.max_points, False, ["https://example.com/test_sample.py"]
+        )
+
+        # Act & Assert
+        self.assertEqual([os.path.join(self.project_root, "tests/test_sample.py")], local_check.referenced_files)
+        self.assertIsNone(remote_check.referenced_files)
+
+    @patch("grader.checks.run_tests_check.RunTestsCheck._RunTestsCheck__pytest_run")
+    def test_19_report_is_removed(self, mock_pytest_run: MagicMock) -> None:
+        """Verify that the pytest report is removed once it is read, whether it is valid or not."""
+        # Arrange
+        report_path = self.__write_report([("test_1", "test_1", "passed")])
+        invalid_report_path = os.path.join(self.__reports_dir, "invalid.xml")
+        with open(invalid_report_path, "w", encoding="utf-8") as report:
+            report.write("INVALID OUTPUT")
+        mock_pytest_run.side_effect = [report_path, invalid_report_path]
+
+        # Act
+        self.tests_check.run()
+        with self.assertRaises(CheckError):
+            self.tests_check.run()
+
+        # Assert
+        self.assertFalse(os.path.exists(report_path))
+        self.assertFalse(os.path.exists(invalid_report_path))
+
+    def __write_report(self, test_cases: list[tuple[str, str, str]]) -> str:
+        """
+        Write a JUnit XML report, as written by pytest.
+
+        :param test_cases: The class name (empty for plain test functions), test name and outcome (passed, failed,
+            error, skipped) of each test.
+        :return: The path to the report.
+        """
+        report_path = os.path.join(self.__reports_dir, "junit.xml")
+
+        with open(report_path, "w", encoding="utf-8") as report:
+            report.write('<?xml version="1.0" encoding="utf-8"?><testsuites><testsuite name="pytest">')
+
+            for class_name, test_name, outcome in test_cases:
+                classname = f"tests.test_module.{class_name}" if class_name else "tests.test_module"
+                report.write(
+                    f'<testcase classname="{classname}" name="{test_name}" file="tests/test_module.py" time="0.01">'
+                )
+                if outcome != "passed":
+                    tag = "failure" if outcome == "failed" else outcome
+                    report.write(f'<{tag} message="{outcome}" />')
+                report.write("</testcase>")
+
+            report.write("</testsuite></testsuites>")
+
+        return report_path
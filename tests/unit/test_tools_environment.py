@@ -0,0 +1,102 @@
+"""Unit tests for the ToolsEnvironment class."""
+
+import os
+import shutil
+import unittest
+from subprocess import CompletedProcess
+from unittest.mock import MagicMock, patch
+
+import grader.utils.constants as const
+from grader.exceptions import VirtualEnvironmentError
+from grader.utils.tools_environment import TOOLS_PTH_FILENAME, ToolsEnvironment
+from grader.utils.venv_cache import VenvCache, read_requirements
+
+
+@patch("grader.utils.tools_environment.get_python_version", MagicMock(return_value="Python 3.12.3"))
+class TestToolsEnvironment(unittest.TestCase):
+    """Test cases for the ToolsEnvironment class."""
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        """
+        Initialize the test case.
+
+        :param methodName: The name of the test method to run.
+        :type methodName: str
+        """
+        self.__sample_dir = os.path.abspath("sample_tools_environment")
+        self.__tools_dir = os.path.join(self.__sample_dir, "tools")
+        self.__built_tools_venv = os.path.join(self.__sample_dir, "built")
+        self.__project_venv = os.path.join(self.__sample_dir, "project", const.VENV_NAME)
+        self.__scripts_dir = os.path.dirname(const.PIP_PATH)
+        self.__site_packages = os.path.join("lib", "python3.12", "site-packages")
+        super().__init__(methodName)
+
+    def setUp(self) -> None:
+        """Build a fake tools environment and an empty project environment."""
+        os.makedirs(os.path.join(self.__built_tools_venv, self.__site_packages, "pylint"))
+        os.makedirs(os.path.join(self.__built_tools_venv, self.__scripts_dir))
+        os.makedirs(os.path.join(self.__project_venv, self.__site_packages))
+        os.makedirs(os.path.join(self.__project_venv, self.__scripts_dir))
+
+        with open(os.path.join(self.__built_tools_venv, self.__scripts_dir, "pylint"), "w", encoding="utf-8") as script:
+            script.write(f"#!{os.path.join(self.__built_tools_venv, 'bin', 'python')}\n")
+
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        """Tear down the test environment."""
+        shutil.rmtree(self.__sample_dir, ignore_errors=True)
+        return super().tearDown()
+
+    @patch("grader.utils.tools_environment.run")
+    def test_01_existing_environment_is_not_rebuilt(self, mocked_run: MagicMock) -> None:
+        """Verify that an already built tools environment is reused."""
+        # Arrange
+        self.__store_tools_environment()
+
+        # Act
+        ToolsEnvironment(self.__tools_dir).setup()
+
+        # Assert
+        mocked_run.assert_not_called()
+
+    @patch("grader.utils.tools_environment.run")
+    def test_02_attach(self, mocked_run: MagicMock) -> None:
+        """Verify that attaching adds the tools site-packages to the project environment and copies the scripts."""
+        # Arrange
+        self.__store_tools_environment()
+        tools_environment = ToolsEnvironment(self.__tools_dir)
+
+        # Act
+        tools_environment.attach(self.__project_venv)
+
+        with open(os.path.join(self.__project_venv, self.__site_packages, TOOLS_PTH_FILENAME), encoding="utf-8") as pth:
+            pth_content = pth.read()
+
+        with open(os.path.join(self.__project_venv, self.__scripts_dir, "pylint"), encoding="utf-8") as script:
+            script_content = script.read()
+
+        # Assert
+        mocked_run.assert_not_called()
+        self.assertTrue(pth_content.strip().startswith(self.__tools_dir))
+        self.assertTrue(pth_content.strip().endswith("site-packages"))
+        self.assertIn(self.__project_venv, script_content)
+
+    @patch("grader.utils.tools_environment.run")
+    def test_03_failed_build(self, mocked_run: MagicMock) -> None:
+        """Verify that a failure while building the tools environment raises VirtualEnvironmentError."""
+        # Arrange
+        mocked_run.return_value = CompletedProcess([], 1)
+
+        # Act & Assert
+        with self.assertRaises(VirtualEnvironmentError):
+            ToolsEnvironment(self.__tools_dir).setup()
+
+    def __store_tools_environment(self) -> None:
+        """Store the fake tools environment under the key of the current grader requirements."""
+        key = VenvCache.compute_key([], read_requirements(const.GRADER_REQUIREMENTS) or [], "Python 3.12.3")
+        VenvCache(self.__tools_dir).store(key, self.__built_tools_venv)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""Unit tests for the trace export module."""
+
+import json
+import os
+import shutil
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from grader.exceptions import TraceExportError
+from grader.utils.instrumentation import StageMetrics
+from grader.utils.trace_export import export_otlp, to_chrome_trace, to_otlp_spans, write_chrome_trace
+
+
+class TestTraceExport(unittest.TestCase):
+    """Test cases for the Chrome trace and OTLP exports."""
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        """
+        Initialize the test case.
+
+        :param methodName: The name of the test method to run.
+        :type methodName: str
+        """
+        self.__sample_dir = os.path.abspath("sample_trace")
+        self.__check = StageMetrics("check:tests", 2.0, start_time=101.0, thread_id=7, process_id=1)
+        self.__process = StageMetrics(
+            "process:python", 1.5, subprocesses=1, start_time=101.25, thread_id=7, process_id=1
+        )
+        self.__setup = StageMetrics("venv:setup", 0.5, start_time=100.0, thread_id=8, process_id=1)
+        super().__init__(methodName)
+
+    def tearDown(self) -> None:
+        """Tear down the test environment."""
+        shutil.rmtree(self.__sample_dir, ignore_errors=True)
+        return super().tearDown()
+
+    def test_01_chrome_trace(self) -> None:
+        """Verify that each submission is a process of the trace, with an event for each stage."""
+        # Act
+        trace = to_chrome_trace({"student_a": [self.__process, self.__check], "student_b": [self.__setup]})
+
+        # Assert
+        metadata, process, check, _, setup = trace["traceEvents"]
+        self.assertEqual({"name": "process_name", "ph": "M", "pid": 1, "args": {"name": "student_a"}}, metadata)
+        self.assertEqual(
+            ("process", 1_250_000, 1_500_000, 1, 7), tuple(process[key] for key in ("cat", "ts", "dur", "pid", "tid"))
+        )
+        self.assertEqual(("check", 1_000_000), (check["cat"], check["ts"]))
+        self.assertEqual((0, 2), (setup["ts"], setup["pid"]))
+        self.assertEqual(1, process["args"]["subprocesses"])
+
+    def test_02_write_chrome_trace(self) -> None:
+        """Verify that the trace file is written, and that a failure to write it raises a TraceExportError."""
+        # Arrange
+        trace_path = os.path.join(self.__sample_dir, "traces", "run.json")
+
+        # Act
+        write_chrome_trace({"student_a": [self.__check]}, trace_path)
+
+        # Assert
+        with open(trace_path, encoding="utf-8") as trace_file:
+            self.assertEqual(2, len(json.load(trace_file)["traceEvents"]))
+        with self.assertRaises(TraceExportError):
+            write_chrome_trace({}, self.__sample_dir)
+
+    def test_03_otlp_spans_are_nested(self) -> None:
+        """Verify that a stage is the child of the stage of the same thread it ran in."""
+        # Act
+        request = to_otlp_spans({"student_a": [self.__process, self.__check, self.__setup]})
+
+        # Assert
+        (resource_spans,) = request["resourceSpans"]
+        process, check, setup = resource_spans["scopeSpans"][0]["spans"]
+        self.assertEqual(check["spanId"], process["parentSpanId"])
+        self.assertEqual("", check["parentSpanId"])
+        self.assertEqual("", setup["parentSpanId"])
+        self.assertEqual(process["traceId"], setup["traceId"])
+        self.assertEqual(str(101_250_000_000), process["startTimeUnixNano"])
+        self.assertIn({"key": "subprocesses", "value": {"intValue": "1"}}, process["attributes"])
+
+    @patch("grader.utils.trace_export.requests.post")
+    def test_04_export_otlp(self, mock_post: MagicMock) -> None:
+        """Verify that the spans are posted to the collector, and that a failed export raises a TraceExportError."""
+        # Arrange
+        endpoint = "http://localhost:4318/v1/traces"
+
+        # Act
+        export_otlp({"student_a": [self.__check]}, endpoint)
+
+        # Assert
+        mock_post.assert_called_once()
+        self.assertEqual(endpoint, mock_post.call_args.args[0])
+        self.assertIn("resourceSpans", mock_post.call_args.kwargs["json"])
+
+        mock_post.side_effect = requests.ConnectionError("refused")
+        with self.assertRaises(TraceExportError):
+            export_otlp({"student_a": [self.__check]}, endpoint)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+"""Unit tests for the AST-based type hints counter."""
+
+import os
+import shutil
+import sys
+import unittest
+
+from grader.utils.type_hints import count_all_annotated_functions, count_annotated_functions
+
+
+class TestTypeHints(unittest.TestCase):
+    """Test cases for the AST-based type hints counter."""
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        """
+        Initialize the test case.
+
+        :param methodName: The name of the test method to run.
+        :type methodName: str
+        """
+        self.__project_root = os.path.abspath("sample_type_hints_sources")
+        super().__init__(methodName)
+
+    def setUp(self) -> None:
+        """Set up the test environment."""
+        os.makedirs(self.__project_root, exist_ok=True)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        """Tear down the test environment."""
+        shutil.rmtree(self.__project_root, ignore_errors=True)
+        return super().tearDown()
+
+    def __write_file(self, name: str, content: str) -> str:
+        """
+        Write a python file in the sample project.
+
+        :param name: The name of the file.
+        :param content: The contents of the file.
+        :return: The path to the file.
+        """
+        path = os.path.join(self.__project_root, name)
+        with open(path, "w", encoding="utf-8") as python_file:
+            python_file.write(content)
+        return path
+
+    def test_01_functions_and_methods(self) -> None:
+        """Verify that functions and methods are counted, nested functions and lambdas are not."""
+        # Arrange
+        path = self.__write_file(
+            "main.py",
+            "def add(a: int, b: int) -> int:\n"
+            "    def inner(x):\n"
+            "        return x\n"
+            "    return inner(a) + b\n\n"
+            "def sub(a, b):  # type: (int, int) -> int\n"
+            "    return a - b\n\n"
+            "async def fetch(url):\n"
+            "    return lambda x: x\n\n"
+            "class Calculator:\n"
+            "    def __init__(self):\n"
+            "        pass\n\n"
+            "    def multiply(self, *args: int):\n"
+            "        pass\n",
+        )
+
+        # Act
+        counts = count_annotated_functions(path)
+
+        # Assert
+        # add, sub (type comment) and multiply have type hints, fetch and __init__ do not
+        self.assertEqual((3, 5), counts)
+
+    def test_02_dataclass_methods(self) -> None:
+        """Verify that the methods mypy generates for dataclasses are counted as functions with type hints."""
+        # Arrange
+        path = self.__write_file(
+            "models.py",
+            "import dataclasses\n"
+            "from dataclasses import dataclass\n\n"
+            "@dataclass\n"
+            "class Point:\n"
+            "    x: int\n\n"
+            "@dataclass\n"
+            "class Point3D(Point):\n"
+            "    pass\n\n"
+            "@dataclasses.dataclass(order=True)\n"
+            "class Version:\n"
+            "    major: int\n\n"
+            "    def __post_init__(self):\n"
+            "        pass\n",
+        )
+        replace_method = 1 if sys.version_info >= (3, 13) else 0
+
+        # Act
+        counts = count_annotated_functions(path)
+
+        # Assert
+        # Point and Point3D - __init__ and the internal replace method
+        # Version - also 4 comparison methods and the internal __post_init__ method, its own __post_init__ has no hints
+        expected_generated = 2 * (2 + replace_method) + (7 + replace_method)
+        self.assertEqual((expected_generated, expected_generated + 1), counts)
+
+    def test_03_syntax_error(self) -> None:
+        """Verify that, like mypy, nothing is counted if any of the files cannot be parsed."""
+        # Arrange
+        valid_path = self.__write_file("valid.py", "def add(a: int, b: int) -> int:\n    return a + b\n")
+        invalid_path = self.__write_file("invalid.py", "def add(a, b:\n")
+
+        # Act & Assert
+        self.assertEqual((1, 1), count_all_annotated_functions([valid_path]))
+        self.assertEqual((0, 0), count_all_annotated_functions([valid_path, invalid_path]))
+
+    def test_04_parallel(self) -> None:
+        """Verify that parsing the files in processes gives the same counts."""
+        # Arrange
+        source = "def typed(a: int) -> int:\n    return a\n\ndef untyped(a):\n    pass\n"
+        paths = [self.__write_file(f"module_{index}.py", source) for index in range(4)]
+
+        # Act & Assert
+        self.assertEqual((4, 8), count_all_annotated_functions(paths))
+        self.assertEqual((4, 8), count_all_annotated_functions(paths, jobs=2))
+
+
+if __name__ == "__main__":
+    unittest.main()
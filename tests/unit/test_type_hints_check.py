@@ -9,7 +9,7 @@ from unittest.mock import MagicMock, patch
 import grader.utils.constants as const
 from grader.checks.abstract_check import ScoredCheckResult
 from grader.checks.type_hints_check import TypeHintsCheck
-from grader.exceptions import CheckError
+from grader.exceptions import CheckError, InvalidConfigError
 
 
 class TestTypeHintsCheck(unittest.TestCase):
@@ -262,3 +262,66 @@ class TestTypeHintsCheck(unittest.TestCase):
 
         # Assert
         self.assertEqual(expected_score, actual_score)
+
+    @patch("grader.utils.process.run")
+    def test_13_cached_files_are_not_checked_again(self, mocked_run: MagicMock) -> None:
+        """Test that with a cache, a second run does not check unchanged files and gives the same result."""
+        # Arrange
+        project_root = os.path.abspath("sample_type_hints_project")
+        cache_dir = os.path.abspath("sample_type_hints_project_cache")
+        report_path = os.path.join(project_root, "linecount.txt")
+        os.makedirs(project_root, exist_ok=True)
+        with open(os.path.join(project_root, "main.py"), "w", encoding="utf-8") as main_file:
+            main_file.write("def add(a: int, b: int) -> int:\n    return a + b\n\n\ndef sub(a, b):\n    return a - b\n")
+
+        def mocked_run_side_effect(command: list[str], **_: dict) -> CompletedProcess:
+            if "--version" in command:
+                return CompletedProcess(command, 0, "mypy 1.13.0 (compiled: yes)")
+            with open(report_path, "w", encoding="utf-8") as report_file:
+                report_file.write("      3       6      1      2 total\n      3       6      1      2 main\n")
+            return CompletedProcess(command, 1)
+
+        mocked_run.side_effect = mocked_run_side_effect
+
+        # Act
+        with patch.object(const, "MYPY_LINE_COUNT_REPORT", report_path):
+            first_check = TypeHintsCheck("type_hints", project_root, 2, is_venv_required=False, cache_dir=cache_dir)
+            first_result = first_check.run()
+            mypy_calls_after_first_run = mocked_run.call_count
+            second_check = TypeHintsCheck("type_hints", project_root, 2, is_venv_required=False, cache_dir=cache_dir)
+            second_result = second_check.run()
+
+        shutil.rmtree(project_root, ignore_errors=True)
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+        # Assert
+        expected_result = ScoredCheckResult("type_hints", 1, "50.00% of the functions have type hints", "", 2)
+        self.assertEqual(expected_result, first_result)
+        self.assertEqual(first_result, second_result)
+        self.assertEqual(2, mypy_calls_after_first_run)
+        self.assertEqual(3, mocked_run.call_count)
+
+    @patch("grader.utils.process.run")
+    def test_14_ast_engine(self, mocked_run: MagicMock) -> None:
+        """Test that the ast engine counts the functions with type hints without running mypy."""
+        # Arrange
+        project_root = os.path.abspath("sample_type_hints_ast_project")
+        os.makedirs(project_root, exist_ok=True)
+        with open(os.path.join(project_root, "main.py"), "w", encoding="utf-8") as main_file:
+            main_file.write("def add(a: int, b: int) -> int:\n    return a + b\n\n\ndef sub(a, b):\n    return a - b\n")
+        type_hints_check = TypeHintsCheck("type_hints", project_root, 2, is_venv_required=False, engine="ast")
+
+        # Act
+        result = type_hints_check.run()
+        shutil.rmtree(project_root, ignore_errors=True)
+
+        # Assert
+        mocked_run.assert_not_called()
+        self.assertIsNone(type_hints_check.exclusive_resource)
+        self.assertEqual(ScoredCheckResult("type_hints", 1, "50.00% of the functions have type hints", "", 2), result)
+
+    def test_15_unknown_engine(self) -> None:
+        """Test that an unknown engine is a configuration error."""
+        # Act & Assert
+        with self.assertRaises(InvalidConfigError):
+            TypeHintsCheck("type_hints", "sample_dir", 2, is_venv_required=False, engine="pyright")
@@ -0,0 +1,194 @@
+"""Unit tests for the virtual environment cache."""
+
+import os
+import shutil
+import unittest
+
+import grader.utils.constants as const
+from grader.utils.venv_cache import VenvCache, read_pyproject_dependencies, read_requirements
+
+
+class TestReadRequirements(unittest.TestCase):
+    """Test cases for the read_requirements and read_pyproject_dependencies functions."""
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        """
+        Initialize the test case.
+
+        :param methodName: The name of the test method to run.
+        :type methodName: str
+        """
+        self.__sample_dir = "sample_venv_cache_requirements"
+        super().__init__(methodName)
+
+    def setUp(self) -> None:
+        """Set up the test environment."""
+        os.makedirs(self.__sample_dir, exist_ok=True)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        """Tear down the test environment."""
+        shutil.rmtree(self.__sample_dir, ignore_errors=True)
+        return super().tearDown()
+
+    def test_01_requirements_are_normalized(self) -> None:
+        """Verify that comments, empty lines, duplicates and casing do not affect the requirements."""
+        # Arrange
+        first = self.__write("first.txt", "# comment\nRequests==2.32.5\n\nnumpy  # math\n")
+        second = self.__write("second.txt", "numpy\nrequests==2.32.5\nnumpy\n")
+
+        # Act
+        first_requirements = read_requirements(first)
+        second_requirements = read_requirements(second)
+
+        # Assert
+        self.assertEqual(["numpy", "requests==2.32.5"], first_requirements)
+        self.assertEqual(first_requirements, second_requirements)
+
+    def test_02_requirements_including_other_files_are_not_cacheable(self) -> None:
+        """Verify that requirements pointing to other files or local paths cannot be cached."""
+        # Arrange
+        requirements = [
+            self.__write("included.txt", "-r other.txt\n"),
+            self.__write("editable.txt", "-e .\n"),
+            self.__write("local.txt", "./libs/package\n"),
+        ]
+
+        # Act & Assert
+        for requirements_path in requirements:
+            self.assertIsNone(read_requirements(requirements_path))
+
+    def test_03_missing_requirements_are_not_cacheable(self) -> None:
+        """Verify that a missing requirements file cannot be cached."""
+        # Act & Assert
+        self.assertIsNone(read_requirements(os.path.join(self.__sample_dir, "missing.txt")))
+
+    def test_04_pyproject_dependencies(self) -> None:
+        """Verify that the dependencies are read from pyproject.toml."""
+        # Arrange
+        pyproject = self.__write("pyproject.toml", '[project]\nname = "sample"\ndependencies = ["Requests", "attrs"]\n')
+
+        # Act
+        dependencies = read_pyproject_dependencies(pyproject)
+
+        # Assert
+        self.assertEqual(["attrs", "requests"], dependencies)
+
+    def test_05_pyproject_dynamic_dependencies_are_not_cacheable(self) -> None:
+        """Verify that dynamic dependencies cannot be cached."""
+        # Arrange
+        pyproject = self.__write("pyproject.toml", '[project]\nname = "sample"\ndynamic = ["dependencies"]\n')
+
+        # Act & Assert
+        self.assertIsNone(read_pyproject_dependencies(pyproject))
+
+    def __write(self, filename: str, content: str) -> str:
+        """
+        Write a file in the sample directory.
+
+        :param filename: The name of the file.
+        :param content: The content of the file.
+        :return: The path to the file.
+        """
+        path = os.path.join(self.__sample_dir, filename)
+        with open(path, "w", encoding="utf-8") as file_handler:
+            file_handler.write(content)
+        return path
+
+
+class TestVenvCache(unittest.TestCase):
+    """Test cases for the VenvCache class."""
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        """
+        Initialize the test case.
+
+        :param methodName: The name of the test method to run.
+        :type methodName: str
+        """
+        self.__sample_dir = os.path.abspath("sample_venv_cache")
+        self.__cache_dir = os.path.join(self.__sample_dir, "cache")
+        self.__original_venv = os.path.join(self.__sample_dir, "original", const.VENV_NAME)
+        self.__new_venv = os.path.join(self.__sample_dir, "new", const.VENV_NAME)
+        self.__scripts_dir = os.path.dirname(const.PIP_PATH)
+        self.__package_file = os.path.join("lib", "site-packages", "package", "__init__.py")
+        super().__init__(methodName)
+
+    def setUp(self) -> None:
+        """Build a fake virtual environment to be cached, and an empty one to restore into."""
+        os.makedirs(os.path.join(self.__original_venv, os.path.dirname(self.__package_file)))
+        os.makedirs(os.path.join(self.__original_venv, self.__scripts_dir))
+        os.makedirs(os.path.join(self.__new_venv, self.__scripts_dir))
+
+        with open(os.path.join(self.__original_venv, self.__package_file), "w", encoding="utf-8") as package:
+            package.write("VALUE = 1\n")
+
+        with open(os.path.join(self.__original_venv, self.__scripts_dir, "tool"), "w", encoding="utf-8") as script:
+            script.write(f"#!{os.path.join(self.__original_venv, 'bin', 'python')}\nprint('tool')\n")
+
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        """Tear down the test environment."""
+        shutil.rmtree(self.__sample_dir, ignore_errors=True)
+        return super().tearDown()
+
+    def test_01_key_depends_on_all_inputs(self) -> None:
+        """Verify that the key is stable and changes with the dependencies, the grader and the python version."""
+        # Arrange
+        key = VenvCache.compute_key(["requests"], ["pylint"], "Python 3.12.3")
+
+        # Act & Assert
+        self.assertEqual(key, VenvCache.compute_key(["requests"], ["pylint"], "Python 3.12.3"))
+        self.assertNotEqual(key, VenvCache.compute_key(["numpy"], ["pylint"], "Python 3.12.3"))
+        self.assertNotEqual(key, VenvCache.compute_key(["requests"], ["mypy"], "Python 3.12.3"))
+        self.assertNotEqual(key, VenvCache.compute_key(["requests"], ["pylint"], "Python 3.13.0"))
+
+    def test_02_restore_missing_entry(self) -> None:
+        """Verify that restoring a key which is not cached does nothing."""
+        # Arrange
+        cache = VenvCache(self.__cache_dir)
+
+        # Act
+        is_restored = cache.restore("missing", self.__new_venv)
+
+        # Assert
+        self.assertFalse(is_restored)
+        self.assertFalse(cache.is_cached("missing"))
+
+    def test_03_store_and_restore(self) -> None:
+        """Verify that a stored environment is restored with its packages and with scripts pointing to it."""
+        # Arrange
+        cache = VenvCache(self.__cache_dir)
+
+        # Act
+        cache.store("key", self.__original_venv)
+        is_restored = cache.restore("key", self.__new_venv)
+
+        with open(os.path.join(self.__new_venv, self.__scripts_dir, "tool"), "r", encoding="utf-8") as script:
+            script_content = script.read()
+
+        # Assert
+        self.assertTrue(cache.is_cached("key"))
+        self.assertTrue(is_restored)
+        self.assertTrue(os.path.exists(os.path.join(self.__new_venv, self.__package_file)))
+        self.assertIn(self.__new_venv, script_content)
+        self.assertNotIn(self.__original_venv, script_content)
+
+    def test_04_cache_survives_venv_removal(self) -> None:
+        """Verify that removing the original environment does not affect the cache."""
+        # Arrange
+        cache = VenvCache(self.__cache_dir)
+        cache.store("key", self.__original_venv)
+
+        # Act
+        shutil.rmtree(self.__original_venv)
+        is_restored = cache.restore("key", self.__new_venv)
+
+        # Assert
+        self.assertTrue(is_restored)
+        self.assertTrue(os.path.exists(os.path.join(self.__new_venv, self.__package_file)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -76,12 +76,12 @@ class TestsVirtualEnvironment(unittest.TestCase):
         # Assert
         self.assertTrue(does_python_exist)
 
-    @patch("subprocess.run")
+    @patch("grader.utils.virtual_environment.run")
     def test_04_failed_venv_creation(self, patched_run: MagicMock) -> None:
         """
         Verify that the VirtualEnvironment class raises an exception when it can't create a virtual environment.
 
-        :param patched_run: Mocked subprocess.run function.
+        :param patched_run: Mocked process.run function.
         :type patched_run: MagicMock
         """
         patched_run.return_value = subprocess.CompletedProcess([], 1)
@@ -110,12 +110,12 @@ class TestsVirtualEnvironment(unittest.TestCase):
         self.assertTrue(is_expected_package_installed)
         self.assertTrue(is_version_correct)
 
-    @patch("subprocess.run")
+    @patch("grader.utils.virtual_environment.run")
     def test_06_fail_install_requirements(self, patched_run: MagicMock) -> None:
         """
         Verify that the VirtualEnvironment class raises an exception when it fails to install the requirements.
 
-        :param patched_run: Mocked subprocess.run function.
+        :param patched_run: Mocked process.run function.
         :type patched_run: MagicMock
         """
 
@@ -148,12 +148,12 @@ class TestsVirtualEnvironment(unittest.TestCase):
         self.assertTrue(is_expected_package_installed)
         self.assertTrue(is_version_correct)
 
-    @patch("subprocess.run")
+    @patch("grader.utils.virtual_environment.run")
     def test_08_fail_install_grader_requirements(self, patched_run: MagicMock) -> None:
         """
         Verify that the VirtualEnvironment class raises an exception when it fails to install the grader requirements.
 
-        :param patched_run: Mocked subprocess.run function.
+        :param patched_run: Mocked process.run function.
         :type patched_run: MagicMock
         """
 
@@ -0,0 +1,141 @@
+"""Unit tests for the ZipProjectIndex class."""
+
+import os
+import shutil
+import unittest
+import zipfile
+
+from grader.utils.archive import is_safe_member_name
+from grader.utils.zip_project_index import ZipProjectIndex, build_directory_tree
+
+
+class TestZipProjectIndex(unittest.TestCase):
+    """Test cases for the ZipProjectIndex class."""
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        """
+        Initialize the test case.
+
+        :param methodName: The name of the test method to run.
+        :type methodName: str
+        """
+        self.__sample_dir = os.path.abspath("sample_zip_index")
+        self.__archive_path = os.path.join(self.__sample_dir, "submission.zip")
+        self.__target_dir = os.path.join(self.__sample_dir, "extracted")
+        super().__init__(methodName)
+
+    def setUp(self) -> None:
+        """Set up the test environment."""
+        os.makedirs(self.__sample_dir, exist_ok=True)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        """Tear down the test environment."""
+        shutil.rmtree(self.__sample_dir, ignore_errors=True)
+        return super().tearDown()
+
+    def __write_archive(self, members: dict[str, str]) -> None:
+        """
+        Write the sample archive.
+
+        :param members: The names of the members of the archive, mapped to their contents.
+        """
+        with zipfile.ZipFile(self.__archive_path, "w") as archive:
+            for name, content in members.items():
+                archive.writestr(name, content)
+
+    def test_01_lists_files_without_extracting(self) -> None:
+        """Verify that the files are listed from the archive, and nothing is extracted."""
+        # Arrange
+        self.__write_archive(
+            {
+                "project/main.py": "",
+                "project/src/app.py": "",
+                "project/.venv/lib/site.py": "",
+                "__MACOSX/project/._main.py": "",
+            }
+        )
+        project_root = os.path.join(self.__target_dir, "project")
+
+        # Act
+        project_index = ZipProjectIndex(self.__archive_path, self.__target_dir)
+
+        # Assert
+        self.assertEqual(project_root, project_index.project_root)
+        self.assertEqual(
+            [os.path.join(project_root, "main.py"), os.path.join(project_root, "src", "app.py")],
+            sorted(project_index.python_files),
+        )
+        self.assertEqual(["main.py", "src/app.py", "src"], project_index.entries)
+        self.assertFalse(os.path.exists(self.__target_dir))
+        self.assertFalse(project_index.is_extracted)
+
+    def test_02_several_top_level_entries(self) -> None:
+        """Verify that the extraction directory is the project root if the archive has several top-level folders."""
+        # Arrange
+        self.__write_archive({"main.py": "", "src/app.py": "", "tests/test_app.py": ""})
+
+        # Act
+        project_index = ZipProjectIndex(self.__archive_path, self.__target_dir)
+
+        # Assert
+        self.assertEqual(self.__target_dir, project_index.project_root)
+        self.assertEqual("tests", project_index.tests_directory)
+
+    def test_03_extract(self) -> None:
+        """Verify that the archive is extracted on demand, only once."""
+        # Arrange
+        self.__write_archive({"project/main.py": "print('hello')"})
+        project_index = ZipProjectIndex(self.__archive_path, self.__target_dir)
+
+        # Act
+        project_root = project_index.extract()
+        os.remove(os.path.join(project_root, "main.py"))
+        project_index.extract()
+
+        # Assert
+        self.assertTrue(project_index.is_extracted)
+        self.assertFalse(os.path.exists(os.path.join(project_root, "main.py")))
+
+    def test_04_gitignore(self) -> None:
+        """Verify that the .gitignore files are read from the archive."""
+        # Arrange
+        self.__write_archive(
+            {"project/.gitignore": "generated/\n", "project/main.py": "", "project/generated/a.py": ""}
+        )
+
+        # Act
+        project_index = ZipProjectIndex(self.__archive_path, self.__target_dir, is_respecting_gitignore=True)
+
+        # Assert
+        self.assertEqual([os.path.join(self.__target_dir, "project", "main.py")], project_index.python_files)
+
+    def test_05_helpers(self) -> None:
+        """Verify that unsafe member names are detected and implied directories are part of the tree."""
+        # Act
+        tree = build_directory_tree(["root/a/b.py", "root/c/"], "root/")
+
+        # Assert
+        self.assertEqual({"": {"a": True, "c": True}, "a/": {"b.py": False}}, tree)
+        self.assertTrue(is_safe_member_name("src/main.py"))
+        self.assertFalse(is_safe_member_name("../main.py"))
+        self.assertFalse(is_safe_member_name("/etc/passwd"))
+        self.assertFalse(is_safe_member_name("C:/main.py"))
+
+    def test_06_fingerprint(self) -> None:
+        """Verify that the fingerprint of an archive changes with the contents of its files, without extracting it."""
+        # Arrange
+        self.__write_archive({"project/main.py": "print('hello')"})
+        fingerprint = ZipProjectIndex(self.__archive_path, self.__target_dir).compute_fingerprint()
+
+        # Act
+        self.__write_archive({"project/main.py": "print('changed')"})
+        changed_fingerprint = ZipProjectIndex(self.__archive_path, self.__target_dir).compute_fingerprint()
+
+        # Assert
+        self.assertNotEqual(fingerprint, changed_fingerprint)
+        self.assertFalse(os.path.exists(self.__target_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()